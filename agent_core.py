@@ -10,17 +10,25 @@ serves as the runtime backbone for higher-level creative agents such as
 
 import os
 import json
+import contextlib
 import uuid
 import datetime
 import threading
-import time
 import logging
 from decimal import Decimal
 from types import SimpleNamespace
-from typing import Any, Dict, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 from virtual_diary import load_entries
 from config import Config, get_emoji_weights
+from entity_locks import EntityLocks
+from fixed_point import format_units, from_units, scale_units, split_units, to_units
+from hook_dispatcher import HookDispatcher
 from hook_manager import HookManager
+from nonce_store import NonceStore
+from parallel_replay import replay_log
+from proposal_scheduler import ProposalScheduler
+from snapshot_store import IncrementalSnapshotStore, collect_entities, encode_chunk
+from tally_index import TallyIndex
 
 if TYPE_CHECKING:
     from superNova_2177 import (
@@ -34,7 +42,6 @@ if TYPE_CHECKING:
         InMemoryStorage,
         Coin,
         User,
-        acquire_multiple_locks,
         AddUserPayload,
         MintPayload,
         ReactPayload,
@@ -57,8 +64,8 @@ except Exception:  # pragma: no cover - graceful fallback
     events = None  # type: ignore[assignment]
 
 # Provide a minimal fallback implementation of ``LogChain`` if the real
-# class is unavailable at runtime. Tests only require ``add``,
-# ``replay_events``, ``verify`` and ``entries`` attributes.
+# class is unavailable at runtime. Tests only require ``add``, ``add_batch``,
+# ``replay_events``, ``verify``, ``entries`` and ``len()`` support.
 try:  # pragma: no cover - prefer real implementation when present
     LogChain  # type: ignore[name-defined]
 except Exception:  # pragma: no cover - lightweight stub for tests
@@ -73,11 +80,17 @@ except Exception:  # pragma: no cover - lightweight stub for tests
         def add(self, event: Dict[str, Any]) -> None:
             self.entries.append(event)
 
+        def add_batch(self, events: list[dict[str, Any]]) -> None:
+            self.entries.extend(events)
+
+        def __len__(self) -> int:
+            return len(self.entries)
+
         def replay_events(self, handler: Any, since: Any = None) -> None:
             for event in self.entries:
                 handler(event)
 
-        def verify(self) -> bool:
+        def verify(self, since: Any = None) -> bool:
             return True
 
 
@@ -95,6 +108,12 @@ def VerifiedScientificModel(*args: Any, **kwargs: Any):  # placeholder
     return decorator
 
 
+# Keys a user record needs to carry voting weight in ``_tally_proposal``.
+TALLY_USER_FIELDS = frozenset(
+    {"species", "consent", "harmony_score", "is_genesis", "join_time"}
+)
+
+
 def _load_globals() -> None:
     """Import symbols from superNova_2177 at runtime to avoid circular deps."""
     import superNova_2177 as sn
@@ -133,41 +152,55 @@ class RemixAgent:
         self.total_system_karma = Decimal("0")
         self.lock = threading.RLock()
         self.snapshot = snapshot
-        self.hooks = HookManager()
+        # Incremental binary checkpoints live next to the legacy JSON snapshot.
+        self.snapshot_store = IncrementalSnapshotStore(
+            os.environ.get("SNAPSHOT_DIR", f"{os.path.splitext(snapshot)[0]}.d")
+        )
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_failed = False
+        self.hooks = HookManager(
+            dispatcher=HookDispatcher(
+                maxsize=self.config.HOOK_QUEUE_SIZE,
+                timeout=self.config.HOOK_TIMEOUT_SECONDS,
+                put_timeout=self.config.HOOK_PUT_TIMEOUT_SECONDS,
+            )
+        )
         # Track awarded fork badges for users
         self.fork_badges: Dict[str, list[str]] = {}
         # Register hook for cross remix creation events
         if events is not None:
             self.hooks.register_hook(events.CROSS_REMIX_CREATED, self.on_cross_remix_created)
         self.event_count = 0
-        self.processed_nonces = {}
-        self._cleanup_thread = threading.Thread(
-            target=self._cleanup_nonces, daemon=True
+        self.processed_nonces = NonceStore(
+            ttl=self.config.NONCE_EXPIRATION_SECONDS,
+            bucket_seconds=self.config.NONCE_CLEANUP_INTERVAL_SECONDS,
+            bloom_capacity=int(os.environ.get("NONCE_BLOOM_CAPACITY", "0")),
+            bloom_path=os.environ.get("NONCE_BLOOM_FILE"),
         )
-        self._cleanup_thread.start()
+        self.entity_locks = EntityLocks(self.config.ENTITY_LOCK_STRIPES)
+        self.tally_index = TallyIndex(self.config.GENESIS_BONUS_DECAY_YEARS)
+        self.proposal_scheduler = ProposalScheduler()
         if not self._use_simple:
             self.load_state()
 
-    def _cleanup_nonces(self) -> None:
-        while True:
-            time.sleep(self.config.NONCE_CLEANUP_INTERVAL_SECONDS)
-            now = ts()
-            with self.lock:
-                to_remove = [
-                    n
-                    for n, t in self.processed_nonces.items()
-                    if (
-                        datetime.datetime.fromisoformat(now.replace("Z", "+00:00"))
-                        - datetime.datetime.fromisoformat(t.replace("Z", "+00:00"))
-                    ).total_seconds()
-                    > self.config.NONCE_EXPIRATION_SECONDS
-                ]
-                for n in to_remove:
-                    del self.processed_nonces[n]
-
     def load_state(self) -> None:
         snapshot_timestamp = None
-        if os.path.exists(self.snapshot):
+        snapshot_seq = None
+        if self.snapshot_store.exists():
+            manifest, state = self.snapshot_store.load()
+            snapshot_timestamp = manifest.get("timestamp")
+            snapshot_seq = manifest.get("last_seq")
+            self.treasury = Decimal(manifest.get("treasury", "0"))
+            self.total_system_karma = Decimal(manifest.get("total_system_karma", "0"))
+            self.storage.bulk_load(state)
+            karma_decay = getattr(self.storage, "karma_decay", None)
+            if karma_decay is not None:
+                karma_decay.load_state(manifest.get("karma_decay", []))
+                # Storages shared between processes keep the ledger in the database.
+                save_karma_decay = getattr(self.storage, "save_karma_decay", None)
+                if save_karma_decay is not None:
+                    save_karma_decay()
+        elif os.path.exists(self.snapshot):
             with open(self.snapshot, "r") as f:
                 data = json.load(f)
             snapshot_timestamp = data.get("timestamp")
@@ -181,32 +214,62 @@ class RemixAgent:
                 self.storage.set_proposal(p["proposal_id"], p)
             for l in data.get("marketplace_listings", []):
                 self.storage.set_marketplace_listing(l["listing_id"], l)
-        self.logchain.replay_events(self._apply_event, snapshot_timestamp)
-        self.event_count = len(self.logchain.entries)
-        if not self.logchain.verify():
+        if hasattr(self.logchain, "iter_records"):
+            # Seek straight to the first event the snapshot has not seen.
+            start_seq = snapshot_seq + 1 if snapshot_seq is not None else None
+            since = snapshot_timestamp if start_seq is None else None
+            replay_log(self, start_seq=start_seq, since=since)
+            verified = self.logchain.verify(since=since, start_seq=start_seq)
+        else:
+            self.logchain.replay_events(self._apply_event, snapshot_timestamp)
+            verified = self.logchain.verify(since=snapshot_timestamp)
+        self.event_count = len(self.logchain)
+        # Snapshot loads and parallel replay bypass the per-event hooks.
+        self._rebuild_tally_index()
+        self.rescan_proposals()
+        # Only the replayed tail needs re-hashing; the snapshot already
+        # captures the state produced by everything before it.
+        if not verified:
             raise ValueError("Logchain verification failed.")
 
     def save_snapshot(self) -> None:
-        with self.lock:
-            data = {
-                "treasury": str(self.treasury),
-                "total_system_karma": str(self.total_system_karma),
-                "users": self.storage.get_all_users(),
-                "coins": [
-                    self.storage.get_coin(cid) for cid in self.storage.coins.keys()
-                ],
-                "proposals": [
-                    self.storage.get_proposal(pid)
-                    for pid in self.storage.proposals.keys()
-                ],
-                "marketplace_listings": [
-                    self.storage.get_marketplace_listing(lid)
-                    for lid in self.storage.marketplace_listings.keys()
-                ],
-                "timestamp": ts(),
-            }
-            with open(self.snapshot, "w") as f:
-                json.dump(data, f, default=str)
+        """Checkpoint entities changed since the last snapshot.
+
+        Only the delta is encoded while the agent lock is held; the chunk is
+        written afterwards. A full base chunk is written when dirty tracking
+        is unavailable or the delta chain grew too long.
+        """
+        with self._snapshot_lock:
+            with self.lock:
+                dirty = self.storage.drain_dirty()
+                base = (
+                    dirty is None
+                    or self._snapshot_failed
+                    or self.snapshot_store.needs_base()
+                )
+                blob = encode_chunk(
+                    collect_entities(
+                        self.storage.snapshot_source(), None if base else dirty
+                    )
+                )
+                meta = {
+                    "treasury": str(self.treasury),
+                    "total_system_karma": str(self.total_system_karma),
+                    "last_seq": getattr(self.logchain, "last_seq", None),
+                    "timestamp": ts(),
+                }
+                karma_decay = getattr(self.storage, "karma_decay", None)
+                if karma_decay is not None:
+                    # Stored user records are only current up to their epoch.
+                    meta["karma_decay"] = karma_decay.state()
+            try:
+                self.snapshot_store.write(blob, meta, base=base)
+            except Exception:
+                # The drained keys are lost; fall back to a full checkpoint.
+                self._snapshot_failed = True
+                raise
+            self._snapshot_failed = False
+            self.processed_nonces.save()
 
     def on_cross_remix_created(self, event: Dict[str, Any]) -> None:
         """Hook triggered after a Cross-Remix to simulate a creative breakthrough."""
@@ -221,6 +284,10 @@ class RemixAgent:
         with self.lock:
             self.total_system_karma += delta
 
+    def _credit_treasury(self, amount: Decimal) -> None:
+        with self.lock:
+            self.treasury += amount
+
     @ScientificModel(
         source="protocol governance heuristic",
         model_type="DynamicThreshold",
@@ -313,12 +380,12 @@ class RemixAgent:
             if not user_data:
                 return
 
-            karma = Decimal(str(user_data.get("karma", "0")))
+            karma = to_units(user_data.get("karma", "0"))
             bypass = event.get("genesis_creator") or event.get("genesis_bonus_applied")
             if (
                 not user_data.get("is_genesis")
                 and not bypass
-                and karma < self.config.KARMA_MINT_THRESHOLD
+                and karma < to_units(self.config.KARMA_MINT_THRESHOLD)
             ):
                 return
 
@@ -328,27 +395,32 @@ class RemixAgent:
                 return
 
             try:
-                root_value = Decimal(str(root_coin.get("value", "0")))
-                mint_value = Decimal(str(event.get("value", "0")))
+                root_value = to_units(root_coin.get("value", "0"))
+                mint_value = to_units(event.get("value", "0"))
             except Exception:
                 return
 
             if mint_value > root_value:
                 return
 
-            root_coin["value"] = str(root_value - mint_value)
-            treasury = mint_value * self.config.TREASURY_SHARE
-            reactor = mint_value * self.config.REACTOR_SHARE
-            creator_val = mint_value * self.config.CREATOR_SHARE
-            self.treasury += treasury
+            root_coin["value"] = format_units(root_value - mint_value)
+            treasury, reactor, creator_val = split_units(
+                mint_value,
+                (
+                    self.config.TREASURY_SHARE,
+                    self.config.REACTOR_SHARE,
+                    self.config.CREATOR_SHARE,
+                ),
+            )
+            self.treasury += from_units(treasury)
             self.storage.set_coin(root_coin_id, root_coin)
             self.storage.set_coin(
                 event["coin_id"],
                 {
                     "owner": user,
                     "creator": user,
-                    "value": str(creator_val),
-                    "reactor_escrow": str(reactor),
+                    "value": format_units(creator_val),
+                    "reactor_escrow": format_units(reactor),
                     "reactions": [],
                 },
             )
@@ -378,13 +450,13 @@ class RemixAgent:
                     and (buyer_root := self.storage.get_coin(buyer.get("root_coin_id")))
                     and (seller_root := self.storage.get_coin(seller.get("root_coin_id")))
                 ):
-                    price = Decimal(str(listing.get("price", "0")))
-                    total = Decimal(str(event.get("total_cost", price)))
-                    buyer_root_value = Decimal(str(buyer_root.get("value", "0")))
+                    price = to_units(listing.get("price", "0"))
+                    total = to_units(event.get("total_cost", listing.get("price", "0")))
+                    buyer_root_value = to_units(buyer_root.get("value", "0"))
                     if buyer_root_value >= total:
-                        buyer_root["value"] = str(buyer_root_value - total)
-                        seller_root["value"] = str(
-                            Decimal(str(seller_root.get("value", "0"))) + price
+                        buyer_root["value"] = format_units(buyer_root_value - total)
+                        seller_root["value"] = format_units(
+                            to_units(seller_root.get("value", "0")) + price
                         )
                         coin["owner"] = event["buyer"]
                         buyer.setdefault("coins_owned", []).append(coin["coin_id"])
@@ -410,22 +482,22 @@ class RemixAgent:
             if weight is None:
                 return
             if creator:
-                creator_karma = Decimal(str(creator.get("karma", "0")))
-                creator["karma"] = str(
-                    creator_karma + self.config.CREATOR_KARMA_PER_REACT * weight
+                creator["karma"] = format_units(
+                    to_units(creator.get("karma", "0"))
+                    + to_units(self.config.CREATOR_KARMA_PER_REACT * weight)
                 )
                 self.storage.set_user(creator_name, creator)
-            reactor_karma = Decimal(str(reactor.get("karma", "0")))
-            reactor["karma"] = str(
-                reactor_karma + self.config.REACTOR_KARMA_PER_REACT * weight
+            reactor["karma"] = format_units(
+                to_units(reactor.get("karma", "0"))
+                + to_units(self.config.REACTOR_KARMA_PER_REACT * weight)
             )
             self.storage.set_user(event["reactor"], reactor)
-            escrow = Decimal(str(coin.get("reactor_escrow", "0")))
+            escrow = to_units(coin.get("reactor_escrow", "0"))
             release = min(
                 escrow,
-                escrow * (weight / self.config.REACTION_ESCROW_RELEASE_FACTOR),
+                scale_units(escrow, weight / self.config.REACTION_ESCROW_RELEASE_FACTOR),
             )
-            coin["reactor_escrow"] = str(escrow - release)
+            coin["reactor_escrow"] = format_units(escrow - release)
             coin.setdefault("reactions", []).append(
                 {
                     "reactor": event["reactor"],
@@ -438,41 +510,170 @@ class RemixAgent:
             if release > 0:
                 root = self.storage.get_coin(reactor.get("root_coin_id"))
                 if root:
-                    root_val = Decimal(str(root.get("value", "0")))
-                    root["value"] = str(root_val + release)
+                    root["value"] = format_units(to_units(root.get("value", "0")) + release)
                     self.storage.set_coin(reactor["root_coin_id"], root)
 
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Run queued hooks, then stop the hook dispatcher's loop and threads."""
+        self.hooks.close(timeout)
+
     def process_event(self, event: Dict[str, Any]) -> None:
-        if not self.vaccine.scan(json.dumps(event)):
-            raise BlockedContentError("Event content blocked by vaccine.")
-        nonce = event.get("nonce")
-        with self.lock:
-            if nonce in self.processed_nonces:
-                return
-            self.processed_nonces[nonce] = ts()
+        rule = self.vaccine.scan_event(event)
+        if rule is not None:
+            raise BlockedContentError(f"Event content blocked by vaccine rule {rule!r}.")
+        if not self.processed_nonces.add(event.get("nonce")):
+            return
         try:
             self.logchain.add(event)
-            if self._use_simple:
-                self._simple_process_event(event)
-            else:
-                self._apply_event(event)
+            with RemixAgent._event_locks(self, event), self._storage_scope("unit_of_work"):
+                if self._use_simple:
+                    self._simple_process_event(event)
+                else:
+                    self._apply_event(event)
             self.event_count += 1
             self.hooks.fire_hooks(event["event"], event)
+        except Exception as e:
+            logging.error(f"Event processing failed for {event.get('event')}: {e}")
+            return
+        if not self._use_simple and self.event_count % self.config.SNAPSHOT_INTERVAL == 0:
+            try:
+                self.save_snapshot()
+            except Exception as e:
+                # The event is already applied and logged; replay covers the gap.
+                logging.error(f"Snapshot failed after event {self.event_count}: {e}")
+
+    def _storage_scope(self, name: str) -> Any:
+        """Return ``storage.<name>()`` or a null context if the storage lacks it."""
+        factory = getattr(self.storage, name, None)
+        return factory() if factory is not None else contextlib.nullcontext()
+
+    def _event_locks(self, event: Optional[Dict[str, Any]] = None) -> Any:
+        """Return a context holding the stripes ``event`` touches.
+
+        Enter it before the storage scope so the stripes stay held until the
+        write is committed.  ``event=None`` holds every stripe, for batches
+        whose later events may touch entities the earlier ones create.
+        """
+        entity_locks = getattr(self, "entity_locks", None)
+        if entity_locks is None or getattr(self, "_use_simple", False):
+            return contextlib.nullcontext()
+        keys = None if event is None else RemixAgent._event_lock_keys(self, event)
+        return entity_locks.hold_all() if keys is None else entity_locks.hold(*keys)
+
+    def process_events(self, batch: list[Dict[str, Any]]) -> None:
+        """Process ``batch`` with the same outcome as sequential :meth:`process_event` calls.
+
+        The vaccine scan, nonce bookkeeping, log append, storage commit and
+        hook dispatch each run once for the whole batch. Events before the
+        first blocked one are still processed before ``BlockedContentError``
+        is raised. Hooks run after every event in the batch has been applied.
+        """
+        batch = list(batch)
+        blocked = self.vaccine.scan_events(batch)
+        accepted = [
+            event
+            for event in (batch if blocked is None else batch[:blocked])
+            if self.processed_nonces.add(event.get("nonce"))
+        ]
+        if accepted:
+            self._ingest_batch(accepted)
+        if blocked is not None:
+            rule = self.vaccine.scan_event(batch[blocked])
+            raise BlockedContentError(f"Event content blocked by vaccine rule {rule!r}.")
+
+    def _ingest_batch(self, events: list[Dict[str, Any]]) -> None:
+        try:
+            self.logchain.add_batch(events)
+        except Exception as e:
+            for event in events:
+                logging.error(f"Event processing failed for {event.get('event')}: {e}")
+            return
+        start_count = self.event_count
+        applied = []
+        with RemixAgent._event_locks(self), self._storage_scope("group_commit"):
+            for event in events:
+                try:
+                    with self._storage_scope("unit_of_work"):
+                        if self._use_simple:
+                            self._simple_process_event(event)
+                        else:
+                            self._apply_event(event)
+                except Exception as e:
+                    logging.error(f"Event processing failed for {event.get('event')}: {e}")
+                    continue
+                self.event_count += 1
+                applied.append(event)
+        try:
+            self.hooks.fire_many((event.get("event"), (event,)) for event in applied)
+            interval = self.config.SNAPSHOT_INTERVAL
+            # One checkpoint covers every interval boundary crossed by the batch.
             if (
                 not self._use_simple
-                and self.event_count % self.config.SNAPSHOT_INTERVAL == 0
+                and self.event_count // interval > start_count // interval
             ):
                 self.save_snapshot()
         except Exception as e:
-            logging.error(f"Event processing failed for {event.get('event')}: {e}")
+            logging.error(f"Batch post-processing failed: {e}")
 
     def _apply_event(self, event: Dict[str, Any]) -> None:
         event_type = event.get("event")
         handler = getattr(self, f"_apply_{event_type}", None)
-        if handler:
-            handler(event)
-        else:
+        if not handler:
             logging.warning(f"Unknown event type {event_type}")
+            return
+        # Re-entrant: a no-op when the caller already holds the stripes
+        # around its unit of work; replay relies on it to lock each event.
+        with RemixAgent._event_locks(self, event):
+            handler(event)
+
+    def _event_lock_keys(self, event: Dict[str, Any]) -> Optional[List[Tuple[str, Any]]]:
+        """Return the entity keys ``event`` touches, or ``None`` for all.
+
+        Root coins are reached through their owner, so the owner's
+        ``("user", name)`` key covers them, as in :mod:`parallel_replay`.
+        """
+        kind = event.get("event")
+        try:
+            if kind == "ADD_USER":
+                keys = [("user", event["user"])]
+            elif kind == "MINT":
+                keys = [("user", event["user"]), ("coin", event["coin_id"])]
+            elif kind == "REACT":
+                coin = self.storage.get_coin(event["coin_id"]) or {}
+                keys = [
+                    ("user", event["reactor"]),
+                    ("user", coin.get("creator", coin.get("owner"))),
+                    ("coin", event["coin_id"]),
+                ]
+            elif kind == "LIST_COIN_FOR_SALE":
+                keys = [
+                    ("listing", event["listing_id"]),
+                    ("user", event["seller"]),
+                    ("coin", event["coin_id"]),
+                ]
+            elif kind == "BUY_COIN":
+                listing = self.storage.get_marketplace_listing(event["listing_id"]) or {}
+                keys = [
+                    ("listing", event["listing_id"]),
+                    ("user", event["buyer"]),
+                    ("user", listing.get("seller")),
+                    ("coin", listing.get("coin_id")),
+                ]
+            elif kind == "CREATE_PROPOSAL":
+                keys = [("proposal", event["proposal_id"]), ("user", event["creator"])]
+            elif kind == "VOTE_PROPOSAL":
+                keys = [("proposal", event["proposal_id"])]
+            elif kind in ("STAKE_KARMA", "UNSTAKE_KARMA", "REVOKE_CONSENT"):
+                keys = [("user", event["user"])]
+            elif kind == "CROSS_REMIX":
+                keys = [("user", event["user"]), ("coin", event["coin_id"])]
+            elif kind == "FORK_UNIVERSE":
+                keys = []
+            else:
+                return None
+        except KeyError:
+            return None
+        return [key for key in keys if key[1] is not None]
 
     def _apply_ADD_USER(self, event: AddUserPayload) -> None:
         username = event["user"]
@@ -481,7 +682,8 @@ class RemixAgent:
                 return
 
             user = User(username, event["is_genesis"], event["species"], self.config)
-            user.root_coin_id = f"root_{uuid.uuid4().hex}"
+            # Replays must recreate the root coin later MINT events name.
+            user.root_coin_id = event.get("root_coin_id") or f"root_{uuid.uuid4().hex}"
             root_coin = Coin(
                 user.root_coin_id,
                 username,
@@ -502,6 +704,7 @@ class RemixAgent:
                     stored_user["action_timestamps"] = {}
                     self.storage.set_user(username, stored_user)
                 self._update_total_karma(user.effective_karma())
+                self._index_tally_user(username)
                 logging.info(
                     f"User {username} added successfully with root coin {user.root_coin_id}"
                 )
@@ -526,12 +729,11 @@ class RemixAgent:
         if not root_coin_data or root_coin_data["owner"] != user:
             return
         root_coin = Coin.from_dict(root_coin_data, self.config)
-        value = Decimal(event["value"])
-        if value > root_coin.value:
+        value = to_units(event["value"])
+        if value > root_coin.value_units:
             return
-        if (
-            not user_obj.is_genesis
-            and user_obj.effective_karma() < self.config.KARMA_MINT_THRESHOLD
+        if not user_obj.is_genesis and user_obj.effective_karma_units() < to_units(
+            self.config.KARMA_MINT_THRESHOLD
         ):
             return
         if (
@@ -539,34 +741,37 @@ class RemixAgent:
             and len(event["improvement"]) < self.config.MIN_IMPROVEMENT_LEN
         ):
             return
-        locks = [user_obj.lock, root_coin.lock]
-        with acquire_multiple_locks(locks):
-            root_coin.value -= value
-            treasury = value * self.config.TREASURY_SHARE
-            reactor = value * self.config.REACTOR_SHARE
-            creator = value * self.config.CREATOR_SHARE
-            self.treasury += treasury
-            new_coin_id = event["coin_id"]
-            new_coin = Coin(
-                new_coin_id,
-                user,
-                user,
-                creator,
-                self.config,
-                is_root=False,
-                universe_id="main",
-                is_remix=event["is_remix"],
-                references=event["references"],
-                improvement=event["improvement"],
-                fractional_pct=event["fractional_pct"],
-                ancestors=event["ancestors"],
-                content=event["content"],
-            )
-            new_coin.reactor_escrow = reactor
-            user_obj.coins_owned.append(new_coin_id)
-            self.storage.set_user(user, user_obj.to_dict())
-            self.storage.set_coin(root_coin_id, root_coin.to_dict())
-            self.storage.set_coin(new_coin_id, new_coin.to_dict())
+        root_coin.value_units -= value
+        treasury, reactor, creator = split_units(
+            value,
+            (
+                self.config.TREASURY_SHARE,
+                self.config.REACTOR_SHARE,
+                self.config.CREATOR_SHARE,
+            ),
+        )
+        self._credit_treasury(from_units(treasury))
+        new_coin_id = event["coin_id"]
+        new_coin = Coin(
+            new_coin_id,
+            user,
+            user,
+            from_units(creator),
+            self.config,
+            is_root=False,
+            universe_id="main",
+            is_remix=event["is_remix"],
+            references=event["references"],
+            improvement=event["improvement"],
+            fractional_pct=event["fractional_pct"],
+            ancestors=event["ancestors"],
+            content=event["content"],
+        )
+        new_coin.escrow_units = reactor
+        user_obj.coins_owned.append(new_coin_id)
+        self.storage.set_user(user, user_obj.to_dict())
+        self.storage.set_coin(root_coin_id, root_coin.to_dict())
+        self.storage.set_coin(new_coin_id, new_coin.to_dict())
 
     def _apply_REACT(self, event: ReactPayload) -> None:
         reactor = event["reactor"]
@@ -578,8 +783,6 @@ class RemixAgent:
             return
         self.storage.set_user(reactor, reactor_data)
         reactor_obj = User.from_dict(reactor_data, self.config)
-        if not reactor_obj.check_rate_limit("react"):
-            return
         coin_id = event["coin_id"]
         coin_data = self.storage.get_coin(coin_id)
         if not coin_data:
@@ -588,38 +791,39 @@ class RemixAgent:
         if event["emoji"] not in get_emoji_weights():
             return
         weight = get_emoji_weights()[event["emoji"]]
-        locks = [reactor_obj.lock, coin.lock]
-        with acquire_multiple_locks(locks):
-            coin.add_reaction(
-                {
-                    "reactor": reactor,
-                    "emoji": event["emoji"],
-                    "message": event["message"],
-                    "timestamp": event["timestamp"],
-                }
+        coin.add_reaction(
+            {
+                "reactor": reactor,
+                "emoji": event["emoji"],
+                "message": event["message"],
+                "timestamp": event["timestamp"],
+            }
+        )
+        reactor_obj.karma_units += to_units(
+            self.config.REACTOR_KARMA_PER_REACT * weight
+        )
+        creator_data = self.storage.get_user(coin.creator)
+        if creator_data:
+            creator_obj = User.from_dict(creator_data, self.config)
+            creator_obj.karma_units += to_units(
+                self.config.CREATOR_KARMA_PER_REACT * weight
             )
-            reactor_obj.karma += self.config.REACTOR_KARMA_PER_REACT * weight
-            creator_data = self.storage.get_user(coin.creator)
-            if creator_data:
-                creator_obj = User.from_dict(creator_data, self.config)
-                with creator_obj.lock:
-                    creator_obj.karma += self.config.CREATOR_KARMA_PER_REACT * weight
-                self.storage.set_user(coin.creator, creator_obj.to_dict())
-            release = coin.release_escrow(
-                weight
-                / self.config.REACTION_ESCROW_RELEASE_FACTOR
-                * coin.reactor_escrow
+            self.storage.set_user(coin.creator, creator_obj.to_dict())
+        release = coin.release_escrow_units(
+            scale_units(
+                coin.escrow_units,
+                weight / self.config.REACTION_ESCROW_RELEASE_FACTOR,
             )
-            if release > 0:
-                reactor_root_data = self.storage.get_coin(reactor_obj.root_coin_id)
-                reactor_root = Coin.from_dict(reactor_root_data, self.config)
-                with reactor_root.lock:
-                    reactor_root.value += release
-                    self.storage.set_coin(
-                        reactor_obj.root_coin_id, reactor_root.to_dict()
-                    )
-            self.storage.set_user(reactor, reactor_obj.to_dict())
-            self.storage.set_coin(coin_id, coin.to_dict())
+        )
+        if release > 0:
+            reactor_root_data = self.storage.get_coin(reactor_obj.root_coin_id)
+            reactor_root = Coin.from_dict(reactor_root_data, self.config)
+            reactor_root.value_units += release
+            self.storage.set_coin(
+                reactor_obj.root_coin_id, reactor_root.to_dict()
+            )
+        self.storage.set_user(reactor, reactor_obj.to_dict())
+        self.storage.set_coin(coin_id, coin.to_dict())
 
     def _apply_LIST_COIN_FOR_SALE(self, event: MarketplaceListPayload) -> None:
         """List a coin for sale in the in-memory marketplace."""
@@ -655,28 +859,26 @@ class RemixAgent:
         seller_obj = User.from_dict(seller_data, self.config)
         coin_data = self.storage.get_coin(listing.coin_id)
         coin = Coin.from_dict(coin_data, self.config)
-        total_cost = Decimal(event["total_cost"])
+        total_cost = to_units(event["total_cost"])
+        price = to_units(listing.price)
         buyer_root_data = self.storage.get_coin(buyer_obj.root_coin_id)
         buyer_root = Coin.from_dict(buyer_root_data, self.config)
-        locks = [buyer_obj.lock, seller_obj.lock, coin.lock, buyer_root.lock]
         seller_root_data = self.storage.get_coin(seller_obj.root_coin_id)
         seller_root = Coin.from_dict(seller_root_data, self.config)
-        locks.append(seller_root.lock)
-        with acquire_multiple_locks(locks):
-            if buyer_root.value < total_cost:
-                return
-            buyer_root.value -= total_cost
-            seller_root.value += listing.price
-            self.treasury += total_cost - listing.price
-            coin.owner = buyer
-            buyer_obj.coins_owned.append(coin.coin_id)
-            seller_obj.coins_owned.remove(coin.coin_id)
-            self.storage.set_user(buyer, buyer_obj.to_dict())
-            self.storage.set_user(listing.seller, seller_obj.to_dict())
-            self.storage.set_coin(listing.coin_id, coin.to_dict())
-            self.storage.set_coin(buyer_obj.root_coin_id, buyer_root.to_dict())
-            self.storage.set_coin(seller_obj.root_coin_id, seller_root.to_dict())
-            self.storage.delete_marketplace_listing(listing_id)
+        if buyer_root.value_units < total_cost:
+            return
+        buyer_root.value_units -= total_cost
+        seller_root.value_units += price
+        self._credit_treasury(from_units(total_cost - price))
+        coin.owner = buyer
+        buyer_obj.coins_owned.append(coin.coin_id)
+        seller_obj.coins_owned.remove(coin.coin_id)
+        self.storage.set_user(buyer, buyer_obj.to_dict())
+        self.storage.set_user(listing.seller, seller_obj.to_dict())
+        self.storage.set_coin(listing.coin_id, coin.to_dict())
+        self.storage.set_coin(buyer_obj.root_coin_id, buyer_root.to_dict())
+        self.storage.set_coin(seller_obj.root_coin_id, seller_root.to_dict())
+        self.storage.delete_marketplace_listing(listing_id)
 
     def _apply_CREATE_PROPOSAL(self, event: ProposalPayload) -> None:
         proposal_id = event["proposal_id"]
@@ -737,6 +939,9 @@ class RemixAgent:
             "execution_time": None,
         }
         self.storage.set_proposal(proposal_id, proposal)
+        scheduler = getattr(self, "proposal_scheduler", None)
+        if scheduler is not None:
+            scheduler.schedule_proposal(proposal)
 
     def _apply_VOTE_PROPOSAL(self, event: VoteProposalPayload) -> None:
         proposal_data = self.storage.get_proposal(event["proposal_id"])
@@ -748,6 +953,9 @@ class RemixAgent:
             return
         proposal["votes"][event["voter"]] = event["vote"]
         self.storage.set_proposal(event["proposal_id"], proposal)
+        tally_index = getattr(self, "tally_index", None)
+        if tally_index is not None:
+            tally_index.record_vote(event["proposal_id"], event["voter"], event["vote"])
 
     def _get_dynamic_threshold(
         self, total_voters: int, is_constitutional: bool, avg_yes: Decimal
@@ -808,6 +1016,9 @@ class RemixAgent:
             self.config.update_policy(target, value)
             proposal["status"] = "executed"
             self.storage.set_proposal(proposal_id, proposal)
+            scheduler = getattr(self, "proposal_scheduler", None)
+            if scheduler is not None:
+                scheduler.discard(proposal_id)
 
     def _apply_STAKE_KARMA(self, event: StakeKarmaPayload) -> None:
         user = event["user"]
@@ -815,13 +1026,12 @@ class RemixAgent:
         if not user_data:
             return
         user_obj = User.from_dict(user_data, self.config)
-        amount = Decimal(event["amount"])
-        with user_obj.lock:
-            if amount > user_obj.karma:
-                return
-            user_obj.karma -= amount
-            user_obj.staked_karma += amount
-            self.storage.set_user(user, user_obj.to_dict())
+        amount = to_units(event["amount"])
+        if amount > user_obj.karma_units:
+            return
+        user_obj.karma_units -= amount
+        user_obj.staked_units += amount
+        self.storage.set_user(user, user_obj.to_dict())
 
     def _apply_UNSTAKE_KARMA(self, event: UnstakeKarmaPayload) -> None:
         user = event["user"]
@@ -829,13 +1039,12 @@ class RemixAgent:
         if not user_data:
             return
         user_obj = User.from_dict(user_data, self.config)
-        amount = Decimal(event["amount"])
-        with user_obj.lock:
-            if amount > user_obj.staked_karma:
-                return
-            user_obj.staked_karma -= amount
-            user_obj.karma += amount
-            self.storage.set_user(user, user_obj.to_dict())
+        amount = to_units(event["amount"])
+        if amount > user_obj.staked_units:
+            return
+        user_obj.staked_units -= amount
+        user_obj.karma_units += amount
+        self.storage.set_user(user, user_obj.to_dict())
 
     def _apply_REVOKE_CONSENT(self, event: RevokeConsentPayload) -> None:
         user = event["user"]
@@ -843,9 +1052,9 @@ class RemixAgent:
         if not user_data:
             return
         user_obj = User.from_dict(user_data, self.config)
-        with user_obj.lock:
-            user_obj.revoke_consent()
-            self.storage.set_user(user, user_obj.to_dict())
+        user_obj.revoke_consent()
+        self.storage.set_user(user, user_obj.to_dict())
+        self._index_tally_user(user)
 
     def _apply_FORK_UNIVERSE(self, event: ForkUniversePayload) -> None:
         # Forking handled by CosmicNexus for unified governance
@@ -871,9 +1080,8 @@ class RemixAgent:
         root_coin = Coin.from_dict(root_coin_data, self.config)
         if root_coin.value < Config.CROSS_REMIX_COST:
             return
-        with root_coin.lock:
-            root_coin.value -= Config.CROSS_REMIX_COST
-            self.storage.set_coin(root_coin.coin_id, root_coin.to_dict())
+        root_coin.value -= Config.CROSS_REMIX_COST
+        self.storage.set_coin(root_coin.coin_id, root_coin.to_dict())
         new_coin_id = event["coin_id"]
         new_coin = Coin(
             new_coin_id,
@@ -897,33 +1105,131 @@ class RemixAgent:
             )
 
     def _apply_DAILY_DECAY(self, event: ApplyDailyDecayPayload) -> None:
+        apply_karma_decay = getattr(self.storage, "apply_karma_decay", None)
+        if apply_karma_decay is not None:
+            try:
+                apply_karma_decay(
+                    self.config.DAILY_DECAY, self.config.GENESIS_BONUS_DECAY_YEARS
+                )
+                return
+            except NotImplementedError:
+                pass
         users = self.storage.get_all_users()
         for u in users:
             user_obj = User.from_dict(u, self.config)
-            with user_obj.lock:
-                user_obj.karma *= self.config.DAILY_DECAY
-                if user_obj.is_genesis:
-                    # Apply genesis bonus decay
-                    join_time = datetime.datetime.fromisoformat(
-                        u["join_time"].replace("Z", "+00:00")
-                    )
-                    decay_factor = calculate_genesis_bonus_decay(
-                        join_time, self.config.GENESIS_BONUS_DECAY_YEARS
-                    )
-                    user_obj.karma *= decay_factor
-                self.storage.set_user(u["name"], user_obj.to_dict())
+            user_obj.karma *= self.config.DAILY_DECAY
+            if user_obj.is_genesis:
+                # Apply genesis bonus decay
+                join_time = datetime.datetime.fromisoformat(
+                    u["join_time"].replace("Z", "+00:00")
+                )
+                decay_factor = calculate_genesis_bonus_decay(
+                    join_time, self.config.GENESIS_BONUS_DECAY_YEARS
+                )
+                user_obj.karma *= decay_factor
+            self.storage.set_user(u["name"], user_obj.to_dict())
 
-    def _tally_proposal(self, proposal_id: str) -> Dict[str, Decimal]:
+    def _tally_weight_inputs(self, user_data: Dict[str, Any]) -> tuple | None:
+        """Return the ``TallyIndex.set_user`` arguments for a stored user.
+
+        Records without the governance fields (such as plain ``User.to_dict``
+        output) carry no voting weight and yield ``None``.
+        """
+        if not TALLY_USER_FIELDS.issubset(user_data):
+            return None
+        join_ts = None
+        if user_data["is_genesis"]:
+            join_time = datetime.datetime.fromisoformat(
+                user_data["join_time"].replace("Z", "+00:00")
+            )
+            if join_time.tzinfo is None:
+                join_time = join_time.replace(tzinfo=datetime.timezone.utc)
+            join_ts = join_time.timestamp()
+        return (
+            user_data["species"],
+            bool(user_data["consent"]),
+            safe_decimal(user_data["harmony_score"]),
+            join_ts,
+        )
+
+    def _index_tally_user(self, name: str) -> None:
+        tally_index = getattr(self, "tally_index", None)
+        if tally_index is None:
+            return
+        user_data = self.storage.get_user(name)
+        inputs = self._tally_weight_inputs(user_data) if user_data else None
+        if inputs is not None:
+            tally_index.set_user(name, *inputs)
+        else:
+            tally_index.remove_user(name)
+
+    def _rebuild_tally_index(self) -> None:
+        """Recompute the tally index from storage (open proposals only)."""
+        tally_index = self.tally_index
+        tally_index.clear()
+        for u in self.storage.get_all_users():
+            inputs = self._tally_weight_inputs(u)
+            if inputs is not None and "name" in u:
+                tally_index.set_user(u["name"], *inputs)
+        for proposal in self.storage.get_active_proposals():
+            if proposal.get("status") == "open":
+                RemixAgent._index_tally_votes(self, proposal)
+
+    def _index_tally_votes(self, proposal: Dict[str, Any]) -> None:
+        for voter, vote in (proposal.get("votes") or {}).items():
+            self.tally_index.record_vote(proposal["proposal_id"], voter, vote)
+
+    @staticmethod
+    def _combine_tally(
+        species_votes: Dict[str, Dict[str, Decimal]],
+        voted_harmony: Decimal,
+        total_harmony: Decimal,
+    ) -> Dict[str, Decimal]:
+        active_species = [s for s, v in species_votes.items() if v["total"] > 0]
+        if not active_species:
+            return {"yes": Decimal("0"), "no": Decimal("0"), "quorum": Decimal("0")}
+        species_weight = Decimal("1") / len(active_species)
+        final_yes = sum(
+            (sv["yes"] / sv["total"]) * species_weight
+            for s, sv in species_votes.items()
+            if sv["total"] > 0
+        )
+        final_no = sum(
+            (sv["no"] / sv["total"]) * species_weight
+            for s, sv in species_votes.items()
+            if sv["total"] > 0
+        )
+        quorum = voted_harmony / total_harmony if total_harmony > 0 else Decimal("0")
+        return {"yes": final_yes, "no": final_no, "quorum": quorum}
+
+    def _tally_proposal(
+        self, proposal_id: str, full: bool = False
+    ) -> Dict[str, Decimal]:
         """
         Tally votes for a proposal using tri-species harmony model.
         Weights votes by Harmony Score, adjusted for genesis decay.
         Returns {'yes': fraction, 'no': fraction, 'quorum': fraction}.
+
+        Reads the running sums in ``self.tally_index``; ``full=True`` (or an
+        agent without an index) recomputes from every user for verification.
         """
         proposal_data = self.storage.get_proposal(proposal_id)
         if not proposal_data:
             raise VoteError("Proposal not found.")
-        proposal = proposal_data
+        tally_index = getattr(self, "tally_index", None)
+        if full or tally_index is None:
+            return RemixAgent._tally_proposal_full(self, proposal_data)
+        if tally_index.decay_years != self.config.GENESIS_BONUS_DECAY_YEARS:
+            self.tally_index = TallyIndex(self.config.GENESIS_BONUS_DECAY_YEARS)
+            self._rebuild_tally_index()
+        if proposal_id not in self.tally_index:
+            # Votes stored by another process never reached this index.
+            RemixAgent._index_tally_votes(self, proposal_data)
+        return RemixAgent._combine_tally(*self.tally_index.tally(proposal_id))
+
+    def _tally_proposal_full(self, proposal: Dict[str, Any]) -> Dict[str, Decimal]:
         users_data = self.storage.get_all_users()
+        users_by_name = {u["name"]: u for u in users_data}
         total_harmony = Decimal("0")
         for u in users_data:
             harmony_score = safe_decimal(u["harmony_score"])
@@ -945,7 +1251,7 @@ class RemixAgent:
         }
         voted_harmony = Decimal("0")
         for voter, vote in proposal["votes"].items():
-            user_data = next((ud for ud in users_data if ud["name"] == voter), None)
+            user_data = users_by_name.get(voter)
             if user_data and user_data["consent"]:
                 harmony_score = safe_decimal(user_data["harmony_score"])
                 is_genesis = user_data["is_genesis"]
@@ -964,85 +1270,99 @@ class RemixAgent:
                 species_votes[s][vote] += weight
                 species_votes[s]["total"] += weight
                 voted_harmony += weight
-        active_species = [s for s, v in species_votes.items() if v["total"] > 0]
-        if not active_species:
-            return {"yes": Decimal("0"), "no": Decimal("0"), "quorum": Decimal("0")}
-        species_weight = Decimal("1") / len(active_species)
-        final_yes = sum(
-            (sv["yes"] / sv["total"]) * species_weight
-            for s, sv in species_votes.items()
-            if sv["total"] > 0
-        )
-        final_no = sum(
-            (sv["no"] / sv["total"]) * species_weight
-            for s, sv in species_votes.items()
-            if sv["total"] > 0
-        )
-        quorum = voted_harmony / total_harmony if total_harmony > 0 else Decimal("0")
-        return {"yes": final_yes, "no": final_no, "quorum": quorum}
+        return RemixAgent._combine_tally(species_votes, voted_harmony, total_harmony)
+
+    def rescan_proposals(self) -> None:
+        """Reload the whole deadline schedule from storage (used at startup)."""
+        self._proposals_checked_at = datetime.datetime.utcnow()
+        self.proposal_scheduler.rebuild(self.storage.get_active_proposals())
+
+    def schedule_changed_proposals(self, window: float) -> None:
+        """Schedule proposals that changed in storage since the last check.
+
+        Other processes' writes never reach this agent's scheduler, so only
+        the rows they changed are read back.  The check reaches ``window``
+        seconds further back to cover writer clock skew and transactions
+        that commit after their ``updated_at``.  Storages without change
+        tracking are private to this process, whose handlers already
+        schedule every proposal they write.
+        """
+        changed = getattr(self.storage, "get_proposals_changed_since", None)
+        if changed is None:
+            return
+        now = datetime.datetime.utcnow()
+        since = getattr(self, "_proposals_checked_at", now)
+        for proposal in changed(since - datetime.timedelta(seconds=window)):
+            self.proposal_scheduler.schedule_proposal(proposal)
+        self._proposals_checked_at = now
 
     def _process_proposal_lifecycle(self) -> None:
         """
-        Process the lifecycle of all open proposals: tally if deadline passed, update status, execute if ready.
+        Process the lifecycle of proposals whose deadline has passed: tally
+        open ones, update status, execute approved ones once their timelock
+        expires. Only proposals popped from ``proposal_scheduler`` are read.
         """
-        proposals = [
-            self.storage.get_proposal(pid) for pid in self.storage.proposals.keys()
-        ]
-        for proposal in proposals:
-            if proposal["status"] != "open":
-                if proposal["status"] == "approved":
-                    execution_time = (
-                        datetime.datetime.fromisoformat(proposal["execution_time"])
-                        if proposal["execution_time"]
-                        else None
-                    )
-                    if execution_time and datetime.datetime.utcnow() >= execution_time:
-                        target = proposal["target"]
-                        if target in self.config.ALLOWED_POLICY_KEYS:
-                            value = proposal["payload"].get("value")
-                            self.config.update_policy(target, value)
-                            proposal["status"] = "executed"
-                            self.storage.set_proposal(proposal["proposal_id"], proposal)
-                            logging.info(
-                                f"Executed proposal {proposal['proposal_id']}: {target} = {value}"
-                            )
-                continue
-            voting_deadline = datetime.datetime.fromisoformat(
-                proposal["voting_deadline"]
-            )
-            if datetime.datetime.utcnow() > voting_deadline:
-                tally = self._tally_proposal(proposal["proposal_id"])
-                if tally["quorum"] < self.config.GOV_QUORUM_THRESHOLD:
-                    proposal["status"] = "rejected"
-                else:
-                    total_power = tally["yes"] + tally["no"]
-                    dynamic_threshold = self.get_dynamic_supermajority_threshold(
-                        proposal.get("proposal_type", "general"),
-                        float(tally["quorum"]),
-                    )
-                    logging.info(
-                        f"Dynamic threshold for proposal {proposal['proposal_id']} computed as {dynamic_threshold}"
-                    )
-                    if (
-                        total_power > 0
-                        and (tally["yes"] / total_power) >= dynamic_threshold
-                    ):
-                        proposal["status"] = "approved"
-                        proposal["execution_time"] = (
-                            datetime.datetime.utcnow()
-                            + datetime.timedelta(
-                                seconds=self.config.GOV_EXECUTION_TIMELOCK_SEC
-                            )
-                        ).isoformat()
-                    else:
-                        proposal["status"] = "rejected"
-                if proposal["status"] == "rejected":
-                    proposal["status"] = "closed"
-                self.storage.set_proposal(proposal["proposal_id"], proposal)
-                logging.info(
-                    f"Processed proposal {proposal['proposal_id']} "
-                    f"to status {proposal['status']} with threshold {dynamic_threshold}"
+        for proposal_id in self.proposal_scheduler.pop_due():
+            proposal = self.storage.get_proposal(proposal_id)
+            if proposal:
+                self._advance_proposal(proposal)
+
+    def _advance_proposal(self, proposal: Dict[str, Any]) -> None:
+        if proposal["status"] != "open":
+            if proposal["status"] == "approved":
+                execution_time = (
+                    datetime.datetime.fromisoformat(proposal["execution_time"])
+                    if proposal["execution_time"]
+                    else None
                 )
+                if execution_time and datetime.datetime.utcnow() >= execution_time:
+                    target = proposal["target"]
+                    if target in self.config.ALLOWED_POLICY_KEYS:
+                        value = proposal["payload"].get("value")
+                        self.config.update_policy(target, value)
+                        proposal["status"] = "executed"
+                        self.storage.set_proposal(proposal["proposal_id"], proposal)
+                        logging.info(
+                            f"Executed proposal {proposal['proposal_id']}: {target} = {value}"
+                        )
+                    return
+                # Woken marginally early; try again at the exact instant.
+                self.proposal_scheduler.schedule_proposal(proposal)
+            return
+        voting_deadline = datetime.datetime.fromisoformat(proposal["voting_deadline"])
+        if datetime.datetime.utcnow() <= voting_deadline:
+            self.proposal_scheduler.schedule_proposal(proposal)
+            return
+        dynamic_threshold = None
+        tally = self._tally_proposal(proposal["proposal_id"])
+        if tally["quorum"] < self.config.GOV_QUORUM_THRESHOLD:
+            proposal["status"] = "rejected"
+        else:
+            total_power = tally["yes"] + tally["no"]
+            dynamic_threshold = self.get_dynamic_supermajority_threshold(
+                proposal.get("proposal_type", "general"),
+                float(tally["quorum"]),
+            )
+            logging.info(
+                f"Dynamic threshold for proposal {proposal['proposal_id']} computed as {dynamic_threshold}"
+            )
+            if total_power > 0 and (tally["yes"] / total_power) >= dynamic_threshold:
+                proposal["status"] = "approved"
+                proposal["execution_time"] = (
+                    datetime.datetime.utcnow()
+                    + datetime.timedelta(seconds=self.config.GOV_EXECUTION_TIMELOCK_SEC)
+                ).isoformat()
+            else:
+                proposal["status"] = "rejected"
+        if proposal["status"] == "rejected":
+            proposal["status"] = "closed"
+        self.storage.set_proposal(proposal["proposal_id"], proposal)
+        self.tally_index.drop_proposal(proposal["proposal_id"])
+        self.proposal_scheduler.schedule_proposal(proposal)
+        logging.info(
+            f"Processed proposal {proposal['proposal_id']} "
+            f"to status {proposal['status']} with threshold {dynamic_threshold}"
+        )
 
     def self_improve(self) -> list[str]:
         """Analyze recent diary entries and suggest improvements."""
@@ -0,0 +1,89 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Opt-in async database mode for the FastAPI app.
+
+With ``ASYNC_DB=1`` the app builds an async engine next to the sync one:
+aiosqlite for the local SQLite universe and asyncpg in central mode.  The
+hottest endpoints are then served from an ``APIRouter`` of ``async def``
+handlers whose queries await the driver instead of blocking the event loop.
+Every other endpoint keeps using the sync engine.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Tuple
+
+try:
+    from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
+                                        create_async_engine)
+except ImportError:  # pragma: no cover - optional dependency
+    AsyncSession = None  # type: ignore[assignment,misc]
+    async_sessionmaker = create_async_engine = None  # type: ignore[assignment]
+
+# Dialect -> async driver used when ``DATABASE_URL`` names no async driver.
+ASYNC_DRIVERS: Dict[str, str] = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "postgres": "asyncpg",
+}
+_ASYNC_DRIVER_NAMES = {"aiosqlite", "asyncpg", "psycopg", "aiomysql", "asyncmy"}
+
+
+def async_engine_url(url: str) -> str:
+    """Return ``url`` rewritten to use an async driver.
+
+    ``sqlite:///x.db`` becomes ``sqlite+aiosqlite:///x.db`` and
+    ``postgresql://...`` (or ``postgresql+psycopg2://...``) becomes
+    ``postgresql+asyncpg://...``.  URLs already naming an async driver are
+    returned unchanged.
+    """
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        raise ValueError(f"Invalid database URL: {url!r}")
+    dialect, _, driver = scheme.partition("+")
+    if driver in _ASYNC_DRIVER_NAMES:
+        return url
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {dialect!r} databases")
+    driver = ASYNC_DRIVERS[dialect]
+    if dialect == "postgres":
+        dialect = "postgresql"
+    return f"{dialect}+{driver}://{rest}"
+
+
+def create_async_session_factory(url: str, **engine_kwargs: Any) -> Tuple[Any, Any]:
+    """Return ``(engine, sessionmaker)`` for the async form of ``url``.
+
+    Sessions keep attributes loaded after commit so response models can be
+    built from them without another round trip.
+    """
+    if create_async_engine is None:
+        raise RuntimeError("ASYNC_DB requires SQLAlchemy's asyncio extension")
+    engine = create_async_engine(async_engine_url(url), **engine_kwargs)
+    factory = async_sessionmaker(
+        engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+    return engine, factory
+
+
+def swap_routes(app: Any, router: Any) -> None:
+    """Serve ``router``'s routes instead of ``app`` routes for the same path and method.
+
+    Calling it again with the same router replaces the earlier copies, so
+    ``create_app`` can run more than once.
+    """
+    taken = {
+        (route.path, method)
+        for route in router.routes
+        for method in getattr(route, "methods", None) or ()
+    }
+    app.router.routes[:] = [
+        route
+        for route in app.router.routes
+        if not any(
+            (getattr(route, "path", None), method) in taken
+            for method in getattr(route, "methods", None) or ()
+        )
+    ]
+    app.include_router(router)
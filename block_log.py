@@ -0,0 +1,318 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Buffered, rotating audit log for blocked content.
+
+Entries are JSON lines in ``<path>``.  A background thread drains a queue
+and appends whole batches, flushing once ``batch_size`` entries are pending
+or ``flush_interval`` seconds after the first one arrived, so a moderation
+spike costs one write per batch instead of one ``open`` per entry.
+
+Next to every log file sits a ``.idx`` file of fixed-width
+``(offset, timestamp)`` entries.  When the active file grows past
+``max_bytes`` it is renamed to ``<path>.<n>`` (gzip-compressed to
+``<path>.<n>.gz`` when ``compress`` is set) together with its index.
+:class:`BlockLogReader` uses the indexes to page through a time range
+without scanning the files.
+
+Use :func:`writer_for` rather than constructing writers, so a process keeps
+one writer per log.  Writers in different processes may share a log: each
+batch is written, and each rotation or crash recovery done, while holding
+an exclusive ``flock`` on ``<path>.lock``.  A writer that finds the file
+changed under it re-reads the index before appending, and only a torn tail
+left by a writer that died mid-batch is ever truncated.  Without ``fcntl``
+(Windows) there is no cross-process lock, so keep one writing process.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import glob
+import gzip
+import json
+import os
+import queue
+import shutil
+import struct
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from event_log import to_epoch
+
+INDEX_ENTRY = struct.Struct(">Qd")
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+def _index_path(path: str) -> str:
+    return path + ".idx"
+
+
+def _load_index(path: str) -> List[Tuple[int, float]]:
+    try:
+        with open(_index_path(path), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    usable = len(data) - len(data) % INDEX_ENTRY.size
+    return list(INDEX_ENTRY.iter_unpack(data[:usable]))
+
+
+class BlockLogWriter:
+    """Append blocked-content entries from a queue in batches."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        compress: bool = False,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._size = 0
+        self._last_ts = 0.0
+        self._seen: Optional[Tuple[int, int]] = None
+        with self._file_lock():
+            self._recover()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @contextlib.contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        with open(self.path + ".lock", "ab") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _file_id(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size
+
+    def _recover(self) -> None:
+        """Index any lines appended after the last index entry (e.g. a crash).
+
+        Call with the file lock held: every live writer holds it while
+        appending, so an unindexed or torn tail can only be a dead writer's.
+        """
+        self._size = 0
+        if not os.path.exists(self.path):
+            self._seen = None
+            return
+        index = _load_index(self.path)
+        with open(self.path, "rb") as f:
+            start = 0
+            if index:
+                f.seek(index[-1][0])
+                f.readline()
+                start = f.tell()
+                self._last_ts = index[-1][1]
+            entries = []
+            offset = start
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                entries.append(self._index_entry(offset, line))
+                offset += len(line)
+        with open(_index_path(self.path), "r+b" if index else "wb") as f:
+            f.seek(len(index) * INDEX_ENTRY.size)
+            f.truncate()
+            f.write(b"".join(entries))
+        self._size = offset
+        if offset < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+        self._seen = self._file_id()
+
+    def _index_entry(self, offset: int, line: bytes) -> bytes:
+        try:
+            stamp = to_epoch(json.loads(line).get("ts"))
+        except (ValueError, TypeError, AttributeError):
+            stamp = None
+        # Keep index timestamps monotonic so they can be bisected.
+        self._last_ts = max(stamp if stamp is not None else time.time(), self._last_ts)
+        return INDEX_ENTRY.pack(offset, self._last_ts)
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Queue ``entry`` (a JSON-serialisable dict with an ISO ``ts``)."""
+        self._queue.put(entry)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is on disk."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Dict[str, Any]] = []
+            waiters: List[threading.Event] = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            self._append(batch)
+            for waiter in waiters:
+                waiter.set()
+
+    def _append(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        encoded = [(json.dumps(entry, default=str) + "\n").encode("utf-8") for entry in batch]
+        with self._file_lock():
+            if self._file_id() != self._seen:
+                # Another process appended or rotated since our last batch.
+                self._recover()
+            lines: List[bytes] = []
+            index: List[bytes] = []
+            for line in encoded:
+                if self._size and self._size + len(line) > self.max_bytes:
+                    self._write(lines, index)
+                    lines, index = [], []
+                    self._rotate()
+                index.append(self._index_entry(self._size, line))
+                lines.append(line)
+                self._size += len(line)
+            self._write(lines, index)
+
+    def _write(self, lines: List[bytes], index: List[bytes]) -> None:
+        if not lines:
+            return
+        with open(self.path, "ab") as f:
+            f.write(b"".join(lines))
+        with open(_index_path(self.path), "ab") as f:
+            f.write(b"".join(index))
+        self._seen = self._file_id()
+
+    def _rotate(self) -> None:
+        segments = rotated_segments(self.path)
+        number = int(segments[-1].rsplit(".", 1)[1]) + 1 if segments else 1
+        target = f"{self.path}.{number:06d}"
+        os.replace(_index_path(self.path), _index_path(target))
+        if self.compress:
+            with open(self.path, "rb") as src, gzip.open(target + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(self.path)
+        else:
+            os.replace(self.path, target)
+        self._size = 0
+        self._seen = None
+
+
+_writers: Dict[str, BlockLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def writer_for(path: str, **options: Any) -> BlockLogWriter:
+    """Return this process's writer for ``path``, creating it with ``options``."""
+    key = os.path.abspath(path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = BlockLogWriter(path, **options)
+        return writer
+
+
+def rotated_segments(path: str) -> List[str]:
+    """Return rotated segment paths (without ``.gz``) oldest first."""
+    found = set()
+    for name in glob.glob(f"{glob.escape(path)}.*"):
+        token = name[len(path) + 1 :]
+        if token.endswith(".gz"):
+            token = token[:-3]
+        if token.isdigit():
+            found.add(int(token))
+    return [f"{path}.{n:06d}" for n in sorted(found)]
+
+
+class BlockLogReader:
+    """Indexed, time-ranged access to a :class:`BlockLogWriter` log."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def _segments(self) -> List[Tuple[str, List[Tuple[int, float]]]]:
+        segments = rotated_segments(self.path)
+        if os.path.exists(self.path):
+            segments.append(self.path)
+        return [(seg, _load_index(seg)) for seg in segments]
+
+    @staticmethod
+    def _open(segment: str):
+        if os.path.exists(segment):
+            return open(segment, "rb")
+        return gzip.open(segment + ".gz", "rb")
+
+    def count(self, start: Any = None, end: Any = None) -> int:
+        """Number of entries with ``start <= ts <= end``."""
+        return sum(hi - lo for _, _, lo, hi in self._ranges(start, end))
+
+    def _ranges(
+        self, start: Any, end: Any
+    ) -> Iterator[Tuple[str, List[Tuple[int, float]], int, int]]:
+        lo_ts, hi_ts = to_epoch(start), to_epoch(end)
+        for segment, index in self._segments():
+            if not index:
+                continue
+            if lo_ts is not None and index[-1][1] < lo_ts:
+                continue
+            if hi_ts is not None and index[0][1] > hi_ts:
+                break
+            lo = 0 if lo_ts is None else bisect.bisect_left(index, lo_ts, key=lambda e: e[1])
+            hi = len(index) if hi_ts is None else bisect.bisect_right(index, hi_ts, key=lambda e: e[1])
+            if lo < hi:
+                yield segment, index, lo, hi
+
+    def page(
+        self, start: Any = None, end: Any = None, offset: int = 0, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` entries in the range, skipping ``offset``."""
+        entries: List[Dict[str, Any]] = []
+        for segment, index, lo, hi in self._ranges(start, end):
+            if offset >= hi - lo:
+                offset -= hi - lo
+                continue
+            lo += offset
+            offset = 0
+            take = min(hi, lo + limit - len(entries))
+            with self._open(segment) as f:
+                f.seek(index[lo][0])
+                for _ in range(lo, take):
+                    entries.append(json.loads(f.readline()))
+            if len(entries) >= limit:
+                break
+        return entries
+
+    def iter_entries(self, start: Any = None, end: Any = None) -> Iterator[Dict[str, Any]]:
+        """Yield every entry in the range, oldest first."""
+        for segment, index, lo, hi in self._ranges(start, end):
+            with self._open(segment) as f:
+                f.seek(index[lo][0])
+                for _ in range(lo, hi):
+                    yield json.loads(f.readline())
@@ -0,0 +1,257 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Precomputed network analysis for ``/network-analysis/``.
+
+Exact betweenness centrality is O(V*E), far too slow to run per request.
+:class:`CentralityService` computes it in a background job instead, using
+Brandes' algorithm over at most ``samples`` pivot nodes (``k`` in networkx).
+Graphs with no more nodes than that get the exact value.  The result is
+stored in ``SystemState`` together with the version of the graph it was
+computed from, and requests are served from that stored snapshot.
+
+The graph version is a counter in the state store.  Writes that change
+the graph flag their session with :func:`mark_graph_changed`, and the
+counter is bumped once when that session commits.  Mapper and collection
+events flag ORM changes: harmonizers and vibenodes added or removed,
+follow, like and entanglement collections, and edits to the names, scores
+and authors the graph shows.  The
+Core helpers in :mod:`engagement_counters` flag likes and entanglements
+themselves.  Each response carries a ``freshness`` block saying which
+version it describes, when it was computed, and whether the graph has moved
+on since then.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import threading
+import weakref
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import networkx as nx
+except ImportError:  # pragma: no cover - optional dependency
+    nx = None
+
+try:
+    from sqlalchemy import event, inspect
+    from sqlalchemy.orm import Session, object_session
+except ImportError:  # pragma: no cover - optional dependency
+    event = inspect = Session = object_session = None
+
+from db_models import (Harmonizer, SystemState, VibeNode, harmonizer_follows,
+                       vibenode_entanglements, vibenode_likes)
+from graph_assembly import build_interaction_graph
+
+logger = logging.getLogger(__name__)
+
+STATE_KEY = "network_analysis"
+GRAPH_VERSION_KEY = "network_analysis:graph_version"
+_CHANGED = "graph_changed"
+
+# Columns shown on graph nodes or edges, per model.
+GRAPH_COLUMNS = {
+    Harmonizer: ("username", "harmony_score"),
+    VibeNode: ("name", "echo", "author_id"),
+}
+
+_services: "weakref.WeakSet[CentralityService]" = weakref.WeakSet()
+
+
+def mark_graph_changed(db) -> None:
+    """Bump the graph version when ``db``'s transaction commits."""
+    if db is not None:
+        db.info[_CHANGED] = True
+
+
+def _mark_target(mapper, connection, target) -> None:
+    mark_graph_changed(object_session(target))
+
+
+def _mark_updated(mapper, connection, target) -> None:
+    attrs = inspect(target).attrs
+    if any(attrs[name].history.has_changes() for name in GRAPH_COLUMNS[type(target)]):
+        mark_graph_changed(object_session(target))
+
+
+def _mark_collection(target, value, initiator) -> None:
+    mark_graph_changed(object_session(target))
+
+
+def _after_commit(session) -> None:
+    if session.info.pop(_CHANGED, False):
+        for service in list(_services):
+            service.bump()
+
+
+def _after_rollback(session) -> None:
+    session.info.pop(_CHANGED, None)
+
+
+if event is not None and hasattr(Harmonizer, "__table__"):
+    for _model in GRAPH_COLUMNS:
+        event.listen(_model, "after_insert", _mark_target)
+        event.listen(_model, "after_delete", _mark_target)
+        event.listen(_model, "after_update", _mark_updated)
+    for _collection in (Harmonizer.following, VibeNode.likes, VibeNode.entangled_with):
+        event.listen(_collection, "append", _mark_collection)
+        event.listen(_collection, "remove", _mark_collection)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+
+
+def analyze_graph(G: "nx.DiGraph", samples: int = 0, seed: int = 0) -> Dict[str, Any]:
+    """Return nodes, edges and metrics for ``G``.
+
+    ``samples`` caps the number of source nodes used for betweenness; ``0``
+    or a value not below the node count computes it exactly.
+    """
+    n = G.number_of_nodes()
+    k = samples if 0 < samples < n else None
+    degree = nx.degree_centrality(G) if n else {}
+    betweenness = nx.betweenness_centrality(G, k=k, seed=seed) if n else {}
+    return {
+        "nodes": [
+            {
+                "id": node,
+                **G.nodes[node],
+                "degree_centrality": degree.get(node, 0),
+                "betweenness_centrality": betweenness.get(node, 0),
+            }
+            for node in G.nodes
+        ],
+        "edges": [{"source": u, "target": v, **G.edges[u, v]} for u, v in G.edges],
+        "metrics": {
+            "node_count": n,
+            "edge_count": G.number_of_edges(),
+            "density": nx.density(G) if n else 0.0,
+            "is_strongly_connected": nx.is_strongly_connected(G) if n else False,
+        },
+        "betweenness": {"approximate": k is not None, "samples": k or n},
+    }
+
+
+def page(snapshot: Dict[str, Any], skip: int = 0, limit: int = 100) -> Dict[str, Any]:
+    """Slice a snapshot the way the endpoint always paged.
+
+    ``skip``/``limit`` apply to harmonizers and vibenodes separately; the
+    edges returned are those leaving a node on the page.
+    """
+    picked = []
+    for kind in ("harmonizer", "vibenode"):
+        nodes = [n for n in snapshot["nodes"] if n.get("type") == kind]
+        picked.extend(nodes[skip : skip + limit])
+    ids = {n["id"] for n in picked}
+    return {
+        "nodes": picked,
+        "edges": [e for e in snapshot["edges"] if e["source"] in ids],
+        "metrics": snapshot["metrics"],
+    }
+
+
+class CentralityService:
+    """Compute, store and serve network-analysis snapshots.
+
+    ``store`` returns the :class:`~state_store.StateStore` holding the graph
+    version counter.
+    """
+
+    def __init__(
+        self,
+        store: Callable[[], Any],
+        samples: int = 512,
+        seed: int = 0,
+        key: str = STATE_KEY,
+    ) -> None:
+        self.store = store
+        self.samples = samples
+        self.seed = seed
+        self.key = key
+        self._lock = threading.Lock()
+        self._cached: Optional[Tuple[str, Dict[str, Any]]] = None
+        _services.add(self)
+
+    def graph_version(self) -> str:
+        """Return the current graph version."""
+        return self.store().get(GRAPH_VERSION_KEY, "0")
+
+    def bump(self) -> None:
+        """Record a change to the graph."""
+        try:
+            self.store().increment(GRAPH_VERSION_KEY, 1)
+        except Exception:  # never fail the committed write
+            logger.exception("graph version bump failed")
+
+    # ``<key>:stamp`` is small and read on every request; ``<key>`` holds
+    # the snapshot and is only loaded when the stamp changes.
+    def _get(self, db, key: str) -> Optional[str]:
+        row = db.query(SystemState).filter(SystemState.key == key).first()
+        return row.value if row else None
+
+    def _put(self, db, key: str, value: str) -> None:
+        row = db.query(SystemState).filter(SystemState.key == key).first()
+        if row:
+            row.value = value
+        else:
+            db.add(SystemState(key=key, value=value))
+
+    def refresh(self, db, force: bool = False) -> Dict[str, Any]:
+        """Recompute the snapshot unless it already matches the graph."""
+        version = self.graph_version()
+        if not force:
+            current = self.load(db)
+            if current is not None and current["graph_version"] == version:
+                return current
+        with self._lock:
+            snapshot = analyze_graph(build_interaction_graph(db), self.samples, self.seed)
+            snapshot["graph_version"] = version
+            snapshot["computed_at"] = datetime.datetime.utcnow().isoformat()
+            stamp = f"{version}@{snapshot['computed_at']}"
+            self._put(db, self.key, json.dumps(snapshot))
+            self._put(db, f"{self.key}:stamp", stamp)
+            db.commit()
+            self._cached = (stamp, snapshot)
+        logger.info(
+            "network analysis refreshed",
+            extra={"graph_version": version, **snapshot["betweenness"]},
+        )
+        return snapshot
+
+    def load(self, db) -> Optional[Dict[str, Any]]:
+        """Return the stored snapshot, or ``None`` if none was computed."""
+        stamp = self._get(db, f"{self.key}:stamp")
+        if stamp is None:
+            return None
+        cached = self._cached
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        raw = self._get(db, self.key)
+        if raw is None:
+            return None
+        snapshot = json.loads(raw)
+        self._cached = (stamp, snapshot)
+        return snapshot
+
+    def serve(self, db, skip: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """Return a page of the stored analysis with a ``freshness`` block.
+
+        The first request on a new database computes the snapshot inline.
+        """
+        snapshot = self.load(db)
+        if snapshot is None:
+            snapshot = self.refresh(db, force=True)
+        version = self.graph_version()
+        computed_at = datetime.datetime.fromisoformat(snapshot["computed_at"])
+        result = page(snapshot, skip, limit)
+        result["freshness"] = {
+            "graph_version": snapshot["graph_version"],
+            "current_graph_version": version,
+            "stale": snapshot["graph_version"] != version,
+            "computed_at": snapshot["computed_at"],
+            "age_seconds": (datetime.datetime.utcnow() - computed_at).total_seconds(),
+            **snapshot["betweenness"],
+        }
+        return result
@@ -1,6 +1,6 @@
 # --- MODULE: config.py ---
 from decimal import Decimal
-from typing import Dict, List
+from typing import Dict, List, Optional
 from functools import lru_cache
 import os
 
@@ -20,6 +20,11 @@ class Config:
     MAX_INPUT_LENGTH: int = 10000
     VAX_PATTERNS: Dict[str, List[str]] = {"block": [r"\b(blocked_word)\b"]}
     VAX_FUZZY_THRESHOLD: int = 2
+    BLOCK_LOG_PATH: str = "blocked_content.log"
+    BLOCK_LOG_MAX_BYTES: int = 16 * 1024 * 1024
+    BLOCK_LOG_COMPRESS: bool = True
+    BLOCK_LOG_BATCH_SIZE: int = 256
+    BLOCK_LOG_FLUSH_SECONDS: float = 1.0
     REACTOR_KARMA_PER_REACT: Decimal = Decimal("1")
     CREATOR_KARMA_PER_REACT: Decimal = Decimal("2")
 
@@ -61,10 +66,25 @@ class Config:
     # --- Background task tuning ---
     PASSIVE_AURA_UPDATE_INTERVAL_SECONDS: int = 3600
     PROPOSAL_LIFECYCLE_INTERVAL_SECONDS: int = 300
+    HOOK_QUEUE_SIZE: int = 1024
+    HOOK_TIMEOUT_SECONDS: float = 5.0
+    # None waits for queue space; a number of seconds drops hooks after that wait.
+    HOOK_PUT_TIMEOUT_SECONDS: Optional[float] = None
+    UNIVERSE_HOST_PROCESSES: int = 0
+    UNIVERSE_HOST_START_METHOD: str = "spawn"
+    UNIVERSE_HOST_TIMEOUT_SECONDS: float = 30.0
+    ENTITY_LOCK_STRIPES: int = 1024
+    LOG_CHAIN_BATCH_SIZE: int = 256
+    LOG_CHAIN_CHECKPOINT_INTERVAL: int = 1024
+    STATE_FLUSH_INTERVAL_SECONDS: float = 1.0
+    STATE_CACHE_TTL_SECONDS: float = 5.0
     NONCE_CLEANUP_INTERVAL_SECONDS: int = 3600
     NONCE_EXPIRATION_SECONDS: int = 86400
     CONTENT_ENTROPY_UPDATE_INTERVAL_SECONDS: int = 600
     NETWORK_CENTRALITY_UPDATE_INTERVAL_SECONDS: int = 3600
+    NETWORK_ANALYSIS_INTERVAL_SECONDS: int = 600
+    NETWORK_BETWEENNESS_SAMPLES: int = 512
+    ENGAGEMENT_COUNTER_RECONCILE_INTERVAL_SECONDS: int = 3600
     PROACTIVE_INTERVENTION_INTERVAL_SECONDS: int = 3600
     AI_PERSONA_EVOLUTION_INTERVAL_SECONDS: int = 86400
     GUINNESS_PURSUIT_INTERVAL_SECONDS: int = 86400 * 3
@@ -90,6 +110,9 @@ class Config:
 
     # FUSED: Added fields from v01_grok15.py Config
     GENESIS_BONUS_DECAY_YEARS: int = 4
+    # SQL storage writes lazily decayed karma back to every row once per
+    # this many DAILY_DECAY epochs.
+    KARMA_DECAY_MATERIALIZE_EPOCHS: int = 7
     GOV_QUORUM_THRESHOLD: Decimal = Decimal("0.5")
     GOV_SUPERMAJORITY_THRESHOLD: Decimal = Decimal("0.9")
     GOV_EXECUTION_TIMELOCK_SEC: int = 259200  # 3 days
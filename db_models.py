@@ -138,6 +138,22 @@ vibenode_entanglements = Table(
     Column("target_id", Integer, ForeignKey("vibenodes.id"), primary_key=True),
     Column("strength", Float, default=1.0),
 )
+# Ancestor closure of the remix tree (``VibeNode.parent_vibenode_id``), kept
+# by ``lineage.record_vibenode``; every node has a depth-0 row for itself.
+vibenode_lineage = Table(
+    "vibenode_lineage",
+    Base.metadata,
+    Column("ancestor_id", Integer, ForeignKey("vibenodes.id"), primary_key=True),
+    Column("descendant_id", Integer, ForeignKey("vibenodes.id"), primary_key=True, index=True),
+    Column("depth", Integer, nullable=False),
+)
+# Trigram index behind ``/users/search`` on SQLite; see ``user_search``.
+harmonizer_search_grams = Table(
+    "harmonizer_search_grams",
+    Base.metadata,
+    Column("gram", String, primary_key=True),
+    Column("harmonizer_id", Integer, ForeignKey("harmonizers.id"), primary_key=True, index=True),
+)
 proposal_votes = Table(
     "proposal_votes",
     Base.metadata,
@@ -169,6 +185,10 @@ class Harmonizer(Base):
     network_centrality = Column(Float, default=0.0)
     karma_score = Column(Float, default=0.0)
     last_passive_aura_timestamp = Column(DateTime, default=datetime.datetime.utcnow)
+    # Agent record fields without a column of their own (coins_owned, ...).
+    agent_fields = Column(JSON, default=dict)
+    # Karma decay epoch the agent karma in agent_fields is brought up to.
+    decay_epoch = Column(Integer, nullable=True)
     vibenodes = relationship(
         "VibeNode", back_populates="author", cascade="all, delete-orphan"
     )
@@ -226,6 +246,10 @@ class VibeNode(Base):
     negentropy_score = Column(String, default="0.0")
     tags = Column(JSON, default=list)
     patron_saint_id = Column(Integer, ForeignKey("ai_personas.id"), nullable=True)
+    # Denormalized counters kept by ``engagement_counters``.
+    likes_count = Column(Integer, default=0)
+    comments_count = Column(Integer, default=0)
+    entangled_count = Column(Integer, default=0)
     author = relationship("Harmonizer", back_populates="vibenodes")
     sub_nodes = relationship(
         "VibeNode",
@@ -357,6 +381,13 @@ class Proposal(Base):
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     voting_deadline = Column(DateTime(timezone=True), nullable=False)
     payload = Column(JSON, nullable=True)
+    # Lets lifecycle tasks in other processes read only changed proposals.
+    updated_at = Column(
+        DateTime,
+        default=datetime.datetime.utcnow,
+        onupdate=datetime.datetime.utcnow,
+        index=True,
+    )
     group = relationship("Group", back_populates="proposals")
     votes = relationship(
         "ProposalVote", back_populates="proposal", cascade="all, delete-orphan"
@@ -422,33 +453,71 @@ class LogEntry(Base):
     timestamp = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     event_type = Column(String, nullable=False)
     payload = Column(Text)
-    previous_hash = Column(String, nullable=False)
+    # Unique so two writers can never chain onto the same entry.
+    previous_hash = Column(String, unique=True, nullable=False)
     current_hash = Column(String, unique=True, nullable=False)
 
     def chain_of_remix(self, db: Session) -> list[str]:
-        """Return lineage of remix hashes leading to this entry."""
-        chain = []
-        prev = self.previous_hash
-        while prev:
-            entry = db.query(LogEntry).filter_by(current_hash=prev).first()
-            if not entry:
-                logging.error("Broken remix chain at %s", prev)
-                raise ValueError(f"Missing log entry for hash {prev}")
-            chain.append(entry.current_hash)
-            prev = entry.previous_hash
-        return chain
+        """Return lineage of remix hashes leading to this entry.
+
+        The whole chain is fetched with one recursive query.
+        """
+        from sqlalchemy import literal, select
+
+        if not self.previous_hash:
+            return []
+        chain = (
+            select(
+                LogEntry.current_hash, LogEntry.previous_hash, literal(1).label("hop")
+            )
+            .where(LogEntry.current_hash == self.previous_hash)
+            .cte("remix_chain", recursive=True)
+        )
+        chain = chain.union_all(
+            select(LogEntry.current_hash, LogEntry.previous_hash, chain.c.hop + 1).where(
+                LogEntry.current_hash == chain.c.previous_hash
+            )
+        )
+        rows = db.execute(
+            select(chain.c.current_hash, chain.c.previous_hash).order_by(chain.c.hop)
+        ).all()
+        missing = rows[-1][1] if rows else self.previous_hash
+        if missing:
+            logging.error("Broken remix chain at %s", missing)
+            raise ValueError(f"Missing log entry for hash {missing}")
+        return [row[0] for row in rows]
 
     def compute_hash(self) -> str:
         """Return SHA-256 hash for this entry."""
         data = f"{self.timestamp.isoformat()}|{self.event_type}|{self.payload}|{self.previous_hash}"
         return hashlib.sha256(data.encode("utf-8")).hexdigest()
 
+    def verify(self, db: Session) -> bool:
+        """Check this entry's hash, chain link and Merkle checkpoint."""
+        from remix_chain import verify_entry
+
+        return verify_entry(db, self)
+
+
+class LogCheckpoint(Base):
+    """Merkle root over a run of ``LogEntry`` rows, written by ``remix_chain``."""
+
+    __tablename__ = "log_chain_checkpoints"
+    id = Column(Integer, primary_key=True)
+    first_entry_id = Column(Integer, nullable=False, index=True)
+    last_entry_id = Column(Integer, nullable=False, unique=True)
+    entry_count = Column(Integer, nullable=False)
+    merkle_root = Column(String, nullable=False)
+    previous_root = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
 
 class SystemState(Base):
     __tablename__ = "system_state"
     id = Column(Integer, primary_key=True)
     key = Column(String, unique=True, nullable=False)
     value = Column(String, nullable=False)
+    version = Column(Integer, default=0, nullable=False)
 
 
 class ValidatorReputation(Base):
@@ -0,0 +1,148 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Denormalized engagement counters on ``VibeNode``.
+
+``likes_count``, ``comments_count`` and ``entangled_count`` are kept next
+to the row they describe.  The write helpers below change the underlying
+rows and the counter in the same transaction, with a SQL-side
+``count = count + delta`` rather than a read-modify-write.  Likes are
+checked with a keyed statement on ``vibenode_likes``; the ``likes``
+collection is never loaded.  Like and entanglement writes also flag the
+network-analysis graph version (see :mod:`centrality_service`).
+
+Writes that bypass these helpers, such as ORM relationship edits or bulk
+imports, can leave a counter wrong.  :func:`reconcile_counters` recomputes
+every counter with one correlated ``UPDATE`` per counter, so a periodic run
+repairs the drift.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+try:
+    from sqlalchemy import and_, delete, func, insert, select, update
+except ImportError:  # pragma: no cover - optional dependency
+    and_ = delete = func = insert = select = update = None
+
+from centrality_service import mark_graph_changed
+from db_models import Comment, VibeNode, vibenode_entanglements, vibenode_likes
+
+
+def counter_sources() -> Dict[str, Tuple[object, str]]:
+    """Map each counter column to ``(table, column naming the vibenode)``."""
+    return {
+        "likes_count": (vibenode_likes, "vibenode_id"),
+        "comments_count": (Comment.__table__, "vibenode_id"),
+        "entangled_count": (vibenode_entanglements, "source_id"),
+    }
+
+
+def _bump(db, vibenode_id: int, counter: str, delta: int) -> None:
+    column = getattr(VibeNode, counter)
+    db.execute(
+        update(VibeNode)
+        .where(VibeNode.id == vibenode_id)
+        .values({counter: func.coalesce(column, 0) + delta})
+        .execution_options(synchronize_session=False)
+    )
+
+
+def toggle_like(db, vibenode_id: int, harmonizer_id: int) -> bool:
+    """Like or unlike ``vibenode_id``; return ``True`` if it is now liked.
+
+    The caller commits.
+    """
+    key = and_(
+        vibenode_likes.c.vibenode_id == vibenode_id,
+        vibenode_likes.c.harmonizer_id == harmonizer_id,
+    )
+    removed = db.execute(delete(vibenode_likes).where(key)).rowcount
+    mark_graph_changed(db)
+    if removed:
+        _bump(db, vibenode_id, "likes_count", -removed)
+        return False
+    db.execute(
+        insert(vibenode_likes).values(vibenode_id=vibenode_id, harmonizer_id=harmonizer_id)
+    )
+    _bump(db, vibenode_id, "likes_count", 1)
+    return True
+
+
+def add_comment(db, comment: Comment) -> Comment:
+    """Add ``comment`` and count it on its vibenode.  The caller commits."""
+    db.add(comment)
+    db.flush()
+    _bump(db, comment.vibenode_id, "comments_count", 1)
+    return comment
+
+
+def remove_comment(db, comment: Comment) -> None:
+    """Delete ``comment`` and uncount it.  The caller commits."""
+    vibenode_id = comment.vibenode_id
+    db.delete(comment)
+    db.flush()
+    _bump(db, vibenode_id, "comments_count", -1)
+
+
+def entangle(db, source_id: int, target_id: int, strength: float = 1.0) -> bool:
+    """Entangle ``source_id`` with ``target_id``; return ``False`` if they already were.
+
+    An existing entanglement only has its strength updated.  The caller
+    commits.
+    """
+    key = and_(
+        vibenode_entanglements.c.source_id == source_id,
+        vibenode_entanglements.c.target_id == target_id,
+    )
+    updated = db.execute(
+        update(vibenode_entanglements).where(key).values(strength=strength)
+    ).rowcount
+    mark_graph_changed(db)
+    if updated:
+        return False
+    db.execute(
+        insert(vibenode_entanglements).values(
+            source_id=source_id, target_id=target_id, strength=strength
+        )
+    )
+    _bump(db, source_id, "entangled_count", 1)
+    return True
+
+
+def disentangle(db, source_id: int, target_id: int) -> bool:
+    """Remove an entanglement; return whether one existed.  The caller commits."""
+    removed = db.execute(
+        delete(vibenode_entanglements).where(
+            and_(
+                vibenode_entanglements.c.source_id == source_id,
+                vibenode_entanglements.c.target_id == target_id,
+            )
+        )
+    ).rowcount
+    if removed:
+        _bump(db, source_id, "entangled_count", -removed)
+        mark_graph_changed(db)
+    return bool(removed)
+
+
+def reconcile_counters(db) -> int:
+    """Reset every counter that disagrees with its table; return rows fixed."""
+    fixed = 0
+    for counter, (table, key) in counter_sources().items():
+        actual = (
+            select(func.count())
+            .select_from(table)
+            .where(table.c[key] == VibeNode.id)
+            .scalar_subquery()
+        )
+        stale = func.coalesce(getattr(VibeNode, counter), -1) != actual
+        fixed += db.execute(
+            update(VibeNode)
+            .where(stale)
+            .values({counter: actual})
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    db.commit()
+    return fixed
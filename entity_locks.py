@@ -0,0 +1,113 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Striped locks keyed by entity id.
+
+``User`` and ``Coin`` objects are rebuilt from storage on every access, so
+the ``RLock`` each of them creates guards nothing shared.  ``EntityLocks``
+maps an entity key such as ``("user", "alice")`` onto one of a fixed pool of
+re-entrant locks.  :meth:`EntityLocks.hold` takes every stripe an operation
+needs in ascending stripe order, which rules out lock-order deadlocks
+between holders.  A nested ``hold`` may only add stripes above the ones its
+thread already has.
+
+Contention is measured with a non-blocking first attempt.  Only acquisitions
+that had to wait are timed, so the uncontended path stays cheap.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterable, Iterator, List
+
+DEFAULT_STRIPES = 1024
+
+
+class LockOrderError(RuntimeError):
+    """A nested hold would acquire a stripe below one already held."""
+
+
+class EntityLocks:
+    """Fixed pool of striped ``RLock`` objects with ordered acquisition."""
+
+    def __init__(self, stripes: int = DEFAULT_STRIPES) -> None:
+        self.stripes = max(1, stripes)
+        self._locks = [threading.RLock() for _ in range(self.stripes)]
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._acquired = 0
+        self._contended = [0] * self.stripes
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def stripe(self, key: Hashable) -> int:
+        return hash(key) % self.stripes
+
+    def _held(self) -> List[int]:
+        held = getattr(self._local, "held", None)
+        if held is None:
+            held = self._local.held = []
+        return held
+
+    def _acquire(self, stripe: int) -> None:
+        lock = self._locks[stripe]
+        if lock.acquire(blocking=False):
+            waited = None
+        else:
+            start = time.perf_counter()
+            lock.acquire()
+            waited = time.perf_counter() - start
+        with self._stats_lock:
+            self._acquired += 1
+            if waited is not None:
+                self._contended[stripe] += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def hold(self, *keys: Hashable) -> Any:
+        """Hold the stripes of ``keys`` (``None`` keys are ignored)."""
+        return self._hold_stripes({self.stripe(k) for k in keys if k is not None})
+
+    def hold_all(self) -> Any:
+        """Hold every stripe, for operations that touch all entities."""
+        return self._hold_stripes(range(self.stripes))
+
+    @contextmanager
+    def _hold_stripes(self, stripes: Iterable[int]) -> Iterator[None]:
+        held = self._held()
+        wanted = sorted(set(stripes) - set(held))
+        if wanted and held and wanted[0] < max(held):
+            raise LockOrderError(
+                f"stripe {wanted[0]} requested while holding stripe {max(held)}"
+            )
+        taken: List[int] = []
+        try:
+            for stripe in wanted:
+                self._acquire(stripe)
+                taken.append(stripe)
+                held.append(stripe)
+            yield
+        finally:
+            for stripe in reversed(taken):
+                held.remove(stripe)
+                self._locks[stripe].release()
+
+    def stats(self, top: int = 5) -> Dict[str, Any]:
+        """Return acquisition and contention counters."""
+        with self._stats_lock:
+            contended = sum(self._contended)
+            hot = sorted(
+                ((count, stripe) for stripe, count in enumerate(self._contended) if count),
+                reverse=True,
+            )[:top]
+            return {
+                "stripes": self.stripes,
+                "acquired": self._acquired,
+                "contended": contended,
+                "contention_ratio": contended / self._acquired if self._acquired else 0.0,
+                "wait_seconds": self._wait_total,
+                "max_wait": self._wait_max,
+                "hot_stripes": [(stripe, count) for count, stripe in hot],
+            }
@@ -0,0 +1,454 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Durable append-only event log with segment files and SHA-256 chaining.
+
+Each record is stored as one tab separated line::
+
+    <seq>\t<timestamp>\t<previous hash>\t<hash>\t<canonical JSON payload>
+
+Records are grouped into segment files named ``<filename>.<first seq>.seg``.
+Every segment has a companion ``.idx`` file of fixed-width
+``(seq, offset, timestamp)`` entries so readers can seek straight to an
+event id or a point in time.  Replay maps segments into memory and only
+touches the records after the requested position, which keeps cold starts
+and audits proportional to the tail of the log.
+"""
+
+from __future__ import annotations
+
+import bisect
+import datetime
+import glob
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+GENESIS_HASH = "0" * 64
+DEFAULT_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+INDEX_ENTRY = struct.Struct(">QQd")
+
+logger = logging.getLogger(__name__)
+
+
+class LogRecord(NamedTuple):
+    """Decoded log record."""
+
+    seq: int
+    timestamp: float
+    previous_hash: str
+    hash: str
+    event: Dict[str, Any]
+
+
+def canonical_payload(event: Dict[str, Any]) -> bytes:
+    """Return the canonical JSON encoding used for hashing ``event``."""
+    return json.dumps(
+        event, sort_keys=True, separators=(",", ":"), default=str, ensure_ascii=False
+    ).encode("utf-8")
+
+
+def record_hash(previous_hash: str, seq: int, ts_text: str, payload: bytes) -> str:
+    """Return the chained SHA-256 digest for a single record."""
+    digest = hashlib.sha256(f"{previous_hash}|{seq}|{ts_text}|".encode("utf-8"))
+    digest.update(payload)
+    return digest.hexdigest()
+
+
+def to_epoch(since: Any) -> Optional[float]:
+    """Normalize ``since`` (ISO string, datetime or epoch) to epoch seconds."""
+    if since is None:
+        return None
+    if isinstance(since, (int, float)):
+        return float(since)
+    if isinstance(since, str):
+        since = datetime.datetime.fromisoformat(since.replace("Z", "+00:00"))
+    if isinstance(since, datetime.datetime):
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=datetime.timezone.utc)
+        return since.timestamp()
+    raise TypeError(f"Unsupported 'since' value: {since!r}")
+
+
+def _split_line(line: bytes) -> Tuple[int, bytes, str, str, bytes]:
+    seq, ts_text, prev, digest, payload = line.split(b"\t", 4)
+    return int(seq), ts_text, prev.decode("ascii"), digest.decode("ascii"), payload
+
+
+class _IndexView:
+    """Sequence view over a packed index buffer (usable with :mod:`bisect`)."""
+
+    def __init__(self, buf: bytes) -> None:
+        self.buffer = buf
+
+    def __len__(self) -> int:
+        return len(self.buffer) // INDEX_ENTRY.size
+
+    def __getitem__(self, i: int) -> Tuple[int, int, float]:
+        return INDEX_ENTRY.unpack_from(self.buffer, i * INDEX_ENTRY.size)
+
+
+class SegmentedLogChain:
+    """Hash-chained event log persisted as rotating segment files."""
+
+    def __init__(
+        self,
+        filename: str,
+        segment_max_bytes: int = DEFAULT_SEGMENT_MAX_BYTES,
+        fsync: bool = False,
+        read_only: bool = False,
+    ) -> None:
+        self.filename = filename
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync = fsync
+        self.read_only = read_only
+        self._lock = threading.RLock()
+        self._segments: List[int] = []
+        self._last_seq = 0
+        self._last_hash = GENESIS_HASH
+        self._last_ts = 0.0
+        self._active_size = 0
+        self._fh = None
+        self._idx_fh = None
+        self._recover()
+
+    # ------------------------------------------------------------------
+    # Paths and recovery
+    def _segment_path(self, first_seq: int) -> str:
+        return f"{self.filename}.{first_seq:012d}.seg"
+
+    def _index_path(self, first_seq: int) -> str:
+        return f"{self.filename}.{first_seq:012d}.idx"
+
+    def _discover(self) -> List[int]:
+        pattern = f"{glob.escape(self.filename)}.*.seg"
+        firsts = []
+        for path in glob.glob(pattern):
+            token = path[len(self.filename) + 1 : -len(".seg")]
+            if token.isdigit():
+                firsts.append(int(token))
+        return sorted(firsts)
+
+    def _recover(self) -> None:
+        self._segments = self._discover()
+        while self._segments:
+            first = self._segments[-1]
+            tail, end = self._repair_segment(first)
+            if tail is not None:
+                self._last_seq, self._last_hash, self._last_ts = tail
+                self._active_size = end
+                break
+            # Empty trailing segment: drop it and fall back to the previous one.
+            if not self.read_only:
+                os.remove(self._segment_path(first))
+                if os.path.exists(self._index_path(first)):
+                    os.remove(self._index_path(first))
+            self._segments.pop()
+        if self._segments and not self.read_only:
+            self._open_active(self._segments[-1])
+
+    def _repair_segment(
+        self, first_seq: int
+    ) -> Tuple[Optional[Tuple[int, str, float]], int]:
+        """Truncate torn writes and rebuild missing index entries.
+
+        Returns ``(seq, hash, timestamp)`` of the last intact record (or
+        ``None`` when the segment holds no records) and the byte length of
+        the intact prefix. Read-only logs never modify files.
+        """
+        seg_path = self._segment_path(first_seq)
+        idx_path = self._index_path(first_seq)
+        with open(seg_path, "rb") as f:
+            data = f.read()
+        index = _IndexView(b"")
+        if os.path.exists(idx_path):
+            with open(idx_path, "rb") as f:
+                index = _IndexView(f.read())
+        # Resume scanning after the last indexed record that is still intact.
+        entries = len(index)
+        pos = 0
+        while entries:
+            seq, offset, _ = index[entries - 1]
+            nl = data.find(b"\n", offset)
+            if seq == first_seq + entries - 1 and nl != -1:
+                pos = nl + 1
+                break
+            entries -= 1
+        good: List[Tuple[int, int, float]] = [index[i] for i in range(entries)]
+        last: Optional[Tuple[int, str, float]] = None
+        if entries:
+            seq, offset, ts_val = good[-1]
+            _, _, _, digest, _ = _split_line(data[offset : data.find(b"\n", offset)])
+            last = (seq, digest, ts_val)
+        while pos < len(data):
+            nl = data.find(b"\n", pos)
+            if nl == -1:
+                break
+            try:
+                seq, ts_text, _, digest, _ = _split_line(data[pos:nl])
+            except ValueError:
+                break
+            good.append((seq, pos, float(ts_text)))
+            last = (seq, digest, float(ts_text))
+            pos = nl + 1
+        if self.read_only:
+            return last, pos
+        if pos < len(data):
+            logger.warning("Truncating torn log tail in %s at offset %d", seg_path, pos)
+            with open(seg_path, "r+b") as f:
+                f.truncate(pos)
+        if len(good) * INDEX_ENTRY.size != len(index.buffer):
+            with open(idx_path, "wb") as f:
+                f.write(b"".join(INDEX_ENTRY.pack(*e) for e in good))
+        return last, pos
+
+    def _open_active(self, first_seq: int) -> None:
+        self._fh = open(self._segment_path(first_seq), "ab")
+        self._idx_fh = open(self._index_path(first_seq), "ab")
+        self._active_size = self._fh.tell()
+
+    def _rotate(self, first_seq: int) -> None:
+        self.close()
+        self._segments.append(first_seq)
+        self._open_active(first_seq)
+
+    def close(self) -> None:
+        """Close open segment handles (the log can be reopened lazily)."""
+        with self._lock:
+            for fh in (self._fh, self._idx_fh):
+                if fh is not None:
+                    fh.close()
+            self._fh = None
+            self._idx_fh = None
+
+    # ------------------------------------------------------------------
+    # Writing
+    def _encode(
+        self, event: Dict[str, Any], seq: int, prev: str, last_ts: float
+    ) -> Tuple[bytes, str, float]:
+        ts_text = f"{max(time.time(), last_ts):.6f}"
+        payload = canonical_payload(event)
+        digest = record_hash(prev, seq, ts_text, payload)
+        line = b"\t".join(
+            [str(seq).encode(), ts_text.encode(), prev.encode(), digest.encode(), payload]
+        )
+        return line + b"\n", digest, float(ts_text)
+
+    def _flush(self) -> None:
+        self._fh.flush()
+        self._idx_fh.flush()
+        if self.fsync:
+            os.fsync(self._fh.fileno())
+            os.fsync(self._idx_fh.fileno())
+
+    def add(self, event: Dict[str, Any]) -> int:
+        """Append ``event`` and return its sequence number (event id)."""
+        return self.add_batch([event])[0]
+
+    def add_batch(self, events: List[Dict[str, Any]]) -> List[int]:
+        """Append ``events`` with one write per touched segment.
+
+        Returns the sequence numbers assigned to ``events`` in order.
+        """
+        if self.read_only:
+            raise PermissionError(f"Log {self.filename} is opened read-only")
+        with self._lock:
+            if self._fh is None and self._segments:
+                self._open_active(self._segments[-1])
+            seq, prev, last_ts = self._last_seq, self._last_hash, self._last_ts
+            seqs: List[int] = []
+            lines: List[bytes] = []
+            index: List[bytes] = []
+            size = self._active_size
+            for event in events:
+                seq += 1
+                line, prev, last_ts = self._encode(event, seq, prev, last_ts)
+                if self._fh is None or (size and size + len(line) > self.segment_max_bytes):
+                    self._write_group(lines, index)
+                    lines, index = [], []
+                    self._rotate(seq)
+                    size = 0
+                index.append(INDEX_ENTRY.pack(seq, size, last_ts))
+                lines.append(line)
+                size += len(line)
+                seqs.append(seq)
+            self._write_group(lines, index)
+            self._last_seq, self._last_hash, self._last_ts = seq, prev, last_ts
+            return seqs
+
+    def _write_group(self, lines: List[bytes], index: List[bytes]) -> None:
+        if not lines:
+            return
+        data = b"".join(lines)
+        self._fh.write(data)
+        self._idx_fh.write(b"".join(index))
+        self._active_size += len(data)
+        self._flush()
+
+    # ------------------------------------------------------------------
+    # Reading
+    def __len__(self) -> int:
+        if not self._segments:
+            return 0
+        return self._last_seq - self._segments[0] + 1
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    @property
+    def last_hash(self) -> str:
+        return self._last_hash
+
+    @property
+    def entries(self) -> List[Dict[str, Any]]:
+        """All logged events in order (loads the full history)."""
+        return [r.event for r in self.iter_records()]
+
+    def _read_index(self, first_seq: int) -> _IndexView:
+        path = self._index_path(first_seq)
+        if not os.path.exists(path):
+            if self.read_only:
+                return _IndexView(self._scan_index(first_seq))
+            self._repair_segment(first_seq)
+        with open(path, "rb") as f:
+            return _IndexView(f.read())
+
+    def _scan_index(self, first_seq: int) -> bytes:
+        """Build a packed index for a segment without touching the disk."""
+        entries = []
+        with open(self._segment_path(first_seq), "rb") as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                seq, ts_text, _, _, _ = _split_line(line[:-1])
+                entries.append(INDEX_ENTRY.pack(seq, offset, float(ts_text)))
+                offset += len(line)
+        return b"".join(entries)
+
+    def _locate(self, start_seq: Optional[int], since: Optional[float]) -> Tuple[int, int]:
+        """Return ``(segment position, byte offset)`` of the first wanted record."""
+        if start_seq is not None:
+            pos = max(bisect.bisect_right(self._segments, start_seq) - 1, 0)
+            index = self._read_index(self._segments[pos])
+            i = start_seq - self._segments[pos]
+            if i <= 0:
+                return pos, 0
+            if i >= len(index):
+                return pos + 1, 0
+            return pos, index[i][1]
+        if since is not None:
+            pos = 0
+            lo, hi = 0, len(self._segments)
+            # Find the last segment whose first record is not newer than ``since``.
+            while lo < hi:
+                mid = (lo + hi) // 2
+                index = self._read_index(self._segments[mid])
+                if len(index) and index[0][2] <= since:
+                    pos = mid
+                    lo = mid + 1
+                else:
+                    hi = mid
+            index = self._read_index(self._segments[pos])
+            i = bisect.bisect_right(index, since, key=lambda e: e[2])
+            if i >= len(index):
+                return pos + 1, 0
+            return pos, index[i][1]
+        return 0, 0
+
+    def _iter_raw(
+        self, start_seq: Optional[int] = None, since: Any = None
+    ) -> Iterator[Tuple[int, bytes, str, str, bytes]]:
+        with self._lock:
+            if not self._segments:
+                return
+            segments = list(self._segments)
+            active_limit = self._active_size
+            pos, offset = self._locate(start_seq, to_epoch(since))
+        for n in range(pos, len(segments)):
+            first = segments[n]
+            is_active = n == len(segments) - 1
+            with open(self._segment_path(first), "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                limit = min(size, active_limit) if is_active else size
+                if limit <= offset:
+                    offset = 0
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    cursor = offset
+                    while cursor < limit:
+                        nl = mm.find(b"\n", cursor, limit)
+                        if nl == -1:
+                            break
+                        record = _split_line(mm[cursor:nl])
+                        cursor = nl + 1
+                        if start_seq is not None and record[0] < start_seq:
+                            continue
+                        yield record
+            offset = 0
+
+    def iter_records(self, start_seq: Optional[int] = None, since: Any = None) -> Iterator[LogRecord]:
+        """Yield decoded records from ``start_seq`` or strictly after ``since``."""
+        for seq, ts_text, prev, digest, payload in self._iter_raw(start_seq, since):
+            yield LogRecord(seq, float(ts_text), prev, digest, json.loads(payload))
+
+    def get(self, seq: int) -> Optional[LogRecord]:
+        """Return the record with event id ``seq`` if present."""
+        for record in self.iter_records(start_seq=seq):
+            return record if record.seq == seq else None
+        return None
+
+    def replay_events(
+        self,
+        apply: Callable[[Dict[str, Any]], None],
+        since: Any = None,
+        start_seq: Optional[int] = None,
+    ) -> int:
+        """Feed events newer than ``since`` (or from ``start_seq``) to ``apply``.
+
+        Returns the number of replayed events.
+        """
+        count = 0
+        for record in self.iter_records(start_seq=start_seq, since=since):
+            apply(record.event)
+            count += 1
+        return count
+
+    def verify(self, since: Any = None, start_seq: Optional[int] = None) -> bool:
+        """Recompute the hash chain, optionally only for the tail of the log."""
+        expected_prev: Optional[str] = None
+        expected_seq: Optional[int] = None
+        partial = since is not None or start_seq is not None
+        for seq, ts_text, prev, digest, payload in self._iter_raw(start_seq, since):
+            if expected_prev is None:
+                if not partial and (prev != GENESIS_HASH or seq != self._segments[0]):
+                    logger.error("Log chain does not start at genesis (seq %d)", seq)
+                    return False
+            elif prev != expected_prev or seq != expected_seq:
+                logger.error("Log chain link broken at seq %d", seq)
+                return False
+            if record_hash(prev, seq, ts_text.decode("ascii"), payload) != digest:
+                logger.error("Log chain hash mismatch at seq %d", seq)
+                return False
+            expected_prev, expected_seq = digest, seq + 1
+        if expected_prev is not None and expected_prev != self._last_hash:
+            logger.error("Log chain tail does not match the writer state")
+            return False
+        return True
+
+    def tail(self, limit: int = 100) -> List[str]:
+        """Return the last ``limit`` raw record lines for display."""
+        start = max(self._last_seq - limit + 1, 1)
+        return [
+            b"\t".join([str(seq).encode(), ts_text, prev.encode(), digest.encode(), payload]).decode(
+                "utf-8", errors="replace"
+            )
+            for seq, ts_text, prev, digest, payload in self._iter_raw(start_seq=start)
+        ]
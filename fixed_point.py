@@ -0,0 +1,100 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Fixed-point ledger arithmetic.
+
+Karma, staked karma, coin values and escrow are held as signed 64-bit
+integers counting micro-units (``SCALE`` = 10**6).  Rounding rules:
+
+* converting any other number to units rounds half-to-even;
+* multiplying units by a ratio rounds half-to-even, except
+* :func:`split_units` floors every share; when the shares add up to one the
+  last share also takes the remainder, so a split never creates or destroys
+  value.
+
+Stored records keep their decimal string form; :func:`parse_units` and
+:func:`format_units` convert without building ``Decimal`` objects.
+"""
+
+from __future__ import annotations
+
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Any, List, Sequence
+
+SCALE_DIGITS = 6
+SCALE = 10**SCALE_DIGITS
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+_QUANTUM = Decimal(1).scaleb(-SCALE_DIGITS)
+
+
+def checked(units: int) -> int:
+    """Return ``units`` or raise ``OverflowError`` outside the int64 range."""
+    if not INT64_MIN <= units <= INT64_MAX:
+        raise OverflowError(f"ledger amount out of range: {units}")
+    return units
+
+
+def parse_units(text: str) -> int:
+    """Parse a plain decimal string (``"-12.5"``) into units."""
+    negative = text.startswith("-")
+    whole, _, frac = text.lstrip("+-").partition(".")
+    if not (whole or frac).isdigit() or (frac and not frac.isdigit()):
+        raise ValueError(text)
+    if len(frac) > SCALE_DIGITS:
+        # More precision than the ledger holds: round like to_units.
+        return to_units(Decimal(text))
+    units = int(whole or "0") * SCALE + int(frac.ljust(SCALE_DIGITS, "0") or "0")
+    return checked(-units if negative else units)
+
+
+def to_units(value: Any) -> int:
+    """Convert ``Decimal``/``int``/``str``/``float`` to units (half-even)."""
+    if isinstance(value, int):
+        return checked(value * SCALE)
+    if isinstance(value, str):
+        try:
+            return parse_units(value)
+        except ValueError:
+            pass  # exponents, whitespace, NaN: let Decimal decide
+    quantized = Decimal(str(value)).quantize(_QUANTUM, rounding=ROUND_HALF_EVEN)
+    return checked(int(quantized.scaleb(SCALE_DIGITS)))
+
+
+def from_units(units: int) -> Decimal:
+    return Decimal(units).scaleb(-SCALE_DIGITS)
+
+
+def format_units(units: int) -> str:
+    """Render units as the shortest exact decimal string."""
+    sign = "-" if units < 0 else ""
+    whole, frac = divmod(abs(units), SCALE)
+    if not frac:
+        return f"{sign}{whole}"
+    return f"{sign}{whole}.{str(frac).rjust(SCALE_DIGITS, '0').rstrip('0')}"
+
+
+def mul_units(units: int, ratio: int) -> int:
+    """Multiply two unit amounts, rounding half-to-even."""
+    quotient, remainder = divmod(units * ratio, SCALE)
+    twice = 2 * remainder
+    if twice > SCALE or (twice == SCALE and quotient % 2):
+        quotient += 1
+    return checked(quotient)
+
+
+def scale_units(units: int, factor: Any) -> int:
+    """Multiply units by an arbitrary-precision factor (half-even)."""
+    if isinstance(factor, int):
+        return checked(units * factor)
+    return to_units(from_units(units) * Decimal(str(factor)))
+
+
+def split_units(total: int, shares: Sequence[Any]) -> List[int]:
+    """Split ``total`` by ``shares`` (see the module rounding rules)."""
+    ratios = [to_units(share) for share in shares]
+    parts = [total * ratio // SCALE for ratio in ratios]
+    if sum(ratios) == SCALE:
+        parts[-1] = total - sum(parts[:-1])
+    return parts
@@ -0,0 +1,111 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Edit-distance index for fuzzy keyword matching.
+
+``BKTree`` arranges the keywords so that, by the triangle inequality, a query
+only visits children whose edge distance lies within ``max_distance`` of the
+distance to their parent.  Distances are computed with
+:func:`bounded_levenshtein`, which rejects on length difference and stops as
+soon as a DP row exceeds the bound, so most comparisons never run to
+completion.
+
+The tree is built once and never mutated afterwards; concurrent queries need
+no lock.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def bounded_levenshtein(s1: str, s2: str, limit: int) -> int:
+    """Return the edit distance of ``s1`` and ``s2``, or ``limit + 1`` if larger."""
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if len(s1) - len(s2) > limit:
+        return limit + 1
+    if not s2:
+        return len(s1)
+    previous = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current = [i + 1]
+        for j, c2 in enumerate(s2):
+            current.append(
+                min(previous[j + 1] + 1, current[j] + 1, previous[j] + (c1 != c2))
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+class _Node:
+    __slots__ = ("word", "order", "children", "max_edge")
+
+    def __init__(self, word: str, order: int) -> None:
+        self.word = word
+        self.order = order
+        self.children: Dict[int, _Node] = {}
+        self.max_edge = 0
+
+
+class BKTree:
+    """Burkhard-Keller tree over a fixed keyword list."""
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.root: Optional[_Node] = None
+        self.size = 0
+        for word in words:
+            self._insert(word)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _insert(self, word: str) -> None:
+        node = _Node(word, self.size)
+        if self.root is None:
+            self.root = node
+            self.size = 1
+            return
+        parent = self.root
+        while True:
+            # Exact distance: edges must carry the true metric value.
+            d = bounded_levenshtein(word, parent.word, max(len(word), len(parent.word)))
+            if d == 0:
+                return  # duplicate keyword
+            child = parent.children.get(d)
+            if child is None:
+                parent.children[d] = node
+                parent.max_edge = max(parent.max_edge, d)
+                self.size += 1
+                return
+            parent = child
+
+    def query(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+        """Return ``(distance, keyword)`` for every keyword within ``max_distance``.
+
+        Results are in keyword insertion order.
+        """
+        if self.root is None or max_distance < 0:
+            return []
+        found: List[Tuple[int, int, str]] = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            # Children need d - max_distance <= edge, so anything past
+            # max_edge + max_distance is as good as infinity.
+            d = bounded_levenshtein(word, node.word, node.max_edge + max_distance)
+            if d <= max_distance:
+                found.append((node.order, d, node.word))
+            low, high = d - max_distance, d + max_distance
+            for edge, child in node.children.items():
+                if low <= edge <= high:
+                    stack.append(child)
+        found.sort()
+        return [(d, keyword) for _, d, keyword in found]
+
+    def first(self, word: str, max_distance: int) -> Optional[str]:
+        """Return the earliest inserted keyword within ``max_distance``."""
+        hits = self.query(word, max_distance)
+        return hits[0][1] if hits else None
@@ -0,0 +1,80 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Set-based assembly of the social graph.
+
+Walking ``harmonizer.following`` or ``vibenode.likes`` issues one lazy query
+per object.  The builders here read node columns and the association
+tables (``harmonizer_follows``, ``vibenode_likes`` and
+``vibenode_entanglements``) with one query each, so a graph always costs the
+same handful of round trips.  Rows are streamed with ``yield_per`` and fed
+straight into the graph's adjacency, so no ORM objects or intermediate edge
+lists are kept in memory.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, Tuple
+
+try:
+    import networkx as nx
+except ImportError:  # pragma: no cover - optional dependency
+    nx = None
+
+from db_models import (Harmonizer, VibeNode, harmonizer_follows,
+                       vibenode_entanglements, vibenode_likes)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def stream(query: Any, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterable[Tuple[Any, ...]]:
+    """Iterate ``query`` in server-side batches where the backend allows it."""
+    yield_per = getattr(query, "yield_per", None)
+    return yield_per(batch_size) if yield_per is not None else query
+
+
+def follow_edges(db, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Tuple[int, int]]:
+    """Yield ``(follower_id, followed_id)`` pairs."""
+    query = db.query(harmonizer_follows.c.follower_id, harmonizer_follows.c.followed_id)
+    for follower_id, followed_id in stream(query, batch_size):
+        yield follower_id, followed_id
+
+
+def build_follow_graph(db, batch_size: int = DEFAULT_BATCH_SIZE) -> "nx.DiGraph":
+    """Return the follow graph keyed by harmonizer id, in two queries."""
+    G = nx.DiGraph()
+    for (hid,) in stream(db.query(Harmonizer.id), batch_size):
+        G.add_node(hid)
+    for follower_id, followed_id in follow_edges(db, batch_size):
+        G.add_edge(follower_id, followed_id)
+    return G
+
+
+def build_interaction_graph(db, batch_size: int = DEFAULT_BATCH_SIZE) -> "nx.DiGraph":
+    """Return the harmonizer/vibenode graph used by ``/network-analysis/``.
+
+    Harmonizer nodes are ``h_<id>`` and vibenode nodes ``v_<id>``.  Edges
+    are typed ``follow``, ``created``, ``liked`` or ``entangled``.  A like
+    overrides the ``created`` type of the same author->vibenode pair.
+    """
+    G = nx.DiGraph()
+    harmonizers = db.query(Harmonizer.id, Harmonizer.username, Harmonizer.harmony_score)
+    for hid, username, score in stream(harmonizers, batch_size):
+        G.add_node(f"h_{hid}", label=username, type="harmonizer", harmony_score=float(score))
+    for u, v in follow_edges(db, batch_size):
+        G.add_edge(f"h_{u}", f"h_{v}", type="follow")
+    vibenodes = db.query(VibeNode.id, VibeNode.name, VibeNode.echo, VibeNode.author_id)
+    for vid, name, echo, author_id in stream(vibenodes, batch_size):
+        G.add_node(f"v_{vid}", label=name, type="vibenode", echo=float(echo))
+        G.add_edge(f"h_{author_id}", f"v_{vid}", type="created")
+    likes = db.query(vibenode_likes.c.harmonizer_id, vibenode_likes.c.vibenode_id)
+    for hid, vid in stream(likes, batch_size):
+        G.add_edge(f"h_{hid}", f"v_{vid}", type="liked")
+    entanglements = db.query(
+        vibenode_entanglements.c.source_id,
+        vibenode_entanglements.c.target_id,
+        vibenode_entanglements.c.strength,
+    )
+    for src, dst, strength in stream(entanglements, batch_size):
+        G.add_edge(f"v_{src}", f"v_{dst}", type="entangled", strength=strength)
+    return G
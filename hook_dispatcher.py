@@ -0,0 +1,219 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Long-lived executor for hook callbacks.
+
+``HookManager.fire_hooks`` used to spin up (or re-enter) an event loop on
+every call.  ``HookDispatcher`` instead owns one event loop on a daemon
+thread.  Producers hand it invocations through a bounded queue.  When the
+queue is full ``submit`` waits for a slot, so hooks are never lost by
+default.  Dropping is opt-in: with ``put_timeout`` set, ``submit`` waits at
+most that long (``0`` not at all) and then drops the invocation, counting
+it.  Hooks fired from a hook callback skip the bound rather than wait on
+the queue they are draining.
+
+Invocations are taken off the queue in order by ``workers`` consumer tasks.
+The callbacks of one invocation run concurrently: coroutine functions on the
+dispatcher loop, plain callables on a small thread pool.  Each callback is
+bounded by ``timeout``; a callback that overruns yields ``None`` and is
+counted in :meth:`HookDispatcher.stats`, which also reports queue depth and
+queue/run latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import inspect
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def _name(func: Callable[..., Any]) -> str:
+    return getattr(func, "__name__", repr(func))
+
+
+class HookDispatcher:
+    """Run hook invocations on a persistent background event loop."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        timeout: Optional[float] = 5.0,
+        put_timeout: Optional[float] = None,
+        workers: int = 1,
+        thread_workers: int = 4,
+    ) -> None:
+        self.maxsize = max(1, maxsize)
+        self.timeout = timeout
+        self.put_timeout = put_timeout
+        self._slots = threading.BoundedSemaphore(self.maxsize)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "dropped": 0,
+            "timeouts": 0,
+            "errors": 0,
+            "queued": 0,
+            "high_water": 0,
+        }
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+        self._run_max = 0.0
+        self._idle = threading.Condition(self._stats_lock)
+        self._inside = threading.local()
+        self._closed = False
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=thread_workers,
+            thread_name_prefix="hook",
+            initializer=self._mark_inside,
+        )
+        self._loop = asyncio.new_event_loop()
+        self._queue: Optional[asyncio.Queue] = None
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._serve, args=(max(1, workers), ready), daemon=True
+        )
+        self._thread.start()
+        ready.wait()
+
+    # ------------------------------------------------------------------
+    # Loop thread
+    def _mark_inside(self) -> None:
+        self._inside.active = True
+
+    def _serve(self, workers: int, ready: threading.Event) -> None:
+        self._mark_inside()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        tasks = [self._loop.create_task(self._worker()) for _ in range(workers)]
+        ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(
+                asyncio.gather(*tasks, return_exceptions=True)
+            )
+            self._loop.close()
+
+    async def _worker(self) -> None:
+        while True:
+            callbacks, args, kwargs, queued_at, future, slot = await self._queue.get()
+            started = time.perf_counter()
+            try:
+                results = await asyncio.gather(
+                    *(self._call(func, args, kwargs) for func in callbacks)
+                )
+            finally:
+                finished = time.perf_counter()
+                if slot:
+                    self._slots.release()
+                with self._stats_lock:
+                    self._stats["completed"] += 1
+                    self._stats["queued"] -= 1
+                    self._wait_total += started - queued_at
+                    self._wait_max = max(self._wait_max, started - queued_at)
+                    self._run_total += finished - started
+                    self._run_max = max(self._run_max, finished - started)
+                    self._idle.notify_all()
+            if not future.done():
+                future.set_result(results)
+
+    async def _call(
+        self, func: Callable[..., Any], args: Sequence[Any], kwargs: Dict[str, Any]
+    ) -> Any:
+        try:
+            if inspect.iscoroutinefunction(func):
+                pending = func(*args, **kwargs)
+            else:
+                pending = self._loop.run_in_executor(
+                    self._executor, lambda: func(*args, **kwargs)
+                )
+            result = await asyncio.wait_for(pending, self.timeout)
+            if inspect.isawaitable(result):
+                result = await asyncio.wait_for(result, self.timeout)
+            return result
+        except asyncio.TimeoutError:
+            with self._stats_lock:
+                self._stats["timeouts"] += 1
+            logger.warning("Hook %s timed out after %ss", _name(func), self.timeout)
+        except Exception:
+            with self._stats_lock:
+                self._stats["errors"] += 1
+            logger.exception("Hook %s raised an exception", _name(func))
+        return None
+
+    # ------------------------------------------------------------------
+    # Producer API
+    def submit(
+        self,
+        callbacks: Sequence[Callable[..., Any]],
+        args: Sequence[Any] = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Optional["concurrent.futures.Future[List[Any]]"]:
+        """Queue one invocation of ``callbacks``.
+
+        Returns a future resolving to the callback results in order, or
+        ``None`` when ``put_timeout`` is set and the queue stayed full for
+        that long.
+        """
+        inside = getattr(self._inside, "active", False)
+        if inside or self.put_timeout == 0:
+            # From a callback, waiting would block the consumers that free slots.
+            acquired = self._slots.acquire(blocking=False)
+        elif self.put_timeout is None:
+            acquired = self._slots.acquire()
+        else:
+            acquired = self._slots.acquire(timeout=self.put_timeout)
+        with self._stats_lock:
+            if not acquired and not (inside and self.put_timeout is None):
+                self._stats["dropped"] += 1
+                logger.warning("Hook queue full; dropping invocation")
+                return None
+            self._stats["submitted"] += 1
+            self._stats["queued"] += 1
+            self._stats["high_water"] = max(
+                self._stats["high_water"], self._stats["queued"]
+            )
+        future: "concurrent.futures.Future[List[Any]]" = concurrent.futures.Future()
+        job = (
+            list(callbacks), tuple(args), dict(kwargs or {}), time.perf_counter(), future, acquired
+        )
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        return future
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted invocation has finished."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._stats["queued"] == 0, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters, queue depth and latency figures (seconds)."""
+        with self._stats_lock:
+            done = self._stats["completed"]
+            return {
+                **self._stats,
+                "capacity": self.maxsize,
+                "avg_wait": self._wait_total / done if done else 0.0,
+                "max_wait": self._wait_max,
+                "avg_run": self._run_total / done if done else 0.0,
+                "max_run": self._run_max,
+            }
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Finish queued work, then stop the loop and its thread pool."""
+        if self._closed:
+            return
+        self._closed = True
+        self.drain(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._executor.shutdown(wait=False)
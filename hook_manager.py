@@ -3,7 +3,9 @@ import inspect
 import logging
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, Dict, List
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from hook_dispatcher import HookDispatcher
 
 
 @dataclass
@@ -13,6 +15,9 @@ class HookManager:
     hooks: Dict[str, List[Callable[..., Any]]] = field(
         default_factory=lambda: defaultdict(list)
     )
+    # When set, ``fire_hooks``/``fire_many`` queue work here instead of
+    # running an event loop per call, and return without waiting.
+    dispatcher: Optional[HookDispatcher] = None
 
     def register_hook(self, name: str, func: Callable[..., Any]) -> None:
         """Safely register a hook callback under a cosmic name."""
@@ -49,8 +54,18 @@ class HookManager:
             )
         return results
 
+    def dispatch(self, name: str, *args: Any, **kwargs: Any):
+        """Queue *name* on the dispatcher; returns a future or ``None``."""
+        callbacks = list(self.hooks.get(name, []))
+        if not callbacks or self.dispatcher is None:
+            return None
+        return self.dispatcher.submit(callbacks, args, kwargs)
+
     def fire_hooks(self, name: str, *args: Any, **kwargs: Any) -> List[Any]:
         """Public entry point to trigger hooks synchronously or asynchronously."""
+        if self.dispatcher is not None:
+            self.dispatch(name, *args, **kwargs)
+            return []
         coro = self.trigger(name, *args, **kwargs)
         try:
             loop = asyncio.get_running_loop()
@@ -59,6 +74,34 @@ class HookManager:
         else:
             return loop.run_until_complete(coro)
 
+    async def trigger_many(
+        self, calls: Iterable[Tuple[str, Tuple[Any, ...]]]
+    ) -> List[List[Any]]:
+        """Trigger each ``(name, args)`` pair in order within one event loop turn."""
+        return [await self.trigger(name, *args) for name, args in calls]
+
+    def fire_many(self, calls: Iterable[Tuple[str, Tuple[Any, ...]]]) -> List[List[Any]]:
+        """Fire a batch of hooks with a single event loop round trip."""
+        calls = list(calls)
+        if self.dispatcher is not None:
+            for name, args in calls:
+                self.dispatch(name, *args)
+            return [[] for _ in calls]
+        if not any(self.hooks.get(name) for name, _ in calls):
+            return [[] for _ in calls]
+        coro = self.trigger_many(calls)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        else:
+            return loop.run_until_complete(coro)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Shut down the dispatcher, if any, after its queued hooks ran."""
+        if self.dispatcher is not None:
+            self.dispatcher.close(timeout)
+
     def dump_hooks(self) -> Dict[str, List[str]]:
         """Inspect current hook bindings for audit clarity."""
         return {n: [getattr(f, "__name__", repr(f)) for f in cbs] for n, cbs in self.hooks.items()}
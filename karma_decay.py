@@ -0,0 +1,92 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Lazy, epoch-based karma decay.
+
+``DAILY_DECAY`` used to rewrite every user record.  Instead the storage keeps
+a :class:`KarmaDecayLedger` of decay epochs, each remembering the factor, the
+instant and the genesis decay horizon in force when it was declared.  Every
+user record carries the ``decay_epoch`` it has been brought up to; reading a
+record replays the pending epochs in order, with exactly the multiplications
+and fixed-point rounding the eager sweep through ``User.karma`` performed, so
+the resulting karma is bit-for-bit identical.
+"""
+
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from fixed_point import format_units, scale_units, to_units
+
+EPOCH_FIELD = "decay_epoch"
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+
+def genesis_decay_at(
+    join_time: str, decay_years: float, at: datetime.datetime
+) -> Decimal:
+    """``calculate_genesis_bonus_decay`` evaluated at ``at`` instead of now."""
+    joined = datetime.datetime.fromisoformat(join_time.replace("Z", "+00:00"))
+    if joined.tzinfo is None:
+        joined = joined.replace(tzinfo=datetime.timezone.utc)
+    years_passed = (at - joined).total_seconds() / SECONDS_PER_YEAR
+    if years_passed >= decay_years:
+        return Decimal("0")
+    return Decimal("1") - Decimal(years_passed) / decay_years
+
+
+class KarmaDecayLedger:
+    """Ordered list of decay epochs applied to user records on access."""
+
+    def __init__(self) -> None:
+        self._epochs: List[Tuple[Decimal, datetime.datetime, float]] = []
+
+    @property
+    def epoch(self) -> int:
+        return len(self._epochs)
+
+    def bump(
+        self,
+        factor: Decimal,
+        genesis_decay_years: float,
+        at: Optional[datetime.datetime] = None,
+    ) -> int:
+        """Declare one decay step and return the new epoch number."""
+        at = at or datetime.datetime.now(datetime.timezone.utc)
+        self._epochs.append((Decimal(factor), at, genesis_decay_years))
+        return self.epoch
+
+    def stamp(self, data: Dict[str, Any]) -> None:
+        """Mark a record written without an epoch as current."""
+        if EPOCH_FIELD not in data:
+            data[EPOCH_FIELD] = self.epoch
+
+    def materialize(self, data: Dict[str, Any]) -> bool:
+        """Apply pending epochs to ``data`` in place; return ``True`` if changed."""
+        since = data.get(EPOCH_FIELD)
+        if since is None:
+            data[EPOCH_FIELD] = self.epoch
+            return True
+        if since >= self.epoch:
+            return False
+        karma = to_units(data.get("karma", "0"))
+        genesis = data.get("is_genesis") and data.get("join_time")
+        for factor, at, years in self._epochs[since:]:
+            karma = scale_units(karma, factor)
+            if genesis:
+                karma = scale_units(karma, genesis_decay_at(data["join_time"], years, at))
+        data["karma"] = format_units(karma)
+        data[EPOCH_FIELD] = self.epoch
+        return True
+
+    def state(self) -> List[List[Any]]:
+        return [[str(f), at.isoformat(), years] for f, at, years in self._epochs]
+
+    def load_state(self, state: List[List[Any]]) -> None:
+        self._epochs = [
+            (Decimal(f), datetime.datetime.fromisoformat(at), years)
+            for f, at, years in state
+        ]
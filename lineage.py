@@ -0,0 +1,199 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Remix lineage of vibenodes in one query.
+
+``vibenode_lineage`` is the ancestor closure of the remix tree: one
+``(ancestor_id, descendant_id, depth)`` row for every ancestor of every
+node, including the node itself at depth 0.  :func:`record_vibenode` keeps
+it current on insert by copying the parent's rows in one
+``INSERT ... SELECT``.  Full ancestry or descendants are then a single
+indexed lookup, however deep the chain.
+
+Databases created before the table existed are still served.
+:func:`ancestors` and :func:`descendants` fall back to a recursive CTE over
+``parent_vibenode_id`` when the table is missing or a node has no depth-0
+row yet, and :func:`ensure_lineage` backfills the table at startup from
+that same CTE.
+"""
+
+from __future__ import annotations
+
+import weakref
+from typing import List, Optional, Tuple
+
+try:
+    from sqlalchemy import delete, func, inspect, insert, literal, select
+except ImportError:  # pragma: no cover - optional dependency
+    delete = func = inspect = insert = literal = select = None
+
+from db_models import VibeNode, vibenode_lineage
+
+Lineage = List[Tuple[int, int]]
+
+_has_closure: "weakref.WeakKeyDictionary[object, bool]" = weakref.WeakKeyDictionary()
+
+
+def has_closure(db) -> bool:
+    """Return whether the closure table exists; checked once per engine."""
+    if inspect is None:
+        return False
+    bind = db.get_bind()
+    if bind not in _has_closure:
+        _has_closure[bind] = inspect(bind).has_table(vibenode_lineage.name)
+    return _has_closure[bind]
+
+
+def record_vibenode(db, node_id: int, parent_id: Optional[int]) -> None:
+    """Add the closure rows of a newly inserted node.  The caller commits."""
+    if not has_closure(db):
+        return
+    db.execute(
+        insert(vibenode_lineage).values(ancestor_id=node_id, descendant_id=node_id, depth=0)
+    )
+    if parent_id is None:
+        return
+    if db.execute(
+        select(vibenode_lineage.c.depth).where(
+            vibenode_lineage.c.descendant_id == parent_id
+        ).limit(1)
+    ).first() is None:
+        # The parent predates the table; derive its ancestry from the tree.
+        rows = [(parent_id, 0)] + _cte_ancestors(db, parent_id, None)
+        db.execute(
+            insert(vibenode_lineage),
+            [
+                {"ancestor_id": aid, "descendant_id": node_id, "depth": depth + 1}
+                for aid, depth in rows
+            ],
+        )
+        return
+    db.execute(
+        insert(vibenode_lineage).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(
+                vibenode_lineage.c.ancestor_id,
+                literal(node_id),
+                vibenode_lineage.c.depth + 1,
+            ).where(vibenode_lineage.c.descendant_id == parent_id),
+        )
+    )
+
+
+def _recorded(db, node_id: int) -> bool:
+    c = vibenode_lineage.c
+    return (
+        db.execute(
+            select(c.depth).where(c.descendant_id == node_id, c.depth == 0).limit(1)
+        ).first()
+        is not None
+    )
+
+
+def _page(stmt, depth_column, id_column, max_depth, offset, limit):
+    if max_depth is not None:
+        stmt = stmt.where(depth_column <= max_depth)
+    stmt = stmt.order_by(depth_column, id_column).offset(offset)
+    return stmt.limit(limit) if limit is not None else stmt
+
+
+def _cte_ancestors(
+    db, node_id: int, max_depth: Optional[int], offset: int = 0, limit: Optional[int] = None
+) -> Lineage:
+    tree = (
+        select(VibeNode.parent_vibenode_id.label("node_id"), literal(1).label("depth"))
+        .where(VibeNode.id == node_id)
+        .cte("ancestors", recursive=True)
+    )
+    tree = tree.union_all(
+        select(VibeNode.parent_vibenode_id, tree.c.depth + 1).where(
+            VibeNode.id == tree.c.node_id
+        )
+    )
+    stmt = select(tree.c.node_id, tree.c.depth).where(tree.c.node_id.is_not(None))
+    stmt = _page(stmt, tree.c.depth, tree.c.node_id, max_depth, offset, limit)
+    return [(row[0], row[1]) for row in db.execute(stmt)]
+
+
+def _cte_descendants(
+    db, node_id: int, max_depth: Optional[int], offset: int, limit: Optional[int]
+) -> Lineage:
+    tree = (
+        select(VibeNode.id.label("node_id"), literal(1).label("depth"))
+        .where(VibeNode.parent_vibenode_id == node_id)
+        .cte("descendants", recursive=True)
+    )
+    tree = tree.union_all(
+        select(VibeNode.id, tree.c.depth + 1).where(
+            VibeNode.parent_vibenode_id == tree.c.node_id
+        )
+    )
+    stmt = select(tree.c.node_id, tree.c.depth)
+    stmt = _page(stmt, tree.c.depth, tree.c.node_id, max_depth, offset, limit)
+    return [(row[0], row[1]) for row in db.execute(stmt)]
+
+
+def ancestors(
+    db, node_id: int, max_depth: Optional[int] = None, offset: int = 0, limit: Optional[int] = None
+) -> Lineage:
+    """Return ``(ancestor_id, depth)`` pairs, nearest first."""
+    if not has_closure(db):
+        return _cte_ancestors(db, node_id, max_depth, offset, limit)
+    c = vibenode_lineage.c
+    stmt = select(c.ancestor_id, c.depth).where(c.descendant_id == node_id, c.depth > 0)
+    stmt = _page(stmt, c.depth, c.ancestor_id, max_depth, offset, limit)
+    rows = [(row[0], row[1]) for row in db.execute(stmt)]
+    if not rows and not _recorded(db, node_id):
+        return _cte_ancestors(db, node_id, max_depth, offset, limit)
+    return rows
+
+
+def descendants(
+    db, node_id: int, max_depth: Optional[int] = None, offset: int = 0, limit: Optional[int] = None
+) -> Lineage:
+    """Return ``(descendant_id, depth)`` pairs, nearest first."""
+    if not has_closure(db):
+        return _cte_descendants(db, node_id, max_depth, offset, limit)
+    c = vibenode_lineage.c
+    stmt = select(c.descendant_id, c.depth).where(c.ancestor_id == node_id, c.depth > 0)
+    stmt = _page(stmt, c.depth, c.descendant_id, max_depth, offset, limit)
+    rows = [(row[0], row[1]) for row in db.execute(stmt)]
+    if not rows and not _recorded(db, node_id):
+        return _cte_descendants(db, node_id, max_depth, offset, limit)
+    return rows
+
+
+def rebuild_lineage(db) -> int:
+    """Recompute the whole closure table from ``parent_vibenode_id``; return rows."""
+    tree = (
+        select(
+            VibeNode.id.label("ancestor_id"),
+            VibeNode.id.label("descendant_id"),
+            literal(0).label("depth"),
+        ).cte("closure", recursive=True)
+    )
+    tree = tree.union_all(
+        select(tree.c.ancestor_id, VibeNode.id, tree.c.depth + 1).where(
+            VibeNode.parent_vibenode_id == tree.c.descendant_id
+        )
+    )
+    db.execute(delete(vibenode_lineage))
+    db.execute(
+        insert(vibenode_lineage).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(tree.c.ancestor_id, tree.c.descendant_id, tree.c.depth),
+        )
+    )
+    db.commit()
+    return db.execute(select(func.count()).select_from(vibenode_lineage)).scalar()
+
+
+def ensure_lineage(db) -> int:
+    """Rebuild the closure table if some node has no rows; return rows written."""
+    if not has_closure(db):
+        return 0
+    recorded = select(vibenode_lineage.c.descendant_id).where(vibenode_lineage.c.depth == 0)
+    missing = db.execute(
+        select(VibeNode.id).where(VibeNode.id.not_in(recorded)).limit(1)
+    ).first()
+    return rebuild_lineage(db) if missing is not None else 0
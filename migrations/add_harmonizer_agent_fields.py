@@ -0,0 +1,14 @@
+"""Add agent_fields column to harmonizers table."""
+from sqlalchemy import inspect, text
+from db_models import engine
+
+def migrate():
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        cols = {c['name'] for c in inspector.get_columns('harmonizers')}
+        if 'agent_fields' not in cols:
+            conn.execute(text('ALTER TABLE harmonizers ADD COLUMN agent_fields JSON'))
+
+if __name__ == '__main__':
+    migrate()
+    print('Migration complete')
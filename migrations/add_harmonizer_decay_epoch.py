@@ -0,0 +1,14 @@
+"""Add decay_epoch column to harmonizers table."""
+from sqlalchemy import inspect, text
+from db_models import engine
+
+def migrate():
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        cols = {c['name'] for c in inspector.get_columns('harmonizers')}
+        if 'decay_epoch' not in cols:
+            conn.execute(text('ALTER TABLE harmonizers ADD COLUMN decay_epoch INTEGER'))
+
+if __name__ == '__main__':
+    migrate()
+    print('Migration complete')
@@ -0,0 +1,14 @@
+"""Add a unique index on log_chain.previous_hash so the chain cannot fork."""
+from sqlalchemy import text
+from db_models import engine
+
+def migrate():
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE UNIQUE INDEX IF NOT EXISTS ux_log_chain_previous_hash '
+            'ON log_chain (previous_hash)'
+        ))
+
+if __name__ == '__main__':
+    migrate()
+    print('Migration complete')
@@ -0,0 +1,16 @@
+"""Add indexed updated_at column to proposals table."""
+from sqlalchemy import inspect, text
+from db_models import engine
+
+def migrate():
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        cols = {c['name'] for c in inspector.get_columns('proposals')}
+        if 'updated_at' not in cols:
+            conn.execute(text('ALTER TABLE proposals ADD COLUMN updated_at TIMESTAMP'))
+            conn.execute(text('UPDATE proposals SET updated_at = created_at'))
+            conn.execute(text('CREATE INDEX IF NOT EXISTS ix_proposals_updated_at ON proposals (updated_at)'))
+
+if __name__ == '__main__':
+    migrate()
+    print('Migration complete')
@@ -0,0 +1,14 @@
+"""Add the per-key version counter to the system_state table."""
+from sqlalchemy import inspect, text
+from db_models import engine
+
+def migrate():
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        cols = {c['name'] for c in inspector.get_columns('system_state')}
+        if 'version' not in cols:
+            conn.execute(text('ALTER TABLE system_state ADD COLUMN version INTEGER NOT NULL DEFAULT 0'))
+
+if __name__ == '__main__':
+    migrate()
+    print('Migration complete')
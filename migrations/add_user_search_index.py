@@ -0,0 +1,18 @@
+"""Create the harmonizer search index and backfill it."""
+from db_models import SessionLocal, engine, harmonizer_search_grams
+from user_search import ensure_search_index, rebuild_search_index
+
+def migrate():
+    ensure_search_index(engine)
+    if engine.dialect.name == 'postgresql':
+        return 0
+    harmonizer_search_grams.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        return rebuild_search_index(db)
+    finally:
+        db.close()
+
+if __name__ == '__main__':
+    count = migrate()
+    print(f'Migration complete ({count} harmonizers indexed)')
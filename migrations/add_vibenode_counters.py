@@ -0,0 +1,22 @@
+"""Add denormalized engagement counters to the vibenodes table."""
+from sqlalchemy import inspect, text
+from db_models import engine
+
+COUNTERS = {
+    "likes_count": "SELECT COUNT(*) FROM vibenode_likes WHERE vibenode_id = vibenodes.id",
+    "comments_count": "SELECT COUNT(*) FROM comments WHERE vibenode_id = vibenodes.id",
+    "entangled_count": "SELECT COUNT(*) FROM vibenode_entanglements WHERE source_id = vibenodes.id",
+}
+
+def migrate():
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        cols = {c['name'] for c in inspector.get_columns('vibenodes')}
+        for name, count_sql in COUNTERS.items():
+            if name not in cols:
+                conn.execute(text(f'ALTER TABLE vibenodes ADD COLUMN {name} INTEGER DEFAULT 0'))
+            conn.execute(text(f'UPDATE vibenodes SET {name} = ({count_sql})'))
+
+if __name__ == '__main__':
+    migrate()
+    print('Migration complete')
@@ -0,0 +1,15 @@
+"""Create the vibenode_lineage closure table and backfill it."""
+from db_models import SessionLocal, engine, vibenode_lineage
+from lineage import rebuild_lineage
+
+def migrate():
+    vibenode_lineage.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        return rebuild_lineage(db)
+    finally:
+        db.close()
+
+if __name__ == '__main__':
+    rows = migrate()
+    print(f'Migration complete ({rows} lineage rows)')
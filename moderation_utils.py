@@ -1,15 +1,28 @@
 # RFC_V5_1_INIT
 """Moderation helper stubs."""
 
-from typing import Any
+from typing import Any, Iterator, List, Mapping, Optional, Sequence
 import re
 
+PROFANITY = frozenset({"badword"})
+
+# Numbered or named backreferences change meaning inside a combined regex.
+_BACKREF = re.compile(r"\\[1-9]|\(\?P=")
+_ANCHORS = ("^", "$", "\\A", "\\Z")
+_GROUP_NAME = re.compile(r"\(\?P<(\w+)>")
+
 
 def check_profanity(text: str) -> bool:
     """Return True if profanity detected (stub)."""
-    banned = {"badword"}
-    words = set(text.lower().split())
-    return not banned.isdisjoint(words)
+    return profane_word(text) is not None
+
+
+def profane_word(text: str) -> Optional[str]:
+    """Return the first banned whitespace-separated word in ``text``."""
+    for word in text.lower().split():
+        if word in PROFANITY:
+            return word
+    return None
 
 
 def has_active_consent(user: Any = None) -> bool:
@@ -17,20 +30,114 @@ def has_active_consent(user: Any = None) -> bool:
     return True
 
 
+def event_strings(value: Any) -> Iterator[str]:
+    """Yield every string value nested in an event payload."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, Mapping):
+        for item in value.values():
+            yield from event_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from event_strings(item)
+
+
+class PatternSet:
+    """Regex rules compiled into one alternation with a named group per rule.
+
+    ``search`` makes a single pass over the text whatever the number of
+    rules and returns the index of the rule that matched.  Rules that cannot
+    be embedded (backreferences, global inline flags, clashing group names)
+    are kept as separate regexes.
+    """
+
+    def __init__(self, patterns: Sequence[str], flags: int = re.IGNORECASE):
+        self.patterns = list(patterns)
+        self.anchored = any(tok in p for p in self.patterns for tok in _ANCHORS)
+        combinable: List[int] = []
+        names: set[str] = set()
+        self._separate: List[tuple[int, re.Pattern[str]]] = []
+        for i, pattern in enumerate(self.patterns):
+            own = set(_GROUP_NAME.findall(pattern))
+            try:
+                if _BACKREF.search(pattern) or own & names:
+                    raise re.error("cannot be combined")
+                re.compile(f"(?P<_rule{i}>{pattern})", flags)
+                combinable.append(i)
+                names |= own
+            except re.error:
+                self._separate.append((i, re.compile(pattern, flags)))
+        self._groups = [f"_rule{i}" for i in combinable]
+        self._combined: Optional[re.Pattern[str]] = None
+        if combinable:
+            self._combined = re.compile(
+                "|".join(f"(?P<_rule{i}>{self.patterns[i]})" for i in combinable),
+                flags,
+            )
+
+    def search(self, text: str) -> Optional[int]:
+        """Return the index of a matching rule or ``None``."""
+        if self._combined is not None:
+            m = self._combined.search(text)
+            if m is not None:
+                for name in self._groups:
+                    if m.group(name) is not None:
+                        return int(name[len("_rule") :])
+        for i, pat in self._separate:
+            if pat.search(text):
+                return i
+        return None
+
+
 class Vaccine:
     """Simple text vaccine using regex-based filtering."""
 
     def __init__(self, config: Any):
         """Compile patterns from ``config.VAX_PATTERNS['block']``."""
         block = config.VAX_PATTERNS.get("block", [])
-        self.patterns = [re.compile(p, re.IGNORECASE) for p in block]
+        self.rules = PatternSet(block)
+
+    def match(self, text: str) -> Optional[str]:
+        """Return the rule that blocks ``text`` or ``None`` if it passes."""
+        hit = self.rules.search(text)
+        if hit is not None:
+            return self.rules.patterns[hit]
+        word = profane_word(text)
+        if word is not None:
+            return f"profanity:{word}"
+        return None
 
     def scan(self, text: str) -> bool:
         """Return ``True`` if content passes vaccine checks."""
-        lower = text.lower()
-        for pat in self.patterns:
-            if pat.search(lower):
-                return False
-        if check_profanity(text):
-            return False
-        return True
+        return self.match(text) is None
+
+    def scan_many(self, texts: Sequence[str]) -> Optional[int]:
+        """Return the index of the first blocked text or ``None`` if all pass.
+
+        The texts are scanned as one newline-joined document; only when that
+        fails (or a pattern is anchored) is each text checked on its own, so
+        a match spanning two texts never blocks either of them.
+        """
+        if not self.rules.anchored and self.scan("\n".join(texts)):
+            return None
+        for i, text in enumerate(texts):
+            if not self.scan(text):
+                return i
+        return None
+
+    def scan_event(self, event: Mapping[str, Any]) -> Optional[str]:
+        """Return the rule matched by a single string field of ``event``."""
+        fields = list(event_strings(event))
+        hit = self.scan_many(fields)
+        return None if hit is None else self.match(fields[hit])
+
+    def scan_events(self, events: Sequence[Mapping[str, Any]]) -> Optional[int]:
+        """Return the index of the first blocked event or ``None``."""
+        owners: List[int] = []
+        fields: List[str] = []
+        for n, event in enumerate(events):
+            for text in event_strings(event):
+                owners.append(n)
+                fields.append(text)
+        hit = self.scan_many(fields)
+        return None if hit is None else owners[hit]
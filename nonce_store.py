@@ -0,0 +1,170 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Time-bucketed nonce deduplication.
+
+Nonces are grouped into generations of ``bucket_seconds`` each.  A single
+dict maps a nonce to the generation and time that last saw it, so membership
+checks are one hash lookup that compares against the exact ``ttl``.  A
+generation is dropped whole, inline with inserts, once even its newest nonce
+is older than ``ttl``, which removes the need for a background sweeper
+re-parsing timestamps under the agent lock.
+
+An optional Bloom filter front answers "definitely new" without touching the
+exact map.  It rotates every retention window (a current and a previous
+filter are checked) and can be persisted to disk so it survives restarts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import struct
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+BLOOM_HEADER = struct.Struct(">QQdd")  # bits, hashes, current start, previous start
+
+
+class RotatingBloomFilter:
+    """Pair of Bloom filters that forget entries after one to two windows."""
+
+    def __init__(self, capacity: int, error_rate: float, window: float) -> None:
+        bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.bits = max(8, bits + (-bits % 8))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.window = window
+        self.current = bytearray(self.bits // 8)
+        self.previous = bytearray(self.bits // 8)
+        self.current_start = 0.0
+        self.previous_start = 0.0
+
+    def _positions(self, item: object) -> List[int]:
+        digest = hashlib.blake2b(str(item).encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack(">QQ", digest)
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def _rotate(self, now: float) -> None:
+        if now - self.current_start >= self.window:
+            self.previous, self.current = self.current, bytearray(self.bits // 8)
+            self.previous_start, self.current_start = self.current_start, now
+
+    def add(self, item: str, now: float) -> None:
+        self._rotate(now)
+        for pos in self._positions(item):
+            self.current[pos >> 3] |= 1 << (pos & 7)
+
+    def might_contain(self, item: str) -> bool:
+        positions = self._positions(item)
+        return any(
+            all(bits[p >> 3] & (1 << (p & 7)) for p in positions)
+            for bits in (self.current, self.previous)
+        )
+
+    def save(self, path: str) -> None:
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(
+                BLOOM_HEADER.pack(
+                    self.bits, self.hashes, self.current_start, self.previous_start
+                )
+            )
+            f.write(self.current)
+            f.write(self.previous)
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> bool:
+        """Load a saved filter; returns ``False`` if missing or sized differently."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return False
+        if len(data) < BLOOM_HEADER.size:
+            return False
+        bits, hashes, current_start, previous_start = BLOOM_HEADER.unpack_from(data)
+        size = bits // 8
+        if bits != self.bits or hashes != self.hashes or len(data) != BLOOM_HEADER.size + 2 * size:
+            return False
+        body = data[BLOOM_HEADER.size :]
+        self.current = bytearray(body[:size])
+        self.previous = bytearray(body[size:])
+        self.current_start, self.previous_start = current_start, previous_start
+        return True
+
+
+class NonceStore:
+    """Remember nonces for ``ttl`` seconds using whole-bucket expiry."""
+
+    def __init__(
+        self,
+        ttl: float,
+        bucket_seconds: float,
+        bloom_capacity: int = 0,
+        bloom_error_rate: float = 0.01,
+        bloom_path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.bucket_seconds = max(bucket_seconds, 1e-9)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._seen: Dict[str, Tuple[int, float]] = {}
+        self._generations: Deque[Tuple[int, List[str]]] = deque()
+        self.bloom_path = bloom_path
+        self.bloom: Optional[RotatingBloomFilter] = None
+        if bloom_capacity:
+            self.bloom = RotatingBloomFilter(bloom_capacity, bloom_error_rate, ttl)
+            if bloom_path:
+                self.bloom.load(bloom_path)
+
+    def _expire(self, now: float) -> None:
+        # A generation ends at (bucket + 1) * bucket_seconds; drop it only
+        # once that end is ttl in the past, so no nonce leaves early.
+        cutoff = now - self.ttl
+        while (
+            self._generations
+            and (self._generations[0][0] + 1) * self.bucket_seconds <= cutoff
+        ):
+            bucket, nonces = self._generations.popleft()
+            for nonce in nonces:
+                if self._seen.get(nonce, (None,))[0] == bucket:
+                    del self._seen[nonce]
+
+    def _live(self, nonce: object, now: float) -> bool:
+        seen = self._seen.get(nonce)  # type: ignore[arg-type]
+        return seen is not None and now - seen[1] < self.ttl
+
+    def add(self, nonce: str) -> bool:
+        """Record ``nonce``; return ``True`` if it was not seen within ``ttl``."""
+        now = self._clock()
+        current = int(now // self.bucket_seconds)
+        with self._lock:
+            self._expire(now)
+            if self.bloom is None or self.bloom.might_contain(nonce):
+                if self._live(nonce, now):
+                    return False
+            self._seen[nonce] = (current, now)
+            if not self._generations or self._generations[-1][0] != current:
+                self._generations.append((current, []))
+            self._generations[-1][1].append(nonce)
+            if self.bloom is not None:
+                self.bloom.add(nonce, now)
+            return True
+
+    def __contains__(self, nonce: object) -> bool:
+        now = self._clock()
+        with self._lock:
+            return self._live(nonce, now)
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def save(self) -> None:
+        """Persist the Bloom front when ``bloom_path`` is configured."""
+        if self.bloom is not None and self.bloom_path:
+            with self._lock:
+                self.bloom.save(self.bloom_path)
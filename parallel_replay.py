@@ -0,0 +1,395 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Key-partitioned parallel replay of the event log.
+
+Most events only touch a few users and coins.  The replayer cuts the log into
+segments at *barrier* events (those touching global or cross-universe state,
+such as ``BUY_COIN``, ``CROSS_REMIX`` or ``DAILY_DECAY``), groups the events of
+a segment into connected components of the entity keys they touch and applies
+independent components on a forked process pool.  Each worker runs the
+agent's own ``_apply_*`` handlers against a private slice of the state and
+records every key it reads or writes.
+
+Results are merged only after verification: the read/write sets of the
+components must be pairwise disjoint and no worker may have read a key it
+was not shipped.  Disjoint components commute, so the merged state equals
+sequential replay.  Treasury and karma deltas are re-applied in log order.
+Any conflict or handler error makes the segment replay sequentially instead.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import multiprocessing
+import os
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[str, str]
+KIND_BY_PREFIX = {
+    "user": "users",
+    "coin": "coins",
+    "proposal": "proposals",
+    "listing": "marketplace_listings",
+}
+PREFIX_BY_KIND = {kind: prefix for prefix, kind in KIND_BY_PREFIX.items()}
+MIN_PARALLEL_EVENTS = 1000
+SEGMENT_MAX_EVENTS = 50_000
+
+# Agent inherited by forked workers; set only while a pool is alive.
+_FORK_AGENT: Any = None
+
+
+class _SubsetStorage:
+    """Dict storage over a slice of the state that records accessed keys."""
+
+    def __init__(self, subset: Dict[str, Dict[str, Any]]) -> None:
+        self.users = subset.get("users", {})
+        self.coins = subset.get("coins", {})
+        self.proposals = subset.get("proposals", {})
+        self.marketplace_listings = subset.get("marketplace_listings", {})
+        self.reads: Set[Key] = set()
+        self.writes: Set[Key] = set()
+        self.global_read = False
+
+    def _get(self, kind: str, key: str) -> Any:
+        self.reads.add((PREFIX_BY_KIND[kind], key))
+        return getattr(self, kind).get(key)
+
+    def _set(self, kind: str, key: str, data: Any) -> None:
+        self.writes.add((PREFIX_BY_KIND[kind], key))
+        getattr(self, kind)[key] = data
+
+    def _delete(self, kind: str, key: str) -> None:
+        self.writes.add((PREFIX_BY_KIND[kind], key))
+        getattr(self, kind).pop(key, None)
+
+    def get_user(self, name):
+        return self._get("users", name)
+
+    def set_user(self, name, data):
+        self._set("users", name, data)
+
+    def delete_user(self, name):
+        self._delete("users", name)
+
+    def get_coin(self, coin_id):
+        return self._get("coins", coin_id)
+
+    def set_coin(self, coin_id, data):
+        self._set("coins", coin_id, data)
+
+    def delete_coin(self, coin_id):
+        self._delete("coins", coin_id)
+
+    def get_proposal(self, proposal_id):
+        return self._get("proposals", proposal_id)
+
+    def set_proposal(self, proposal_id, data):
+        self._set("proposals", proposal_id, data)
+
+    def get_marketplace_listing(self, listing_id):
+        return self._get("marketplace_listings", listing_id)
+
+    def set_marketplace_listing(self, listing_id, data):
+        self._set("marketplace_listings", listing_id, data)
+
+    def delete_marketplace_listing(self, listing_id):
+        self._delete("marketplace_listings", listing_id)
+
+    def get_all_users(self):
+        self.global_read = True
+        return list(self.users.values())
+
+    @contextmanager
+    def transaction(self):
+        backup_users = copy.deepcopy(self.users)
+        backup_coins = copy.deepcopy(self.coins)
+        try:
+            yield
+        except Exception:
+            self.users = backup_users
+            self.coins = backup_coins
+            raise
+
+    @contextmanager
+    def unit_of_work(self):
+        yield
+
+    def written(self) -> Dict[Key, Any]:
+        return {
+            (prefix, key): getattr(self, KIND_BY_PREFIX[prefix]).get(key)
+            for prefix, key in self.writes
+        }
+
+
+def _replay_bucket(
+    task: Tuple[List[Tuple[int, Dict[str, Any]]], Dict[str, Dict[str, Any]]]
+) -> Tuple[Set[Key], Dict[Key, Any], bool, List[Tuple[int, Decimal, Decimal]]]:
+    """Worker entry point: apply ``events`` to a private state slice."""
+    events, subset = task
+    agent = _FORK_AGENT
+    storage = _SubsetStorage(subset)
+    agent.storage = storage
+    agent.lock = threading.RLock()
+    deltas = []
+    for seq, event in events:
+        agent.treasury = Decimal("0")
+        agent.total_system_karma = Decimal("0")
+        agent._apply_event(event)
+        if agent.treasury or agent.total_system_karma:
+            deltas.append((seq, agent.treasury, agent.total_system_karma))
+    return storage.reads, storage.written(), storage.global_read, deltas
+
+
+class _DisjointSets:
+    def __init__(self) -> None:
+        self.parent: Dict[Key, Key] = {}
+
+    def find(self, key: Key) -> Key:
+        parent = self.parent.setdefault(key, key)
+        while parent != key:
+            grand = self.parent[parent]
+            self.parent[key] = grand
+            key, parent = parent, grand
+        return key
+
+    def union(self, keys: Iterable[Key]) -> Key:
+        keys = iter(keys)
+        root = self.find(next(keys))
+        for key in keys:
+            other = self.find(key)
+            if other != root:
+                self.parent[other] = root
+        return root
+
+
+class ParallelReplayer:
+    """Replay logged events for ``agent`` across a process pool."""
+
+    def __init__(self, agent: Any, workers: Optional[int] = None) -> None:
+        self.agent = agent
+        self.workers = workers or int(os.environ.get("REPLAY_WORKERS", os.cpu_count() or 1))
+        self._pool = None
+        self._root_owner: Dict[str, str] = {}
+        self._creator: Dict[str, str] = {}
+        self.stats = {"parallel": 0, "sequential": 0, "fallbacks": 0}
+
+    # ------------------------------------------------------------------
+    # Key resolution
+    def _index_state(self) -> None:
+        state = self.agent.storage.snapshot_source()
+        for name, user in state["users"].items():
+            root = user.get("root_coin_id")
+            if root:
+                self._root_owner[root] = name
+        for coin_id, coin in state["coins"].items():
+            if coin.get("creator"):
+                self._creator[coin_id] = coin["creator"]
+
+    def _coin_key(self, coin_id: str) -> Key:
+        # Root coins are only reached through their user, so they share its key.
+        owner = self._root_owner.get(coin_id)
+        return ("user", owner) if owner is not None else ("coin", coin_id)
+
+    def event_keys(self, event: Dict[str, Any]) -> Optional[Set[Key]]:
+        """Return the entity keys ``event`` touches or ``None`` for barriers."""
+        kind = event.get("event")
+        try:
+            if kind == "ADD_USER":
+                return {("user", event["user"])}
+            if kind == "MINT":
+                return {
+                    ("user", event["user"]),
+                    self._coin_key(event["root_coin_id"]),
+                    self._coin_key(event["coin_id"]),
+                }
+            if kind == "REACT":
+                creator = self._creator.get(event["coin_id"])
+                if creator is None:
+                    return None
+                return {
+                    ("user", event["reactor"]),
+                    ("user", creator),
+                    self._coin_key(event["coin_id"]),
+                }
+            if kind == "LIST_COIN_FOR_SALE":
+                return {("listing", event["listing_id"]), self._coin_key(event["coin_id"])}
+            if kind == "VOTE_PROPOSAL":
+                return {("proposal", event["proposal_id"])}
+            if kind in ("STAKE_KARMA", "UNSTAKE_KARMA", "REVOKE_CONSENT"):
+                return {("user", event["user"])}
+        except KeyError:
+            return None
+        return None
+
+    def _note_created(self, event: Dict[str, Any]) -> None:
+        if event.get("event") in ("MINT", "CROSS_REMIX") and event.get("coin_id"):
+            self._creator.setdefault(event["coin_id"], event.get("user"))
+
+    # ------------------------------------------------------------------
+    # Replay
+    def replay(self, start_seq: Optional[int] = None, since: Any = None) -> int:
+        """Replay the log tail and return the number of applied events."""
+        self._index_state()
+        count = 0
+        segment: List[Tuple[int, Dict[str, Any]]] = []
+        try:
+            for record in self.agent.logchain.iter_records(start_seq=start_seq, since=since):
+                event = record.event
+                keys = self.event_keys(event)
+                if keys is None:
+                    self._flush(segment)
+                    segment = []
+                    self.agent._apply_event(event)
+                    self.stats["sequential"] += 1
+                    if event.get("event") == "EXECUTE_PROPOSAL":
+                        self._close_pool()  # workers must see the new policy
+                else:
+                    segment.append((record.seq, event))
+                    if len(segment) >= SEGMENT_MAX_EVENTS:
+                        self._flush(segment)
+                        segment = []
+                self._note_created(event)
+                count += 1
+            self._flush(segment)
+        finally:
+            self._close_pool()
+        return count
+
+    def _apply_sequential(self, segment: List[Tuple[int, Dict[str, Any]]]) -> None:
+        for _, event in segment:
+            self.agent._apply_event(event)
+        self.stats["sequential"] += len(segment)
+
+    def _flush(self, segment: List[Tuple[int, Dict[str, Any]]]) -> None:
+        if not segment:
+            return
+        if self.workers < 2 or len(segment) < MIN_PARALLEL_EVENTS:
+            self._apply_sequential(segment)
+            return
+        try:
+            applied = self._apply_parallel(segment)
+        except Exception as exc:
+            logger.warning("Parallel replay failed (%s); replaying segment sequentially", exc)
+            applied = False
+        if not applied:
+            self.stats["fallbacks"] += 1
+            self._apply_sequential(segment)
+
+    def _buckets(
+        self, segment: List[Tuple[int, Dict[str, Any]]]
+    ) -> List[Tuple[List[Tuple[int, Dict[str, Any]]], Set[Key]]]:
+        sets = _DisjointSets()
+        for _, event in segment:
+            sets.union(self.event_keys(event))
+        components: Dict[Key, Tuple[List[Tuple[int, Dict[str, Any]]], Set[Key]]] = {}
+        for item in segment:
+            keys = self.event_keys(item[1])
+            events, comp_keys = components.setdefault(sets.find(next(iter(keys))), ([], set()))
+            events.append(item)
+            comp_keys.update(keys)
+        # Largest-first bin packing keeps the workers evenly loaded.
+        buckets: List[Tuple[List[Tuple[int, Dict[str, Any]]], Set[Key]]] = [
+            ([], set()) for _ in range(min(self.workers, len(components)))
+        ]
+        for events, keys in sorted(components.values(), key=lambda c: -len(c[0])):
+            events_b, keys_b = min(buckets, key=lambda b: len(b[0]))
+            events_b.extend(events)
+            keys_b.update(keys)
+        for events, _ in buckets:
+            events.sort(key=lambda item: item[0])
+        return buckets
+
+    def _subset(self, keys: Set[Key], state: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        subset: Dict[str, Dict[str, Any]] = {kind: {} for kind in KIND_BY_PREFIX.values()}
+        for prefix, key in keys:
+            kind = KIND_BY_PREFIX[prefix]
+            if key in state[kind]:
+                # get_user brings lazily decayed karma up to date first.
+                subset[kind][key] = (
+                    self.agent.storage.get_user(key)
+                    if kind == "users"
+                    else state[kind][key]
+                )
+            if prefix == "user" and key in state["users"]:
+                root = state["users"][key].get("root_coin_id")
+                if root in state["coins"]:
+                    subset["coins"][root] = state["coins"][root]
+        return subset
+
+    def _apply_parallel(self, segment: List[Tuple[int, Dict[str, Any]]]) -> bool:
+        state = self.agent.storage.snapshot_source()
+        buckets = self._buckets(segment)
+        tasks = [(events, self._subset(keys, state)) for events, keys in buckets]
+        results = self._get_pool().map(_replay_bucket, tasks)
+
+        claimed: Dict[Key, int] = {}
+        for i, ((reads, written, global_read, _), (_, subset)) in enumerate(zip(results, tasks)):
+            if global_read:
+                return False
+            for key in reads | set(written):
+                if claimed.setdefault(key, i) != i:
+                    return False
+                prefix, name = key
+                kind = KIND_BY_PREFIX[prefix]
+                if name in state[kind] and name not in subset[kind]:
+                    return False
+
+        # Resolve every mutation before applying any, so a failure here still
+        # leaves the state untouched for the sequential fallback.
+        storage = self.agent.storage
+        methods = {
+            "user": ("set_user", "delete_user"),
+            "coin": ("set_coin", "delete_coin"),
+            "proposal": ("set_proposal", None),
+            "listing": ("set_marketplace_listing", "delete_marketplace_listing"),
+        }
+        writes = []
+        for _, written, _, _ in results:
+            for (prefix, name), data in written.items():
+                setter, deleter = methods[prefix]
+                if data is None and deleter is not None:
+                    writes.append((getattr(storage, deleter), (name,)))
+                elif data is not None:
+                    writes.append((getattr(storage, setter), (name, data)))
+        for method, args in writes:
+            method(*args)
+        deltas = sorted(d for result in results for d in result[3])
+        for _, treasury, karma in deltas:
+            self.agent.treasury += treasury
+            self.agent.total_system_karma += karma
+        self.stats["parallel"] += len(segment)
+        return True
+
+    def _get_pool(self) -> Any:
+        global _FORK_AGENT
+        if self._pool is None:
+            # Workers inherit the agent (handlers, config, domain classes) by fork.
+            try:
+                context = multiprocessing.get_context("fork")
+            except ValueError:  # pragma: no cover - platforms without fork
+                self.workers = 1
+                raise
+            _FORK_AGENT = self.agent
+            self._pool = context.Pool(self.workers)
+        return self._pool
+
+    def _close_pool(self) -> None:
+        global _FORK_AGENT
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        _FORK_AGENT = None
+
+
+def replay_log(agent: Any, start_seq: Optional[int] = None, since: Any = None) -> int:
+    """Replay ``agent.logchain`` into ``agent`` using :class:`ParallelReplayer`."""
+    return ParallelReplayer(agent).replay(start_seq=start_seq, since=since)
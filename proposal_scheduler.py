@@ -0,0 +1,128 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Deadline heap for the proposal lifecycle.
+
+Open proposals are due at their ``voting_deadline`` and approved ones at
+their ``execution_time``.  ``ProposalScheduler`` keeps those instants in a
+min-heap (stale entries are skipped lazily), so the lifecycle task sleeps
+until the earliest deadline and only touches proposals that are actually
+due.  Scheduling an earlier deadline wakes a sleeping task immediately.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import heapq
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+ACTIVE_PROPOSAL_STATUSES = ("open", "approved")
+
+
+def deadline_timestamp(value: Any) -> Optional[float]:
+    """Convert an ISO string or ``datetime`` (naive means UTC) to epoch seconds."""
+    if not value:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+def proposal_due(proposal: Dict[str, Any]) -> Optional[float]:
+    """Return when ``proposal`` next needs lifecycle processing, if ever."""
+    status = proposal.get("status")
+    if status == "open":
+        return deadline_timestamp(proposal.get("voting_deadline"))
+    if status == "approved":
+        return deadline_timestamp(proposal.get("execution_time"))
+    return None
+
+
+class ProposalScheduler:
+    """Min-heap of proposal deadlines with lazy invalidation."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[float, str]] = []
+        self._due: Dict[str, float] = {}
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def schedule(self, proposal_id: str, when: Any) -> None:
+        """(Re)schedule ``proposal_id`` at ``when``; ``None`` unschedules it."""
+        due = deadline_timestamp(when)
+        if due is None:
+            self.discard(proposal_id)
+            return
+        with self._lock:
+            self._due[proposal_id] = due
+            heapq.heappush(self._heap, (due, proposal_id))
+            self._prune()
+            waiters = list(self._waiters) if self._heap[0] == (due, proposal_id) else []
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def schedule_proposal(self, proposal: Dict[str, Any]) -> None:
+        self.schedule(proposal["proposal_id"], proposal_due(proposal))
+
+    def discard(self, proposal_id: str) -> None:
+        with self._lock:
+            self._due.pop(proposal_id, None)
+
+    def rebuild(self, proposals: Iterable[Dict[str, Any]]) -> None:
+        """Replace the schedule with the deadlines of ``proposals``."""
+        with self._lock:
+            self._heap = []
+            self._due = {}
+        for proposal in proposals:
+            self.schedule_proposal(proposal)
+
+    def _prune(self) -> None:
+        heap = self._heap
+        while heap and self._due.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def next_due(self) -> Optional[float]:
+        with self._lock:
+            self._prune()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """Remove and return the ids of proposals due at or before ``now``."""
+        now = time.time() if now is None else now
+        due: List[str] = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                when, proposal_id = heapq.heappop(heap)
+                if self._due.get(proposal_id) == when:
+                    del self._due[proposal_id]
+                    due.append(proposal_id)
+        return due
+
+    async def wait(self, max_wait: Optional[float] = None) -> None:
+        """Sleep until the next deadline, a new earlier deadline, or ``max_wait``."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            due = self.next_due()
+            delay = None if due is None else max(0.0, due - time.time())
+            if max_wait is not None:
+                delay = max_wait if delay is None else min(delay, max_wait)
+            try:
+                await asyncio.wait_for(waiter[1].wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
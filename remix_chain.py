@@ -0,0 +1,360 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Single-writer appender for the ``log_chain`` table with Merkle checkpoints.
+
+Appending used to read the newest ``LogEntry`` to learn ``previous_hash`` and
+then insert, so two concurrent remixes could chain onto the same parent.
+:class:`ChainAppender` serializes appends through one writer thread that
+keeps the chain head in memory.  Whatever is queued when the writer wakes
+is written in a single transaction.
+
+Every ``checkpoint_every`` entries the writer also stores a
+:class:`~db_models.LogCheckpoint` holding the Merkle root of that window and
+the root of the checkpoint before it.  Checking an entry therefore needs its
+own hash, its predecessor, and an O(log n) Merkle path to a stored root,
+rather than a rehash of the chain from genesis.  Entries newer than the last
+checkpoint are only checked by hash linkage.
+
+``previous_hash`` is unique, so an entry can only extend the real head.
+When another process appended first, the insert fails; the writer then
+reloads the head and retries the batch up to ``retries`` times.  Any other
+failure also reloads the head before the next batch.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import datetime
+import hashlib
+import logging
+import queue
+import threading
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+try:
+    from sqlalchemy.exc import IntegrityError
+except ImportError:  # pragma: no cover - optional dependency
+    IntegrityError = None
+
+from db_models import LogCheckpoint, LogEntry
+
+logger = logging.getLogger(__name__)
+
+GENESIS_HASH = ""
+GENESIS_ROOT = ""
+_RESET = object()
+
+
+# ----------------------------------------------------------------------
+# Merkle helpers (leaves are the hex ``current_hash`` values)
+def _leaf(entry_hash: str) -> bytes:
+    return hashlib.sha256(b"\x00" + entry_hash.encode("ascii")).digest()
+
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _levels(hashes: Sequence[str]) -> List[List[bytes]]:
+    level = [_leaf(h) for h in hashes]
+    levels = [level]
+    while len(level) > 1:
+        level = [
+            _node(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+        levels.append(level)
+    return levels
+
+
+def merkle_root(hashes: Sequence[str]) -> str:
+    """Return the hex Merkle root over ``hashes``; an odd node is carried up."""
+    if not hashes:
+        return GENESIS_ROOT
+    return _levels(hashes)[-1][0].hex()
+
+
+def merkle_proof(hashes: Sequence[str], index: int) -> List[Tuple[str, str]]:
+    """Return the ``(side, sibling)`` path from ``hashes[index]`` to the root."""
+    proof = []
+    for level in _levels(hashes)[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(("left" if sibling < index else "right", level[sibling].hex()))
+        index //= 2
+    return proof
+
+
+def verify_proof(entry_hash: str, proof: Sequence[Tuple[str, str]], root: str) -> bool:
+    """Return whether ``proof`` links ``entry_hash`` to ``root``."""
+    node = _leaf(entry_hash)
+    for side, sibling in proof:
+        other = bytes.fromhex(sibling)
+        node = _node(other, node) if side == "left" else _node(node, other)
+    return node.hex() == root
+
+
+# ----------------------------------------------------------------------
+# Verification
+def _checkpoint_for(db, entry_id: int) -> Optional[LogCheckpoint]:
+    return (
+        db.query(LogCheckpoint)
+        .filter(LogCheckpoint.first_entry_id <= entry_id)
+        .filter(LogCheckpoint.last_entry_id >= entry_id)
+        .first()
+    )
+
+
+def _window_hashes(db, checkpoint: LogCheckpoint) -> List[Tuple[int, str]]:
+    return (
+        db.query(LogEntry.id, LogEntry.current_hash)
+        .filter(LogEntry.id >= checkpoint.first_entry_id)
+        .filter(LogEntry.id <= checkpoint.last_entry_id)
+        .order_by(LogEntry.id)
+        .all()
+    )
+
+
+def entry_proof(db, entry_id: int) -> Optional[dict]:
+    """Return the Merkle proof of ``entry_id`` against its checkpoint.
+
+    ``None`` means the entry is newer than the last checkpoint.
+    """
+    checkpoint = _checkpoint_for(db, entry_id)
+    if checkpoint is None:
+        return None
+    window = _window_hashes(db, checkpoint)
+    ids = [row[0] for row in window]
+    if entry_id not in ids:
+        return None
+    return {
+        "checkpoint_id": checkpoint.id,
+        "merkle_root": checkpoint.merkle_root,
+        "entry_hash": window[ids.index(entry_id)][1],
+        "proof": merkle_proof([row[1] for row in window], ids.index(entry_id)),
+    }
+
+
+def verify_entry(db, entry: LogEntry) -> bool:
+    """Check one entry's hash, its link to its predecessor and its checkpoint."""
+    if entry.compute_hash() != entry.current_hash:
+        return False
+    previous = (
+        db.query(LogEntry.current_hash)
+        .filter(LogEntry.id < entry.id)
+        .order_by(LogEntry.id.desc())
+        .first()
+    )
+    if entry.previous_hash != (previous[0] if previous else GENESIS_HASH):
+        return False
+    proof = entry_proof(db, entry.id)
+    if proof is None:
+        return _checkpoint_for(db, entry.id) is None
+    return proof["entry_hash"] == entry.current_hash and verify_proof(
+        entry.current_hash, proof["proof"], proof["merkle_root"]
+    )
+
+
+def verify_range(db, first_id: int, last_id: int) -> bool:
+    """Check entries ``first_id``..``last_id`` and the checkpoints covering them."""
+    entries = (
+        db.query(LogEntry)
+        .filter(LogEntry.id >= first_id)
+        .filter(LogEntry.id <= last_id)
+        .order_by(LogEntry.id)
+        .all()
+    )
+    if not entries:
+        return True
+    if not verify_entry(db, entries[0]):
+        return False
+    for prev, entry in zip(entries, entries[1:]):
+        if entry.previous_hash != prev.current_hash:
+            return False
+        if entry.compute_hash() != entry.current_hash:
+            return False
+    checkpoints = (
+        db.query(LogCheckpoint)
+        .filter(LogCheckpoint.last_entry_id >= first_id)
+        .filter(LogCheckpoint.first_entry_id <= last_id)
+        .order_by(LogCheckpoint.first_entry_id)
+        .all()
+    )
+    for prev, checkpoint in zip([None] + checkpoints, checkpoints):
+        if prev is not None and checkpoint.previous_root != prev.merkle_root:
+            return False
+        window = [row[1] for row in _window_hashes(db, checkpoint)]
+        if merkle_root(window) != checkpoint.merkle_root:
+            return False
+    return True
+
+
+# ----------------------------------------------------------------------
+# Writer
+class ChainAppender:
+    """Append ``LogEntry`` rows through one writer thread.
+
+    ``session_factory`` returns a new session; ``batch_size`` caps the
+    entries written per transaction and ``checkpoint_every`` is the Merkle
+    window size (``0`` disables checkpoints).  ``retries`` bounds the
+    attempts after losing the head to another writer.  The writer thread
+    starts on the first append.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        checkpoint_every: int = 1024,
+        batch_size: int = 256,
+        retries: int = 3,
+    ) -> None:
+        self.session_factory = session_factory
+        self.checkpoint_every = checkpoint_every
+        self.batch_size = max(1, batch_size)
+        self.retries = max(0, retries)
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loaded = False
+        self._head = GENESIS_HASH
+        self._root = GENESIS_ROOT
+        self._leaves: List[Tuple[int, str]] = []
+
+    def append(self, event_type: str, payload: str) -> "concurrent.futures.Future[Tuple[int, str]]":
+        """Queue an entry; the future resolves to ``(id, current_hash)``."""
+        future: "concurrent.futures.Future[Tuple[int, str]]" = concurrent.futures.Future()
+        self._ensure_started()
+        self._queue.put((event_type, payload, datetime.datetime.utcnow(), future))
+        return future
+
+    def record(self, event_type: str, payload: str, timeout: Optional[float] = 30.0) -> Tuple[int, str]:
+        """Append and wait until the entry is committed."""
+        return self.append(event_type, payload).result(timeout)
+
+    def reset(self) -> None:
+        """Forget the cached head, e.g. after the database was swapped."""
+        if self._thread is None:
+            self._loaded = False
+        else:
+            self._queue.put(_RESET)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+            self._thread = None
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="remix-chain", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            items = [self._queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            batch = []
+            for item in items:
+                if item is None:
+                    stop = True
+                elif item is _RESET:
+                    self._write(batch)
+                    batch = []
+                    self._loaded = False
+                else:
+                    batch.append(item)
+            self._write(batch)
+
+    def _load(self, db) -> None:
+        last = db.query(LogEntry).order_by(LogEntry.id.desc()).first()
+        self._head = last.current_hash if last else GENESIS_HASH
+        checkpoint = db.query(LogCheckpoint).order_by(LogCheckpoint.last_entry_id.desc()).first()
+        self._root = checkpoint.merkle_root if checkpoint else GENESIS_ROOT
+        after = checkpoint.last_entry_id if checkpoint else 0
+        self._leaves = [
+            (row[0], row[1])
+            for row in db.query(LogEntry.id, LogEntry.current_hash)
+            .filter(LogEntry.id > after)
+            .order_by(LogEntry.id)
+            .all()
+        ]
+        self._loaded = True
+
+    def _write(self, batch: List[Any]) -> None:
+        if not batch:
+            return
+        attempt = 0
+        while True:
+            try:
+                head, root, leaves, written = self._commit(batch)
+                break
+            except Exception as exc:
+                self._loaded = False
+                conflict = IntegrityError is not None and isinstance(exc, IntegrityError)
+                if conflict and attempt < self.retries:
+                    attempt += 1
+                    logger.warning("Remix chain head moved; retrying (%d)", attempt)
+                    continue
+                logger.exception("Remix chain append failed")
+                for *_, future in batch:
+                    future.set_exception(exc)
+                return
+        self._head, self._root, self._leaves = head, root, leaves
+        for (*_, future), result in zip(batch, written):
+            future.set_result(result)
+
+    def _commit(self, batch: List[Any]) -> Tuple[str, str, List[Tuple[int, str]], List[Any]]:
+        """Write ``batch`` onto the cached head; return the new head state."""
+        db = self.session_factory()
+        try:
+            if not self._loaded:
+                self._load(db)
+            head = self._head
+            entries = []
+            for event_type, payload, timestamp, _ in batch:
+                entry = LogEntry(
+                    timestamp=timestamp,
+                    event_type=event_type,
+                    payload=payload,
+                    previous_hash=head,
+                    current_hash="",
+                )
+                entry.current_hash = entry.compute_hash()
+                head = entry.current_hash
+                db.add(entry)
+                entries.append(entry)
+            db.flush()
+            written = [(entry.id, entry.current_hash) for entry in entries]
+            leaves = self._leaves + written
+            root = self._root
+            size = self.checkpoint_every
+            while size > 0 and len(leaves) >= size:
+                window, leaves = leaves[:size], leaves[size:]
+                checkpoint_root = merkle_root([h for _, h in window])
+                db.add(
+                    LogCheckpoint(
+                        first_entry_id=window[0][0],
+                        last_entry_id=window[-1][0],
+                        entry_count=len(window),
+                        merkle_root=checkpoint_root,
+                        previous_root=root,
+                    )
+                )
+                root = checkpoint_root
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        return head, root, leaves, written
@@ -0,0 +1,165 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Incremental binary snapshots for :class:`agent_core.RemixAgent` state.
+
+A snapshot is a directory holding a ``manifest.json`` plus an ordered list
+of zlib-compressed chunk files.  Each chunk only contains the entities that
+changed since the previous checkpoint (or a tombstone for deleted ones), so
+checkpoints cost time proportional to the delta rather than the universe.
+Restores merge the chunks in order and hand the result to the storage in one
+bulk call.  Once the chain of deltas grows past ``max_chunks`` the next
+checkpoint writes a full base chunk and drops the older files.
+
+Chunk layout (after decompression) is a sequence of frames::
+
+    >BHI  kind, key length, value length (0xFFFFFFFF marks a tombstone)
+    key   UTF-8 bytes
+    value canonical JSON bytes
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SNAPSHOT_KINDS: Tuple[str, ...] = ("users", "coins", "proposals", "marketplace_listings")
+CHUNK_MAGIC = b"SNC1"
+FRAME_HEADER = struct.Struct(">BHI")
+TOMBSTONE = 0xFFFFFFFF
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+EntityState = Dict[str, Dict[str, Optional[Dict[str, Any]]]]
+
+
+def encode_chunk(entities: EntityState) -> bytes:
+    """Serialize ``{kind: {key: value or None}}`` to a compressed chunk."""
+    frames: List[bytes] = []
+    for kind_id, kind in enumerate(SNAPSHOT_KINDS):
+        for key, value in entities.get(kind, {}).items():
+            key_bytes = str(key).encode("utf-8")
+            if value is None:
+                frames.append(FRAME_HEADER.pack(kind_id, len(key_bytes), TOMBSTONE))
+                frames.append(key_bytes)
+                continue
+            body = json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+            frames.append(FRAME_HEADER.pack(kind_id, len(key_bytes), len(body)))
+            frames.append(key_bytes)
+            frames.append(body)
+    return CHUNK_MAGIC + zlib.compress(b"".join(frames), 1)
+
+
+def decode_chunk(blob: bytes, into: Optional[EntityState] = None) -> EntityState:
+    """Merge the frames of ``blob`` into ``into`` (deletes drop the key)."""
+    if not blob.startswith(CHUNK_MAGIC):
+        raise ValueError("Not a snapshot chunk")
+    state = into if into is not None else {kind: {} for kind in SNAPSHOT_KINDS}
+    data = zlib.decompress(blob[len(CHUNK_MAGIC) :])
+    view = memoryview(data)
+    pos = 0
+    while pos < len(data):
+        kind_id, key_len, value_len = FRAME_HEADER.unpack_from(data, pos)
+        pos += FRAME_HEADER.size
+        key = bytes(view[pos : pos + key_len]).decode("utf-8")
+        pos += key_len
+        bucket = state.setdefault(SNAPSHOT_KINDS[kind_id], {})
+        if value_len == TOMBSTONE:
+            bucket.pop(key, None)
+            continue
+        bucket[key] = json.loads(view[pos : pos + value_len].tobytes())
+        pos += value_len
+    return state
+
+
+class IncrementalSnapshotStore:
+    """Manifest plus delta chunks stored under ``directory``."""
+
+    def __init__(self, directory: str, max_chunks: int = 32) -> None:
+        self.directory = directory
+        self.max_chunks = max_chunks
+        self._lock = threading.Lock()
+        self._manifest: Optional[Dict[str, Any]] = None
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.manifest_path)
+
+    def read_manifest(self) -> Optional[Dict[str, Any]]:
+        if self._manifest is None and self.exists():
+            with open(self.manifest_path, "r") as f:
+                self._manifest = json.load(f)
+        return self._manifest
+
+    def needs_base(self) -> bool:
+        """Return ``True`` when the next checkpoint should be a full chunk."""
+        manifest = self.read_manifest()
+        return manifest is None or len(manifest.get("chunks", [])) >= self.max_chunks
+
+    def _write_atomic(self, name: str, data: bytes) -> None:
+        path = os.path.join(self.directory, name)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def write(self, blob: bytes, meta: Dict[str, Any], base: bool = False) -> str:
+        """Persist an encoded chunk and return its file name.
+
+        ``base`` chunks hold the full state and replace every earlier chunk.
+        ``meta`` (timestamp, log position, counters) replaces the manifest's
+        metadata.
+        """
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            manifest = self.read_manifest() or {"chunks": [], "next_chunk": 1}
+            stale: List[str] = manifest["chunks"] if base else []
+            number = manifest.get("next_chunk", 1)
+            name = f"{number:08d}.chunk"
+            self._write_atomic(name, blob)
+            manifest = {
+                **meta,
+                "version": MANIFEST_VERSION,
+                "chunks": [name] if base else manifest["chunks"] + [name],
+                "next_chunk": number + 1,
+            }
+            self._write_atomic(
+                MANIFEST_NAME, json.dumps(manifest, default=str).encode("utf-8")
+            )
+            self._manifest = manifest
+            for old in stale:
+                try:
+                    os.remove(os.path.join(self.directory, old))
+                except FileNotFoundError:
+                    pass
+            return name
+
+    def load(self) -> Tuple[Dict[str, Any], EntityState]:
+        """Return ``(manifest, {kind: {key: value}})`` merged over all chunks."""
+        manifest = self.read_manifest()
+        if manifest is None:
+            raise FileNotFoundError(self.manifest_path)
+        state: EntityState = {kind: {} for kind in SNAPSHOT_KINDS}
+        for name in manifest.get("chunks", []):
+            with open(os.path.join(self.directory, name), "rb") as f:
+                decode_chunk(f.read(), state)
+        return manifest, state
+
+
+def collect_entities(
+    source: Dict[str, Dict[str, Any]], keys: Optional[Dict[str, Iterable[str]]] = None
+) -> EntityState:
+    """Pick ``keys`` (or everything) out of ``source``; missing keys become tombstones."""
+    if keys is None:
+        return {kind: dict(source.get(kind, {})) for kind in SNAPSHOT_KINDS}
+    return {
+        kind: {key: source.get(kind, {}).get(key) for key in keys.get(kind, ())}
+        for kind in SNAPSHOT_KINDS
+    }
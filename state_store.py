@@ -0,0 +1,369 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Write-coalescing cache in front of the ``system_state`` table.
+
+``SystemStateService.set_state`` used to commit a row per call.  A
+:class:`StateStore` keeps values in process and stages writes instead.  A
+flusher thread writes everything staged every ``flush_interval`` seconds,
+or sooner when :meth:`StateStore.flush` is called.  Each flush locks the
+affected rows, writes them and commits once.  Repeated writes to a hot key
+between flushes collapse into one row update.
+
+* :meth:`~StateStore.increment` stages a delta rather than a value.  The
+  delta is added to the row's current value under the row lock, so
+  increments from several workers all land.
+* Every row carries a ``version`` bumped on each write.
+  :meth:`~StateStore.compare_and_set` writes through immediately, and only
+  if the version is still the one the caller read.
+* After a flush the written keys are published on a Redis channel when the
+  backend supports pub/sub, and other workers drop them from their cache.
+  Without Redis, cached entries still expire after ``cache_ttl`` seconds.
+
+Staged writes live in memory until flushed.  A crash can lose up to
+``flush_interval`` seconds of them, and readers that query ``system_state``
+directly can lag by the same amount.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import threading
+import time
+import uuid
+import weakref
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from sqlalchemy.exc import IntegrityError
+    from sqlalchemy.orm import sessionmaker
+except ImportError:  # pragma: no cover - optional dependency
+    IntegrityError = sessionmaker = None
+
+from db_models import SystemState
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "system_state:invalidate"
+
+
+class StateStore:
+    """Cached, coalesced access to ``SystemState`` rows.
+
+    ``session_factory`` returns a new session.  ``backend`` is a callable
+    returning a Redis-like client (or ``None``) for cross-worker
+    invalidation.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        flush_interval: float = 1.0,
+        cache_ttl: float = 5.0,
+        backend: Optional[Callable[[], Any]] = None,
+        channel: str = INVALIDATION_CHANNEL,
+    ) -> None:
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.cache_ttl = cache_ttl
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._backend = backend
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._cache: Dict[str, Tuple[Optional[str], int, float]] = {}
+        self._pending: Dict[str, str] = {}
+        self._deltas: Dict[str, Tuple[Decimal, str]] = {}
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._listener: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    def _load(self, key: str) -> Tuple[Optional[str], int]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[2] > time.monotonic():
+                return entry[0], entry[1]
+        self._ensure_listener()
+        db = self.session_factory()
+        try:
+            row = db.query(SystemState).filter(SystemState.key == key).first()
+            value, version = (row.value, row.version or 0) if row else (None, 0)
+        finally:
+            db.close()
+        with self._lock:
+            self._cache[key] = (value, version, time.monotonic() + self.cache_ttl)
+        return value, version
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Return the value of ``key`` including staged writes."""
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+        value, _ = self._load(key)
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            if key in self._deltas:
+                delta, delta_default = self._deltas[key]
+                base = value if value is not None else delta_default
+                return str(Decimal(base) + delta)
+        return value if value is not None else default
+
+    def get_versioned(self, key: str) -> Tuple[Optional[str], int]:
+        """Return ``(value, version)`` as stored, flushing staged writes first."""
+        with self._lock:
+            staged = key in self._pending or key in self._deltas
+        if staged:
+            self.flush()
+        return self._load(key)
+
+    # ------------------------------------------------------------------
+    # Writes
+    def set(self, key: str, value: str) -> None:
+        """Stage ``value`` for ``key``; it replaces any staged delta."""
+        with self._lock:
+            self._pending[key] = value
+            self._deltas.pop(key, None)
+        self._ensure_flusher()
+
+    def increment(self, key: str, delta: Any, default: str = "0") -> str:
+        """Stage ``key += delta`` and return the value this process now sees."""
+        delta = Decimal(str(delta))
+        Decimal(self.get(key, default))  # refuse non-numeric values before staging
+        with self._lock:
+            if key in self._pending:
+                value = str(Decimal(self._pending[key]) + delta)
+                self._pending[key] = value
+                return value
+            staged, _ = self._deltas.get(key, (Decimal(0), default))
+            self._deltas[key] = (staged + delta, default)
+        self._ensure_flusher()
+        return self.get(key, default)
+
+    def compare_and_set(self, key: str, expected_version: int, value: str) -> bool:
+        """Write ``value`` only if ``key`` is still at ``expected_version``.
+
+        ``expected_version=0`` also matches a key that does not exist yet.
+        The write is committed before this returns.
+        """
+        self.flush()
+        db = self.session_factory()
+        try:
+            updated = (
+                db.query(SystemState)
+                .filter(SystemState.key == key, SystemState.version == expected_version)
+                .update(
+                    {"value": value, "version": SystemState.version + 1},
+                    synchronize_session=False,
+                )
+            )
+            if not updated and expected_version == 0:
+                db.add(SystemState(key=key, value=value, version=1))
+                updated = 1
+            db.commit()
+            if not updated:
+                self.invalidate(key)
+                return False
+        except IntegrityError:
+            db.rollback()
+            self.invalidate(key)
+            return False
+        finally:
+            db.close()
+        with self._lock:
+            self._cache[key] = (value, expected_version + 1, time.monotonic() + self.cache_ttl)
+        self._publish([key])
+        return True
+
+    def flush(self) -> int:
+        """Write every staged value in one transaction; return the keys written."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                deltas, self._deltas = self._deltas, {}
+            keys = sorted(set(pending) | set(deltas))
+            if not keys:
+                return 0
+            db = self.session_factory()
+            try:
+                rows = {
+                    row.key: row
+                    for row in db.query(SystemState)
+                    .filter(SystemState.key.in_(keys))
+                    .with_for_update()
+                    .all()
+                }
+                for key in keys:
+                    row = rows.get(key)
+                    base = None
+                    if row is None:
+                        row = rows[key] = SystemState(key=key, value="", version=0)
+                        db.add(row)
+                    else:
+                        base = row.value
+                    if key in pending:
+                        row.value = pending[key]
+                    else:
+                        delta, default = deltas[key]
+                        row.value = str(Decimal(base if base is not None else default) + delta)
+                    row.version = (row.version or 0) + 1
+                db.commit()
+                written = {key: (rows[key].value, rows[key].version) for key in keys}
+            except Exception:
+                self._restage(pending, deltas)
+                logger.exception("System state flush failed")
+                try:
+                    db.rollback()
+                except Exception:
+                    logger.warning("System state rollback failed", exc_info=True)
+                return 0
+            finally:
+                try:
+                    db.close()
+                except Exception:
+                    pass
+        expires = time.monotonic() + self.cache_ttl
+        with self._lock:
+            for key, (value, version) in written.items():
+                if key not in self._pending and key not in self._deltas:
+                    self._cache[key] = (value, version, expires)
+                else:
+                    self._cache.pop(key, None)
+        self._publish(keys)
+        return len(keys)
+
+    def _restage(self, pending: Dict[str, str], deltas: Dict[str, Tuple[Decimal, str]]) -> None:
+        # Writes staged while the failed flush ran are newer and win.
+        with self._lock:
+            for key, value in pending.items():
+                if key not in self._pending and key not in self._deltas:
+                    self._pending[key] = value
+            for key, (delta, default) in deltas.items():
+                if key in self._pending:
+                    continue
+                staged, _ = self._deltas.get(key, (Decimal(0), default))
+                self._deltas[key] = (staged + delta, default)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop ``key`` (or every key) from the cache; staged writes are kept."""
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
+
+    def _client(self) -> Any:
+        try:
+            return self._backend() if self._backend is not None else None
+        except Exception:
+            return None
+
+    def _publish(self, keys: List[str]) -> None:
+        client = self._client()
+        if client is None or not hasattr(client, "publish"):
+            return
+        try:
+            client.publish(self.channel, json.dumps({"origin": self.origin, "keys": keys}))
+        except Exception:  # redis unavailable
+            pass
+
+    def handle_message(self, data: Any) -> None:
+        """Apply an invalidation published by another worker."""
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self.origin:
+            return
+        for key in message.get("keys", []):
+            self.invalidate(key)
+
+    # ------------------------------------------------------------------
+    # Threads
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._stop.clear()
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="system-state-flush", daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:  # keep the flusher alive; staged writes are retried
+                logger.exception("System state flusher error")
+
+    def _ensure_listener(self) -> None:
+        if self._listener is not None:
+            return
+        client = self._client()
+        if client is None or not hasattr(client, "pubsub"):
+            return
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, args=(client,), name="system-state-listen", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self, client: Any) -> None:
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(self.channel)
+            for message in pubsub.listen():
+                self.handle_message(message.get("data"))
+        except Exception:
+            logger.warning("System state invalidation listener stopped", exc_info=True)
+            # Fall back to ``cache_ttl`` expiry.
+            self.invalidate()
+
+    def close(self) -> None:
+        """Stop the flusher after writing what is staged."""
+        self._stop.set()
+        flusher = self._flusher
+        if flusher is not None:
+            flusher.join()
+            self._flusher = None
+        self.flush()
+
+
+_stores: "weakref.WeakKeyDictionary[object, StateStore]" = weakref.WeakKeyDictionary()
+_stores_lock = threading.Lock()
+
+
+def store_for(engine, **options: Any) -> StateStore:
+    """Return the shared store for ``engine``, creating it with ``options``.
+
+    ``engine`` must be a synchronous engine: the flusher thread opens its own
+    sessions on it.  Do not pass the bind of a session run through
+    ``AsyncSession.run_sync``, whose engine only works inside a greenlet.
+    """
+    with _stores_lock:
+        store = _stores.get(engine)
+        if store is None:
+            store = _stores[engine] = StateStore(sessionmaker(bind=engine), **options)
+        return store
+
+
+@atexit.register
+def flush_all() -> None:
+    """Flush every store; registered to run at interpreter exit."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        try:
+            store.flush()
+        except Exception:
+            pass
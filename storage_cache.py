@@ -0,0 +1,250 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Two-tier read-through cache for storage lookups.
+
+Tier one is a bounded in-process LRU holding decoded values, tier two is the
+shared Redis (or ``DummyRedis``) client.  Every key carries an in-process
+version stamp that :meth:`TwoTierCache.invalidate` bumps; a load that raced
+with a write is returned to its callers but never cached.  Concurrent misses
+for the same key are coalesced so only one of them queries the database.
+
+Keys are namespaced by the text before their first ``:`` (``user:alice``
+is in ``user``).  :meth:`TwoTierCache.invalidate_namespace` drops a whole
+namespace in O(1): it bumps the namespace's local generation, which is part
+of every key's stamp, and increments a generation counter in Redis that is
+part of every remote key.  Other processes pick up the new remote
+generation within ``local_ttl``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_RESULTS = ("local_hit", "remote_hit", "miss", "coalesced")
+GENERATION_KEY = "cache:generation:"
+
+
+def clone(value: Any) -> Any:
+    """Copy JSON-shaped data so callers cannot mutate cached entries."""
+    if type(value) is dict:
+        return {k: clone(v) for k, v in value.items()}
+    if type(value) is list:
+        return [clone(v) for v in value]
+    return value
+
+
+def namespace(key: str) -> str:
+    """Return the namespace of ``key``: the text before its first ``:``."""
+    return key.split(":", 1)[0]
+
+
+class _Flight:
+    """A pending load shared by concurrent callers."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TwoTierCache:
+    """In-process LRU in front of a Redis-like client with single-flight loads.
+
+    ``backend`` is a callable returning the current Redis-like client, so the
+    cache follows the module-level client swapped in at app start-up.
+    ``local_ttl`` bounds how long another process's writes can go unseen.
+    """
+
+    def __init__(
+        self,
+        backend: Callable[[], Any],
+        max_entries: int = 4096,
+        local_ttl: float = 5.0,
+        remote_ttl: int = 300,
+        metric: Any = None,
+    ) -> None:
+        self._backend = backend
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.remote_ttl = remote_ttl
+        self._metric = metric
+        self._lock = threading.Lock()
+        self._local: "OrderedDict[str, tuple[Tuple[int, int], float, Any]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._generations: Dict[str, int] = {}
+        self._remote_generations: Dict[str, Tuple[int, float]] = {}
+        self._flights: Dict[str, _Flight] = {}
+        self._stats = {result: 0 for result in CACHE_RESULTS}
+
+    def _record(self, result: str) -> None:
+        self._stats[result] += 1
+        if self._metric is not None:
+            try:
+                self._metric.labels(result=result).inc()
+            except Exception:  # pragma: no cover - metrics are best effort
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current local size."""
+        with self._lock:
+            lookups = sum(self._stats.values())
+            hits = self._stats["local_hit"] + self._stats["remote_hit"]
+            return {
+                **self._stats,
+                "entries": len(self._local),
+                "hit_ratio": hits / lookups if lookups else 0.0,
+            }
+
+    def _stamp(self, key: str) -> Tuple[int, int]:
+        return self._generations.get(namespace(key), 0), self._versions.get(key, 0)
+
+    def _remote_generation(self, space: str) -> int:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._remote_generations.get(space)
+            if cached is not None and cached[1] > now:
+                return cached[0]
+        try:
+            generation = int(self._backend().get(GENERATION_KEY + space) or 0)
+        except Exception:  # redis unavailable or no counter yet
+            generation = 0
+        with self._lock:
+            self._remote_generations[space] = (generation, now + self.local_ttl)
+        return generation
+
+    def _remote_key(self, key: str) -> str:
+        generation = self._remote_generation(namespace(key))
+        return f"{key}#{generation}" if generation else key
+
+    def _remote_get(self, key: str) -> Any:
+        try:
+            raw = self._backend().get(self._remote_key(key))
+        except Exception:  # redis unavailable
+            return None
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def _remote_set(self, key: str, value: Any) -> None:
+        try:
+            self._backend().setex(self._remote_key(key), self.remote_ttl, json.dumps(value))
+        except Exception:  # unavailable or not JSON serializable
+            pass
+
+    def _remote_delete(self, key: str) -> None:
+        try:
+            self._backend().delete(self._remote_key(key))
+        except Exception:
+            pass
+
+    def _store_local(self, key: str, version: Tuple[int, int], value: Any) -> None:
+        self._local[key] = (version, time.monotonic() + self.local_ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            evicted, _ = self._local.popitem(last=False)
+            self._forget(evicted)
+
+    def _forget(self, key: str) -> None:
+        # Versions only matter while a local entry or a load refers to them.
+        if key not in self._local and key not in self._flights:
+            self._versions.pop(key, None)
+
+    def get(self, key: str, loader: Callable[[], Any], use_remote: bool = True) -> Any:
+        """Return the value for ``key``, calling ``loader`` at most once per miss.
+
+        ``None`` results are not cached. ``use_remote=False`` skips both tiers
+        for reading and writing (used inside uncommitted transactions).
+        """
+        if not use_remote:
+            return loader()
+        with self._lock:
+            entry = self._local.get(key)
+            version = self._stamp(key)
+            if entry is not None:
+                if entry[0] == version and entry[1] > time.monotonic():
+                    self._local.move_to_end(key)
+                    self._record("local_hit")
+                    return clone(entry[2])
+                del self._local[key]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self._record("coalesced")
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return clone(flight.value)
+        try:
+            value = self._remote_get(key)
+            result = "remote_hit" if value is not None else "miss"
+            if value is None:
+                value = loader()
+            with self._lock:
+                self._record(result)
+                # Only cache if no write invalidated the key while loading.
+                fresh = self._stamp(key) == version
+                if fresh and value is not None:
+                    self._store_local(key, version, value)
+            if fresh and value is not None and result == "miss":
+                self._remote_set(key, value)
+                with self._lock:
+                    raced = self._stamp(key) != version
+                if raced:
+                    self._remote_delete(key)
+            flight.value = value
+            return clone(value)
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                self._forget(key)
+            flight.done.set()
+
+    def invalidate(self, key: str) -> None:
+        """Drop ``key`` from both tiers and bump its version stamp."""
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self._local.pop(key, None)
+            self._forget(key)
+        self._remote_delete(key)
+
+    def invalidate_namespace(self, space: str) -> None:
+        """Drop every key in namespace ``space`` from both tiers.
+
+        Nothing is enumerated: local entries and in-flight loads fail their
+        stamp check, and remote entries stop being addressed once the Redis
+        generation moves on; they expire after ``remote_ttl``.
+        """
+        with self._lock:
+            self._generations[space] = self._generations.get(space, 0) + 1
+        try:
+            generation = int(self._backend().incr(GENERATION_KEY + space))
+        except Exception:  # redis unavailable or a DummyRedis without incr
+            return
+        with self._lock:
+            self._remote_generations[space] = (generation, time.monotonic() + self.local_ttl)
+
+    def clear(self) -> None:
+        """Drop every local entry (remote entries expire on their own)."""
+        with self._lock:
+            for key in self._flights:
+                self._versions[key] = self._versions.get(key, 0) + 1
+            self._local.clear()
+            for key in list(self._versions):
+                self._forget(key)
@@ -254,6 +254,7 @@ import unittest
 import uuid
 import weakref
 from collections import Counter, defaultdict, deque
+from collections.abc import Mapping as MappingABC
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import timedelta
@@ -264,9 +265,14 @@ from typing import (
     Awaitable,
     Callable,
     Dict,
+    Iterable,
+    Iterator,
     List,
     Literal,
     Optional,
+    Sequence,
+    Set,
+    Tuple,
     TypedDict,
     Union,
     NotRequired,
@@ -281,17 +287,18 @@ from self_improvement import self_improvement_task
 # Web and DB Imports from FastAPI files
 USING_STUBS = False
 try:
-    from fastapi import (BackgroundTasks, Body, Depends, FastAPI, File,
-                         HTTPException, Query, UploadFile, status)
+    from fastapi import (APIRouter, BackgroundTasks, Body, Depends, FastAPI,
+                         File, HTTPException, Query, UploadFile, status)
     from fastapi.middleware.cors import CORSMiddleware
     from fastapi.responses import HTMLResponse, JSONResponse
     from fastapi.security import (OAuth2PasswordBearer,
                                   OAuth2PasswordRequestForm)
     from sqlalchemy import (JSON, Boolean, Column, DateTime, Float, ForeignKey,
-                            Integer, String, Table, Text, create_engine, func)
+                            Integer, String, Table, Text, create_engine, func,
+                            select)
     from sqlalchemy.exc import IntegrityError
     from sqlalchemy.orm import (Session, declarative_base, relationship,
-                                sessionmaker)
+                                selectinload, sessionmaker)
 except ImportError:  # pragma: no cover - fallback when deps are missing
     USING_STUBS = True
     from stubs.fastapi_stub import (BackgroundTasks, Body, CORSMiddleware,
@@ -305,6 +312,7 @@ except ImportError:  # pragma: no cover - fallback when deps are missing
                                        Session, String, Table, Text,
                                        create_engine, declarative_base, func,
                                        relationship, sessionmaker)
+    select = selectinload = None  # async database mode needs SQLAlchemy
 try:
     from pydantic import BaseModel, EmailStr, Field, ValidationError
 except Exception:  # pragma: no cover - lightweight fallback
@@ -350,6 +358,8 @@ class Settings(BaseSettings):
     UPLOAD_FOLDER: str = "./uploads"
     REDIS_URL: str = "redis://localhost"
     DB_MODE: str = Field("local", env="DB_MODE")
+    # Serve the hottest endpoints from an async engine (aiosqlite/asyncpg).
+    ASYNC_DB: bool = Field(False, env="ASYNC_DB")
     UNIVERSE_ID: str = Field(
         default_factory=lambda: str(uuid.uuid4()), env="UNIVERSE_ID"
     )
@@ -496,6 +506,24 @@ from db_models import (AIPersona, Base, BranchVote, Coin, Comment,
                        UniverseBranch, VibeNode, engine, event_attendees,
                        group_members, harmonizer_follows, proposal_votes,
                        vibenode_entanglements, vibenode_likes)
+from async_db import create_async_session_factory, swap_routes
+from block_log import BlockLogReader, writer_for as block_log_writer
+from centrality_service import CentralityService
+from event_log import SegmentedLogChain
+from fixed_point import format_units, from_units, to_units
+from engagement_counters import reconcile_counters, toggle_like
+from fuzzy_index import BKTree
+from graph_assembly import build_follow_graph
+from karma_decay import EPOCH_FIELD, KarmaDecayLedger
+from lineage import ancestors, descendants, ensure_lineage, record_vibenode
+from proposal_scheduler import ACTIVE_PROPOSAL_STATUSES
+from remix_chain import ChainAppender
+from snapshot_store import SNAPSHOT_KINDS
+from state_store import StateStore, store_for
+from storage_cache import TwoTierCache, namespace as cache_namespace
+from universe_host import UniverseHost, resolve_call
+from user_search import ensure_search_index
+from user_search import search_users as search_harmonizers
 from governance_config import calculate_entropy_divergence, quantum_consensus
 from quantum_sim import QuantumContext
 from scientific_metrics import (analyze_prediction_accuracy,
@@ -513,11 +541,11 @@ from scientific_utils import (
     generate_hypotheses,
     refine_hypotheses_from_evidence,
     safe_decimal,
-    acquire_multiple_locks,
 )
 
 # Database engine URL resolved at runtime
 DB_ENGINE_URL = None
+from hook_dispatcher import HookDispatcher
 from hook_manager import HookManager
 from prediction_manager import PredictionManager
 from resonance_music import generate_midi_from_metrics
@@ -609,6 +637,13 @@ if "total_vibenodes" in REGISTRY._names_to_collectors:
 else:
     vibenodes_gauge = prom.Gauge("total_vibenodes", "Total number of vibenodes")
 
+if "storage_cache_requests" in REGISTRY._names_to_collectors:
+    storage_cache_counter = REGISTRY._names_to_collectors["storage_cache_requests"]
+else:
+    storage_cache_counter = prom.Counter(
+        "storage_cache_requests", "Storage cache lookups by result", ["result"]
+    )
+
 _session_started = bool(st and st.session_state.get("metrics_started"))
 if not _session_started and not metrics_started:
     port = Config.METRICS_PORT
@@ -956,22 +991,52 @@ class TokenData(BaseModel):
 
 
 # --- MODULE: services.py ---
+def get_state_store() -> StateStore:
+    """Return the write-coalescing ``SystemState`` store.
+
+    It is built on the synchronous engine, never on the caller's session
+    bind: under ``ASYNC_DB`` that bind is an async engine's ``sync_engine``,
+    which the flusher thread cannot use.
+    """
+    return store_for(
+        engine,
+        flush_interval=Config.STATE_FLUSH_INTERVAL_SECONDS,
+        cache_ttl=Config.STATE_CACHE_TTL_SECONDS,
+        backend=lambda: redis_client,
+    )
+
+
 class SystemStateService:
+    """``SystemState`` access through the shared :class:`StateStore`.
+
+    Writes are staged and flushed on the store's timer; call :meth:`flush`
+    where a write must be durable before continuing.
+    """
+
     def __init__(self, db: Session):
         self.db = db
 
+    @property
+    def store(self) -> StateStore:
+        return get_state_store()
+
     def get_state(self, key: str, default: str) -> str:
-        state = self.db.query(SystemState).filter(SystemState.key == key).first()
-        return state.value if state else default
+        return self.store.get(key, default)
 
     def set_state(self, key: str, value: str):
-        state = self.db.query(SystemState).filter(SystemState.key == key).first()
-        if state:
-            state.value = value
-        else:
-            state = SystemState(key=key, value=value)
-            self.db.add(state)
-        self.db.commit()
+        self.store.set(key, value)
+
+    def increment_state(self, key: str, delta: Any, default: str = "0") -> str:
+        return self.store.increment(key, delta, default)
+
+    def get_versioned_state(self, key: str) -> Tuple[Optional[str], int]:
+        return self.store.get_versioned(key)
+
+    def compare_and_set_state(self, key: str, expected_version: int, value: str) -> bool:
+        return self.store.compare_and_set(key, expected_version, value)
+
+    def flush(self) -> int:
+        return self.store.flush()
 
 
 class GenerativeAIService:
@@ -1156,28 +1221,11 @@ def detailed_error_log(exc: Exception) -> str:
     return "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
 
 
-# Minimal logchain implementation used during tests. The real system may
-# provide a more robust version, but unit tests only rely on a handful of
-# methods.  Keeping it lightweight avoids optional dependencies and complex
-# state management.
-class LogChain:
-    """Simple in-memory event log used for testing."""
-
-    def __init__(self, filename: str) -> None:
-        self.filename = filename
-        self.entries: list[Dict[str, Any]] = []
-
-    def add(self, event: Dict[str, Any]) -> None:
-        self.entries.append(event)
-
-    def replay_events(
-        self, apply: Callable[[Dict[str, Any]], None], since: Any | None = None
-    ) -> None:
-        for event in self.entries:
-            apply(event)
-
-    def verify(self) -> bool:  # pragma: no cover - simple always-true stub
-        return True
+# Durable event log backing ``RemixAgent``. Events are appended to segment
+# files with per-record SHA-256 chaining and an offset index, so replay after
+# a snapshot only reads the tail of the history (see ``event_log.py``).
+class LogChain(SegmentedLogChain):
+    """Append-only, hash-chained event log persisted to segment files."""
 
 
 async def async_add_event(logchain: "LogChain", event: Dict[str, Any]) -> None:
@@ -1660,6 +1708,11 @@ class Config:
         default_factory=lambda: {"block": [r"\b(blocked_word)\b"]}
     )
     VAX_FUZZY_THRESHOLD: int = 2
+    BLOCK_LOG_PATH: str = "blocked_content.log"
+    BLOCK_LOG_MAX_BYTES: int = 16 * 1024 * 1024
+    BLOCK_LOG_COMPRESS: bool = True
+    BLOCK_LOG_BATCH_SIZE: int = 256
+    BLOCK_LOG_FLUSH_SECONDS: float = 1.0
     REACTOR_KARMA_PER_REACT: Decimal = Decimal("1")
     CREATOR_KARMA_PER_REACT: Decimal = Decimal("2")
     SNAPSHOT_INTERVAL: int = 100
@@ -1709,10 +1762,25 @@ class Config:
     # --- Background task tuning ---
     PASSIVE_AURA_UPDATE_INTERVAL_SECONDS: int = 3600
     PROPOSAL_LIFECYCLE_INTERVAL_SECONDS: int = 300
+    HOOK_QUEUE_SIZE: int = 1024
+    HOOK_TIMEOUT_SECONDS: float = 5.0
+    # None waits for queue space; a number of seconds drops hooks after that wait.
+    HOOK_PUT_TIMEOUT_SECONDS: Optional[float] = None
+    UNIVERSE_HOST_PROCESSES: int = 0
+    UNIVERSE_HOST_START_METHOD: str = "spawn"
+    UNIVERSE_HOST_TIMEOUT_SECONDS: float = 30.0
+    ENTITY_LOCK_STRIPES: int = 1024
+    LOG_CHAIN_BATCH_SIZE: int = 256
+    LOG_CHAIN_CHECKPOINT_INTERVAL: int = 1024
+    STATE_FLUSH_INTERVAL_SECONDS: float = 1.0
+    STATE_CACHE_TTL_SECONDS: float = 5.0
     NONCE_CLEANUP_INTERVAL_SECONDS: int = 3600
     NONCE_EXPIRATION_SECONDS: int = 86400
     CONTENT_ENTROPY_UPDATE_INTERVAL_SECONDS: int = 600
     NETWORK_CENTRALITY_UPDATE_INTERVAL_SECONDS: int = 3600
+    NETWORK_ANALYSIS_INTERVAL_SECONDS: int = 600
+    NETWORK_BETWEENNESS_SAMPLES: int = 512
+    ENGAGEMENT_COUNTER_RECONCILE_INTERVAL_SECONDS: int = 3600
     PROACTIVE_INTERVENTION_INTERVAL_SECONDS: int = 3600
     AI_PERSONA_EVOLUTION_INTERVAL_SECONDS: int = 86400
     GUINNESS_PURSUIT_INTERVAL_SECONDS: int = 86400 * 3
@@ -1737,6 +1805,9 @@ class Config:
 
     # FUSED: Added fields from v01_grok15.py Config
     GENESIS_BONUS_DECAY_YEARS: int = 4
+    # SQL storage writes lazily decayed karma back to every row once per
+    # this many DAILY_DECAY epochs.
+    KARMA_DECAY_MATERIALIZE_EPOCHS: int = 7
     GOV_QUORUM_THRESHOLD: Decimal = Decimal("0.5")
     GOV_SUPERMAJORITY_THRESHOLD: Decimal = Decimal("0.9")
     GOV_EXECUTION_TIMELOCK_SEC: int = 259200  # 3 days
@@ -1763,7 +1834,11 @@ LATEST_SYSTEM_PREDICTIONS: Dict[str, Any] = {}
 
 
 class User:
-    """Lightweight user model for in-memory operations."""
+    """Lightweight user model for in-memory operations.
+
+    Karma amounts are fixed-point integers (see ``fixed_point``); the
+    ``karma`` and ``staked_karma`` properties expose them as ``Decimal``.
+    """
 
     def __init__(
         self, username: str, is_genesis: bool, species: str, config: Config
@@ -1774,14 +1849,33 @@ class User:
         self.config = config
         self.root_coin_id: str = ""
         self.coins_owned: list[str] = []
-        self.karma: Decimal = Decimal("0")
-        self.staked_karma: Decimal = Decimal("0")
+        self.karma_units = 0
+        self.staked_units = 0
         self.consent_given: bool = True
         self.lock = threading.RLock()
         self.action_timestamps: Dict[str, str] = {}
 
+    @property
+    def karma(self) -> Decimal:
+        return from_units(self.karma_units)
+
+    @karma.setter
+    def karma(self, value: Any) -> None:
+        self.karma_units = to_units(value)
+
+    @property
+    def staked_karma(self) -> Decimal:
+        return from_units(self.staked_units)
+
+    @staked_karma.setter
+    def staked_karma(self, value: Any) -> None:
+        self.staked_units = to_units(value)
+
     def effective_karma(self) -> Decimal:
-        return self.karma - self.staked_karma
+        return from_units(self.effective_karma_units())
+
+    def effective_karma_units(self) -> int:
+        return self.karma_units - self.staked_units
 
     def check_rate_limit(self, action: str, limit_seconds: int = 10) -> bool:
         last = self.action_timestamps.get(action)
@@ -1805,8 +1899,8 @@ class User:
             "species": self.species,
             "root_coin_id": self.root_coin_id,
             "coins_owned": list(self.coins_owned),
-            "karma": str(self.karma),
-            "staked_karma": str(self.staked_karma),
+            "karma": format_units(self.karma_units),
+            "staked_karma": format_units(self.staked_units),
             "consent_given": self.consent_given,
             "action_timestamps": self.action_timestamps,
         }
@@ -1821,15 +1915,19 @@ class User:
         )
         obj.root_coin_id = data.get("root_coin_id", "")
         obj.coins_owned = list(data.get("coins_owned", []))
-        obj.karma = Decimal(str(data.get("karma", "0")))
-        obj.staked_karma = Decimal(str(data.get("staked_karma", "0")))
+        obj.karma_units = to_units(data.get("karma", "0"))
+        obj.staked_units = to_units(data.get("staked_karma", "0"))
         obj.consent_given = data.get("consent_given", True)
         obj.action_timestamps = data.get("action_timestamps", {}).copy()
         return obj
 
 
 class Coin:
-    """Simplified coin representation used for tests."""
+    """Simplified coin representation used for tests.
+
+    ``value`` and ``reactor_escrow`` are fixed-point integers underneath,
+    exposed as ``Decimal`` properties.
+    """
 
     def __init__(
         self,
@@ -1851,7 +1949,7 @@ class Coin:
         self.coin_id = coin_id
         self.owner = owner
         self.creator = creator
-        self.value = Decimal(str(value))
+        self.value_units = to_units(value)
         self.config = config
         self.is_root = is_root
         self.universe_id = universe_id
@@ -1861,16 +1959,35 @@ class Coin:
         self.fractional_pct = fractional_pct
         self.ancestors = ancestors or []
         self.content = content
-        self.reactor_escrow: Decimal = Decimal("0")
+        self.escrow_units = 0
         self.reactions: list[Dict[str, Any]] = []
         self.lock = threading.RLock()
 
+    @property
+    def value(self) -> Decimal:
+        return from_units(self.value_units)
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self.value_units = to_units(value)
+
+    @property
+    def reactor_escrow(self) -> Decimal:
+        return from_units(self.escrow_units)
+
+    @reactor_escrow.setter
+    def reactor_escrow(self, value: Any) -> None:
+        self.escrow_units = to_units(value)
+
     def add_reaction(self, reaction: Dict[str, Any]) -> None:
         self.reactions.append(reaction)
 
     def release_escrow(self, amount: Decimal) -> Decimal:
-        amt = min(self.reactor_escrow, amount)
-        self.reactor_escrow -= amt
+        return from_units(self.release_escrow_units(to_units(amount)))
+
+    def release_escrow_units(self, units: int) -> int:
+        amt = min(self.escrow_units, units)
+        self.escrow_units -= amt
         return amt
 
     def to_dict(self) -> Dict[str, Any]:
@@ -1878,7 +1995,7 @@ class Coin:
             "coin_id": self.coin_id,
             "owner": self.owner,
             "creator": self.creator,
-            "value": str(self.value),
+            "value": format_units(self.value_units),
             "is_root": self.is_root,
             "universe_id": self.universe_id,
             "is_remix": self.is_remix,
@@ -1887,7 +2004,7 @@ class Coin:
             "fractional_pct": self.fractional_pct,
             "ancestors": self.ancestors,
             "content": self.content,
-            "reactor_escrow": str(self.reactor_escrow),
+            "reactor_escrow": format_units(self.escrow_units),
             "reactions": self.reactions,
         }
 
@@ -1897,7 +2014,7 @@ class Coin:
             data["coin_id"],
             data["owner"],
             data.get("creator", data["owner"]),
-            Decimal(str(data.get("value", "0"))),
+            data.get("value", "0"),
             config,
             is_root=data.get("is_root", False),
             universe_id=data.get("universe_id", "main"),
@@ -1908,7 +2025,7 @@ class Coin:
             ancestors=data.get("ancestors", []),
             content=data.get("content", ""),
         )
-        obj.reactor_escrow = Decimal(str(data.get("reactor_escrow", "0")))
+        obj.escrow_units = to_units(data.get("reactor_escrow", "0"))
         obj.reactions = list(data.get("reactions", []))
         return obj
 
@@ -1927,11 +2044,16 @@ class HarmonyScanner:
         self.fuzzy_keywords = [
             p.strip(r"\b") for p in config.VAX_PATTERNS.get("block", []) if r"\b" in p
         ]
-        self._block_queue = queue.Queue()
-        self._block_writer_thread = threading.Thread(
-            target=self._block_writer_loop, daemon=True
+        # Read-only after construction, so scans query it without the lock.
+        self.fuzzy_index = BKTree(self.fuzzy_keywords)
+        # One writer per log and process, however many scanners are built.
+        self.block_log = block_log_writer(
+            getattr(config, "BLOCK_LOG_PATH", "blocked_content.log"),
+            max_bytes=getattr(config, "BLOCK_LOG_MAX_BYTES", 16 * 1024 * 1024),
+            compress=getattr(config, "BLOCK_LOG_COMPRESS", True),
+            batch_size=getattr(config, "BLOCK_LOG_BATCH_SIZE", 256),
+            flush_interval=getattr(config, "BLOCK_LOG_FLUSH_SECONDS", 1.0),
         )
-        self._block_writer_thread.start()
         # ML model for enhanced fuzzy detection
         torch_mod = globals().get("torch")
         nn_mod = globals().get("nn")
@@ -1942,34 +2064,61 @@ class HarmonyScanner:
         else:
             self.embedding_model = None
 
+    def _fuzzy_hits(self, words: Iterable[str]) -> Dict[str, str]:
+        """Map each word that is close to a fuzzy keyword to that keyword."""
+        threshold = self.config.VAX_FUZZY_THRESHOLD
+        hits = {}
+        for word in words:
+            if len(word) > 2:
+                keyword = self.fuzzy_index.first(word, threshold)
+                if keyword is not None:
+                    hits[word] = keyword
+        return hits
+
+    def _check(self, text: str, fuzzy: Optional[Dict[str, str]] = None) -> None:
+        lower_text = text.lower()
+        for pat in self.compiled_patterns:
+            if pat.search(lower_text):
+                self._log_block("block", pat.pattern, text)
+                raise DissonantContentError(f"Content blocked: matches '{pat.pattern}'.")
+        # Fuzzy with Levenshtein, through the BK-tree index
+        words = set(re.split(r"\W+", lower_text))
+        if fuzzy is None:
+            fuzzy = self._fuzzy_hits(words)
+        for word in words:
+            keyword = fuzzy.get(word)
+            if keyword is not None:
+                self._log_block("fuzzy", keyword, text)
+                raise DissonantContentError(
+                    f"Fuzzy match: '{word}' close to '{keyword}'."
+                )
+        # ML enhancement: embed and compare cosine similarity
+        if self._ml_detect_dissonance(text):
+            raise DissonantContentError("ML detected dissonance.")
+
     def scan(self, text: str) -> bool:
         """Scan text for dissonant content."""
-        lower_text = text.lower()
-        with self.lock:
-            for pat in self.compiled_patterns:
-                if pat.search(lower_text):
-                    self._log_block("block", pat.pattern, text)
-                    raise DissonantContentError(
-                        f"Content blocked: matches '{pat.pattern}'."
-                    )
-            # Fuzzy with Levenshtein
-            words = set(re.split(r"\W+", lower_text))
-            for word in words:
-                if len(word) > 2:
-                    for keyword in self.fuzzy_keywords:
-                        if (
-                            levenshtein_distance(word, keyword)
-                            <= self.config.VAX_FUZZY_THRESHOLD
-                        ):
-                            self._log_block("fuzzy", keyword, text)
-                            raise DissonantContentError(
-                                f"Fuzzy match: '{word}' close to '{keyword}'."
-                            )
-            # ML enhancement: embed and compare cosine similarity
-            if self._ml_detect_dissonance(text):
-                raise DissonantContentError("ML detected dissonance.")
+        self._check(text)
         return True
 
+    def scan_many(self, texts: Sequence[str]) -> List[Optional[str]]:
+        """Scan a batch; return ``None`` for each passing text, else the reason.
+
+        Every distinct word in the batch is looked up in the fuzzy index once.
+        """
+        words = set()
+        for text in texts:
+            words.update(re.split(r"\W+", text.lower()))
+        fuzzy = self._fuzzy_hits(words)
+        results: List[Optional[str]] = []
+        for text in texts:
+            try:
+                self._check(text, fuzzy)
+                results.append(None)
+            except DissonantContentError as exc:
+                results.append(str(exc))
+        return results
+
     def _ml_detect_dissonance(self, text: str) -> bool:
         """Use torch for embedding-based detection."""
         torch_mod = globals().get("torch")
@@ -1985,21 +2134,18 @@ class HarmonyScanner:
 
     def _log_block(self, level: str, pattern: str, text: str):
         """Log blocked content."""
-        self.block_counts[level] += 1
+        with self.lock:
+            self.block_counts[level] += 1
         snippet = text[:100]
-        log_entry = (
-            json.dumps(
-                {"ts": ts(), "level": level, "pattern": pattern, "snippet": snippet}
-            )
-            + "\n"
+        self.block_log.write(
+            {"ts": ts(), "level": level, "pattern": pattern, "snippet": snippet}
         )
-        self._block_queue.put(log_entry)
 
-    def _block_writer_loop(self):
-        while True:
-            entry = self._block_queue.get()
-            with open("blocked_content.log", "a") as f:
-                f.write(entry)
+    def blocked_entries(
+        self, start: Any = None, end: Any = None, offset: int = 0, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Page through logged blocks between ``start`` and ``end``."""
+        return BlockLogReader(self.block_log.path).page(start, end, offset, limit)
 
 
 # --- MODULE: cosmic_nexus.py ---
@@ -2021,11 +2167,38 @@ class CosmicNexus:
         self.harmony_scanner = HarmonyScanner(Config())
         self.generative_ai = GenerativeAIService(self._get_session())
         self.sub_universes = {}  # Dict of forked universes
-        self.hooks = HookManager()
+        self.hooks = HookManager(
+            dispatcher=HookDispatcher(
+                maxsize=Config.HOOK_QUEUE_SIZE,
+                timeout=Config.HOOK_TIMEOUT_SECONDS,
+                put_timeout=Config.HOOK_PUT_TIMEOUT_SECONDS,
+            )
+        )
+        # Forks run in worker processes when UNIVERSE_HOST_PROCESSES > 0.
+        self.universe_host = None
+        if Config.UNIVERSE_HOST_PROCESSES > 0:
+            self.universe_host = UniverseHost(
+                build_hosted_universe,
+                Config.UNIVERSE_HOST_PROCESSES,
+                ops=UNIVERSE_OPS,
+                upcall=self._host_upcall,
+                on_hook=self.hooks.fire_hooks,
+                start_method=Config.UNIVERSE_HOST_START_METHOD,
+                timeout=Config.UNIVERSE_HOST_TIMEOUT_SECONDS,
+            )
 
     def _get_session(self) -> Session:
         return self.session_factory()
 
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop in-process forks, hosted workers and the hook dispatcher."""
+        for fork_agent in self.sub_universes.values():
+            if isinstance(fork_agent, RemixAgent):
+                fork_agent.close(timeout)
+        if self.universe_host is not None:
+            self.universe_host.close()
+        self.hooks.close(timeout)
+
     def analyze_and_intervene(self):
         """Analyze system state and intervene if entropy is high."""
         db = self._get_session()
@@ -2079,10 +2252,15 @@ class CosmicNexus:
                     author_id=system_user.id,
                 )
                 db.add(vibenode)
+                db.flush()
+                record_vibenode(db, vibenode.id, None)
                 db.commit()
                 # Reduce entropy
-                new_entropy = system_entropy - Config.ENTROPY_INTERVENTION_STEP
-                self.state_service.set_state("system_entropy", str(new_entropy))
+                self.state_service.increment_state(
+                    "system_entropy",
+                    -Decimal(str(Config.ENTROPY_INTERVENTION_STEP)),
+                    str(Config.SYSTEM_ENTROPY_BASE),
+                )
         finally:
             db.close()
 
@@ -2091,21 +2269,11 @@ class CosmicNexus:
         fork_id = uuid.uuid4().hex
         divergence = calculate_entropy_divergence(custom_config)
         entropy_thr = custom_config.pop("entropy_threshold", None)
-        agent_cls = EntropyTracker if entropy_thr is not None else RemixAgent
-        agent_kwargs = {
-            "cosmic_nexus": self,
-            "filename": f"logchain_{fork_id}.log",
-            "snapshot": f"snapshot_{fork_id}.json",
-        }
-        if entropy_thr is not None:
-            fork_agent = agent_cls(entropy_threshold=float(entropy_thr), **agent_kwargs)
+        spec = {"entropy_threshold": entropy_thr, "config": dict(custom_config)}
+        if self.universe_host is not None:
+            fork_agent = self.universe_host.spawn(fork_id, spec)
         else:
-            fork_agent = agent_cls(**agent_kwargs)
-        for key, value in custom_config.items():
-            if hasattr(fork_agent.config, key):
-                setattr(fork_agent.config, key, value)
-            else:
-                logging.warning("Ignoring invalid config key %s", key)
+            fork_agent = build_fork_agent(self, fork_id, spec)
         self.sub_universes[fork_id] = fork_agent
         if events is not None:
             self.hooks.register_hook(
@@ -2150,84 +2318,63 @@ class CosmicNexus:
         if reference_universe not in self.sub_universes:
             logging.warning(f"Reference universe {reference_universe} not found")
             return
-
-        target_agent = self.sub_universes[reference_universe]
-        source_agent = self.sub_universes.get(source_universe)
-        if not source_agent:
+        if source_universe not in self.sub_universes:
             logging.warning(f"Source universe {source_universe} not found")
             return
 
-        user_data = source_agent.storage.get_user(user)
-        if not user_data:
-            logging.warning(f"User {user} not found in {source_universe}")
+        # Each step runs inside the process that owns the universe it touches.
+        creator = self._universe_call(
+            reference_universe, "cross_remix_target", reference_coin
+        )
+        if creator is None:
             return
-        user_obj = User.from_dict(user_data, source_agent.config)
-        root_coin_data = source_agent.storage.get_coin(user_obj.root_coin_id)
-        if not root_coin_data:
-            logging.warning(f"Root coin for {user} missing in {source_universe}")
+        creator_share = self._universe_call(
+            source_universe,
+            "cross_remix_debit",
+            data,
+            value,
+            source_universe,
+            reference_universe,
+        )
+        if creator_share is None:
             return
-        root_coin = Coin.from_dict(root_coin_data, source_agent.config)
-
-        ref_coin_data = target_agent.storage.get_coin(reference_coin)
-        if not ref_coin_data:
-            logging.warning(
-                f"Reference coin {reference_coin} missing in {reference_universe}"
+        # The debit is already committed in another universe, so a credit
+        # that fails, times out or finds the creator gone is refunded there.
+        try:
+            credited = self._universe_call(
+                reference_universe, "cross_remix_credit", creator, creator_share
             )
-            return
-        ref_coin = Coin.from_dict(ref_coin_data, target_agent.config)
-
-        creator_data = target_agent.storage.get_user(ref_coin.creator)
-        if not creator_data:
-            logging.warning(
-                f"Creator {ref_coin.creator} missing in {reference_universe}"
+        except Exception as exc:
+            logging.error(f"Cross remix credit to {creator} failed: {exc}")
+            credited = False
+        if not credited:
+            self._universe_call(
+                source_universe, "cross_remix_refund", data, value, source_universe
             )
             return
-        creator_obj = User.from_dict(creator_data, target_agent.config)
-        creator_root_data = target_agent.storage.get_coin(creator_obj.root_coin_id)
-        if not creator_root_data:
-            logging.warning(f"Creator root coin missing in {reference_universe}")
-            return
-        creator_root = Coin.from_dict(creator_root_data, target_agent.config)
-
-        locks = [user_obj.lock, root_coin.lock, creator_root.lock]
-        with acquire_multiple_locks(locks):
-            if not user_obj.consent_given or root_coin.value < value:
-                logging.warning(f"Cross remix denied for {user}")
-                return
-
-            root_coin.value -= value
-            creator_share = value * Config.CROSS_REMIX_CREATOR_SHARE
-            treasury_share = value * Config.CROSS_REMIX_TREASURY_SHARE
-            remix_share = value - creator_share - treasury_share
-
-            creator_root.value += creator_share
-            source_agent.treasury += treasury_share
-
-            new_coin = Coin(
-                data["coin_id"],
-                user,
-                user,
-                remix_share,
-                source_agent.config,
-                is_root=False,
-                universe_id=source_universe,
-                is_remix=True,
-                references=[
-                    {"coin_id": reference_coin, "universe": reference_universe}
-                ],
-                improvement=data.get("improvement", ""),
-            )
-            # NOTE: 34/33/33 split preserves symbolic completeness. Creator receives primacy bonus.
-
-            source_agent.storage.set_coin(new_coin.coin_id, new_coin.to_dict())
-            source_agent.storage.set_coin(root_coin.coin_id, root_coin.to_dict())
-            target_agent.storage.set_coin(creator_root.coin_id, creator_root.to_dict())
-            source_agent.storage.set_user(user, user_obj.to_dict())
-            target_agent.storage.set_user(creator_obj.username, creator_obj.to_dict())
+        logging.info(
+            f"Cross remix {data['coin_id']} minted in {source_universe} referencing {reference_universe}:{reference_coin}"
+        )
 
-            logging.info(
-                f"Cross remix {new_coin.coin_id} minted in {source_universe} referencing {reference_universe}:{reference_coin}"
-            )
+    def _universe_call(self, fork_id: str, op: str, *args: Any) -> Any:
+        """Run ``op`` on a sub-universe, in its worker process if it has one."""
+        host = self.universe_host
+        if host is not None and fork_id in host:
+            return host.call(fork_id, op, *args)
+        return resolve_call(self.sub_universes[fork_id], op, UNIVERSE_OPS, args)
+
+    def _host_upcall(self, op: str, *args: Any) -> Any:
+        """Answer a request sent by an agent running in a universe worker."""
+        if op == "get_state":
+            return self.state_service.get_state(*args)
+        if op == "apply_fork_universe":
+            return self.apply_fork_universe(*args)
+        if op == "has_universe":
+            return args[0] in self.sub_universes
+        if op == "call_universe":
+            fork_id, call_op, call_args = args
+            return self._universe_call(fork_id, call_op, *call_args)
+        raise ValueError(f"Unknown universe upcall {op!r}")
 
     def quantum_audit(self) -> None:
         """Post an annual audit proposal to the governance system."""
@@ -2291,12 +2438,165 @@ class EntropyTracker(RemixAgent):
             db.close()
 
 
+def build_fork_agent(cosmic_nexus: Any, fork_id: str, spec: Dict[str, Any]) -> RemixAgent:
+    """Create the agent for ``fork_id`` from a ``fork_universe`` spec."""
+    agent_kwargs = {
+        "cosmic_nexus": cosmic_nexus,
+        "filename": f"logchain_{fork_id}.log",
+        "snapshot": f"snapshot_{fork_id}.json",
+    }
+    entropy_thr = spec.get("entropy_threshold")
+    if entropy_thr is not None:
+        fork_agent = EntropyTracker(entropy_threshold=float(entropy_thr), **agent_kwargs)
+    else:
+        fork_agent = RemixAgent(**agent_kwargs)
+    for key, value in spec.get("config", {}).items():
+        if hasattr(fork_agent.config, key):
+            setattr(fork_agent.config, key, value)
+        else:
+            logging.warning("Ignoring invalid config key %s", key)
+    return fork_agent
+
+
+def build_hosted_universe(fork_id: str, spec: Dict[str, Any], link: Any) -> RemixAgent:
+    """``UniverseHost`` factory: build a fork inside a worker process."""
+    return build_fork_agent(link, fork_id, spec)
+
+
+def cross_remix_target(agent: RemixAgent, reference_coin: str) -> Optional[str]:
+    """Return the creator who would receive a share for ``reference_coin``."""
+    ref_coin_data = agent.storage.get_coin(reference_coin)
+    if not ref_coin_data:
+        logging.warning(f"Reference coin {reference_coin} missing")
+        return None
+    creator = ref_coin_data.get("creator", ref_coin_data.get("owner"))
+    creator_data = agent.storage.get_user(creator)
+    if not creator_data:
+        logging.warning(f"Creator {creator} missing")
+        return None
+    creator_obj = User.from_dict(creator_data, agent.config)
+    if not agent.storage.get_coin(creator_obj.root_coin_id):
+        logging.warning(f"Creator root coin missing for {creator}")
+        return None
+    return creator
+
+
+def cross_remix_debit(
+    agent: RemixAgent,
+    data: Dict[str, Any],
+    value: Decimal,
+    source_universe: str,
+    reference_universe: str,
+) -> Optional[Decimal]:
+    """Charge the remixer and mint the remix coin; return the creator share."""
+    user = data["user"]
+    # The owner's key covers the root coin, as in RemixAgent._event_lock_keys.
+    with agent.entity_locks.hold(("user", user), ("coin", data["coin_id"])):
+        user_data = agent.storage.get_user(user)
+        if not user_data:
+            logging.warning(f"User {user} not found in {source_universe}")
+            return None
+        user_obj = User.from_dict(user_data, agent.config)
+        root_coin_data = agent.storage.get_coin(user_obj.root_coin_id)
+        if not root_coin_data:
+            logging.warning(f"Root coin for {user} missing in {source_universe}")
+            return None
+        root_coin = Coin.from_dict(root_coin_data, agent.config)
+        if not user_obj.consent_given or root_coin.value < value:
+            logging.warning(f"Cross remix denied for {user}")
+            return None
+        root_coin.value -= value
+        creator_share = value * Config.CROSS_REMIX_CREATOR_SHARE
+        treasury_share = value * Config.CROSS_REMIX_TREASURY_SHARE
+        remix_share = value - creator_share - treasury_share
+        agent._credit_treasury(treasury_share)
+        new_coin = Coin(
+            data["coin_id"],
+            user,
+            user,
+            remix_share,
+            agent.config,
+            is_root=False,
+            universe_id=source_universe,
+            is_remix=True,
+            references=[{"coin_id": data["reference_coin"], "universe": reference_universe}],
+            improvement=data.get("improvement", ""),
+        )
+        # NOTE: 34/33/33 split preserves symbolic completeness. Creator receives primacy bonus.
+        agent.storage.set_coin(new_coin.coin_id, new_coin.to_dict())
+        agent.storage.set_coin(root_coin.coin_id, root_coin.to_dict())
+        agent.storage.set_user(user, user_obj.to_dict())
+    return creator_share
+
+
+def cross_remix_credit(agent: RemixAgent, creator: str, amount: Decimal) -> bool:
+    """Pay the creator share into ``creator``'s root coin.
+
+    Returns ``False`` if the creator or their root coin disappeared since
+    :func:`cross_remix_target` checked them.
+    """
+    with agent.entity_locks.hold(("user", creator)):
+        creator_data = agent.storage.get_user(creator)
+        if not creator_data:
+            logging.warning(f"Creator {creator} missing")
+            return False
+        creator_obj = User.from_dict(creator_data, agent.config)
+        root_data = agent.storage.get_coin(creator_obj.root_coin_id)
+        if not root_data:
+            logging.warning(f"Creator root coin missing for {creator}")
+            return False
+        creator_root = Coin.from_dict(root_data, agent.config)
+        creator_root.value += amount
+        agent.storage.set_coin(creator_root.coin_id, creator_root.to_dict())
+    return True
+
+
+def cross_remix_refund(
+    agent: RemixAgent, data: Dict[str, Any], value: Decimal, source_universe: str
+) -> bool:
+    """Undo :func:`cross_remix_debit` after the creator could not be paid."""
+    user = data["user"]
+    with agent.entity_locks.hold(("user", user), ("coin", data["coin_id"])):
+        user_data = agent.storage.get_user(user)
+        root_data = (
+            agent.storage.get_coin(user_data["root_coin_id"]) if user_data else None
+        )
+        if not root_data:
+            logging.error(
+                f"Cross remix refund of {value} to {user} in {source_universe} failed"
+            )
+            return False
+        root_coin = Coin.from_dict(root_data, agent.config)
+        root_coin.value += value
+        agent._credit_treasury(-value * Config.CROSS_REMIX_TREASURY_SHARE)
+        agent.storage.delete_coin(data["coin_id"])
+        agent.storage.set_coin(root_coin.coin_id, root_coin.to_dict())
+    logging.warning(f"Cross remix {data['coin_id']} refunded to {user}")
+    return True
+
+
+# Operations CosmicNexus runs against sub-universes, in-process or hosted.
+UNIVERSE_OPS = {
+    "cross_remix_target": cross_remix_target,
+    "cross_remix_debit": cross_remix_debit,
+    "cross_remix_credit": cross_remix_credit,
+    "cross_remix_refund": cross_remix_refund,
+}
+
+
 async def proposal_lifecycle_task(agent: RemixAgent):
+    interval = Config.PROPOSAL_LIFECYCLE_INTERVAL_SECONDS
     while True:
-        await asyncio.sleep(
-            Config.PROPOSAL_LIFECYCLE_INTERVAL_SECONDS
-        )  # Every 5 minutes
-        agent._process_proposal_lifecycle()
+        # Sleep until the earliest known deadline.  At least every
+        # ``interval`` the proposals other processes changed are scheduled.
+        await agent.proposal_scheduler.wait(interval)
+        try:
+            agent.schedule_changed_proposals(interval)
+            agent._process_proposal_lifecycle()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.error("proposal_lifecycle_task error", exc_info=True)
 
 
 app = FastAPI(
@@ -2317,6 +2617,17 @@ if not hasattr(app, "post"):
 
 cosmic_nexus = None
 agent = None
+# Single writer for the remix log chain; follows ``SessionLocal`` swaps.
+remix_chain = ChainAppender(
+    lambda: SessionLocal(),
+    checkpoint_every=Config.LOG_CHAIN_CHECKPOINT_INTERVAL,
+    batch_size=Config.LOG_CHAIN_BATCH_SIZE,
+)
+async_engine = None
+AsyncSessionLocal = None
+# Async versions of hot endpoints; ``create_app`` mounts them when ASYNC_DB
+# is set.  Under the stubs ``app``'s decorators are no-ops, so reuse it.
+async_router = app if USING_STUBS else APIRouter()
 
 
 # --- MODULE: api.py ---
@@ -2324,6 +2635,7 @@ agent = None
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
     global cosmic_nexus, agent, redis_client, engine, SessionLocal, DB_ENGINE_URL
+    global async_engine, AsyncSessionLocal
 
     s = get_settings()
     try:
@@ -2360,6 +2672,16 @@ def create_app() -> FastAPI:
     os.makedirs(s.UPLOAD_FOLDER, exist_ok=True)
     if engine is not None:
         Base.metadata.create_all(bind=engine)
+        ensure_search_index(engine)
+        db = SessionLocal()
+        try:
+            ensure_lineage(db)
+        finally:
+            db.close()
+    remix_chain.reset()
+    if s.ASYNC_DB:
+        async_engine, AsyncSessionLocal = create_async_session_factory(engine_url)
+        swap_routes(app, async_router)
 
     cosmic_nexus = CosmicNexus(SessionLocal, SystemStateService(SessionLocal()))
     agent = RemixAgent(
@@ -2398,24 +2720,6 @@ def get_db():
         db.close()
 
 
-class SystemStateService:
-    def __init__(self, db: Session):
-        self.db = db
-
-    def get_state(self, key: str, default: str) -> str:
-        state = self.db.query(SystemState).filter(SystemState.key == key).first()
-        return state.value if state else default
-
-    def set_state(self, key: str, value: str):
-        state = self.db.query(SystemState).filter(SystemState.key == key).first()
-        if state:
-            state.value = value
-        else:
-            state = SystemState(key=key, value=value)
-            self.db.add(state)
-        self.db.commit()
-
-
 class MusicGeneratorService:
     def __init__(self, db: Session, user: Harmonizer):
         self.db = db
@@ -2614,14 +2918,16 @@ def get_user_following(username: str, db: Session = Depends(get_db)):
 
 
 @app.get("/users/search", tags=["Harmonizers"])
-def search_users(q: str, db: Session = Depends(get_db)):
-    users = (
-        db.query(Harmonizer)
-        .filter(Harmonizer.username.ilike(f"%{q}%"))
-        .limit(5)
-        .all()
-    )
-    return [{"id": u.id, "username": u.username} for u in users]
+def search_users(
+    q: str,
+    limit: int = 5,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    try:
+        return search_harmonizers(db, q, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 @app.post(
@@ -2659,26 +2965,46 @@ def remix_vibenode(
         negentropy_score="0.0",
     )
     db.add(clone)
+    db.flush()
+    record_vibenode(db, clone.id, parent.id)
     db.commit()
     db.refresh(clone)
 
-    last_entry = db.query(LogEntry).order_by(LogEntry.id.desc()).first()
-    prev_hash = last_entry.current_hash if last_entry else ""
     payload = json.dumps({"parent_id": parent.id, "child_id": clone.id})
-    log = LogEntry(
-        timestamp=datetime.datetime.utcnow(),
-        event_type="vibenode_remix",
-        payload=payload,
-        previous_hash=prev_hash,
-        current_hash="",
-    )
-    log.current_hash = log.compute_hash()
-    db.add(log)
-    db.commit()
-    out = VibeNodeOut.model_validate(clone)
-    data = out.model_dump()
-    data.update(likes_count=0, comments_count=0, entangled_count=0)
-    return VibeNodeOut(**data)
+    # The remix is committed; don't block (or fail) the request on the log
+    # writer, which under ASYNC_DB would also stall the event loop.
+    def log_failure(future) -> None:
+        if future.exception() is not None:
+            logger.error(
+                "remix log append failed", payload=payload, error=str(future.exception())
+            )
+
+    remix_chain.append("vibenode_remix", payload).add_done_callback(log_failure)
+    return VibeNodeOut.model_validate(clone)
+
+
+@app.get("/vibenodes/{vibenode_id}/ancestors", tags=["Content & Engagement"])
+def get_vibenode_ancestors(
+    vibenode_id: int,
+    max_depth: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+):
+    rows = ancestors(db, vibenode_id, max_depth=max_depth, offset=skip, limit=limit)
+    return [{"id": node_id, "depth": depth} for node_id, depth in rows]
+
+
+@app.get("/vibenodes/{vibenode_id}/descendants", tags=["Content & Engagement"])
+def get_vibenode_descendants(
+    vibenode_id: int,
+    max_depth: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+):
+    rows = descendants(db, vibenode_id, max_depth=max_depth, offset=skip, limit=limit)
+    return [{"id": node_id, "depth": depth} for node_id, depth in rows]
 
 
 @app.get("/status", tags=["System"])
@@ -2701,6 +3027,11 @@ def get_system_status(
                 "community_wellspring", "0.0"
             ),
             "current_system_entropy": float(current_entropy),
+            "storage_cache": (
+                agent.storage.cache.stats()
+                if hasattr(getattr(agent, "storage", None), "cache")
+                else {}
+            ),
         },
         "mission": "To create order and meaning from chaos through collective resonance.",
     }
@@ -2755,6 +3086,13 @@ def toggle_fuzzy_mode(enabled: bool):
     return {"fuzzy_mode": enabled}
 
 
+# Betweenness is precomputed by ``network_analysis_task``; requests read the
+# stored snapshot.
+centrality_service = CentralityService(
+    get_state_store, samples=Config.NETWORK_BETWEENNESS_SAMPLES
+)
+
+
 @app.get("/network-analysis/", tags=["System"])
 def get_network_analysis(
     skip: int = 0,
@@ -2762,62 +3100,7 @@ def get_network_analysis(
     db: Session = Depends(get_db),
     current_user: Harmonizer = Depends(get_current_active_user),
 ):
-    G = nx.DiGraph()
-    harmonizers = db.query(Harmonizer).offset(skip).limit(limit).all()
-    for h in harmonizers:
-        G.add_node(
-            f"h_{h.id}",
-            label=h.username,
-            type="harmonizer",
-            harmony_score=float(h.harmony_score),
-        )
-        for followed in h.following:
-            G.add_edge(f"h_{h.id}", f"h_{followed.id}", type="follow")
-    vibenodes = db.query(VibeNode).offset(skip).limit(limit).all()
-    for v in vibenodes:
-        G.add_node(f"v_{v.id}", label=v.name, type="vibenode", echo=float(v.echo))
-        G.add_edge(f"h_{v.author_id}", f"v_{v.id}", type="created")
-        for liker in v.likes:
-            G.add_edge(f"h_{liker.id}", f"v_{v.id}", type="liked")
-        entanglements = (
-            db.query(vibenode_entanglements)
-            .filter(vibenode_entanglements.c.source_id == v.id)
-            .all()
-        )
-        for entangled in entanglements:
-            G.add_edge(
-                f"v_{v.id}",
-                f"v_{entangled.target_id}",
-                type="entangled",
-                strength=entangled.strength,
-            )
-    if not G.nodes:
-        return {"nodes": [], "edges": [], "metrics": {}}
-    degree_centrality = nx.degree_centrality(G)
-    betweenness_centrality = nx.betweenness_centrality(G)
-    nodes_data = [
-        {
-            "id": n,
-            **G.nodes[n],
-            "degree_centrality": degree_centrality.get(n, 0),
-            "betweenness_centrality": betweenness_centrality.get(n, 0),
-        }
-        for n in G.nodes
-    ]
-    edges_data = [{"source": u, "target": v, **G.edges[u, v]} for u, v in G.edges]
-
-    return {
-        "nodes": nodes_data,
-        "edges": edges_data,
-        "metrics": {
-            "node_count": G.number_of_nodes(),
-            "edge_count": G.number_of_edges(),
-            "density": nx.density(G),
-            "is_strongly_connected": (
-                nx.is_strongly_connected(G) if G.number_of_nodes() > 0 else False
-            ),
-        },
-    }
+    return centrality_service.serve(db, skip=skip, limit=limit)
 
 
 def run_validation_cycle() -> None:
@@ -3108,10 +3391,7 @@ def create_vibenode(
     current_user.creative_spark = str(
         Decimal(current_user.creative_spark) + creator_share
     )
-    current_wellspring = Decimal(state_service.get_state("community_wellspring", "0.0"))
-    state_service.set_state(
-        "community_wellspring", str(current_wellspring + treasury_share)
-    )
+    state_service.increment_state("community_wellspring", treasury_share, "0.0")
     parent_depth = 0
     if vibenode.parent_vibenode_id:
         parent = (
@@ -3144,15 +3424,17 @@ def create_vibenode(
         negentropy_score=str(negentropy_bonus),
     )
     db.add(db_vibenode)
+    db.flush()
+    record_vibenode(db, db_vibenode.id, db_vibenode.parent_vibenode_id)
     db.commit()
     db.refresh(db_vibenode)
     # Reduce system entropy by injecting negentropy
-    new_entropy = Decimal(system_entropy) - Decimal(str(Config.ENTROPY_REDUCTION_STEP))
-    state_service.set_state("system_entropy", str(new_entropy))
-    out = VibeNodeOut.model_validate(db_vibenode)
-    data = out.model_dump()
-    data.update(likes_count=0, comments_count=0, entangled_count=0)
-    return VibeNodeOut(**data)
+    state_service.increment_state(
+        "system_entropy",
+        -Decimal(str(Config.ENTROPY_REDUCTION_STEP)),
+        str(Config.SYSTEM_ENTROPY_BASE),
+    )
+    return VibeNodeOut.model_validate(db_vibenode)
 
 
 @app.post(
@@ -3169,11 +3451,9 @@ def like_vibenode(
     if not vibenode:
         raise HTTPException(status_code=404, detail="VibeNode not found")
     bonus_factor = Decimal("1.0")
-    if current_user in vibenode.likes:
-        vibenode.likes.remove(current_user)
+    if not toggle_like(db, vibenode.id, current_user.id):
         message = "Unliked"
     else:
-        vibenode.likes.append(current_user)
         message = "Liked"
         base_echo_gain = Decimal("1.0")
         base_catalyst = Decimal("1.0")
@@ -3210,66 +3490,276 @@ def like_vibenode(
     return {"message": message}
 
 
-class AIPersonaBase(BaseModel):
-    name: str
-    description: str
-    is_emergent: bool = False
+# --- Async database mode ---
+# Mounted over the sync routes by ``create_app`` when ``ASYNC_DB`` is set.
+# Reads are native async queries; write paths run the sync handlers through
+# ``AsyncSession.run_sync`` so the business rules live in one place while
+# the driver I/O still yields to the event loop.
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise HTTPException(status_code=503, detail="Async database mode is disabled")
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
 
 
-class AIPersonaCreate(AIPersonaBase):
-    pass
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), db=Depends(get_async_db)
+):
+    s = get_settings()
+    try:
+        payload = jwt.decode(token, s.SECRET_KEY, algorithms=[s.ALGORITHM])
+        username = payload.get("sub")
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    user = await db.scalar(select(Harmonizer).where(Harmonizer.username == username))
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    return user
 
 
-class AIPersonaOut(AIPersonaBase):
-    id: int
+async def get_current_active_user_async(
+    current_user: Harmonizer = Depends(get_current_user_async),
+):
+    return get_current_active_user(current_user)
 
-    class Config:
-        from_attributes = True
 
+async def _async_user_or_404(db, username: str, *options) -> Harmonizer:
+    user = await db.scalar(
+        select(Harmonizer).where(Harmonizer.username == username).options(*options)
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="Harmonizer not found")
+    return user
 
-class AIAssistRequest(BaseModel):
-    prompt: str
 
+async def _async_state(key: str, default: str) -> str:
+    # Read through the state store so staged writes are visible, as in the
+    # sync endpoints; a cache miss queries the sync engine off the loop.
+    return await asyncio.to_thread(get_state_store().get, key, default)
 
-@app.post("/ai-assist/{vibenode_id}", tags=["AI Assistance"])
-def ai_assist(
-    vibenode_id: int,
-    request: AIAssistRequest,
-    db: Session = Depends(get_db),
-    current_user: Harmonizer = Depends(get_current_active_user),
-    state_service: SystemStateService = Depends(get_system_state_service),
+
+@async_router.post(
+    "/users/register",
+    response_model=HarmonizerOut,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Harmonizers"],
+)
+async def register_harmonizer_async(user: HarmonizerCreate, db=Depends(get_async_db)):
+    return await db.run_sync(lambda session: register_harmonizer(user, session))
+
+
+@async_router.get("/users/me", response_model=HarmonizerOut, tags=["Harmonizers"])
+async def read_users_me_async(
+    current_user: Harmonizer = Depends(get_current_active_user_async),
 ):
-    vibenode = db.query(VibeNode).filter(VibeNode.id == vibenode_id).first()
-    if not vibenode:
-        raise HTTPException(status_code=404, detail="VibeNode not found")
-    if not vibenode.patron_saint_id:
-        raise HTTPException(
-            status_code=400, detail="No AI Persona linked to this VibeNode"
-        )
-    persona = (
-        db.query(AIPersona).filter(AIPersona.id == vibenode.patron_saint_id).first()
-    )
-    if not persona:
-        raise HTTPException(status_code=404, detail="AI Persona not found")
-    # Simulated AI response using persona.description as system prompt
-    system_prompt = persona.description
-    user_prompt = request.prompt
-    # Simulate response (in real, call an AI API)
-    response = f"AI Response based on system prompt '{system_prompt}' and user prompt '{user_prompt}'."
-    # Introduce chaos based on system_entropy
-    system_entropy = float(
-        state_service.get_state("system_entropy", str(Config.SYSTEM_ENTROPY_BASE))
+    return current_user
+
+
+@async_router.get("/users/me/influence-score", tags=["Harmonizers"])
+async def get_user_influence_score_async(
+    db=Depends(get_async_db),
+    current_user: Harmonizer = Depends(get_current_active_user_async),
+):
+    return await db.run_sync(
+        lambda session: get_user_influence_score(session, current_user)
     )
-    if system_entropy > Config.ENTROPY_CHAOS_THRESHOLD:  # High entropy threshold
-        # Add chaotic elements (stub for quantum_chaos_generator)
-        chaotic_words = ["quantum", "flux", "anomaly", "rift"]  # Example
-        response += " " + " ".join(random.sample(chaotic_words, 2))
-    return {"response": response}
 
 
-# Background tasks
-async def passive_aura_resonance_task(db_session_factory):
-    while True:
+@async_router.put("/users/me", response_model=HarmonizerOut, tags=["Harmonizers"])
+async def update_profile_async(
+    bio: Optional[str] = Body(None),
+    cultural_preferences: Optional[List[str]] = Body(None),
+    db=Depends(get_async_db),
+    current_user: Harmonizer = Depends(get_current_active_user_async),
+):
+    return await db.run_sync(
+        lambda session: update_profile(bio, cultural_preferences, session, current_user)
+    )
+
+
+@async_router.get("/users/search", tags=["Harmonizers"])
+async def search_users_async(
+    q: str,
+    limit: int = 5,
+    cursor: Optional[str] = None,
+    db=Depends(get_async_db),
+):
+    return await db.run_sync(lambda session: search_users(q, limit, cursor, session))
+
+
+@async_router.post(
+    "/users/{username}/follow", status_code=status.HTTP_200_OK, tags=["Harmonizers"]
+)
+async def follow_unfollow_user_async(
+    username: str,
+    db=Depends(get_async_db),
+    current_user: Harmonizer = Depends(get_current_active_user_async),
+):
+    return await db.run_sync(
+        lambda session: follow_unfollow_user(username, session, current_user)
+    )
+
+
+@async_router.get("/users/{username}", response_model=HarmonizerOut, tags=["Harmonizers"])
+async def get_user_by_username_async(username: str, db=Depends(get_async_db)):
+    return await _async_user_or_404(db, username)
+
+
+@async_router.get("/users/{username}/followers", tags=["Harmonizers"])
+async def get_user_followers_async(username: str, db=Depends(get_async_db)):
+    user = await _async_user_or_404(db, username, selectinload(Harmonizer.followers))
+    followers = [u.username for u in user.followers]
+    return {"count": len(followers), "followers": followers}
+
+
+@async_router.get("/users/{username}/following", tags=["Harmonizers"])
+async def get_user_following_async(username: str, db=Depends(get_async_db)):
+    user = await _async_user_or_404(db, username, selectinload(Harmonizer.following))
+    following = [u.username for u in user.following]
+    return {"count": len(following), "following": following}
+
+
+@async_router.post(
+    "/vibenodes/",
+    response_model=VibeNodeOut,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Content & Engagement"],
+)
+async def create_vibenode_async(
+    vibenode: VibeNodeCreate,
+    db=Depends(get_async_db),
+    current_user: Harmonizer = Depends(get_current_active_user_async),
+):
+    return await db.run_sync(
+        lambda session: create_vibenode(
+            vibenode, session, current_user, SystemStateService(session)
+        )
+    )
+
+
+@async_router.post(
+    "/vibenodes/{vibenode_id}/remix",
+    response_model=VibeNodeOut,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Content & Engagement"],
+)
+async def remix_vibenode_async(
+    vibenode_id: int,
+    vibenode: Optional[VibeNodeCreate] = None,
+    db=Depends(get_async_db),
+    current_user: Harmonizer = Depends(get_current_active_user_async),
+):
+    return await db.run_sync(
+        lambda session: remix_vibenode(vibenode_id, vibenode, session, current_user)
+    )
+
+
+@async_router.post(
+    "/vibenodes/{vibenode_id}/like",
+    status_code=status.HTTP_200_OK,
+    tags=["Content & Engagement"],
+)
+async def like_vibenode_async(
+    vibenode_id: int,
+    db=Depends(get_async_db),
+    current_user: Harmonizer = Depends(get_current_active_user_async),
+):
+    return await db.run_sync(
+        lambda session: like_vibenode(vibenode_id, session, current_user)
+    )
+
+
+@async_router.get("/status", tags=["System"])
+async def get_system_status_async(db=Depends(get_async_db)):
+    total_harmonizers = await db.scalar(select(func.count()).select_from(Harmonizer))
+    total_vibenodes = await db.scalar(select(func.count()).select_from(VibeNode))
+    current_entropy = await _async_state(
+        "system_entropy", str(Config.SYSTEM_ENTROPY_BASE)
+    )
+    return {
+        "status": "online",
+        "timestamp": datetime.datetime.utcnow().isoformat(),
+        "metrics": {
+            "total_harmonizers": total_harmonizers,
+            "total_vibenodes": total_vibenodes,
+            "community_wellspring": await _async_state(
+                "community_wellspring", "0.0"
+            ),
+            "current_system_entropy": float(current_entropy),
+            "storage_cache": (
+                agent.storage.cache.stats()
+                if hasattr(getattr(agent, "storage", None), "cache")
+                else {}
+            ),
+        },
+        "mission": "To create order and meaning from chaos through collective resonance.",
+    }
+
+
+class AIPersonaBase(BaseModel):
+    name: str
+    description: str
+    is_emergent: bool = False
+
+
+class AIPersonaCreate(AIPersonaBase):
+    pass
+
+
+class AIPersonaOut(AIPersonaBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
+class AIAssistRequest(BaseModel):
+    prompt: str
+
+
+@app.post("/ai-assist/{vibenode_id}", tags=["AI Assistance"])
+def ai_assist(
+    vibenode_id: int,
+    request: AIAssistRequest,
+    db: Session = Depends(get_db),
+    current_user: Harmonizer = Depends(get_current_active_user),
+    state_service: SystemStateService = Depends(get_system_state_service),
+):
+    vibenode = db.query(VibeNode).filter(VibeNode.id == vibenode_id).first()
+    if not vibenode:
+        raise HTTPException(status_code=404, detail="VibeNode not found")
+    if not vibenode.patron_saint_id:
+        raise HTTPException(
+            status_code=400, detail="No AI Persona linked to this VibeNode"
+        )
+    persona = (
+        db.query(AIPersona).filter(AIPersona.id == vibenode.patron_saint_id).first()
+    )
+    if not persona:
+        raise HTTPException(status_code=404, detail="AI Persona not found")
+    # Simulated AI response using persona.description as system prompt
+    system_prompt = persona.description
+    user_prompt = request.prompt
+    # Simulate response (in real, call an AI API)
+    response = f"AI Response based on system prompt '{system_prompt}' and user prompt '{user_prompt}'."
+    # Introduce chaos based on system_entropy
+    system_entropy = float(
+        state_service.get_state("system_entropy", str(Config.SYSTEM_ENTROPY_BASE))
+    )
+    if system_entropy > Config.ENTROPY_CHAOS_THRESHOLD:  # High entropy threshold
+        # Add chaotic elements (stub for quantum_chaos_generator)
+        chaotic_words = ["quantum", "flux", "anomaly", "rift"]  # Example
+        response += " " + " ".join(random.sample(chaotic_words, 2))
+    return {"response": response}
+
+
+# Background tasks
+async def passive_aura_resonance_task(db_session_factory):
+    while True:
         await asyncio.sleep(Config.PASSIVE_AURA_UPDATE_INTERVAL_SECONDS)
         db = db_session_factory()
         try:
@@ -3411,25 +3901,55 @@ async def update_network_centrality_task(db_session_factory):
     while True:
         db = db_session_factory()
         try:
-            G = nx.DiGraph()
-            users = db.query(Harmonizer).all()
-            for user in users:
-                G.add_node(user.id)
-            for user in users:
-                for followed in user.following:
-                    G.add_edge(user.id, followed.id)
-            for uid in G.nodes:
-                u = db.query(Harmonizer).filter(Harmonizer.id == uid).first()
-                if u:
-                    score = calculate_influence_score(G, uid)
-                    u.network_centrality = float(score)
-                    u.harmony_score = str(calculate_interaction_entropy(u, db))
+            G = build_follow_graph(db)
+            for u in db.query(Harmonizer).all():
+                score = calculate_influence_score(G, u.id)
+                u.network_centrality = float(score)
+                u.harmony_score = str(calculate_interaction_entropy(u, db))
             db.commit()
         finally:
             db.close()
         await asyncio.sleep(Config.NETWORK_CENTRALITY_UPDATE_INTERVAL_SECONDS)
 
 
+async def network_analysis_task(db_session_factory):
+    """Recompute the ``/network-analysis/`` snapshot when the graph changes."""
+
+    def refresh() -> None:
+        db = db_session_factory()
+        try:
+            centrality_service.refresh(db)
+        finally:
+            db.close()
+
+    while True:
+        try:
+            await asyncio.to_thread(refresh)
+        except Exception:
+            logger.error("network_analysis_task error", exc_info=True)
+        await asyncio.sleep(Config.NETWORK_ANALYSIS_INTERVAL_SECONDS)
+
+
+async def engagement_counter_reconcile_task(db_session_factory):
+    """Repair drift in the denormalized vibenode engagement counters."""
+
+    def reconcile() -> int:
+        db = db_session_factory()
+        try:
+            return reconcile_counters(db)
+        finally:
+            db.close()
+
+    while True:
+        try:
+            fixed = await asyncio.to_thread(reconcile)
+            if fixed:
+                logger.warning("engagement counters repaired", rows=fixed)
+        except Exception:
+            logger.error("engagement_counter_reconcile_task error", exc_info=True)
+        await asyncio.sleep(Config.ENGAGEMENT_COUNTER_RECONCILE_INTERVAL_SECONDS)
+
+
 async def system_prediction_task(db_session_factory):
     """Generate system-level predictions and experiments periodically."""
     while True:
@@ -3574,6 +4094,8 @@ async def startup_event():
     loop.create_task(annual_audit_task(cosmic_nexus))
     loop.create_task(update_content_entropy_task(SessionLocal))
     loop.create_task(update_network_centrality_task(SessionLocal))
+    loop.create_task(network_analysis_task(SessionLocal))
+    loop.create_task(engagement_counter_reconcile_task(SessionLocal))
     loop.create_task(system_prediction_task(SessionLocal))
     loop.create_task(scientific_reasoning_cycle_task(SessionLocal))
     loop.create_task(adaptive_optimization_task(SessionLocal))
@@ -3692,6 +4214,10 @@ class AbstractStorage:
     def set_proposal(self, proposal_id: str, data: Dict[str, Any]):
         raise NotImplementedError
 
+    def get_active_proposals(self) -> List[Dict[str, Any]]:
+        """Return proposals still awaiting a tally or execution."""
+        raise NotImplementedError
+
     def get_marketplace_listing(self, listing_id: str) -> Optional[Dict[str, Any]]:
         raise NotImplementedError
 
@@ -3706,135 +4232,723 @@ class AbstractStorage:
         """Provides a transactional context to ensure atomicity."""
         raise NotImplementedError
 
+    @contextmanager
+    def group_commit(self):
+        """Share one commit across a batch of storage calls (no-op by default)."""
+        yield
+
+    @contextmanager
+    def unit_of_work(self):
+        """Group the storage calls of one event (no-op by default)."""
+        yield
+
+    def drain_dirty(self) -> Optional[Dict[str, Set[str]]]:
+        """Return and reset keys changed since the last call (``None`` if untracked)."""
+        return None
+
+    def apply_karma_decay(self, factor: Decimal, genesis_decay_years: float) -> None:
+        """Decay every user's karma by ``factor`` (plus genesis bonus decay)."""
+        raise NotImplementedError
+
+    def snapshot_source(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Return ``{kind: {key: data}}`` for every snapshotted entity kind."""
+        raise NotImplementedError
+
+    def bulk_load(self, state: Dict[str, Dict[str, Dict[str, Any]]]):
+        """Load a restored snapshot; the default goes through the setters."""
+        setters = {
+            "users": self.set_user,
+            "coins": self.set_coin,
+            "proposals": self.set_proposal,
+            "marketplace_listings": self.set_marketplace_listing,
+        }
+        for kind, items in state.items():
+            for key, data in items.items():
+                setters[kind](key, data)
+
+
+class _GroupSession:
+    """Per-call view of a shared batch session.
+
+    ``commit`` releases a savepoint instead of ending the transaction and
+    ``close`` discards whatever the call did not commit, so each storage call
+    keeps its own atomicity while the batch pays for a single commit.
+    """
+
+    def __init__(self, session: Session):
+        self._session = session
+        self._savepoint = session.begin_nested()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+    def commit(self) -> None:
+        self._savepoint.commit()
+
+    def rollback(self) -> None:
+        self._savepoint.rollback()
+
+    def close(self) -> None:
+        if self._savepoint.is_active:
+            self._savepoint.rollback()
+
+
+class _UnitOfWork:
+    """Session, identity map and pending cache invalidations for one event."""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.proxy = _UnitOfWorkSession(session)
+        self.rows: Dict[Tuple[Any, Any], Any] = {}
+        self.cache_keys: Set[str] = set()
+        self.cache_namespaces: Set[str] = set()
+        self.dirty: Set[Tuple[str, str]] = set()
+
+
+class _UnitOfWorkSession:
+    """Session view handed to storage calls inside :meth:`SQLAlchemyStorage.unit_of_work`.
+
+    ``commit`` only flushes and ``rollback``/``close`` are deferred to the
+    unit of work, which decides the outcome for all calls together.
+    """
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+    def commit(self) -> None:
+        self._session.flush()
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class _StoredRecords(MappingABC):
+    """Read-only ``{key: record}`` view of one entity kind in SQL storage.
+
+    Lookups of single keys go through the storage getters (and their
+    cache).  Iterating loads every record of the kind in one query and keeps
+    them for the life of the view.
+    """
+
+    def __init__(self, storage: "SQLAlchemyStorage", kind: str):
+        self._storage = storage
+        self._kind = kind
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _all(self) -> Dict[str, Dict[str, Any]]:
+        if self._records is None:
+            self._records = self._storage._all_records(self._kind)
+        return self._records
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        if self._records is not None:
+            return self._records[key]
+        record = self._storage._getters()[self._kind](key)
+        if record is None:
+            raise KeyError(key)
+        return record
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._all())
+
+    def __len__(self) -> int:
+        return len(self._all())
+
 
 class SQLAlchemyStorage(AbstractStorage):
+    # Agent records keep their own field names.  Each kind maps to its
+    # table, its key column and the fields stored under another column name.
+    # User fields without a column live in ``Harmonizer.agent_fields``.
+    _RECORD_KINDS = {
+        "users": (Harmonizer, "username", {"join_time": "created_at"}),
+        "coins": (
+            SymbolicToken,
+            "token_id",
+            {
+                "coin_id": "token_id",
+                "value": "symbolic_value",
+                "reactor_escrow": "reaction_reserve",
+            },
+        ),
+        "marketplace_listings": (
+            MarketplaceListing,
+            "listing_id",
+            {"coin_id": "token_id", "price": "listing_value"},
+        ),
+    }
+    KARMA_DECAY_KEY = "karma_decay:epochs"
+
     def __init__(self, session_factory: Callable[[], Session]):
         self.session_factory = session_factory
+        self._local = threading.local()
+        self.cache = TwoTierCache(lambda: redis_client, metric=storage_cache_counter)
+        self._dirty_lock = threading.Lock()
+        self._dirty: Dict[str, Set[str]] = {kind: set() for kind in SNAPSHOT_KINDS}
+        self._karma_decay = KarmaDecayLedger()
+        self._karma_decay_checked = float("-inf")
 
     def _get_session(self) -> Session:
+        uow = getattr(self._local, "uow", None)
+        if uow is not None:
+            return uow.proxy
+        group = getattr(self._local, "session", None)
+        if group is not None:
+            return _GroupSession(group)
         return self.session_factory()
 
-    @contextmanager
-    def transaction(self):
+    def _find(self, db: Session, model: Any, column: str, value: Any) -> Any:
+        """Query ``model`` by ``column``, consulting the unit-of-work identity map."""
+        uow = getattr(self._local, "uow", None)
+        if uow is not None and (model, value) in uow.rows:
+            return uow.rows[(model, value)]
+        row = db.query(model).filter(getattr(model, column) == value).first()
+        if uow is not None:
+            uow.rows[(model, value)] = row
+        return row
+
+    def _remember(self, model: Any, value: Any, row: Any) -> None:
+        uow = getattr(self._local, "uow", None)
+        if uow is not None:
+            uow.rows[(model, value)] = row
+
+    @staticmethod
+    def _naive_utc(value: str) -> datetime.datetime:
+        parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return parsed
+
+    def _record(self, kind: str, row: Any) -> Dict[str, Any]:
+        """Return the agent record stored in ``row``."""
+        model, _, renamed = self._RECORD_KINDS[kind]
+        fields = {column: name for name, column in renamed.items()}
+        record: Dict[str, Any] = {}
+        for column in model.__table__.columns:
+            value = getattr(row, column.key)
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            record[fields.get(column.key, column.key)] = value
+        record.update(record.pop("agent_fields", None) or {})
+        return record
+
+    def _values(self, kind: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the column values storing the agent record ``data``."""
+        model, _, renamed = self._RECORD_KINDS[kind]
+        columns = model.__table__.columns
+        values: Dict[str, Any] = {}
+        extra: Dict[str, Any] = {}
+        for name, value in data.items():
+            column = renamed.get(name, name)
+            if column not in columns:
+                extra[name] = value
+                continue
+            column_type = columns[column].type
+            if isinstance(value, str) and isinstance(column_type, DateTime):
+                value = self._naive_utc(value)
+            elif isinstance(value, Decimal):
+                value = float(value) if isinstance(column_type, Float) else str(value)
+            values[column] = value
+        if "agent_fields" in columns:
+            values["agent_fields"] = extra
+        if kind == "users" and data.get("karma") is not None:
+            # The web views read karma_score; the record keeps exact karma.
+            values["karma_score"] = float(data["karma"])
+        return values
+
+    @staticmethod
+    def _new_row_defaults(kind: str, key: str) -> Dict[str, Any]:
+        if kind == "users":
+            # Users created through the event log have no login of their own.
+            return {"email": f"{key}@agent.invalid", "hashed_password": ""}
+        return {}
+
+    def _load_record(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        model, column, _ = self._RECORD_KINDS[kind]
         db = self._get_session()
         try:
-            logging.info("Starting DB transaction")
-            yield db
-            db.commit()
-            logging.info("Transaction committed")
-        except Exception:
-            db.rollback()
-            logging.error("Transaction rolled back due to failure")
-            raise
+            row = self._find(db, model, column, key)
+            return self._record(kind, row) if row is not None else None
         finally:
             db.close()
 
-    def get_user(self, name: str) -> Optional[Dict]:
-        try:
-            cached = redis_client.get(f"user:{name}")
-        except Exception:  # redis unavailable
-            cached = None
-        if cached:
-            return json.loads(cached)
+    def _write_record(
+        self, kind: str, key: str, data: Dict[str, Any], cache_key: Optional[str] = None
+    ) -> None:
+        model, column, _ = self._RECORD_KINDS[kind]
+        values = self._values(kind, data)
+        values.pop("id", None)
         db = self._get_session()
         try:
-            user = db.query(Harmonizer).filter(Harmonizer.username == name).first()
-            if user:
-                data = user.__dict__.copy()
-                data.pop("_sa_instance_state", None)
-                try:
-                    redis_client.setex(f"user:{name}", 300, json.dumps(data))
-                except Exception:
-                    pass
-                return data
-            return None
+            row = self._find(db, model, column, key)
+            if row is None:
+                row = model(**{**self._new_row_defaults(kind, key), **values, column: key})
+                db.add(row)
+                self._remember(model, key, row)
+            else:
+                extra = values.pop("agent_fields", None)
+                for name, value in values.items():
+                    setattr(row, name, value)
+                if extra is not None:
+                    # Partial writes keep the fields they do not mention.
+                    row.agent_fields = {**(row.agent_fields or {}), **extra}
+            db.commit()
         finally:
             db.close()
+        self._cache_committed(cache_key)
+        self._mark_dirty(kind, key)
 
-    def set_user(self, name: str, data: Dict):
-        try:
-            redis_client.delete(f"user:{name}")
-        except Exception:
-            pass
+    def _delete_record(self, kind: str, key: str, cache_key: Optional[str] = None) -> None:
+        model, column, _ = self._RECORD_KINDS[kind]
         db = self._get_session()
         try:
-            user = db.query(Harmonizer).filter(Harmonizer.username == name).first()
-            if user:
-                for k, v in data.items():
-                    setattr(user, k, v)
-            else:
-                user = Harmonizer(username=name, **data)
-                db.add(user)
-            db.commit()
+            row = self._find(db, model, column, key)
+            if row:
+                db.delete(row)
+                self._remember(model, key, None)
+                if cache_key is not None:
+                    self._cache_invalidate(cache_key)
+                db.commit()
         finally:
             db.close()
+        self._cache_committed(cache_key)
+        self._mark_dirty(kind, key)
+
+    def _mark_dirty(self, kind: str, key: Any) -> None:
+        # Like cache keys, keys written inside a unit of work or batch are
+        # only marked once it commits, so a snapshot taken in between cannot
+        # drain the key and then read the row from before the write.
+        uow = getattr(self._local, "uow", None)
+        if uow is not None:
+            uow.dirty.add((kind, str(key)))
+        elif getattr(self._local, "session", None) is not None:
+            self._local.group_dirty.add((kind, str(key)))
+        else:
+            self._publish_dirty([(kind, str(key))])
 
-    def get_all_users(self) -> List[Dict]:
+    def _publish_dirty(self, keys: Iterable[Tuple[str, str]]) -> None:
+        with self._dirty_lock:
+            for kind, key in keys:
+                self._dirty[kind].add(key)
+
+    def drain_dirty(self) -> Dict[str, Set[str]]:
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, {kind: set() for kind in SNAPSHOT_KINDS}
+        return dirty
+
+    def _getters(self) -> Dict[str, Callable[[str], Optional[Dict[str, Any]]]]:
+        return {
+            "users": self.get_user,
+            "coins": self.get_coin,
+            "proposals": self.get_proposal,
+            "marketplace_listings": self.get_marketplace_listing,
+        }
+
+    def _all_records(self, kind: str) -> Dict[str, Dict[str, Any]]:
         db = self._get_session()
         try:
-            return [u.__dict__ for u in db.query(Harmonizer).all()]
+            if kind == "proposals":
+                rows = db.query(Proposal).all()
+                votes = self._proposal_votes(db, [p.id for p in rows])
+                return {str(p.id): self._proposal_record(p, votes[p.id]) for p in rows}
+            model, column, _ = self._RECORD_KINDS[kind]
+            records = {
+                getattr(row, column): self._record(kind, row) for row in db.query(model)
+            }
         finally:
             db.close()
+        if kind == "users":
+            for record in records.values():
+                self._decayed(record)
+        return records
 
-    def get_coin(self, coin_id: str) -> Optional[Dict[str, Any]]:
+    def snapshot_source(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return {kind: _StoredRecords(self, kind) for kind in SNAPSHOT_KINDS}
+
+    def bulk_load(self, state: Dict[str, Dict[str, Dict[str, Any]]]):
+        """Upsert a restored snapshot with bulk INSERTs and UPDATEs.
+
+        Rows are matched on their key column, so restored rows keep the ids
+        of existing ones and new rows get fresh ids.  Proposals go through
+        :meth:`set_proposal`, which resolves votes to harmonizer ids.
+        """
+        db = self.session_factory()
+        try:
+            for kind, (model, column, _) in self._RECORD_KINDS.items():
+                records = state.get(kind) or {}
+                if not records:
+                    continue
+                key_column = getattr(model, column)
+                primary = model.__mapper__.primary_key[0].key
+                keys = list(records)
+                existing: Dict[str, Any] = {}
+                for start in range(0, len(keys), 500):
+                    existing.update(
+                        db.query(key_column, getattr(model, primary)).filter(
+                            key_column.in_(keys[start : start + 500])
+                        )
+                    )
+                inserts, updates = [], []
+                for key, data in records.items():
+                    values = self._values(kind, data)
+                    values.pop("id", None)
+                    values[column] = key
+                    if key in existing:
+                        updates.append({**values, primary: existing[key]})
+                    else:
+                        inserts.append({**self._new_row_defaults(kind, key), **values})
+                db.bulk_update_mappings(model, updates)
+                db.bulk_insert_mappings(model, inserts)
+            db.commit()
+            bind = db.get_bind()
+        finally:
+            db.close()
+        # Bulk inserts skip the mapper events that index usernames.
+        ensure_search_index(bind)
+        for proposal_id, data in (state.get("proposals") or {}).items():
+            self.set_proposal(proposal_id, data)
+        self.cache.invalidate_namespace("user")
+        self.cache.invalidate_namespace("coin")
+        self.drain_dirty()
+
+    def _cacheable(self, key: str) -> bool:
+        # Keys written by an uncommitted unit of work or batch must be read
+        # from the session and never populate the shared cache.
+        uow = getattr(self._local, "uow", None)
+        space = cache_namespace(key)
+        if uow is not None and (key in uow.cache_keys or space in uow.cache_namespaces):
+            return False
+        if space in getattr(self._local, "group_cache_namespaces", ()):
+            return False
+        return key not in getattr(self._local, "group_cache_keys", ())
+
+    def _cache_invalidate(self, key: str) -> None:
+        uow = getattr(self._local, "uow", None)
+        if uow is not None:
+            # Invalidate again after commit so readers cannot re-cache old rows.
+            uow.cache_keys.add(key)
+        elif getattr(self._local, "session", None) is not None:
+            self._local.group_cache_keys.add(key)
+        self.cache.invalidate(key)
+
+    def _cache_committed(self, key: Optional[str]) -> None:
+        """Drop ``key`` again once a write outside any batch has committed.
+
+        A reader that missed between the first invalidation and the commit
+        may have cached the old row under a fresh stamp.  Inside a unit of
+        work or group commit the key is already queued for after its commit.
+        """
+        if key is None or getattr(self._local, "uow", None) is not None:
+            return
+        if getattr(self._local, "session", None) is None:
+            self.cache.invalidate(key)
+
+    def _cache_invalidate_namespace(self, namespace: str) -> None:
+        uow = getattr(self._local, "uow", None)
+        if uow is not None:
+            uow.cache_namespaces.add(namespace)
+        elif getattr(self._local, "session", None) is not None:
+            self._local.group_cache_namespaces.add(namespace)
+        self.cache.invalidate_namespace(namespace)
+
+    @contextmanager
+    def unit_of_work(self):
+        """Run the enclosed storage calls on one session and identity map.
+
+        Nothing is committed until the block exits; an exception rolls back
+        every change made inside it. Within :meth:`group_commit` the unit of
+        work maps onto a savepoint of the batch session.
+        """
+        if getattr(self._local, "uow", None) is not None:
+            yield
+            return
+        group = getattr(self._local, "session", None)
+        db = group if group is not None else self.session_factory()
+        savepoint = db.begin_nested() if group is not None else None
+        uow = _UnitOfWork(db)
+        self._local.uow = uow
         try:
-            cached = redis_client.get(f"coin:{coin_id}")
+            yield
+            db.flush()
+            if savepoint is not None:
+                savepoint.commit()
+            else:
+                db.commit()
         except Exception:
-            cached = None
-        if cached:
-            return json.loads(cached)
-        db = self._get_session()
+            if savepoint is not None:
+                savepoint.rollback()
+            else:
+                db.rollback()
+            raise
+        finally:
+            self._local.uow = None
+            if group is None:
+                db.close()
+        if group is not None:
+            self._local.group_cache_keys |= uow.cache_keys
+            self._local.group_cache_namespaces |= uow.cache_namespaces
+            self._local.group_dirty |= uow.dirty
+            return
+        self._publish_dirty(uow.dirty)
+        for key in uow.cache_keys:
+            self.cache.invalidate(key)
+        for namespace in uow.cache_namespaces:
+            self.cache.invalidate_namespace(namespace)
+
+    @contextmanager
+    def group_commit(self):
+        if getattr(self._local, "session", None) is not None:
+            yield
+            return
+        db = self.session_factory()
+        self._local.session = db
+        self._local.group_cache_keys = set()
+        self._local.group_cache_namespaces = set()
+        self._local.group_dirty = set()
         try:
-            coin = db.query(Coin).filter(Coin.coin_id == coin_id).first()
-            if coin:
-                data = coin.__dict__.copy()
-                data.pop("_sa_instance_state", None)
-                try:
-                    redis_client.setex(f"coin:{coin_id}", 300, json.dumps(data))
-                except Exception:
-                    pass
-                return data
-            return None
+            yield
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
         finally:
+            self._local.session = None
             db.close()
+        self._publish_dirty(self._local.group_dirty)
+        for key in self._local.group_cache_keys:
+            self.cache.invalidate(key)
+        for namespace in self._local.group_cache_namespaces:
+            self.cache.invalidate_namespace(namespace)
+        self._local.group_cache_keys = set()
+        self._local.group_cache_namespaces = set()
+        self._local.group_dirty = set()
 
-    def set_coin(self, coin_id: str, data: Dict[str, Any]):
+    @contextmanager
+    def transaction(self):
+        db = self._get_session()
         try:
-            redis_client.delete(f"coin:{coin_id}")
+            logging.info("Starting DB transaction")
+            yield db
+            db.commit()
+            logging.info("Transaction committed")
         except Exception:
-            pass
+            db.rollback()
+            logging.error("Transaction rolled back due to failure")
+            raise
+        finally:
+            db.close()
+
+    def get_user(self, name: str) -> Optional[Dict]:
+        key = f"user:{name}"
+        record = self.cache.get(
+            key, lambda: self._load_record("users", name), self._cacheable(key)
+        )
+        return self._decayed(record)
+
+    def set_user(self, name: str, data: Dict):
+        if data.get("karma") is not None:
+            self._decay_ledger().stamp(data)
+        key = f"user:{name}"
+        self._cache_invalidate(key)
+        self._write_record("users", name, data, key)
+
+    def get_all_users(self) -> List[Dict]:
+        return list(self._all_records("users").values())
+
+    @property
+    def karma_decay(self) -> KarmaDecayLedger:
+        return self._decay_ledger()
+
+    def _decay_ledger(self, seen_epoch: int = 0) -> KarmaDecayLedger:
+        """Return the decay ledger, reloaded once it may be out of date.
+
+        Other processes bump the ledger stored in ``system_state``.  It is
+        re-read after ``cache.local_ttl`` seconds, the staleness the user
+        cache already allows, or at once when a row carries a newer epoch.
+        """
+        now = time.monotonic()
+        if (
+            seen_epoch > self._karma_decay.epoch
+            or now - self._karma_decay_checked >= self.cache.local_ttl
+        ):
+            db = self._get_session()
+            try:
+                row = (
+                    db.query(SystemState.value)
+                    .filter(SystemState.key == self.KARMA_DECAY_KEY)
+                    .first()
+                )
+            finally:
+                db.close()
+            if row is not None:
+                ledger = KarmaDecayLedger()
+                ledger.load_state(json.loads(row[0]))
+                self._karma_decay = ledger
+            self._karma_decay_checked = now
+        return self._karma_decay
+
+    def _decayed(self, record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        # Rows without agent karma (web-only accounts) keep their karma_score.
+        if record is not None and record.get("karma") is not None:
+            ledger = self._decay_ledger(record.get(EPOCH_FIELD) or 0)
+            if ledger.materialize(record):
+                record["karma_score"] = float(record["karma"])
+        return record
+
+    def _write_karma_decay(self, db: Session, ledger: KarmaDecayLedger) -> None:
+        row = db.query(SystemState).filter(SystemState.key == self.KARMA_DECAY_KEY).first()
+        value = json.dumps(ledger.state())
+        if row is None:
+            db.add(SystemState(key=self.KARMA_DECAY_KEY, value=value, version=1))
+        else:
+            row.value = value
+            row.version = (row.version or 0) + 1
+
+    def save_karma_decay(self) -> None:
+        """Persist the in-process ledger, e.g. after a snapshot restored it."""
         db = self._get_session()
         try:
-            coin = db.query(Coin).filter(Coin.coin_id == coin_id).first()
-            if coin:
-                for k, v in data.items():
-                    setattr(coin, k, v)
-            else:
-                coin = Coin(coin_id=coin_id, **data)
-                db.add(coin)
+            self._write_karma_decay(db, self._karma_decay)
             db.commit()
         finally:
             db.close()
+        self._karma_decay_checked = time.monotonic()
 
-    def delete_user(self, name: str):
+    def apply_karma_decay(self, factor: Decimal, genesis_decay_years: float) -> None:
+        """Declare one decay epoch; rows catch up when read or written.
+
+        Every ``KARMA_DECAY_MATERIALIZE_EPOCHS`` epochs the pending decay is
+        written back to all rows so ``karma_score`` stays usable in queries.
+        """
         db = self._get_session()
         try:
-            user = db.query(Harmonizer).filter(Harmonizer.username == name).first()
-            if user:
-                db.delete(user)
-                db.commit()
+            row = (
+                db.query(SystemState)
+                .filter(SystemState.key == self.KARMA_DECAY_KEY)
+                .with_for_update()
+                .first()
+            )
+            ledger = KarmaDecayLedger()
+            if row is not None:
+                ledger.load_state(json.loads(row.value))
+            ledger.bump(factor, genesis_decay_years)
+            self._write_karma_decay(db, ledger)
+            db.commit()
         finally:
             db.close()
-
-    def delete_coin(self, coin_id: str):
+        self._karma_decay = ledger
+        self._karma_decay_checked = time.monotonic()
+        if ledger.epoch % max(1, Config.KARMA_DECAY_MATERIALIZE_EPOCHS) == 0:
+            self.materialize_karma_decay()
+
+    def materialize_karma_decay(self) -> None:
+        """Write the pending decay of every row back with one bulk UPDATE."""
+        ledger = self._decay_ledger()
         db = self._get_session()
         try:
-            coin = db.query(Coin).filter(Coin.coin_id == coin_id).first()
-            if coin:
-                db.delete(coin)
-                db.commit()
+            rows = (
+                db.query(
+                    Harmonizer.id,
+                    Harmonizer.username,
+                    Harmonizer.is_genesis,
+                    Harmonizer.created_at,
+                    Harmonizer.agent_fields,
+                    Harmonizer.decay_epoch,
+                )
+                .filter(func.coalesce(Harmonizer.decay_epoch, -1) < ledger.epoch)
+                .with_for_update()
+            )
+            mappings = []
+            for row in rows:
+                fields = dict(row.agent_fields or {})
+                if fields.get("karma") is None:
+                    continue
+                record = {
+                    "karma": fields["karma"],
+                    "is_genesis": row.is_genesis,
+                    "join_time": row.created_at.isoformat() if row.created_at else None,
+                    EPOCH_FIELD: row.decay_epoch,
+                }
+                ledger.materialize(record)
+                fields["karma"] = record["karma"]
+                mappings.append(
+                    {
+                        "id": row.id,
+                        "agent_fields": fields,
+                        "karma_score": float(record["karma"]),
+                        EPOCH_FIELD: record[EPOCH_FIELD],
+                    }
+                )
+                self._mark_dirty("users", row.username)
+            db.bulk_update_mappings(Harmonizer, mappings)
+            db.commit()
         finally:
             db.close()
+        # Every user row may have changed; one generation bump drops them all.
+        self._cache_invalidate_namespace("user")
+
+    def get_coin(self, coin_id: str) -> Optional[Dict[str, Any]]:
+        key = f"coin:{coin_id}"
+        return self.cache.get(
+            key, lambda: self._load_record("coins", coin_id), self._cacheable(key)
+        )
+
+    def set_coin(self, coin_id: str, data: Dict[str, Any]):
+        key = f"coin:{coin_id}"
+        self._cache_invalidate(key)
+        self._write_record("coins", coin_id, data, key)
+
+    def delete_user(self, name: str):
+        self._delete_record("users", name, f"user:{name}")
+
+    def delete_coin(self, coin_id: str):
+        self._delete_record("coins", coin_id, f"coin:{coin_id}")
+
+    # Agent proposal records carry ``votes``, ``target``, ``execution_time``
+    # and naive-UTC ISO deadlines.  The ``proposals`` table keeps votes in
+    # ``ProposalVote`` rows and the remaining fields in ``payload``.
+    _PROPOSAL_PAYLOAD_FIELDS = ("target", "execution_time", "proposal_type")
+
+    @staticmethod
+    def _iso_utc(value: Any) -> Optional[str]:
+        if value is None or isinstance(value, str):
+            return value
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return value.isoformat()
+
+    def _proposal_votes(self, db: Session, ids: List[int]) -> Dict[int, Dict[str, str]]:
+        votes: Dict[int, Dict[str, str]] = {pid: {} for pid in ids}
+        if ids:
+            rows = (
+                db.query(ProposalVote.proposal_id, Harmonizer.username, ProposalVote.vote)
+                .join(Harmonizer, Harmonizer.id == ProposalVote.harmonizer_id)
+                .filter(ProposalVote.proposal_id.in_(ids))
+            )
+            for pid, name, vote in rows:
+                votes[pid][name] = vote
+        return votes
+
+    def _proposal_record(self, proposal: Proposal, votes: Dict[str, str]) -> Dict[str, Any]:
+        payload = dict(proposal.payload or {})
+        return {
+            "proposal_id": str(proposal.id),
+            "title": proposal.title,
+            "description": proposal.description,
+            "status": proposal.status,
+            "payload": payload,
+            "votes": votes,
+            "created_at": self._iso_utc(proposal.created_at),
+            "voting_deadline": self._iso_utc(proposal.voting_deadline),
+            "target": payload.get("target"),
+            "execution_time": payload.get("execution_time"),
+            "proposal_type": payload.get("proposal_type", "general"),
+        }
 
     def get_proposal(self, proposal_id: str) -> Optional[Dict[str, Any]]:
         db = self._get_session()
@@ -3842,11 +4956,10 @@ class SQLAlchemyStorage(AbstractStorage):
             proposal = (
                 db.query(Proposal).filter(Proposal.id == int(proposal_id)).first()
             )
-            if proposal:
-                d = proposal.__dict__.copy()
-                d["proposal_id"] = proposal_id
-                return d
-            return None
+            if proposal is None:
+                return None
+            votes = self._proposal_votes(db, [proposal.id])[proposal.id]
+            return self._proposal_record(proposal, votes)
         finally:
             db.close()
 
@@ -3854,66 +4967,99 @@ class SQLAlchemyStorage(AbstractStorage):
         db = self._get_session()
         try:
             proposal = (
-                db.query(Proposal)
-                .filter(Proposal.id == int(data["proposal_id"]))
-                .first()
+                db.query(Proposal).filter(Proposal.id == int(proposal_id)).first()
             )
-            if proposal:
-                for k, v in data.items():
-                    if k != "proposal_id":
-                        setattr(proposal, k, v)
-            else:
-                data_copy = data.copy()
-                data_copy.pop("proposal_id", None)
-                proposal = Proposal(id=int(proposal_id), **data_copy)
+            payload = dict(data.get("payload") or {})
+            for key in self._PROPOSAL_PAYLOAD_FIELDS:
+                if data.get(key) is not None:
+                    payload[key] = data[key]
+            if proposal is None:
+                author = (
+                    db.query(Harmonizer.id)
+                    .filter(Harmonizer.username == data.get("creator"))
+                    .first()
+                )
+                deadline = data.get("voting_deadline")
+                if isinstance(deadline, str):
+                    deadline = datetime.datetime.fromisoformat(deadline)
+                proposal = Proposal(
+                    id=int(proposal_id),
+                    title=data.get("title") or (data.get("description") or "")[:100],
+                    description=data.get("description"),
+                    author_id=author[0] if author else None,
+                    voting_deadline=deadline,
+                )
                 db.add(proposal)
+                db.flush()
+            else:
+                for key in ("title", "description"):
+                    if key in data:
+                        setattr(proposal, key, data[key])
+            proposal.status = data.get("status", proposal.status)
+            proposal.payload = {**(proposal.payload or {}), **payload}
+            stored = self._proposal_votes(db, [proposal.id])[proposal.id]
+            changed = {
+                name: vote
+                for name, vote in (data.get("votes") or {}).items()
+                if stored.get(name) != vote
+            }
+            if changed:
+                voter_ids = dict(
+                    db.query(Harmonizer.username, Harmonizer.id).filter(
+                        Harmonizer.username.in_(list(changed))
+                    )
+                )
+                db.query(ProposalVote).filter(
+                    ProposalVote.proposal_id == proposal.id,
+                    ProposalVote.harmonizer_id.in_(list(voter_ids.values())),
+                ).delete(synchronize_session=False)
+                for name, vote in changed.items():
+                    if name in voter_ids:
+                        db.add(
+                            ProposalVote(
+                                proposal_id=proposal.id,
+                                harmonizer_id=voter_ids[name],
+                                vote=vote,
+                            )
+                        )
             db.commit()
         finally:
             db.close()
+        self._mark_dirty("proposals", proposal_id)
 
-    def get_marketplace_listing(self, listing_id: str) -> Optional[Dict[str, Any]]:
+    def get_active_proposals(self) -> List[Dict[str, Any]]:
         db = self._get_session()
         try:
-            listing = (
-                db.query(MarketplaceListing)
-                .filter(MarketplaceListing.listing_id == listing_id)
-                .first()
+            rows = (
+                db.query(Proposal)
+                .filter(Proposal.status.in_(ACTIVE_PROPOSAL_STATUSES))
+                .all()
             )
-            return listing.__dict__ if listing else None
+            votes = self._proposal_votes(db, [p.id for p in rows])
+            return [self._proposal_record(p, votes[p.id]) for p in rows]
         finally:
             db.close()
 
-    def set_marketplace_listing(self, listing_id: str, data: Dict[str, Any]):
+    def get_proposals_changed_since(
+        self, since: datetime.datetime
+    ) -> List[Dict[str, Any]]:
+        """Return proposals of any status whose row changed at or after ``since``."""
         db = self._get_session()
         try:
-            listing = (
-                db.query(MarketplaceListing)
-                .filter(MarketplaceListing.listing_id == listing_id)
-                .first()
-            )
-            if listing:
-                for k, v in data.items():
-                    setattr(listing, k, v)
-            else:
-                listing = MarketplaceListing(listing_id=listing_id, **data)
-                db.add(listing)
-            db.commit()
+            rows = db.query(Proposal).filter(Proposal.updated_at >= since).all()
+            votes = self._proposal_votes(db, [p.id for p in rows])
+            return [self._proposal_record(p, votes[p.id]) for p in rows]
         finally:
             db.close()
 
+    def get_marketplace_listing(self, listing_id: str) -> Optional[Dict[str, Any]]:
+        return self._load_record("marketplace_listings", listing_id)
+
+    def set_marketplace_listing(self, listing_id: str, data: Dict[str, Any]):
+        self._write_record("marketplace_listings", listing_id, data)
+
     def delete_marketplace_listing(self, listing_id: str):
-        db = self._get_session()
-        try:
-            listing = (
-                db.query(MarketplaceListing)
-                .filter(MarketplaceListing.listing_id == listing_id)
-                .first()
-            )
-            if listing:
-                db.delete(listing)
-                db.commit()
-        finally:
-            db.close()
+        self._delete_record("marketplace_listings", listing_id)
 
     def sync_to_mainchain(self) -> None:
         """Placeholder for future synchronization with the main chain."""
@@ -3926,6 +5072,8 @@ class InMemoryStorage(AbstractStorage):
         self.coins = {}
         self.proposals = {}
         self.marketplace_listings = {}
+        self._dirty = {kind: set() for kind in SNAPSHOT_KINDS}
+        self.karma_decay = KarmaDecayLedger()
 
     @contextmanager
     def transaction(self):
@@ -3942,40 +5090,78 @@ class InMemoryStorage(AbstractStorage):
             raise
 
     def get_user(self, name: str) -> Optional[Dict[str, Any]]:
-        return self.users.get(name)
+        user = self.users.get(name)
+        if user is not None and self.karma_decay.materialize(user):
+            self._dirty["users"].add(name)
+        return user
 
     def set_user(self, name: str, data: Dict[str, Any]):
+        self.karma_decay.stamp(data)
         self.users[name] = data
+        self._dirty["users"].add(name)
 
     def get_all_users(self) -> List[Dict[str, Any]]:
+        for name, user in self.users.items():
+            if self.karma_decay.materialize(user):
+                self._dirty["users"].add(name)
         return list(self.users.values())
 
+    def apply_karma_decay(self, factor: Decimal, genesis_decay_years: float) -> None:
+        # Records catch up on their next read; see karma_decay.py.
+        self.karma_decay.bump(factor, genesis_decay_years)
+
     def get_coin(self, coin_id: str) -> Optional[Dict[str, Any]]:
         return self.coins.get(coin_id)
 
     def set_coin(self, coin_id: str, data: Dict[str, Any]):
         self.coins[coin_id] = data
+        self._dirty["coins"].add(coin_id)
 
     def delete_user(self, name: str):
         self.users.pop(name, None)
+        self._dirty["users"].add(name)
 
     def delete_coin(self, coin_id: str):
         self.coins.pop(coin_id, None)
+        self._dirty["coins"].add(coin_id)
 
     def get_proposal(self, proposal_id: str) -> Optional[Dict[str, Any]]:
         return self.proposals.get(proposal_id)
 
     def set_proposal(self, proposal_id: str, data: Dict[str, Any]):
         self.proposals[proposal_id] = data
+        self._dirty["proposals"].add(proposal_id)
+
+    def get_active_proposals(self) -> List[Dict[str, Any]]:
+        return [
+            p
+            for p in self.proposals.values()
+            if p.get("status") in ACTIVE_PROPOSAL_STATUSES
+        ]
 
     def get_marketplace_listing(self, listing_id: str) -> Optional[Dict[str, Any]]:
         return self.marketplace_listings.get(listing_id)
 
     def set_marketplace_listing(self, listing_id: str, data: Dict[str, Any]):
         self.marketplace_listings[listing_id] = data
+        self._dirty["marketplace_listings"].add(listing_id)
 
     def delete_marketplace_listing(self, listing_id: str):
         self.marketplace_listings.pop(listing_id, None)
+        self._dirty["marketplace_listings"].add(listing_id)
+
+    def drain_dirty(self) -> Dict[str, Set[str]]:
+        dirty = self._dirty
+        self._dirty = {kind: set() for kind in SNAPSHOT_KINDS}
+        return dirty
+
+    def snapshot_source(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return {kind: getattr(self, kind) for kind in SNAPSHOT_KINDS}
+
+    def bulk_load(self, state: Dict[str, Dict[str, Dict[str, Any]]]):
+        for kind in SNAPSHOT_KINDS:
+            getattr(self, kind).update(state.get(kind, {}))
+        self._dirty = {kind: set() for kind in SNAPSHOT_KINDS}
 
     def sync_to_mainchain(self) -> None:
         """Placeholder for future synchronization with the main chain."""
@@ -0,0 +1,196 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Incremental governance tally index.
+
+A vote weight is ``harmony_score`` times the genesis bonus decay, and the
+decay is linear in time until it reaches zero.  The sum of many linearly
+decaying weights is therefore itself linear in time:
+
+    sum(h * (end - now) / span) == (sum(h * end) - now * sum(h)) / span
+
+so every accumulator keeps a flat sum for non-genesis users plus the two
+linear sums for genesis users, and evaluates them at read time.  Members
+whose decay reached zero are dropped lazily from a heap ordered by ``end``.
+
+``RemixAgent`` feeds the index from the events that change a weight input
+(new users, consent revocation, votes) and rebuilds it after loading state.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+VOTE_CHOICES = ("yes", "no")
+
+ZERO = Decimal("0")
+
+
+class _Accumulator:
+    """Running sum of flat and linearly decaying weights."""
+
+    __slots__ = ("flat", "linear_end", "linear", "members", "heap")
+
+    def __init__(self) -> None:
+        self.flat = ZERO
+        self.linear_end = ZERO
+        self.linear = ZERO
+        self.members: Dict[str, Tuple[Decimal, Optional[Decimal]]] = {}
+        self.heap: List[Tuple[Decimal, str, Decimal]] = []
+
+    def add(self, key: str, weight: Decimal, end: Optional[Decimal]) -> None:
+        self.members[key] = (weight, end)
+        if end is None:
+            self.flat += weight
+        else:
+            self.linear_end += weight * end
+            self.linear += weight
+            heapq.heappush(self.heap, (end, key, weight))
+
+    def remove(self, key: str) -> None:
+        member = self.members.pop(key, None)
+        if member is None:
+            return
+        weight, end = member
+        if end is None:
+            self.flat -= weight
+        else:
+            # The heap entry is left behind and skipped when it surfaces.
+            self.linear_end -= weight * end
+            self.linear -= weight
+
+    def value(self, now: Decimal, span: Decimal) -> Decimal:
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            end, key, weight = heapq.heappop(heap)
+            if self.members.get(key) == (weight, end):
+                del self.members[key]
+                self.linear_end -= weight * end
+                self.linear -= weight
+        if not self.linear:
+            return self.flat
+        return self.flat + (self.linear_end - now * self.linear) / span
+
+
+class _UserWeight:
+    __slots__ = ("species", "consent", "harmony", "end")
+
+    def __init__(
+        self, species: str, consent: bool, harmony: Decimal, end: Optional[Decimal]
+    ) -> None:
+        self.species = species
+        self.consent = consent
+        self.harmony = harmony
+        self.end = end
+
+
+class TallyIndex:
+    """Per-proposal weighted vote sums kept up to date as events apply."""
+
+    def __init__(self, decay_years: float) -> None:
+        self.decay_years = decay_years
+        self._span = Decimal(repr(decay_years * SECONDS_PER_YEAR))
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users: Dict[str, _UserWeight] = {}
+            self._population = _Accumulator()
+            self._votes: Dict[str, Dict[str, str]] = {}
+            self._sums: Dict[str, Dict[Tuple[str, str], _Accumulator]] = {}
+            self._voted: Dict[str, Set[str]] = {}
+
+    def _genesis_end(self, join_ts: Optional[float]) -> Optional[Decimal]:
+        if join_ts is None:
+            return None
+        return Decimal(repr(join_ts)) + self._span
+
+    def _attach(self, proposal_id: str, voter: str) -> None:
+        user = self._users.get(voter)
+        vote = self._votes[proposal_id][voter]
+        if user is None or not user.consent or vote not in VOTE_CHOICES:
+            return
+        if user.end is not None and self._span <= 0:
+            return
+        sums = self._sums[proposal_id]
+        key = (user.species, vote)
+        if key not in sums:
+            sums[key] = _Accumulator()
+        sums[key].add(voter, user.harmony, user.end)
+
+    def _detach(self, proposal_id: str, voter: str) -> None:
+        for acc in self._sums[proposal_id].values():
+            acc.remove(voter)
+
+    def set_user(
+        self,
+        name: str,
+        species: str,
+        consent: bool,
+        harmony: Decimal,
+        join_ts: Optional[float] = None,
+    ) -> None:
+        """Insert or refresh ``name``; ``join_ts`` is only set for genesis users."""
+        with self._lock:
+            self._population.remove(name)
+            end = self._genesis_end(join_ts)
+            self._users[name] = _UserWeight(species, consent, harmony, end)
+            if end is None or self._span > 0:
+                self._population.add(name, harmony, end)
+            for proposal_id in self._voted.get(name, ()):
+                self._detach(proposal_id, name)
+                self._attach(proposal_id, name)
+
+    def remove_user(self, name: str) -> None:
+        with self._lock:
+            self._population.remove(name)
+            self._users.pop(name, None)
+            for proposal_id in self._voted.get(name, ()):
+                self._detach(proposal_id, name)
+
+    def record_vote(self, proposal_id: str, voter: str, vote: str) -> None:
+        """Record or replace ``voter``'s vote on ``proposal_id``."""
+        with self._lock:
+            votes = self._votes.setdefault(proposal_id, {})
+            self._sums.setdefault(proposal_id, {})
+            if voter in votes:
+                self._detach(proposal_id, voter)
+            votes[voter] = vote
+            self._voted.setdefault(voter, set()).add(proposal_id)
+            self._attach(proposal_id, voter)
+
+    def __contains__(self, proposal_id: object) -> bool:
+        with self._lock:
+            return proposal_id in self._votes
+
+    def drop_proposal(self, proposal_id: str) -> None:
+        with self._lock:
+            for voter in self._votes.pop(proposal_id, {}):
+                self._voted.get(voter, set()).discard(proposal_id)
+            self._sums.pop(proposal_id, None)
+
+    def tally(
+        self, proposal_id: str, now: Optional[float] = None
+    ) -> Tuple[Dict[str, Dict[str, Decimal]], Decimal, Decimal]:
+        """Return ``(species_votes, voted_harmony, total_harmony)`` at ``now``."""
+        at = Decimal(repr(time.time() if now is None else now))
+        with self._lock:
+            species_votes: Dict[str, Dict[str, Decimal]] = {}
+            voted = ZERO
+            for (species, vote), acc in self._sums.get(proposal_id, {}).items():
+                weight = acc.value(at, self._span)
+                if not weight:
+                    continue
+                sv = species_votes.setdefault(
+                    species, {"yes": ZERO, "no": ZERO, "total": ZERO}
+                )
+                sv[vote] += weight
+                sv["total"] += weight
+                voted += weight
+            return species_votes, voted, self._population.value(at, self._span)
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import pytest
+
+from async_db import async_engine_url, swap_routes
+
+
+def test_async_engine_url_picks_async_drivers():
+    assert async_engine_url("sqlite:///universe_x.db") == "sqlite+aiosqlite:///universe_x.db"
+    assert async_engine_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert async_engine_url("postgres://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert async_engine_url("postgresql+psycopg2://h/db") == "postgresql+asyncpg://h/db"
+    assert async_engine_url("postgresql+asyncpg://h/db") == "postgresql+asyncpg://h/db"
+    with pytest.raises(ValueError):
+        async_engine_url("oracle://h/db")
+
+
+def _route(path, *methods):
+    return SimpleNamespace(path=path, methods=set(methods))
+
+
+def test_swap_routes_replaces_matching_path_and_method():
+    class App:
+        def __init__(self):
+            self.router = SimpleNamespace(
+                routes=[_route("/status", "GET"), _route("/users/{username}", "GET", "HEAD"), _route("/users/me", "PUT")]
+            )
+
+        def include_router(self, router):
+            self.router.routes.extend(router.routes)
+
+    app = App()
+    router = SimpleNamespace(routes=[_route("/status", "GET"), _route("/users/{username}", "GET")])
+    swap_routes(app, router)
+    swap_routes(app, router)
+    assert [r.path for r in app.router.routes] == ["/users/me", "/status", "/users/{username}"]
+    assert app.router.routes[1] is router.routes[0]
@@ -0,0 +1,56 @@
+import json
+import os
+
+from block_log import BlockLogReader, BlockLogWriter, rotated_segments, writer_for
+
+
+def _entry(i):
+    return {"ts": f"2025-01-01T00:00:{i:02d}+00:00", "level": "block", "pattern": "x", "snippet": f"s{i}"}
+
+
+def test_batched_writes_rotate_and_page_by_time(tmp_path):
+    path = str(tmp_path / "blocked.log")
+    writer = BlockLogWriter(path, max_bytes=400, compress=True, batch_size=4, flush_interval=0.05)
+    for i in range(30):
+        writer.write(_entry(i))
+    assert writer.flush(5)
+
+    segments = rotated_segments(path)
+    assert segments and all(os.path.exists(s + ".gz") for s in segments)
+
+    reader = BlockLogReader(path)
+    assert reader.count() == 30
+    assert [e["snippet"] for e in reader.iter_entries()] == [f"s{i}" for i in range(30)]
+    window = reader.page("2025-01-01T00:00:05+00:00", "2025-01-01T00:00:20+00:00", offset=3, limit=5)
+    assert [e["snippet"] for e in window] == ["s8", "s9", "s10", "s11", "s12"]
+    assert reader.count("2025-01-01T00:00:05+00:00", "2025-01-01T00:00:20+00:00") == 16
+
+
+def test_recover_indexes_unindexed_tail(tmp_path):
+    path = str(tmp_path / "blocked.log")
+    with open(path, "w") as f:
+        for i in range(3):
+            f.write(json.dumps(_entry(i)) + "\n")
+        f.write('{"torn"')
+    writer = BlockLogWriter(path, flush_interval=0.01)
+    writer.write(_entry(3))
+    assert writer.flush(5)
+    assert [e["snippet"] for e in BlockLogReader(path).page()] == ["s0", "s1", "s2", "s3"]
+
+
+def test_writers_sharing_a_log_keep_each_others_entries(tmp_path):
+    path = str(tmp_path / "blocked.log")
+    assert writer_for(path, flush_interval=0.01) is writer_for(path)
+    first = writer_for(path, flush_interval=0.01)
+    first.write(_entry(0))
+    assert first.flush(5)
+    # A second writer (as another process would hold) must not truncate
+    # or misindex the first one's lines, including across a rotation.
+    second = BlockLogWriter(path, max_bytes=400, flush_interval=0.01)
+    for i in range(1, 12):
+        writer = first if i % 2 else second
+        writer.write(_entry(i))
+        assert writer.flush(5)
+    reader = BlockLogReader(path)
+    assert rotated_segments(path)
+    assert [e["snippet"] for e in reader.iter_entries()] == [f"s{i}" for i in range(12)]
@@ -0,0 +1,68 @@
+import pytest
+
+import types
+
+import centrality_service
+from centrality_service import CentralityService, analyze_graph, mark_graph_changed, page
+
+
+def test_page_slices_each_node_type_and_keeps_outgoing_edges():
+    snapshot = {
+        "nodes": [{"id": f"h_{i}", "type": "harmonizer"} for i in range(3)]
+        + [{"id": f"v_{i}", "type": "vibenode"} for i in range(3)],
+        "edges": [
+            {"source": "h_1", "target": "v_0"},
+            {"source": "h_0", "target": "h_1"},
+            {"source": "v_2", "target": "v_0"},
+        ],
+        "metrics": {"node_count": 6},
+    }
+    result = page(snapshot, skip=1, limit=1)
+    assert [n["id"] for n in result["nodes"]] == ["h_1", "v_1"]
+    assert result["edges"] == [{"source": "h_1", "target": "v_0"}]
+    assert result["metrics"] == {"node_count": 6}
+
+
+def test_betweenness_is_sampled_only_above_the_pivot_budget():
+    nx = pytest.importorskip("networkx")
+    if not hasattr(nx, "betweenness_centrality"):
+        pytest.skip("networkx is stubbed out")
+    G = nx.path_graph(20, create_using=nx.DiGraph)
+
+    exact = analyze_graph(G, samples=0)
+    assert exact["betweenness"] == {"approximate": False, "samples": 20}
+    assert analyze_graph(G, samples=50)["betweenness"]["approximate"] is False
+
+    approx = analyze_graph(G, samples=5, seed=1)
+    assert approx["betweenness"] == {"approximate": True, "samples": 5}
+    assert len(approx["nodes"]) == 20
+
+
+class _Store:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def increment(self, key, delta, default="0"):
+        self.values[key] = str(int(self.values.get(key, default)) + delta)
+        return self.values[key]
+
+
+def test_graph_version_bumps_once_per_committed_change():
+    store = _Store()
+    service = CentralityService(lambda: store)
+    session = types.SimpleNamespace(info={})
+    assert service.graph_version() == "0"
+
+    mark_graph_changed(session)
+    mark_graph_changed(session)
+    centrality_service._after_commit(session)
+    assert service.graph_version() == "1"
+
+    centrality_service._after_commit(session)
+    mark_graph_changed(session)
+    centrality_service._after_rollback(session)
+    centrality_service._after_commit(session)
+    assert service.graph_version() == "1"
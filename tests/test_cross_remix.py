@@ -0,0 +1,107 @@
+import importlib
+import importlib.util
+import sys
+import types
+from decimal import Decimal
+
+import pytest
+
+from universe_host import RemoteUniverseError
+
+if importlib.util.find_spec("fastapi") is None or importlib.util.find_spec("sqlalchemy") is None:
+    pytest.skip("cross remix tests need the full superNova_2177 module", allow_module_level=True)
+
+
+@pytest.fixture(scope="module")
+def sn():
+    # conftest installs a lightweight stub; these tests need the real module.
+    stub = sys.modules.pop("superNova_2177", None)
+    real = importlib.import_module("superNova_2177")
+    yield real
+    if stub is not None:
+        sys.modules["superNova_2177"] = stub
+
+
+def _universe(sn, monkeypatch, tmp_path, name, user):
+    monkeypatch.setitem(sys.modules, "superNova_2177", sn)
+    monkeypatch.setattr(sn, "USE_IN_MEMORY_STORAGE", True)
+    agent = sn.RemixAgent(cosmic_nexus=None, filename=str(tmp_path / f"{name}.log"))
+    agent.storage = sn.InMemoryStorage()
+    owner = sn.User(user, True, "human", agent.config)
+    owner.root_coin_id = f"root_{user}"
+    owner.coins_owned.append(owner.root_coin_id)
+    root = sn.Coin(owner.root_coin_id, user, user, Decimal("100"), agent.config, is_root=True)
+    agent.storage.set_user(user, owner.to_dict())
+    agent.storage.set_coin(root.coin_id, root.to_dict())
+    return agent
+
+
+def _nexus(sn, monkeypatch, tmp_path):
+    source = _universe(sn, monkeypatch, tmp_path, "source", "remixer")
+    reference = _universe(sn, monkeypatch, tmp_path, "reference", "creator")
+    art = sn.Coin("art", "creator", "creator", Decimal("5"), reference.config)
+    reference.storage.set_coin("art", art.to_dict())
+    nexus = types.SimpleNamespace(
+        sub_universes={"source": source, "reference": reference}, universe_host=None
+    )
+    nexus._universe_call = lambda fork_id, op, *args: sn.CosmicNexus._universe_call(
+        nexus, fork_id, op, *args
+    )
+    return nexus, source, reference
+
+
+def _remix(sn, nexus):
+    data = {
+        "user": "remixer",
+        "coin_id": "remix",
+        "reference_universe": "reference",
+        "reference_coin": "art",
+        "value": "10",
+        "improvement": "new colours",
+    }
+    sn.CosmicNexus.handle_cross_remix(nexus, data, "source")
+
+
+def _root_value(agent, user):
+    return Decimal(agent.storage.get_coin(f"root_{user}")["value"])
+
+
+def test_cross_remix_pays_creator(sn, monkeypatch, tmp_path):
+    nexus, source, reference = _nexus(sn, monkeypatch, tmp_path)
+    _remix(sn, nexus)
+
+    assert _root_value(source, "remixer") == Decimal("90")
+    assert source.storage.get_coin("remix") is not None
+    share = Decimal("10") * sn.Config.CROSS_REMIX_CREATOR_SHARE
+    assert _root_value(reference, "creator") == Decimal("100") + share
+
+
+def test_failed_credit_refunds_the_remixer(sn, monkeypatch, tmp_path):
+    nexus, source, reference = _nexus(sn, monkeypatch, tmp_path)
+
+    def unreachable(agent, creator, amount):
+        raise RemoteUniverseError("cross_remix_credit on universe reference timed out")
+
+    monkeypatch.setitem(sn.UNIVERSE_OPS, "cross_remix_credit", unreachable)
+    _remix(sn, nexus)
+
+    assert _root_value(source, "remixer") == Decimal("100")
+    assert source.storage.get_coin("remix") is None
+    assert source.treasury == Decimal("0")
+    assert _root_value(reference, "creator") == Decimal("100")
+
+
+def test_creator_removed_before_credit_is_refunded(sn, monkeypatch, tmp_path):
+    nexus, source, reference = _nexus(sn, monkeypatch, tmp_path)
+    target = sn.UNIVERSE_OPS["cross_remix_target"]
+
+    def target_then_leave(agent, coin_id):
+        creator = target(agent, coin_id)
+        agent.storage.delete_user(creator)
+        return creator
+
+    monkeypatch.setitem(sn.UNIVERSE_OPS, "cross_remix_target", target_then_leave)
+    _remix(sn, nexus)
+
+    assert _root_value(source, "remixer") == Decimal("100")
+    assert source.storage.get_coin("remix") is None
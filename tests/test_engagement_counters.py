@@ -0,0 +1,46 @@
+import pytest
+
+import engagement_counters
+from db_models import Comment, Harmonizer, VibeNode
+from engagement_counters import add_comment, entangle, reconcile_counters, toggle_like
+
+pytestmark = pytest.mark.skipif(
+    engagement_counters.update is None, reason="SQLAlchemy is not installed"
+)
+
+
+def _setup(db):
+    users = [
+        Harmonizer(username=f"u{i}", email=f"u{i}@example.com", hashed_password="x")
+        for i in range(2)
+    ]
+    db.add_all(users)
+    db.commit()
+    nodes = [VibeNode(name=f"node{i}", author_id=users[0].id) for i in range(2)]
+    db.add_all(nodes)
+    db.commit()
+    return users, nodes
+
+
+def test_counters_follow_writes_and_reconcile_repairs_drift(test_db):
+    (a, b), (n1, n2) = _setup(test_db)
+
+    assert toggle_like(test_db, n1.id, a.id) is True
+    assert toggle_like(test_db, n1.id, b.id) is True
+    assert toggle_like(test_db, n1.id, a.id) is False
+    add_comment(test_db, Comment(content="hi", author_id=b.id, vibenode_id=n1.id))
+    assert entangle(test_db, n1.id, n2.id) is True
+    assert entangle(test_db, n1.id, n2.id, strength=0.5) is False
+    test_db.commit()
+    test_db.refresh(n1)
+    assert (n1.likes_count, n1.comments_count, n1.entangled_count) == (1, 1, 1)
+
+    n1.likes_count = 7
+    n2.comments_count = 3
+    test_db.commit()
+    assert reconcile_counters(test_db) == 2
+    test_db.refresh(n1)
+    test_db.refresh(n2)
+    assert n1.likes_count == 1
+    assert n2.comments_count == 0
+    assert reconcile_counters(test_db) == 0
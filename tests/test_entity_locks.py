@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+from entity_locks import EntityLocks, LockOrderError
+
+
+def _keys_by_stripe(locks, n):
+    keys = {}
+    i = 0
+    while len(keys) < n:
+        key = ("user", f"u{i}")
+        keys.setdefault(locks.stripe(key), key)
+        i += 1
+    return [keys[s] for s in sorted(keys)]
+
+
+def test_nested_hold_is_reentrant_and_checks_order():
+    locks = EntityLocks(16)
+    low, high = _keys_by_stripe(locks, 2)
+    with locks.hold(low):
+        with locks.hold(low, high):
+            pass
+    with locks.hold(high):
+        with pytest.raises(LockOrderError):
+            with locks.hold(low):
+                pass
+    # everything released: a fresh thread can take both
+    done = threading.Event()
+
+    def take_both():
+        with locks.hold(low, high):
+            done.set()
+
+    threading.Thread(target=take_both).start()
+    assert done.wait(2)
+
+
+def test_opposite_order_requests_do_not_deadlock_and_are_counted():
+    locks = EntityLocks(8)
+    a, b = _keys_by_stripe(locks, 2)
+    counter = {"n": 0}
+
+    def work(keys):
+        for _ in range(200):
+            with locks.hold(*keys):
+                n = counter["n"]
+                time.sleep(0)
+                counter["n"] = n + 1
+
+    threads = [threading.Thread(target=work, args=(ks,)) for ks in ([a, b], [b, a]) * 2]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    assert counter["n"] == 800
+
+    stats = locks.stats()
+    assert stats["acquired"] == 1600
+    assert stats["contended"] > 0
+    assert {s for s, _ in stats["hot_stripes"]} <= {locks.stripe(a), locks.stripe(b)}
@@ -0,0 +1,67 @@
+from event_log import GENESIS_HASH, SegmentedLogChain
+
+
+def _fill(log, n, start=0):
+    return [log.add({"event": "TEST", "n": i}) for i in range(start, start + n)]
+
+
+def test_append_and_reopen(tmp_path):
+    path = str(tmp_path / "chain.log")
+    log = SegmentedLogChain(path)
+    assert _fill(log, 5) == [1, 2, 3, 4, 5]
+    log.close()
+
+    reopened = SegmentedLogChain(path)
+    assert len(reopened) == 5
+    assert reopened.last_hash == log.last_hash
+    assert reopened.add({"event": "TEST", "n": 5}) == 6
+    assert [e["n"] for e in reopened.entries] == list(range(6))
+    assert reopened.verify()
+
+
+def test_replay_from_seq_and_timestamp(tmp_path):
+    log = SegmentedLogChain(str(tmp_path / "chain.log"), segment_max_bytes=256)
+    _fill(log, 20)
+    assert len(log._segments) > 1
+
+    seen = []
+    assert log.replay_events(lambda e: seen.append(e["n"]), start_seq=15) == 6
+    assert seen == list(range(14, 20))
+
+    cutoff = log.get(10).timestamp
+    seen = []
+    log.replay_events(lambda e: seen.append(e["n"]), since=cutoff)
+    assert seen and all(n >= 10 for n in seen)
+    assert log.get(1).previous_hash == GENESIS_HASH
+    assert log.get(99) is None
+
+
+def test_verify_detects_tampering(tmp_path):
+    path = str(tmp_path / "chain.log")
+    log = SegmentedLogChain(path)
+    _fill(log, 3)
+    log.close()
+    seg = log._segment_path(1)
+    with open(seg, "rb") as f:
+        data = f.read()
+    with open(seg, "wb") as f:
+        f.write(data.replace(b'"n":1', b'"n":7'))
+    assert not SegmentedLogChain(path).verify()
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    path = str(tmp_path / "chain.log")
+    log = SegmentedLogChain(path)
+    _fill(log, 3)
+    log.close()
+    with open(log._segment_path(1), "ab") as f:
+        f.write(b"4\t123.0\tabc")
+
+    reader = SegmentedLogChain(path, read_only=True)
+    assert len(reader) == 3
+    assert len(reader.tail(10)) == 3
+
+    recovered = SegmentedLogChain(path)
+    assert len(recovered) == 3
+    assert recovered.add({"event": "TEST", "n": 3}) == 4
+    assert recovered.verify()
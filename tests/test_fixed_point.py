@@ -0,0 +1,49 @@
+from decimal import Decimal
+
+import pytest
+
+from fixed_point import (
+    INT64_MAX,
+    SCALE,
+    format_units,
+    from_units,
+    mul_units,
+    parse_units,
+    scale_units,
+    split_units,
+    to_units,
+)
+
+
+def test_parse_and_format_round_trip():
+    for text in ["0", "1", "-12.5", "0.000001", "1000000", "3.25"]:
+        assert format_units(parse_units(text)) == text
+    assert parse_units(".5") == SCALE // 2
+    assert from_units(parse_units("7.125")) == Decimal("7.125")
+
+
+def test_conversions_round_half_even():
+    assert to_units("0.0000005") == 0
+    assert to_units("0.0000015") == 2
+    assert to_units(Decimal("1E+2")) == 100 * SCALE
+    assert to_units(3) == 3 * SCALE
+    assert mul_units(to_units("0.000001"), to_units("0.5")) == 0
+    assert mul_units(to_units("0.000003"), to_units("0.5")) == 2
+    assert scale_units(to_units("100"), Decimal("0.99")) == to_units("99")
+
+
+def test_split_conserves_value():
+    shares = (Decimal("0.3333"), Decimal("0.3333"), Decimal("0.3334"))
+    for total in ("100", "0.000007", "999999.999999"):
+        parts = split_units(to_units(total), shares)
+        assert sum(parts) == to_units(total)
+    # Shares that do not add up to one are floored independently.
+    assert split_units(to_units("1"), (Decimal("0.5"), Decimal("0.25"))) == [
+        SCALE // 2,
+        SCALE // 4,
+    ]
+
+
+def test_out_of_range_amounts_raise():
+    with pytest.raises(OverflowError):
+        to_units(INT64_MAX)
@@ -0,0 +1,38 @@
+import random
+
+from fuzzy_index import BKTree, bounded_levenshtein
+from scientific_utils import levenshtein_distance
+
+
+def test_bounded_levenshtein_matches_full_distance():
+    rng = random.Random(3)
+    for _ in range(300):
+        a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        limit = rng.randint(0, 4)
+        exact = levenshtein_distance(a, b)
+        assert bounded_levenshtein(a, b, limit) == min(exact, limit + 1)
+
+
+def test_bk_tree_query_matches_brute_force():
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abcd") for _ in range(rng.randint(3, 8))) for _ in range(60)]
+    tree = BKTree(words)
+    ordered = list(dict.fromkeys(words))
+    assert len(tree) == len(ordered)
+    for _ in range(100):
+        probe = "".join(rng.choice("abcd") for _ in range(rng.randint(2, 9)))
+        for threshold in (0, 1, 2):
+            expected = [
+                (levenshtein_distance(probe, w), w)
+                for w in ordered
+                if levenshtein_distance(probe, w) <= threshold
+            ]
+            assert tree.query(probe, threshold) == expected
+
+
+def test_first_returns_earliest_keyword():
+    tree = BKTree(["spam", "scam", "slam"])
+    assert tree.first("sxam", 1) == "spam"
+    assert tree.first("hello", 2) is None
+    assert BKTree([]).query("spam", 2) == []
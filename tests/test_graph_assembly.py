@@ -0,0 +1,51 @@
+from db_models import Harmonizer, VibeNode, harmonizer_follows, vibenode_entanglements, vibenode_likes
+from graph_assembly import build_follow_graph, build_interaction_graph
+
+
+class _Query:
+    def __init__(self, rows):
+        self.rows = rows
+        self.batch = None
+
+    def yield_per(self, n):
+        self.batch = n
+        return iter(self.rows)
+
+
+class _DB:
+    def __init__(self):
+        self.queries = []
+        self.rows = {
+            id(Harmonizer.id): [(1, "ann", "0.5"), (2, "bob", "1.0")],
+            id(harmonizer_follows.c.follower_id): [(1, 2)],
+            id(VibeNode.id): [(10, "song", "2.0", 1)],
+            id(vibenode_likes.c.harmonizer_id): [(2, 10), (1, 10)],
+            id(vibenode_entanglements.c.source_id): [(10, 11, 0.5)],
+        }
+
+    def query(self, *columns):
+        rows = self.rows[id(columns[0])]
+        query = _Query([row[: len(columns)] for row in rows])
+        self.queries.append(query)
+        return query
+
+
+def test_interaction_graph_uses_one_streamed_query_per_table():
+    db = _DB()
+    G = build_interaction_graph(db, batch_size=50)
+    assert len(db.queries) == 5
+    assert all(q.batch == 50 for q in db.queries)
+    assert G.nodes["h_1"]["label"] == "ann"
+    assert G.nodes["v_10"]["echo"] == 2.0
+    assert G.get_edge_data("h_1", "h_2")["type"] == "follow"
+    assert G.get_edge_data("h_1", "v_10")["type"] == "liked"
+    assert G.get_edge_data("h_2", "v_10")["type"] == "liked"
+    assert G.get_edge_data("v_10", "v_11")["strength"] == 0.5
+
+
+def test_follow_graph_keys_by_harmonizer_id():
+    db = _DB()
+    G = build_follow_graph(db)
+    assert len(db.queries) == 2
+    assert set(G.nodes) == {1, 2}
+    assert G.has_edge(1, 2)
@@ -33,3 +33,76 @@ def test_dump_hooks():
     dump = hm.dump_hooks()
     assert "alpha" in dump
     assert dump["alpha"]
+
+
+def test_dispatcher_runs_callbacks_concurrently_with_timeouts():
+    import threading
+    import time
+
+    from hook_dispatcher import HookDispatcher
+
+    dispatcher = HookDispatcher(maxsize=8, timeout=0.2)
+    hm = HookManager(dispatcher=dispatcher)
+    barrier = threading.Barrier(2, timeout=1)
+
+    def left(x):
+        barrier.wait()
+        return x + 1
+
+    def right(x):
+        barrier.wait()
+        return x + 2
+
+    async def slow(x):
+        await asyncio.sleep(5)
+
+    hm.register_hook("event", left)
+    hm.register_hook("event", right)
+    hm.register_hook("event", slow)
+
+    assert hm.fire_hooks("event", 1) == []
+    assert hm.dispatch("event", 10).result(2) == [11, 12, None]
+    assert hm.dispatch("unbound", 1) is None
+    assert dispatcher.drain(2)
+    stats = dispatcher.stats()
+    assert stats["completed"] == 2 and stats["queued"] == 0
+    assert stats["timeouts"] == 2 and stats["max_run"] >= 0.2
+    dispatcher.close(2)
+
+
+def test_dispatcher_drops_when_full_only_if_asked():
+    import threading
+
+    from hook_dispatcher import HookDispatcher
+
+    gate = threading.Event()
+    dispatcher = HookDispatcher(maxsize=1, timeout=2, put_timeout=0)
+    assert dispatcher.submit([lambda: gate.wait(2)]) is not None
+    assert dispatcher.submit([lambda: None]) is None
+    gate.set()
+    assert dispatcher.drain(2)
+    assert dispatcher.stats()["dropped"] == 1
+    dispatcher.close(2)
+
+
+def test_dispatcher_waits_for_a_slot_by_default():
+    import threading
+
+    from hook_dispatcher import HookDispatcher
+
+    gate = threading.Event()
+    dispatcher = HookDispatcher(maxsize=1, timeout=2)
+    results = []
+
+    def nested():
+        # Fired from a callback while the queue is full: queued, not dropped.
+        results.append(dispatcher.submit([lambda: "nested"]) is not None)
+
+    assert dispatcher.submit([lambda: gate.wait(2), nested]) is not None
+    threading.Timer(0.1, gate.set).start()
+    assert dispatcher.submit([lambda: None]).result(2) == [None]
+    assert dispatcher.drain(2)
+    assert results == [True]
+    assert dispatcher.stats()["dropped"] == 0
+    dispatcher.close(2)
+    dispatcher.close(2)
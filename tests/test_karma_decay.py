@@ -0,0 +1,63 @@
+import datetime
+import types
+from decimal import Decimal
+
+import agent_core
+from fixed_point import format_units, scale_units, to_units
+from karma_decay import KarmaDecayLedger, genesis_decay_at
+from scientific_utils import calculate_genesis_bonus_decay
+
+UTC = datetime.timezone.utc
+
+
+def test_lazy_decay_matches_eager_sweeps():
+    ledger = KarmaDecayLedger()
+    join = "2023-03-01T00:00:00Z"
+    plain = {"karma": "123.456"}
+    genesis = {"karma": "1000", "is_genesis": True, "join_time": join}
+    ledger.stamp(plain)
+    ledger.stamp(genesis)
+
+    eager_plain, eager_genesis = plain["karma"], genesis["karma"]
+    factors = [Decimal("0.99"), Decimal("0.99"), Decimal("0.95")]
+    for day, factor in enumerate(factors):
+        at = datetime.datetime(2025, 1, 1 + day, tzinfo=UTC)
+        ledger.bump(factor, 4, at)
+        # What the eager sweep did through User.karma on every record.
+        eager_plain = format_units(scale_units(to_units(eager_plain), factor))
+        bonus = genesis_decay_at(join, 4, at)
+        eager_genesis = format_units(
+            scale_units(scale_units(to_units(eager_genesis), factor), bonus)
+        )
+
+    assert ledger.materialize(plain) and ledger.materialize(genesis)
+    assert plain == {"karma": eager_plain, "decay_epoch": 3}
+    assert genesis["karma"] == eager_genesis
+    assert not ledger.materialize(plain)
+
+
+def test_genesis_decay_at_now_matches_scientific_model():
+    join = datetime.datetime(2024, 6, 1, tzinfo=UTC)
+    lazy = genesis_decay_at(join.isoformat(), 4, datetime.datetime.now(UTC))
+    assert abs(lazy - calculate_genesis_bonus_decay(join, 4)) < Decimal("1e-6")
+
+
+def test_state_round_trip_and_new_records_are_current():
+    ledger = KarmaDecayLedger()
+    ledger.bump(Decimal("0.5"), 4)
+    late = {"karma": "10"}
+    ledger.stamp(late)
+    restored = KarmaDecayLedger()
+    restored.load_state(ledger.state())
+    assert restored.epoch == 1
+    assert not restored.materialize(late)
+    assert late["karma"] == "10"
+
+
+def test_daily_decay_event_is_an_epoch_bump():
+    calls = []
+    storage = types.SimpleNamespace(apply_karma_decay=lambda *args: calls.append(args))
+    config = types.SimpleNamespace(DAILY_DECAY=Decimal("0.99"), GENESIS_BONUS_DECAY_YEARS=4)
+    dummy = types.SimpleNamespace(storage=storage, config=config)
+    agent_core.RemixAgent._apply_DAILY_DECAY(dummy, {"event": "DAILY_DECAY"})
+    assert calls == [(Decimal("0.99"), 4)]
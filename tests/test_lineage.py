@@ -0,0 +1,59 @@
+import pytest
+
+import lineage
+from db_models import Harmonizer, VibeNode
+from lineage import ancestors, descendants, ensure_lineage, rebuild_lineage, record_vibenode
+
+pytestmark = pytest.mark.skipif(lineage.select is None, reason="SQLAlchemy is not installed")
+
+
+def _tree(db):
+    """root -> a -> b -> c, plus root -> d."""
+    user = Harmonizer(username="remixer", email="remixer@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    ids = {}
+    for name, parent in (("root", None), ("a", "root"), ("b", "a"), ("c", "b"), ("d", "root")):
+        node = VibeNode(name=name, author_id=user.id, parent_vibenode_id=ids.get(parent))
+        db.add(node)
+        db.flush()
+        record_vibenode(db, node.id, node.parent_vibenode_id)
+        ids[name] = node.id
+    db.commit()
+    return ids
+
+
+def test_closure_answers_ancestry_and_descendants(test_db):
+    ids = _tree(test_db)
+
+    assert ancestors(test_db, ids["c"]) == [(ids["b"], 1), (ids["a"], 2), (ids["root"], 3)]
+    assert ancestors(test_db, ids["c"], max_depth=2) == [(ids["b"], 1), (ids["a"], 2)]
+    assert ancestors(test_db, ids["root"]) == []
+    assert descendants(test_db, ids["root"], max_depth=1) == [(ids["a"], 1), (ids["d"], 1)]
+    assert descendants(test_db, ids["root"], offset=1, limit=2) == [(ids["d"], 1), (ids["b"], 2)]
+    assert lineage._cte_ancestors(test_db, ids["c"], None) == ancestors(test_db, ids["c"])
+    assert lineage._cte_descendants(test_db, ids["root"], None, 0, None) == descendants(
+        test_db, ids["root"]
+    )
+
+
+def test_rebuild_restores_closure(test_db):
+    ids = _tree(test_db)
+    before = descendants(test_db, ids["root"])
+
+    assert rebuild_lineage(test_db) == 12
+    assert descendants(test_db, ids["root"]) == before
+    assert ancestors(test_db, ids["c"])[-1] == (ids["root"], 3)
+
+
+def test_unrecorded_nodes_fall_back_and_are_backfilled(test_db):
+    ids = _tree(test_db)
+    test_db.execute(lineage.delete(lineage.vibenode_lineage))
+    test_db.commit()
+
+    assert ancestors(test_db, ids["c"]) == [(ids["b"], 1), (ids["a"], 2), (ids["root"], 3)]
+    assert descendants(test_db, ids["a"]) == [(ids["b"], 1), (ids["c"], 2)]
+
+    assert ensure_lineage(test_db) == 12
+    assert ensure_lineage(test_db) == 0
+    assert ancestors(test_db, ids["c"])[-1] == (ids["root"], 3)
@@ -0,0 +1,64 @@
+from nonce_store import NonceStore
+
+
+class Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_duplicates_rejected_until_bucket_expires():
+    clock = Clock()
+    store = NonceStore(ttl=60, bucket_seconds=10, clock=clock)
+    assert store.add("a")
+    assert not store.add("a")
+    clock.now = 55
+    assert "a" in store
+    assert not store.add("a")
+    # Duplicates do not extend the window: "a" expires with its first bucket.
+    clock.now = 65
+    assert "a" not in store
+    assert store.add("a")
+    assert len(store) == 1
+
+
+def test_nonce_at_bucket_end_is_kept_for_full_ttl():
+    clock = Clock(3599)
+    store = NonceStore(ttl=3600, bucket_seconds=3600, clock=clock)
+    assert store.add("n1")
+    # The window slides into the next bucket two seconds later.
+    clock.now = 3601
+    assert "n1" in store
+    assert not store.add("n1")
+    clock.now = 3599 + 3599
+    assert not store.add("n1")
+    clock.now = 3599 + 3600
+    assert store.add("n1")
+
+
+def test_whole_buckets_are_dropped():
+    clock = Clock()
+    store = NonceStore(ttl=20, bucket_seconds=10, clock=clock)
+    for i in range(100):
+        store.add(f"n{i}")
+    clock.now = 30
+    store.add("fresh")
+    assert len(store) == 1
+    assert len(store._generations) == 1
+
+
+def test_bloom_front_persists(tmp_path):
+    path = str(tmp_path / "nonces.bloom")
+    clock = Clock(1000)
+    store = NonceStore(60, 10, bloom_capacity=1000, bloom_path=path, clock=clock)
+    assert store.add("x")
+    assert not store.add("x")
+    assert not store.bloom.might_contain("never-added")
+    store.save()
+
+    restored = NonceStore(60, 10, bloom_capacity=1000, bloom_path=path, clock=clock)
+    assert restored.bloom.might_contain("x")
+    # The exact map is empty after a restart; only the filter is restored.
+    assert restored.add("x")
@@ -0,0 +1,150 @@
+import random
+import threading
+from decimal import Decimal
+
+import parallel_replay
+from event_log import SegmentedLogChain
+from parallel_replay import ParallelReplayer
+
+
+class Storage:
+    def __init__(self, users=None, coins=None):
+        self.users = dict(users or {})
+        self.coins = dict(coins or {})
+        self.proposals = {}
+        self.marketplace_listings = {}
+
+    def get_user(self, name):
+        return self.users.get(name)
+
+    def set_user(self, name, data):
+        self.users[name] = data
+
+    def delete_user(self, name):
+        self.users.pop(name, None)
+
+    def get_coin(self, coin_id):
+        return self.coins.get(coin_id)
+
+    def set_coin(self, coin_id, data):
+        self.coins[coin_id] = data
+
+    def delete_coin(self, coin_id):
+        self.coins.pop(coin_id, None)
+
+    def get_all_users(self):
+        return list(self.users.values())
+
+    def snapshot_source(self):
+        return {
+            "users": self.users,
+            "coins": self.coins,
+            "proposals": self.proposals,
+            "marketplace_listings": self.marketplace_listings,
+        }
+
+
+class Agent:
+    def __init__(self, logchain, names):
+        self.logchain = logchain
+        self.lock = threading.RLock()
+        self.treasury = Decimal("0")
+        self.total_system_karma = Decimal("0")
+        self.storage = Storage(
+            {n: {"name": n, "karma": 0, "root_coin_id": f"root_{n}"} for n in names},
+            {f"root_{n}": {"creator": n, "value": 1000} for n in names},
+        )
+
+    def _apply_event(self, event):
+        getattr(self, f"_apply_{event['event']}")(event)
+
+    def _apply_STAKE_KARMA(self, event):
+        user = dict(self.storage.get_user(event["user"]))
+        user["karma"] += event["amount"]
+        self.storage.set_user(event["user"], user)
+        self.total_system_karma += event["amount"]
+
+    def _apply_MINT(self, event):
+        root = dict(self.storage.get_coin(event["root_coin_id"]))
+        root["value"] -= event["value"]
+        self.storage.set_coin(event["root_coin_id"], root)
+        self.storage.set_coin(event["coin_id"], {"creator": event["user"], "reactions": 0})
+        self.treasury += Decimal(event["value"]) / 3
+
+    def _apply_REACT(self, event):
+        coin = self.storage.get_coin(event["coin_id"])
+        if not coin:
+            return
+        coin = dict(coin, reactions=coin["reactions"] + 1)
+        self.storage.set_coin(event["coin_id"], coin)
+        for name, gain in ((event["reactor"], 1), (coin["creator"], 2)):
+            user = dict(self.storage.get_user(name))
+            user["karma"] += gain
+            self.storage.set_user(name, user)
+
+    def _apply_DAILY_DECAY(self, event):
+        for user in self.storage.get_all_users():
+            self.storage.set_user(user["name"], dict(user, karma=user["karma"] // 2))
+
+
+def _events(names, count, seed=7):
+    rng = random.Random(seed)
+    coins = []
+    out = []
+    for i in range(count):
+        roll = rng.random()
+        name = rng.choice(names)
+        if roll < 0.3:
+            coin_id = f"c{i}"
+            coins.append(coin_id)
+            out.append({"event": "MINT", "user": name, "root_coin_id": f"root_{name}", "coin_id": coin_id, "value": 3})
+        elif roll < 0.6 and coins:
+            out.append({"event": "REACT", "reactor": name, "coin_id": rng.choice(coins)})
+        elif roll < 0.995:
+            out.append({"event": "STAKE_KARMA", "user": name, "amount": rng.randint(1, 5)})
+        else:
+            out.append({"event": "DAILY_DECAY"})
+    return out
+
+
+def _state(agent):
+    return agent.storage.users, agent.storage.coins, agent.treasury, agent.total_system_karma
+
+
+def test_parallel_replay_matches_sequential(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallel_replay, "MIN_PARALLEL_EVENTS", 50)
+    names = [f"user{i}" for i in range(40)]
+    log = SegmentedLogChain(str(tmp_path / "chain.log"))
+    log.add_batch(_events(names, 3000))
+
+    sequential = Agent(log, names)
+    log.replay_events(sequential._apply_event)
+
+    parallel = Agent(log, names)
+    replayer = ParallelReplayer(parallel, workers=2)
+    assert replayer.replay() == 3000
+    assert replayer.stats["parallel"] > 0
+    assert _state(parallel) == _state(sequential)
+
+
+def test_conflicting_partition_falls_back(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallel_replay, "MIN_PARALLEL_EVENTS", 10)
+    names = ["alice", "bob"]
+    log = SegmentedLogChain(str(tmp_path / "chain.log"))
+    # STAKE_KARMA is keyed by its user only; the handler below also reads
+    # the other user, which verification must catch.
+    events = [{"event": "STAKE_KARMA", "user": n, "amount": 1} for n in names * 10]
+    log.add_batch(events)
+
+    class Sneaky(Agent):
+        def _apply_STAKE_KARMA(self, event):
+            super()._apply_STAKE_KARMA(event)
+            other = "bob" if event["user"] == "alice" else "alice"
+            self.storage.get_user(other)
+
+    agent = Sneaky(log, names)
+    replayer = ParallelReplayer(agent, workers=2)
+    replayer.replay()
+    assert replayer.stats["fallbacks"] == 1
+    assert agent.storage.users["alice"]["karma"] == 10
+    assert agent.total_system_karma == 20
@@ -0,0 +1,145 @@
+import threading
+import types
+
+import pytest
+
+import agent_core
+from event_log import SegmentedLogChain
+from hook_manager import HookManager
+from moderation_utils import Vaccine
+from nonce_store import NonceStore
+
+
+class Blocked(Exception):
+    pass
+
+
+def _agent(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent_core, "ts", lambda: "1970-01-01T00:00:00Z", raising=False)
+    monkeypatch.setattr(agent_core, "BlockedContentError", Blocked, raising=False)
+    config = types.SimpleNamespace(
+        SNAPSHOT_INTERVAL=100, VAX_PATTERNS={"block": [r"\b(blocked_word)\b"]}
+    )
+    applied = []
+
+    def simple_process(event):
+        if event.get("fail"):
+            raise RuntimeError("boom")
+        applied.append(event["n"])
+
+    dummy = types.SimpleNamespace(
+        config=config,
+        vaccine=Vaccine(config),
+        lock=threading.RLock(),
+        processed_nonces=NonceStore(86400, 3600),
+        logchain=SegmentedLogChain(str(tmp_path / "chain.log")),
+        storage=object(),
+        hooks=HookManager(),
+        event_count=0,
+        _use_simple=True,
+        _simple_process_event=simple_process,
+        applied=applied,
+    )
+    dummy._ingest_batch = lambda events: agent_core.RemixAgent._ingest_batch(dummy, events)
+    dummy._storage_scope = lambda name: agent_core.RemixAgent._storage_scope(dummy, name)
+    return dummy
+
+
+def test_batch_matches_sequential_semantics(tmp_path, monkeypatch):
+    agent = _agent(tmp_path, monkeypatch)
+    fired = []
+    agent.hooks.register_hook("POST", lambda e: fired.append(e["n"]))
+    batch = [
+        {"event": "POST", "nonce": "a", "n": 1},
+        {"event": "POST", "nonce": "a", "n": 2},
+        {"event": "POST", "nonce": "b", "n": 3, "fail": True},
+        {"event": "POST", "nonce": "c", "n": 4},
+    ]
+    agent_core.RemixAgent.process_events(agent, batch)
+
+    assert [e["n"] for e in agent.logchain.entries] == [1, 3, 4]
+    assert agent.applied == [1, 4]
+    assert agent.event_count == 2
+    assert fired == [1, 4]
+    assert all(n in agent.processed_nonces for n in "abc")
+    assert len(agent.processed_nonces) == 3
+
+
+def test_blocked_event_stops_the_batch(tmp_path, monkeypatch):
+    agent = _agent(tmp_path, monkeypatch)
+    batch = [
+        {"event": "POST", "nonce": "a", "n": 1},
+        {"event": "POST", "nonce": "b", "n": 2, "text": "blocked_word"},
+        {"event": "POST", "nonce": "c", "n": 3},
+    ]
+    with pytest.raises(Blocked):
+        agent_core.RemixAgent.process_events(agent, batch)
+    assert agent.applied == [1]
+    assert len(agent.logchain) == 1
+    assert "c" not in agent.processed_nonces
+
+
+def test_each_event_runs_in_its_own_unit_of_work(tmp_path, monkeypatch):
+    import contextlib
+
+    agent = _agent(tmp_path, monkeypatch)
+    scopes = []
+
+    class Storage:
+        @contextlib.contextmanager
+        def group_commit(self):
+            scopes.append("group")
+            yield
+
+        @contextlib.contextmanager
+        def unit_of_work(self):
+            try:
+                yield
+                scopes.append("commit")
+            except Exception:
+                scopes.append("rollback")
+                raise
+
+    agent.storage = Storage()
+    batch = [
+        {"event": "POST", "nonce": "a", "n": 1},
+        {"event": "POST", "nonce": "b", "n": 2, "fail": True},
+    ]
+    agent_core.RemixAgent.process_events(agent, batch)
+    assert scopes == ["group", "commit", "rollback"]
+    assert agent.applied == [1]
+
+
+def test_entity_locks_are_held_until_the_commit(tmp_path, monkeypatch):
+    import contextlib
+
+    from entity_locks import EntityLocks
+
+    agent = _agent(tmp_path, monkeypatch)
+    agent._use_simple = False
+    agent.entity_locks = EntityLocks(16)
+    agent._apply_event = lambda e: agent_core.RemixAgent._apply_event(agent, e)
+    agent._apply_STAKE_KARMA = lambda e: agent.applied.append(e["n"])
+    stripe = agent.entity_locks.stripe(("user", "alice"))
+    held_at_commit = []
+
+    class Storage:
+        @contextlib.contextmanager
+        def group_commit(self):
+            yield
+            held_at_commit.append(len(agent.entity_locks._held()))
+
+        @contextlib.contextmanager
+        def unit_of_work(self):
+            yield
+            held_at_commit.append(stripe in agent.entity_locks._held())
+
+    agent.storage = Storage()
+    event = {"event": "STAKE_KARMA", "nonce": "a", "n": 1, "user": "alice"}
+    agent_core.RemixAgent.process_event(agent, event)
+    assert agent.applied == [1]
+    assert held_at_commit == [True]
+
+    agent_core.RemixAgent.process_events(agent, [dict(event, nonce="b", n=2)])
+    assert held_at_commit == [True, True, 16]
+    assert agent.entity_locks._held() == []
@@ -0,0 +1,102 @@
+import asyncio
+import datetime
+import threading
+import time
+import types
+
+import agent_core
+from proposal_scheduler import ProposalScheduler
+
+
+def _iso(seconds_from_now):
+    return (
+        datetime.datetime.utcnow() + datetime.timedelta(seconds=seconds_from_now)
+    ).isoformat()
+
+
+def test_pop_due_in_deadline_order_with_reschedule():
+    scheduler = ProposalScheduler()
+    base = datetime.datetime(2030, 1, 1, tzinfo=datetime.timezone.utc)
+    for pid, minutes in [("c", 30), ("a", 10), ("b", 20)]:
+        scheduler.schedule(pid, base + datetime.timedelta(minutes=minutes))
+    scheduler.schedule("a", base + datetime.timedelta(minutes=40))
+    scheduler.discard("b")
+    assert len(scheduler) == 2
+    assert scheduler.next_due() == (base + datetime.timedelta(minutes=30)).timestamp()
+    assert scheduler.pop_due(base.timestamp() + 35 * 60) == ["c"]
+    assert scheduler.pop_due(base.timestamp() + 50 * 60) == ["a"]
+    assert scheduler.next_due() is None
+
+
+def test_wait_wakes_for_earlier_deadline():
+    scheduler = ProposalScheduler()
+    scheduler.schedule("late", _iso(3600))
+
+    async def run():
+        start = time.monotonic()
+        task = asyncio.create_task(scheduler.wait())
+        await asyncio.sleep(0.01)
+        threading.Thread(target=scheduler.schedule, args=("soon", _iso(0.05))).start()
+        await task
+        await scheduler.wait()
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) < 5
+    assert scheduler.pop_due() == ["soon"]
+
+
+def test_lifecycle_reads_only_due_proposals():
+    class Storage:
+        def __init__(self):
+            self.reads = []
+            self.proposals = {
+                "due": {"proposal_id": "due", "status": "open", "voting_deadline": _iso(-1)},
+                "later": {"proposal_id": "later", "status": "open", "voting_deadline": _iso(3600)},
+            }
+
+        def get_proposal(self, pid):
+            self.reads.append(pid)
+            return self.proposals.get(pid)
+
+    advanced = []
+    scheduler = ProposalScheduler()
+    dummy = types.SimpleNamespace(
+        storage=Storage(),
+        proposal_scheduler=scheduler,
+        _advance_proposal=advanced.append,
+    )
+    scheduler.rebuild(dummy.storage.proposals.values())
+    agent_core.RemixAgent._process_proposal_lifecycle(dummy)
+    assert dummy.storage.reads == ["due"]
+    assert [p["proposal_id"] for p in advanced] == ["due"]
+    assert len(scheduler) == 1
+
+
+def test_schedule_changed_proposals_reads_only_changed_rows():
+    class Storage:
+        def __init__(self):
+            self.since = []
+            self.changed = [
+                {"proposal_id": "new", "status": "open", "voting_deadline": _iso(60)},
+                {"proposal_id": "closed", "status": "rejected", "voting_deadline": _iso(60)},
+            ]
+
+        def get_active_proposals(self):
+            raise AssertionError("full rescan")
+
+        def get_proposals_changed_since(self, since):
+            self.since.append(since)
+            return self.changed
+
+    scheduler = ProposalScheduler()
+    scheduler.schedule("closed", _iso(30))
+    checked = datetime.datetime(2020, 1, 1)
+    dummy = types.SimpleNamespace(
+        storage=Storage(), proposal_scheduler=scheduler, _proposals_checked_at=checked
+    )
+    agent_core.RemixAgent.schedule_changed_proposals(dummy, 300)
+
+    assert dummy.storage.since == [checked - datetime.timedelta(seconds=300)]
+    assert dummy._proposals_checked_at > checked
+    assert len(scheduler) == 1
+    assert scheduler.next_due() is not None
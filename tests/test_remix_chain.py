@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from db_models import LogEntry
+from remix_chain import ChainAppender, merkle_proof, merkle_root, verify_proof, verify_range
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 8])
+def test_merkle_proofs_link_every_leaf_to_the_root(size):
+    hashes = [f"{i:064x}" for i in range(size)]
+    root = merkle_root(hashes)
+    for i, h in enumerate(hashes):
+        assert verify_proof(h, merkle_proof(hashes, i), root)
+    assert not verify_proof("f" * 64, merkle_proof(hashes, 0), root)
+
+
+@pytest.mark.skipif(not hasattr(LogEntry, "__table__"), reason="SQLAlchemy is not installed")
+def test_appender_chains_batches_and_checkpoints(test_db):
+    chain = ChainAppender(lambda: test_db, checkpoint_every=4, batch_size=3)
+    futures = [chain.append("vibenode_remix", json.dumps({"n": i})) for i in range(10)]
+    results = [f.result(5) for f in futures]
+    chain.close(5)
+
+    entries = test_db.query(LogEntry).order_by(LogEntry.id).all()
+    assert [e.current_hash for e in entries] == [h for _, h in results]
+    assert entries[0].previous_hash == ""
+    assert all(b.previous_hash == a.current_hash for a, b in zip(entries, entries[1:]))
+    assert entries[5].verify(test_db)
+    assert entries[9].verify(test_db)
+    assert verify_range(test_db, entries[0].id, entries[-1].id)
+
+    entries[2].payload = "tampered"
+    test_db.commit()
+    assert not entries[2].verify(test_db)
+    assert not verify_range(test_db, entries[0].id, entries[3].id)
+
+
+@pytest.mark.skipif(not hasattr(LogEntry, "__table__"), reason="SQLAlchemy is not installed")
+def test_stale_head_reloads_instead_of_forking(test_db):
+    from sqlalchemy.orm import sessionmaker
+
+    factory = sessionmaker(bind=test_db.get_bind())
+    first, second = ChainAppender(factory), ChainAppender(factory)
+    first.record("vibenode_remix", "a", timeout=5)
+    second.record("vibenode_remix", "b", timeout=5)
+    # ``first`` still caches "a" as the head, which "b" already extends.
+    first.record("vibenode_remix", "c", timeout=5)
+    first.close(5)
+    second.close(5)
+
+    entries = test_db.query(LogEntry).order_by(LogEntry.id).all()
+    assert [e.payload for e in entries] == ["a", "b", "c"]
+    assert all(b.previous_hash == a.current_hash for a, b in zip(entries, entries[1:]))
@@ -0,0 +1,42 @@
+from snapshot_store import IncrementalSnapshotStore, collect_entities, encode_chunk
+
+
+def _meta(seq):
+    return {"treasury": "1", "total_system_karma": "2", "last_seq": seq}
+
+
+def test_delta_chunks_merge_with_tombstones(tmp_path):
+    store = IncrementalSnapshotStore(str(tmp_path / "snap.d"))
+    source = {"users": {"alice": {"karma": "1"}, "bob": {"karma": "2"}}, "coins": {}}
+    store.write(encode_chunk(collect_entities(source)), _meta(2), base=True)
+
+    source["users"]["alice"] = {"karma": "5"}
+    del source["users"]["bob"]
+    source["coins"]["c1"] = {"owner": "alice", "value": "10"}
+    dirty = {"users": {"alice", "bob"}, "coins": {"c1"}}
+    store.write(encode_chunk(collect_entities(source, dirty)), _meta(4))
+
+    manifest, state = IncrementalSnapshotStore(str(tmp_path / "snap.d")).load()
+    assert manifest["last_seq"] == 4
+    assert len(manifest["chunks"]) == 2
+    assert state["users"] == {"alice": {"karma": "5"}}
+    assert state["coins"] == {"c1": {"owner": "alice", "value": "10"}}
+    assert state["proposals"] == {}
+
+
+def test_base_chunk_compacts_history(tmp_path):
+    store = IncrementalSnapshotStore(str(tmp_path / "snap.d"), max_chunks=2)
+    source = {"users": {"alice": {"karma": "1"}}}
+    assert store.needs_base()
+    store.write(encode_chunk(collect_entities(source)), _meta(1), base=True)
+    store.write(encode_chunk(collect_entities(source, {"users": ["alice"]})), _meta(2))
+    assert store.needs_base()
+
+    store.write(encode_chunk(collect_entities(source)), _meta(3), base=True)
+    manifest, state = store.load()
+    assert manifest["chunks"] == ["00000003.chunk"]
+    assert sorted(p.name for p in (tmp_path / "snap.d").iterdir()) == [
+        "00000003.chunk",
+        "manifest.json",
+    ]
+    assert state["users"] == {"alice": {"karma": "1"}}
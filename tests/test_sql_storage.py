@@ -0,0 +1,247 @@
+import datetime
+import importlib
+import importlib.util
+import sys
+import uuid
+
+import pytest
+
+import parallel_replay
+
+if importlib.util.find_spec("fastapi") is None or importlib.util.find_spec("sqlalchemy") is None:
+    pytest.skip("SQL storage tests need FastAPI and SQLAlchemy", allow_module_level=True)
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture(scope="module")
+def sn():
+    # conftest installs a lightweight stub; these tests need the real module.
+    stub = sys.modules.pop("superNova_2177", None)
+    real = importlib.import_module("superNova_2177")
+    yield real
+    if stub is not None:
+        sys.modules["superNova_2177"] = stub
+
+
+def _session_factory(sn, path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    sn.Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _sql_agent(sn, monkeypatch, tmp_path, db_name, snapshot="snapshot.json"):
+    monkeypatch.setitem(sys.modules, "superNova_2177", sn)
+    Session = _session_factory(sn, tmp_path / db_name)
+    monkeypatch.setattr(sn, "SessionLocal", Session)
+    monkeypatch.setattr(sn, "USE_IN_MEMORY_STORAGE", False)
+    nexus = sn.CosmicNexus(Session, sn.SystemStateService(Session()))
+    return sn.RemixAgent(
+        cosmic_nexus=nexus,
+        filename=str(tmp_path / "chain.log"),
+        snapshot=str(tmp_path / snapshot),
+    )
+
+
+def _event(sn, **data):
+    data.setdefault("nonce", uuid.uuid4().hex)
+    data.setdefault("timestamp", sn.ts())
+    return data
+
+
+def _mint(sn, agent, user, coin_id):
+    root = agent.storage.get_user(user)["root_coin_id"]
+    return _event(
+        sn,
+        event="MINT",
+        user=user,
+        coin_id=coin_id,
+        value="10",
+        root_coin_id=root,
+        references=[],
+        improvement="",
+        fractional_pct="0.0",
+        ancestors=[],
+        is_remix=False,
+        content="art",
+        genesis_creator=None,
+        karma_spent="0",
+    )
+
+
+def _records(storage, kind):
+    records = dict(storage.snapshot_source()[kind])
+    for record in records.values():
+        # Row ids and insert times belong to the database, not the agent;
+        # karma_score is a float mirror whose genesis decay uses insert time.
+        for field in ("id", "join_time", "last_passive_aura_timestamp", "karma_score"):
+            record.pop(field, None)
+    return records
+
+
+def test_save_snapshot_then_load_state_restores_sql_storage(sn, monkeypatch, tmp_path):
+    agent = _sql_agent(sn, monkeypatch, tmp_path, "source.db")
+    agent.process_event(_event(sn, event="ADD_USER", user="alice", is_genesis=True, species="human"))
+    agent.process_event(_event(sn, event="ADD_USER", user="bob", is_genesis=False, species="ai"))
+    agent.process_event(_mint(sn, agent, "alice", "c1"))
+    agent.save_snapshot()
+
+    # Only the entities written since the base chunk go into the delta.
+    agent.process_event(_event(sn, event="ADD_USER", user="carol", is_genesis=False, species="company"))
+    assert agent.storage._dirty["users"] == {"carol"}
+    agent.save_snapshot()
+    chunks = agent.snapshot_store.read_manifest()["chunks"]
+    assert len(chunks) == 2
+
+    restored = _sql_agent(sn, monkeypatch, tmp_path, "restored.db")
+
+    for kind in ("users", "coins"):
+        assert _records(restored.storage, kind) == _records(agent.storage, kind)
+    assert set(_records(restored.storage, "users")) == {"alice", "bob", "carol"}
+    assert restored.storage.drain_dirty()["users"] == set()
+
+
+def test_parallel_replay_matches_sequential_replay(sn, monkeypatch, tmp_path):
+    # Rate limits read the clock; a fixed one makes every replay agree.
+    monkeypatch.setattr(sn, "ts", lambda: "2025-01-01T00:00:00+00:00")
+    agent = _sql_agent(sn, monkeypatch, tmp_path, "source.db")
+    names = ["ann", "ben", "cat", "dan"]
+    for name in names:
+        agent.process_event(
+            _event(
+                sn,
+                event="ADD_USER",
+                user=name,
+                is_genesis=True,
+                species="human",
+                root_coin_id=f"root_{name}",
+            )
+        )
+    for i, name in enumerate(names):
+        agent.process_event(_mint(sn, agent, name, f"coin_{i}"))
+    # Disjoint reactions form independent components between the barriers.
+    for i, (reactor, creator) in enumerate([(0, 1), (1, 0), (2, 3), (3, 2)]):
+        agent.process_event(
+            _event(
+                sn,
+                event="REACT",
+                reactor=names[reactor],
+                coin_id=f"coin_{creator}",
+                emoji="👍",
+                message=f"nice {i}",
+            )
+        )
+    agent.process_event(
+        _event(sn, event="LIST_COIN_FOR_SALE", listing_id="l1", coin_id="coin_0", seller="ann", price="1")
+    )
+    agent.process_event(_event(sn, event="BUY_COIN", listing_id="l1", buyer="cat", total_cost="1.1"))
+    agent.process_event(_event(sn, event="DAILY_DECAY"))
+    agent.process_event(
+        _event(sn, event="LIST_COIN_FOR_SALE", listing_id="l2", coin_id="coin_1", seller="ben", price="2")
+    )
+    agent.process_event(
+        _event(sn, event="LIST_COIN_FOR_SALE", listing_id="l3", coin_id="coin_2", seller="cat", price="3")
+    )
+
+    monkeypatch.setenv("REPLAY_WORKERS", "2")
+    monkeypatch.setattr(parallel_replay, "MIN_PARALLEL_EVENTS", 2)
+    parallel_segments = []
+    apply_parallel = parallel_replay.ParallelReplayer._apply_parallel
+
+    def counting(self, segment):
+        applied = apply_parallel(self, segment)
+        parallel_segments.append(applied)
+        return applied
+
+    monkeypatch.setattr(parallel_replay.ParallelReplayer, "_apply_parallel", counting)
+    parallel = _sql_agent(sn, monkeypatch, tmp_path, "parallel.db", "parallel.json")
+    assert parallel_segments and all(parallel_segments)
+
+    monkeypatch.setattr(parallel_replay, "MIN_PARALLEL_EVENTS", 10**9)
+    sequential = _sql_agent(sn, monkeypatch, tmp_path, "sequential.db", "sequential.json")
+
+    for kind in ("users", "coins", "marketplace_listings"):
+        expected = _records(sequential.storage, kind)
+        assert _records(parallel.storage, kind) == expected
+        assert expected == _records(agent.storage, kind)
+    coins = _records(parallel.storage, "coins")
+    assert coins["coin_0"]["owner"] == "cat"
+    assert all(coins[f"coin_{i}"]["reactions"] for i in range(4))
+    assert parallel.treasury == sequential.treasury
+    assert parallel.total_system_karma == sequential.total_system_karma
+
+
+def test_read_between_write_and_commit_is_not_cached(sn, tmp_path):
+    Session = _session_factory(sn, tmp_path / "cache.db")
+    storage = sn.SQLAlchemyStorage(Session)
+    storage.set_user("alice", {"karma": "1"})
+    assert storage.get_user("alice")["karma"] == "1"
+
+    reads = []
+
+    def read_before_commit(session):
+        # Another reader misses after set_user invalidated but before commit.
+        if not reads:
+            reads.append(storage.get_user("alice")["karma"])
+
+    event.listen(Session, "before_commit", read_before_commit)
+    storage.set_user("alice", {"karma": "2"})
+
+    assert reads == ["1"]
+    assert storage.get_user("alice")["karma"] == "2"
+
+
+def test_sql_karma_decay_is_lazy_and_matches_in_memory(sn, monkeypatch, tmp_path):
+    monkeypatch.setattr(sn.Config, "KARMA_DECAY_MATERIALIZE_EPOCHS", 3)
+    storage = sn.SQLAlchemyStorage(_session_factory(sn, tmp_path / "decay.db"))
+    memory = sn.InMemoryStorage()
+    users = {
+        "gen": {"karma": "100", "is_genesis": True, "join_time": "2024-01-01T00:00:00"},
+        "reg": {"karma": "37.5", "is_genesis": False, "join_time": "2024-06-01T00:00:00"},
+    }
+    for name, data in users.items():
+        storage.set_user(name, dict(data))
+        memory.set_user(name, dict(data))
+
+    def stored_epochs():
+        db = storage.session_factory()
+        try:
+            return dict(db.query(sn.Harmonizer.username, sn.Harmonizer.decay_epoch))
+        finally:
+            db.close()
+
+    for _ in range(3):
+        storage.apply_karma_decay(sn.Config.DAILY_DECAY, 4)
+    # The third epoch writes the decay back to every row.
+    assert stored_epochs() == {"gen": 3, "reg": 3}
+    storage.apply_karma_decay(sn.Config.DAILY_DECAY, 4)
+    assert stored_epochs() == {"gen": 3, "reg": 3}
+
+    memory.karma_decay.load_state(storage.karma_decay.state())
+    for name in users:
+        record = storage.get_user(name)
+        assert record["decay_epoch"] == 4
+        assert record["karma"] == memory.get_user(name)["karma"]
+    assert storage.get_user("reg")["karma"] != "37.5"
+
+    # Writes store the decayed karma with the current epoch.
+    storage.set_user("reg", storage.get_user("reg"))
+    assert stored_epochs()["reg"] == 4
+
+
+def test_changed_proposals_are_read_by_update_time(sn, tmp_path):
+    storage = sn.SQLAlchemyStorage(_session_factory(sn, tmp_path / "proposals.db"))
+    storage.set_user("ann", {"karma": "0"})
+    deadline = "2030-01-01T00:00:00"
+    for pid in ("1", "2"):
+        storage.set_proposal(
+            pid,
+            {"creator": "ann", "description": f"p{pid}", "status": "open", "voting_deadline": deadline},
+        )
+    checked = datetime.datetime.utcnow()
+    assert storage.get_proposals_changed_since(checked) == []
+
+    storage.set_proposal("2", {"status": "rejected"})
+    changed = storage.get_proposals_changed_since(checked)
+    assert [(p["proposal_id"], p["status"]) for p in changed] == [("2", "rejected")]
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+import state_store
+from db_models import SystemState
+from state_store import StateStore
+
+needs_sqlalchemy = pytest.mark.skipif(
+    not hasattr(SystemState, "__table__"), reason="SQLAlchemy is not installed"
+)
+
+
+@pytest.fixture
+def stores(test_db):
+    factory = state_store.sessionmaker(bind=test_db.get_bind())
+    made = []
+
+    def make():
+        store = StateStore(factory, flush_interval=3600, cache_ttl=3600)
+        made.append(store)
+        return store
+
+    yield make
+    for store in made:
+        store.close()
+
+
+def _row(db, key):
+    db.expire_all()
+    return db.query(SystemState).filter(SystemState.key == key).first()
+
+
+@needs_sqlalchemy
+def test_writes_are_coalesced_until_flush(test_db, stores):
+    store = stores()
+    store.set("entropy", "10")
+    store.set("entropy", "11")
+    assert store.get("entropy") == "11"
+    assert _row(test_db, "entropy") is None
+
+    assert store.flush() == 1
+    row = _row(test_db, "entropy")
+    assert (row.value, row.version) == ("11", 1)
+
+
+@needs_sqlalchemy
+def test_increments_from_two_workers_both_land(test_db, stores):
+    a, b = stores(), stores()
+    assert a.increment("wellspring", "1.5", "0.0") == "1.5"
+    assert b.increment("wellspring", 2, "0.0") == "2.0"
+    a.flush()
+    b.flush()
+    row = _row(test_db, "wellspring")
+    assert (row.value, row.version) == ("3.5", 2)
+
+
+@needs_sqlalchemy
+def test_compare_and_set_checks_version(stores):
+    store = stores()
+    assert store.compare_and_set("leader", 0, "a") is True
+    value, version = store.get_versioned("leader")
+    assert (value, version) == ("a", 1)
+    assert store.compare_and_set("leader", version, "b") is True
+    assert store.compare_and_set("leader", version, "c") is False
+    assert store.get("leader") == "b"
+
+
+@needs_sqlalchemy
+def test_invalidation_message_refreshes_other_worker(stores):
+    a, b = stores(), stores()
+    a.set("mode", "calm")
+    a.flush()
+    assert b.get("mode") == "calm"
+    a.set("mode", "storm")
+    a.flush()
+    assert b.get("mode") == "calm"
+
+    message = json.dumps({"origin": a.origin, "keys": ["mode"]})
+    a.handle_message(message)
+    b.handle_message(message)
+    assert b.get("mode") == "storm"
+
+
+class _BrokenSession:
+    """A session whose engine is unusable from this thread."""
+
+    def query(self, *args):
+        raise RuntimeError("greenlet_spawn has not been called")
+
+    def rollback(self):
+        raise RuntimeError("greenlet_spawn has not been called")
+
+    def close(self):
+        pass
+
+
+def test_failed_flush_restages_writes():
+    store = StateStore(_BrokenSession, flush_interval=3600)
+    store._deltas["wellspring"] = (state_store.Decimal("2"), "0")
+    store._pending["entropy"] = "9"
+
+    assert store.flush() == 0
+    assert store._deltas == {"wellspring": (state_store.Decimal("2"), "0")}
+    assert store._pending == {"entropy": "9"}
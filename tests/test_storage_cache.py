@@ -0,0 +1,107 @@
+import threading
+import time
+
+from storage_cache import TwoTierCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+def test_local_then_remote_hits_and_invalidation():
+    redis = FakeRedis()
+    cache = TwoTierCache(lambda: redis)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return {"karma": "1", "coins": ["c1"]}
+
+    first = cache.get("user:alice", loader)
+    first["coins"].append("mutated")
+    assert cache.get("user:alice", loader) == {"karma": "1", "coins": ["c1"]}
+    assert "user:alice" in redis.data
+
+    other = TwoTierCache(lambda: redis)
+    assert other.get("user:alice", loader)["karma"] == "1"
+    assert len(loads) == 1
+
+    cache.invalidate("user:alice")
+    assert "user:alice" not in redis.data
+    cache.get("user:alice", loader)
+    assert len(loads) == 2
+    stats = cache.stats()
+    assert stats["local_hit"] == 1 and stats["miss"] == 2
+    assert other.stats()["remote_hit"] == 1
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TwoTierCache(lambda: FakeRedis())
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"value": 1}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get("coin:c1", loader)))
+        for _ in range(5)
+    ]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    while cache.stats()["coalesced"] < 4:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert results == [{"value": 1}] * 5
+
+
+def test_write_during_load_is_not_cached():
+    redis = FakeRedis()
+    cache = TwoTierCache(lambda: redis)
+
+    def loader():
+        cache.invalidate("coin:c1")
+        return {"value": "stale"}
+
+    assert cache.get("coin:c1", loader) == {"value": "stale"}
+    assert "coin:c1" not in redis.data
+    assert cache.get("coin:c1", lambda: {"value": "fresh"}) == {"value": "fresh"}
+
+
+def test_namespace_invalidation_drops_every_key_in_both_tiers():
+    redis = FakeRedis()
+    cache = TwoTierCache(lambda: redis)
+    other = TwoTierCache(lambda: redis, local_ttl=0)
+    cache.get("user:alice", lambda: {"karma": "1"})
+    cache.get("user:bob", lambda: {"karma": "2"})
+    cache.get("coin:c1", lambda: {"value": 1})
+
+    cache.invalidate_namespace("user")
+    assert cache.get("user:alice", lambda: {"karma": "0.9"}) == {"karma": "0.9"}
+    assert other.get("user:bob", lambda: {"karma": "1.8"}) == {"karma": "1.8"}
+    assert cache.get("coin:c1", lambda: {"value": 2}) == {"value": 1}
+    assert cache.stats()["local_hit"] == 1
@@ -0,0 +1,133 @@
+import datetime
+import types
+from decimal import Decimal
+
+import agent_core
+from scientific_utils import calculate_genesis_bonus_decay, safe_decimal
+from tally_index import SECONDS_PER_YEAR, TallyIndex
+
+
+class Config:
+    GENESIS_BONUS_DECAY_YEARS = 4
+    SPECIES = ["human", "ai", "company"]
+
+
+class Storage:
+    def __init__(self, users, proposals):
+        self.users = users
+        self.proposals = proposals
+
+    def get_user(self, name):
+        return self.users.get(name)
+
+    def get_all_users(self):
+        return list(self.users.values())
+
+    def get_proposal(self, pid):
+        return self.proposals.get(pid)
+
+    def set_proposal(self, pid, data):
+        self.proposals[pid] = data
+
+    def get_active_proposals(self):
+        return [p for p in self.proposals.values() if p.get("status") in ("open", "approved")]
+
+
+def _user(name, species, harmony, genesis=False, years_ago=0.0, consent=True):
+    joined = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+        days=365.25 * years_ago
+    )
+    return {
+        "name": name,
+        "species": species,
+        "harmony_score": harmony,
+        "is_genesis": genesis,
+        "join_time": joined.isoformat().replace("+00:00", "Z"),
+        "consent": consent,
+    }
+
+
+def test_linear_decay_and_expiry():
+    index = TallyIndex(decay_years=4)
+    span = 4 * SECONDS_PER_YEAR
+    index.set_user("g", "human", True, Decimal("2"), join_ts=0.0)
+    index.set_user("h", "human", True, Decimal("1"))
+    index.record_vote("p", "g", "yes")
+    index.record_vote("p", "h", "no")
+
+    votes, voted, total = index.tally("p", now=span / 4)
+    assert abs(votes["human"]["yes"] - Decimal("1.5")) < Decimal("1e-9")
+    assert votes["human"]["no"] == 1
+    assert abs(total - Decimal("2.5")) < Decimal("1e-9")
+
+    votes, voted, total = index.tally("p", now=span + 1)
+    assert votes["human"] == {"yes": 0, "no": 1, "total": 1}
+    assert total == 1
+
+    index.record_vote("p", "h", "yes")
+    assert index.tally("p", now=span + 1)[0]["human"]["no"] == 0
+
+
+def test_agent_index_matches_full_recount(monkeypatch):
+    monkeypatch.setattr(agent_core, "safe_decimal", safe_decimal, raising=False)
+    monkeypatch.setattr(
+        agent_core, "calculate_genesis_bonus_decay", calculate_genesis_bonus_decay, raising=False
+    )
+    users = {
+        "ann": _user("ann", "human", "3", genesis=True, years_ago=1),
+        "bot": _user("bot", "ai", "2"),
+        "co": _user("co", "company", "5", genesis=True, years_ago=5),
+        "dee": _user("dee", "human", "1"),
+        "eve": _user("eve", "ai", "4", consent=False),
+    }
+    deadline = (datetime.datetime.utcnow() + datetime.timedelta(days=1)).isoformat()
+    proposals = {"p1": {"proposal_id": "p1", "votes": {}, "status": "open", "voting_deadline": deadline}}
+    dummy = types.SimpleNamespace(
+        storage=Storage(users, proposals), config=Config(), tally_index=TallyIndex(4)
+    )
+    dummy._tally_weight_inputs = types.MethodType(agent_core.RemixAgent._tally_weight_inputs, dummy)
+    agent_core.RemixAgent._rebuild_tally_index(dummy)
+
+    for voter, vote in [("ann", "yes"), ("bot", "no"), ("co", "yes"), ("eve", "yes"), ("bot", "yes")]:
+        agent_core.RemixAgent._apply_VOTE_PROPOSAL(
+            dummy, {"proposal_id": "p1", "voter": voter, "vote": vote}
+        )
+    dummy.storage.users["ann"] = dict(users["ann"], consent=False)
+    agent_core.RemixAgent._index_tally_user(dummy, "ann")
+
+    fast = agent_core.RemixAgent._tally_proposal(dummy, "p1")
+    full = agent_core.RemixAgent._tally_proposal(dummy, "p1", full=True)
+    assert fast["yes"] == full["yes"] == Decimal("1")
+    assert abs(fast["quorum"] - full["quorum"]) < Decimal("1e-9")
+
+
+def test_records_without_governance_fields_are_skipped(monkeypatch):
+    monkeypatch.setattr(agent_core, "safe_decimal", safe_decimal, raising=False)
+    users = {"bob": {"username": "bob", "karma": "1", "consent_given": True}}
+    dummy = types.SimpleNamespace(
+        storage=Storage(users, {}), config=Config(), tally_index=TallyIndex(4)
+    )
+    dummy._tally_weight_inputs = types.MethodType(agent_core.RemixAgent._tally_weight_inputs, dummy)
+    agent_core.RemixAgent._rebuild_tally_index(dummy)
+    agent_core.RemixAgent._index_tally_user(dummy, "bob")
+    assert dummy.tally_index.tally("p1") == ({}, 0, 0)
+
+
+def test_stored_votes_reach_the_index(monkeypatch):
+    monkeypatch.setattr(agent_core, "safe_decimal", safe_decimal, raising=False)
+    users = {"ann": _user("ann", "human", "3"), "bot": _user("bot", "ai", "2")}
+    proposals = {
+        "p1": {"proposal_id": "p1", "votes": {"ann": "yes"}, "status": "open"},
+    }
+    dummy = types.SimpleNamespace(
+        storage=Storage(users, proposals), config=Config(), tally_index=TallyIndex(4)
+    )
+    dummy._tally_weight_inputs = types.MethodType(agent_core.RemixAgent._tally_weight_inputs, dummy)
+    agent_core.RemixAgent._rebuild_tally_index(dummy)
+    assert agent_core.RemixAgent._tally_proposal(dummy, "p1")["yes"] == Decimal("1")
+
+    # A proposal voted on by another process after the rebuild.
+    proposals["p2"] = {"proposal_id": "p2", "votes": {"bot": "no"}, "status": "open"}
+    fast = agent_core.RemixAgent._tally_proposal(dummy, "p2")
+    assert fast == agent_core.RemixAgent._tally_proposal(dummy, "p2", full=True)
+    assert fast["no"] == Decimal("1")
@@ -0,0 +1,135 @@
+import os
+
+import pytest
+
+from universe_host import RemoteUniverseError, UniverseHost
+
+
+class _Storage:
+    def __init__(self):
+        self.coins = {}
+
+    def get_coin(self, coin_id):
+        return self.coins.get(coin_id)
+
+    def set_coin(self, coin_id, data):
+        self.coins[coin_id] = data
+
+
+class _Agent:
+    def __init__(self, fork_id, nexus):
+        self.fork_id = fork_id
+        self.cosmic_nexus = nexus
+        self.storage = _Storage()
+
+    def pid(self):
+        return os.getpid()
+
+    def copy_from(self, other_fork, coin_id):
+        other = self.cosmic_nexus.sub_universes.get(other_fork)
+        coin = other.storage.get_coin(coin_id)
+        self.storage.set_coin(coin_id, coin)
+        self.cosmic_nexus.hooks.fire_hooks("copied", self.fork_id, coin_id)
+        return self.cosmic_nexus.state_service.get_state("mode", "none")
+
+    def relay(self, target):
+        return self.cosmic_nexus.sub_universes.get(target).pid()
+
+    def ask(self, other):
+        return self.cosmic_nexus.sub_universes.get(other).relay(self.fork_id)
+
+
+def _factory(fork_id, spec, nexus):
+    return _Agent(fork_id, nexus)
+
+
+def _bump(agent, coin_id):
+    coin = agent.storage.get_coin(coin_id)
+    coin["value"] += 1
+    agent.storage.set_coin(coin_id, coin)
+    return coin["value"]
+
+
+def _crash(agent):
+    os._exit(3)
+
+
+def _upcall_for(host_ref):
+    def upcall(op, *args):
+        host = host_ref[0]
+        if op == "has_universe":
+            return args[0] in host
+        if op == "call_universe":
+            fork_id, call_op, call_args = args
+            return host.call(fork_id, call_op, *call_args)
+        raise ValueError(op)
+
+    return upcall
+
+
+def test_waiting_universe_is_not_reentered_and_calls_time_out():
+    ref = [None]
+    host = ref[0] = UniverseHost(
+        _factory, 2, upcall=_upcall_for(ref), start_method="fork", timeout=1.0
+    )
+    try:
+        a = host.spawn("a", {})
+        host.spawn("b", {})
+        # b calling back into a, which waits on b, is queued rather than re-entering.
+        with pytest.raises(RemoteUniverseError):
+            a.ask("b")
+        assert a.pid() != os.getpid()
+    finally:
+        host.close()
+
+
+def test_dead_worker_fails_pending_calls():
+    host = UniverseHost(_factory, 1, ops={"crash": _crash}, start_method="fork")
+    try:
+        host.spawn("a", {})
+        with pytest.raises(RemoteUniverseError, match="exited"):
+            host.call("a", "crash", timeout=5)
+        with pytest.raises(RemoteUniverseError):
+            host.call("a", "pid")
+    finally:
+        host.close()
+
+
+def test_universes_run_in_workers_and_talk_through_the_primary():
+    hooks = []
+    host = None
+
+    def upcall(op, *args):
+        if op == "get_state":
+            return "hosted"
+        if op == "has_universe":
+            return args[0] in host
+        if op == "call_universe":
+            fork_id, call_op, call_args = args
+            return host.call(fork_id, call_op, *call_args)
+        raise ValueError(op)
+
+    host = UniverseHost(
+        _factory,
+        2,
+        ops={"bump": _bump},
+        upcall=upcall,
+        on_hook=lambda name, *a: hooks.append((name, a)),
+        start_method="fork",
+    )
+    try:
+        a = host.spawn("a", {})
+        b = host.spawn("b", {})
+        assert host.shard_of("a") != host.shard_of("b")
+        assert a.pid() != b.pid() != os.getpid()
+
+        a.storage.set_coin("c1", {"value": 1})
+        assert host.call("a", "bump", "c1", timeout=5) == 2
+        assert b.copy_from("a", "c1") == "hosted"
+        assert b.storage.get_coin("c1") == {"value": 2}
+        assert hooks == [("copied", ("b", "c1"))]
+
+        with pytest.raises(RemoteUniverseError):
+            a.storage.missing()
+    finally:
+        host.close()
@@ -0,0 +1,82 @@
+import pytest
+
+import user_search
+from db_models import Harmonizer
+from user_search import (
+    document_grams,
+    ensure_search_index,
+    rebuild_search_index,
+    search_users,
+    uses_grams,
+)
+
+needs_sqlalchemy = pytest.mark.skipif(
+    user_search.select is None, reason="SQLAlchemy is not installed"
+)
+
+
+def _register(db, username, bio=""):
+    user = Harmonizer(
+        username=username, email=f"{username}@example.com", hashed_password="x", bio=bio
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_document_grams_cover_prefixes_and_trigrams():
+    assert document_grams("Nova", "") == {"^n", "^no", "nov", "ova"}
+
+
+@needs_sqlalchemy
+def test_search_ranks_and_pages(test_db):
+    for name, bio in (
+        ("novalee", ""),
+        ("nova", ""),
+        ("supernova", ""),
+        ("zed", "loves nova sounds"),
+        ("nora", ""),
+    ):
+        _register(test_db, name, bio)
+
+    names = [r["username"] for r in search_users(test_db, "NOVA", limit=10)]
+    assert names == ["nova", "novalee", "supernova", "zed"]
+    assert [r["username"] for r in search_users(test_db, "no", limit=10)] == [
+        "nova",
+        "nora",
+        "novalee",
+    ]
+
+    first = search_users(test_db, "nova", limit=2)
+    rest = search_users(test_db, "nova", limit=2, cursor=first[-1]["cursor"])
+    assert [r["username"] for r in first + rest] == names
+    with pytest.raises(ValueError):
+        search_users(test_db, "nova", cursor="bogus")
+
+
+@needs_sqlalchemy
+def test_profile_update_and_rebuild_refresh_index(test_db):
+    user = _register(test_db, "quiet")
+    assert search_users(test_db, "synth") == []
+    user.bio = "modular synth"
+    test_db.commit()
+    assert [r["username"] for r in search_users(test_db, "synth")] == ["quiet"]
+
+    assert rebuild_search_index(test_db) == 1
+    assert [r["username"] for r in search_users(test_db, "qui")] == ["quiet"]
+
+
+@needs_sqlalchemy
+def test_unindexed_users_fall_back_to_like_until_backfilled(test_db):
+    _register(test_db, "oldtimer")
+    test_db.execute(user_search.delete(user_search.harmonizer_search_grams))
+    test_db.commit()
+    user_search._uses_grams.clear()
+    _register(test_db, "newcomer")
+
+    assert not uses_grams(test_db)
+    assert [r["username"] for r in search_users(test_db, "old")] == ["oldtimer"]
+
+    assert ensure_search_index(test_db.get_bind()) == 1
+    assert uses_grams(test_db)
+    assert [r["username"] for r in search_users(test_db, "old")] == ["oldtimer"]
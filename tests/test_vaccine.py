@@ -0,0 +1,45 @@
+import types
+
+from moderation_utils import PatternSet, Vaccine, event_strings
+
+
+def _vaccine(*patterns):
+    return Vaccine(types.SimpleNamespace(VAX_PATTERNS={"block": list(patterns)}))
+
+
+def test_combined_patterns_report_the_matching_rule():
+    rules = PatternSet([r"\bspam\b", r"scam+", r"(?P<w>phish)", r"(?P<w>fraud)", r"(x)\1"])
+    assert rules.search("so much SCAMMM here") == 1
+    assert rules.search("a phishing attempt") == 2
+    # Clashing group names and backreferences are kept as separate regexes.
+    assert rules.search("fraud") == 3
+    assert rules.search("xx") == 4
+    assert rules.search("clean text") is None
+
+
+def test_scan_event_only_reads_string_fields():
+    vaccine = _vaccine(r"\bblocked_word\b", r"event")
+    assert vaccine.scan_event({"event": "POST", "n": 1}) is None
+    assert vaccine.scan_event({"event": "EVENT_X"}) == "event"
+    vaccine = _vaccine(r"\bblocked_word\b", r"\b1\b")
+    assert vaccine.scan_event({"n": 1, "tags": ["ok"]}) is None
+    assert vaccine.scan_event({"meta": {"tags": ["x", "BLOCKED_WORD"]}}) == r"\bblocked_word\b"
+    assert vaccine.scan_event({"text": "a badword b"}) == "profanity:badword"
+    assert list(event_strings({"a": ["x", {"b": "y"}], "c": 2})) == ["x", "y"]
+
+
+def test_scan_events_returns_first_blocked_index():
+    vaccine = _vaccine(r"^blocked_word$")
+    events = [{"text": "fine"}, {"text": "blocked_word"}, {"text": "blocked_word"}]
+    assert vaccine.scan_events(events) == 1
+    assert vaccine.scan_events(events[:1]) is None
+
+
+def test_matches_never_span_fields():
+    vaccine = _vaccine(r"buy\s+now", r"(?s)secret.*leak")
+    event = {"title": "want to buy", "body": "now please"}
+    assert vaccine.scan_event(event) is None
+    assert vaccine.scan_event({"a": "secret", "b": "leak"}) is None
+    assert vaccine.scan_event({"a": "secret leak"}) == r"(?s)secret.*leak"
+    events = [{"title": "buy"}, {"title": "now"}, {"title": "buy now"}]
+    assert vaccine.scan_events(events) == 2
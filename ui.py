@@ -726,13 +726,18 @@ def render_validation_ui() -> None:
                         st.info("Audit functionality unavailable")
 
             with dev_tabs[3]:
-                log_path = Path("logchain_main.log")
-                if not log_path.exists():
-                    log_path = Path("remix_logchain.log")
-                if log_path.exists():
+                log_name = "logchain_main.log"
+                if not list(Path(".").glob(f"{log_name}.*.seg")):
+                    log_name = "remix_logchain.log"
+                if list(Path(".").glob(f"{log_name}.*.seg")):
                     try:
-                        lines = log_path.read_text().splitlines()[-100:]
-                        st.text("\n".join(lines))
+                        from event_log import SegmentedLogChain
+
+                        log = SegmentedLogChain(log_name, read_only=True)
+                        try:
+                            st.text("\n".join(log.tail(100)))
+                        finally:
+                            log.close()
                     except Exception as exc:
                         st.error(f"Log read failed: {exc}")
                 else:
@@ -0,0 +1,423 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Host forked universes in worker processes.
+
+``UniverseHost`` starts ``processes`` workers and places every spawned
+universe on the least loaded one, so busy forks run on their own cores
+instead of sharing the primary process's GIL.  Each worker has its own
+request queue, and all workers share one reply queue that a reader thread
+in the primary drains.
+
+Messages are plain tuples:
+
+* primary -> worker: ``("call", rid, fork_id, op, args)``,
+  ``("reply", rid, ok, value)`` for upcalls, and ``None`` to stop;
+* worker -> primary: ``("reply", rid, ok, value)``, ``("hook", fork_id,
+  name, args)`` and ``("upcall", shard, rid, op, args)``.
+
+``op`` names either an entry of the ``ops`` table, called as
+``ops[op](agent, *args)``, or a dotted attribute path on the agent such as
+``"storage.get_coin"``.  Agents inside a worker get a :class:`NexusLink` in
+place of ``CosmicNexus``.  It forwards hook fires, state lookups, forks and
+calls into other universes to the primary's ``upcall`` handler.  While a
+worker waits for an upcall it keeps serving requests for its other
+universes.  Requests for a universe that is itself waiting are queued until
+its handler returns, so a handler never re-enters mid-operation.  A call
+cycle back into a waiting universe therefore fails by timeout.
+
+Every call has a timeout (``timeout``, 30 seconds by default).  When a
+worker process dies, the requests still pending on it fail with
+:class:`RemoteUniverseError`.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import itertools
+import logging
+import multiprocessing
+import multiprocessing.connection
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+Ops = Mapping[str, Callable[..., Any]]
+
+DEFAULT_TIMEOUT = 30.0
+
+
+class RemoteUniverseError(RuntimeError):
+    """An operation failed inside a hosted universe."""
+
+
+def resolve_call(agent: Any, op: str, ops: Optional[Ops], args: Tuple[Any, ...]) -> Any:
+    """Run ``op`` against ``agent`` the way a worker would."""
+    if ops and op in ops:
+        return ops[op](agent, *args)
+    target = agent
+    for part in op.split("."):
+        target = getattr(target, part)
+    return target(*args)
+
+
+class _RemotePath:
+    """Attribute chain on a remote universe; calling it sends the request."""
+
+    def __init__(self, invoke: Callable[..., Any], path: str) -> None:
+        self._invoke = invoke
+        self._path = path
+
+    def __getattr__(self, name: str) -> "_RemotePath":
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _RemotePath(self._invoke, f"{self._path}.{name}")
+
+    def __call__(self, *args: Any) -> Any:
+        return self._invoke(self._path, args)
+
+
+class RemoteUniverse:
+    """Proxy for a universe hosted in another process.
+
+    ``proxy.storage.get_coin(cid)`` or ``proxy.process_event(event)`` is sent
+    to the owning worker and the result is returned.  Use
+    :meth:`UniverseHost.call` directly for non-blocking access.
+    """
+
+    def __init__(self, fork_id: str, invoke: Callable[[str, str, Tuple[Any, ...]], Any]) -> None:
+        self.fork_id = fork_id
+        self._invoke = invoke
+
+    def __getattr__(self, name: str) -> _RemotePath:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _RemotePath(lambda op, args: self._invoke(self.fork_id, op, args), name)
+
+    def __repr__(self) -> str:
+        return f"RemoteUniverse({self.fork_id!r})"
+
+
+# ----------------------------------------------------------------------
+# Worker side
+class _WorkerHooks:
+    def __init__(self, link: "NexusLink") -> None:
+        self._link = link
+
+    def fire_hooks(self, name: str, *args: Any) -> List[Any]:
+        self._link._send(("hook", self._link.fork_id, name, args))
+        return []
+
+
+class _WorkerState:
+    def __init__(self, link: "NexusLink") -> None:
+        self._link = link
+
+    def get_state(self, key: str, default: Any = None) -> Any:
+        return self._link.upcall("get_state", key, default)
+
+
+class _WorkerDirectory:
+    """``sub_universes`` as seen from inside a worker."""
+
+    def __init__(self, link: "NexusLink") -> None:
+        self._link = link
+
+    def get(self, fork_id: str, default: Any = None) -> Any:
+        local = self._link._worker.agents.get(fork_id)
+        if local is not None:
+            return local
+        if not fork_id or not self._link.upcall("has_universe", fork_id):
+            return default
+        return RemoteUniverse(
+            fork_id, lambda fid, op, args: self._link.upcall("call_universe", fid, op, args)
+        )
+
+    def __contains__(self, fork_id: str) -> bool:
+        return self.get(fork_id) is not None
+
+
+class NexusLink:
+    """Stand-in for ``CosmicNexus`` given to agents hosted in a worker."""
+
+    def __init__(self, worker: "_Worker", fork_id: str) -> None:
+        self._worker = worker
+        self.fork_id = fork_id
+        self.hooks = _WorkerHooks(self)
+        self.state_service = _WorkerState(self)
+        self.sub_universes = _WorkerDirectory(self)
+
+    def _send(self, message: Tuple[Any, ...]) -> None:
+        self._worker.replies.put(message)
+
+    def upcall(self, op: str, *args: Any) -> Any:
+        return self._worker.upcall(op, args)
+
+    def apply_fork_universe(self, event: Dict[str, Any]) -> Any:
+        return self.upcall("apply_fork_universe", event)
+
+
+class _Worker:
+    def __init__(self, shard: int, factory: Callable[..., Any], ops: Optional[Ops], requests, replies) -> None:
+        self.shard = shard
+        self.factory = factory
+        self.ops = ops
+        self.requests = requests
+        self.replies = replies
+        self.agents: Dict[str, Any] = {}
+        self._ids = itertools.count()
+        self._answers: Dict[int, Tuple[bool, Any]] = {}
+        self._busy: Set[str] = set()
+        self._deferred: List[Tuple[Any, ...]] = []
+        self._stopping = False
+
+    def serve(self) -> None:
+        while not self._stopping:
+            message = self.requests.get()
+            if message is None:
+                return
+            self._handle(message)
+
+    def _handle(self, message: Tuple[Any, ...]) -> None:
+        if message[0] == "reply":
+            _, rid, ok, value = message
+            self._answers[rid] = (ok, value)
+            return
+        fork_id = message[2]
+        if fork_id in self._busy:
+            # Its handler is waiting on an upcall; run this once it returns.
+            self._deferred.append(message)
+            return
+        self._busy.add(fork_id)
+        try:
+            self._run(message)
+        finally:
+            self._busy.discard(fork_id)
+        self._run_deferred()
+
+    def _run_deferred(self) -> None:
+        while True:
+            ready = next((m for m in self._deferred if m[2] not in self._busy), None)
+            if ready is None:
+                return
+            self._deferred.remove(ready)
+            self._handle(ready)
+
+    def _run(self, message: Tuple[Any, ...]) -> None:
+        _, rid, fork_id, op, args = message
+        try:
+            if op == "__create__":
+                self.agents[fork_id] = self.factory(fork_id, *args, NexusLink(self, fork_id))
+                value = None
+            elif op == "__drop__":
+                agent = self.agents.pop(fork_id, None)
+                if hasattr(agent, "close"):
+                    agent.close()
+                value = None
+            else:
+                value = resolve_call(self.agents[fork_id], op, self.ops, args)
+            self.replies.put(("reply", rid, True, value))
+        except Exception as exc:  # reported to the caller
+            logger.exception("Universe %s failed on %s", fork_id, op)
+            self.replies.put(("reply", rid, False, f"{type(exc).__name__}: {exc}"))
+
+    def upcall(self, op: str, args: Tuple[Any, ...]) -> Any:
+        rid = next(self._ids)
+        self.replies.put(("upcall", self.shard, rid, op, args))
+        while rid not in self._answers:
+            message = self.requests.get()
+            if message is None:
+                self._stopping = True
+                raise RemoteUniverseError("universe host is shutting down")
+            self._handle(message)
+        ok, value = self._answers.pop(rid)
+        if not ok:
+            raise RemoteUniverseError(value)
+        return value
+
+
+def _serve_worker(shard: int, factory: Callable[..., Any], ops: Optional[Ops], requests, replies) -> None:
+    _Worker(shard, factory, ops, requests, replies).serve()
+
+
+# ----------------------------------------------------------------------
+# Primary side
+class UniverseHost:
+    """Pool of worker processes each hosting a shard of universes.
+
+    ``factory(fork_id, spec, nexus_link)`` builds an agent inside a worker;
+    ``upcall(op, *args)`` answers requests coming back from workers and
+    ``on_hook(name, *args)`` receives their hook fires.  ``factory`` and
+    ``ops`` must be picklable (module-level functions) under ``spawn``.
+    ``timeout`` is the default wait for :meth:`call` and :meth:`spawn`.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., Any],
+        processes: int,
+        ops: Optional[Ops] = None,
+        upcall: Optional[Callable[..., Any]] = None,
+        on_hook: Optional[Callable[..., Any]] = None,
+        start_method: str = "spawn",
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        ctx = multiprocessing.get_context(start_method)
+        self.ops = ops
+        self.timeout = timeout
+        self._upcall = upcall
+        self._on_hook = on_hook
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Tuple[int, concurrent.futures.Future]] = {}
+        self._placement: Dict[str, int] = {}
+        self._dead: Dict[int, str] = {}
+        self._closing = False
+        self._replies = ctx.Queue()
+        self._requests = [ctx.Queue() for _ in range(max(1, processes))]
+        self._processes = [
+            ctx.Process(
+                target=_serve_worker,
+                args=(shard, factory, ops, requests, self._replies),
+                daemon=True,
+            )
+            for shard, requests in enumerate(self._requests)
+        ]
+        for process in self._processes:
+            process.start()
+        # Upcalls may block on other universes, so they never run on the reader.
+        self._upcalls = concurrent.futures.ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="universe-upcall"
+        )
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+        self._watcher = threading.Thread(target=self._watch, daemon=True)
+        self._watcher.start()
+
+    def __contains__(self, fork_id: object) -> bool:
+        return fork_id in self._placement
+
+    def shard_of(self, fork_id: str) -> int:
+        return self._placement[fork_id]
+
+    def _read(self) -> None:
+        # Polled rather than stopped with a sentinel: a worker that died while
+        # writing can leave the reply queue's write lock held forever.
+        while not self._closing:
+            try:
+                message = self._replies.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            kind = message[0]
+            if kind == "reply":
+                _, rid, ok, value = message
+                with self._lock:
+                    _, future = self._pending.pop(rid, (None, None))
+                if future is None:
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(RemoteUniverseError(value))
+            elif kind == "hook":
+                _, fork_id, name, args = message
+                if self._on_hook is not None:
+                    try:
+                        self._on_hook(name, *args)
+                    except Exception:
+                        logger.exception("Hook %s from universe %s failed", name, fork_id)
+            elif kind == "upcall":
+                self._upcalls.submit(self._answer_upcall, *message[1:])
+
+    def _watch(self) -> None:
+        """Fail the pending requests of workers that exit unexpectedly."""
+        alive = {process.sentinel: shard for shard, process in enumerate(self._processes)}
+        while alive:
+            for sentinel in multiprocessing.connection.wait(list(alive)):
+                shard = alive.pop(sentinel)
+                if self._closing:
+                    continue
+                reason = f"universe worker {shard} exited ({self._processes[shard].exitcode})"
+                logger.error(reason)
+                with self._lock:
+                    self._dead[shard] = reason
+                    lost = [rid for rid, (s, _) in self._pending.items() if s == shard]
+                    futures = [self._pending.pop(rid)[1] for rid in lost]
+                for future in futures:
+                    future.set_exception(RemoteUniverseError(reason))
+
+    def _answer_upcall(self, shard: int, rid: int, op: str, args: Tuple[Any, ...]) -> None:
+        try:
+            if self._upcall is None:
+                raise RemoteUniverseError("no upcall handler")
+            reply = ("reply", rid, True, self._upcall(op, *args))
+        except Exception as exc:
+            reply = ("reply", rid, False, f"{type(exc).__name__}: {exc}")
+        self._requests[shard].put(reply)
+
+    def request(self, fork_id: str, op: str, *args: Any) -> concurrent.futures.Future:
+        """Send ``op`` to the worker owning ``fork_id``; returns a future."""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        shard = self._placement[fork_id]
+        with self._lock:
+            dead = self._dead.get(shard)
+            if dead is None:
+                rid = next(self._ids)
+                self._pending[rid] = (shard, future)
+        if dead is not None:
+            future.set_exception(RemoteUniverseError(dead))
+            return future
+        self._requests[shard].put(("call", rid, fork_id, op, args))
+        return future
+
+    def call(self, fork_id: str, op: str, *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run ``op`` and wait for it; ``timeout=None`` uses :attr:`timeout`."""
+        future = self.request(fork_id, op, *args)
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except concurrent.futures.TimeoutError:
+            with self._lock:
+                for rid, (_, pending) in list(self._pending.items()):
+                    if pending is future:
+                        del self._pending[rid]
+            raise RemoteUniverseError(f"{op} on universe {fork_id} timed out") from None
+
+    def spawn(self, fork_id: str, spec: Any, timeout: Optional[float] = None) -> RemoteUniverse:
+        """Create ``fork_id`` on the least loaded worker and return its proxy."""
+        with self._lock:
+            loads = [0] * len(self._requests)
+            for shard in self._placement.values():
+                loads[shard] += 1
+            for shard in self._dead:
+                loads[shard] = float("inf")
+            self._placement[fork_id] = loads.index(min(loads))
+        try:
+            self.call(fork_id, "__create__", spec, timeout=timeout)
+        except Exception:
+            with self._lock:
+                self._placement.pop(fork_id, None)
+            raise
+        return RemoteUniverse(
+            fork_id, lambda fid, op, args: self.call(fid, op, *args, timeout=timeout)
+        )
+
+    def drop(self, fork_id: str) -> None:
+        if fork_id in self._placement:
+            self.call(fork_id, "__drop__")
+            with self._lock:
+                self._placement.pop(fork_id, None)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the workers and the reader thread."""
+        self._closing = True
+        for requests in self._requests:
+            requests.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._reader.join(timeout)
+        self._watcher.join(timeout)
+        self._upcalls.shutdown(wait=False)
@@ -0,0 +1,261 @@
+# STRICTLY A SOCIAL MEDIA PLATFORM
+# Intellectual Property & Artistic Inspiration
+# Legal & Ethical Safeguards
+"""Indexed harmonizer search for ``/users/search``.
+
+A bare ``ILIKE '%q%'`` scans every harmonizer on every keystroke.  Here the
+candidates come from an index first, and only they are checked against the
+pattern:
+
+* Local mode (SQLite) keeps ``harmonizer_search_grams``: the lowercase
+  trigrams of each username and bio, plus ``^a``/``^ab`` username prefixes
+  for one- and two-letter queries.  A harmonizer is a candidate when it
+  holds every gram of the query.  Mapper events rewrite a harmonizer's
+  grams whenever one is inserted or its username or bio changes, whichever
+  code path does it.  Only the first ``BIO_INDEX_CHARS`` of a bio are
+  indexed.  While some harmonizer has no grams (the table was just created
+  on an existing database), search falls back to the plain ``LIKE`` until
+  :func:`ensure_search_index` backfills them.
+* Central mode (PostgreSQL) uses ``pg_trgm`` GIN indexes on
+  ``lower(username)`` and ``lower(bio)``, created by
+  :func:`ensure_search_index`, so the ``LIKE`` itself is indexed and the
+  gram table is not used.
+
+Results are ranked exact username, username prefix, username substring,
+then bio match; shorter usernames first within a rank.  Each result
+carries a ``cursor``; passing the last one back returns the next page.
+"""
+
+from __future__ import annotations
+
+import weakref
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    from sqlalchemy import and_, case, delete, event, func, insert, inspect, or_, select, text
+except ImportError:  # pragma: no cover - optional dependency
+    and_ = case = delete = event = func = insert = inspect = or_ = select = text = None
+
+from db_models import Harmonizer, harmonizer_search_grams
+from graph_assembly import stream
+
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 50
+BIO_INDEX_CHARS = 500
+PREFIX_MARK = "^"
+
+_gram_tables: "weakref.WeakKeyDictionary[object, bool]" = weakref.WeakKeyDictionary()
+_uses_grams: "weakref.WeakKeyDictionary[object, bool]" = weakref.WeakKeyDictionary()
+
+POSTGRES_INDEXES = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_harmonizers_username_trgm "
+    "ON harmonizers USING gin (lower(username) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_harmonizers_bio_trgm "
+    "ON harmonizers USING gin (lower(bio) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_harmonizers_username_prefix "
+    "ON harmonizers (lower(username) text_pattern_ops)",
+)
+
+
+def _trigrams(value: str) -> Set[str]:
+    return {value[i : i + 3] for i in range(len(value) - 2)}
+
+
+def document_grams(username: str, bio: Optional[str]) -> Set[str]:
+    """Return the grams stored for a harmonizer."""
+    name = username.lower()
+    grams = {PREFIX_MARK + name[:n] for n in (1, 2) if len(name) >= n}
+    grams |= _trigrams(name)
+    grams |= _trigrams((bio or "").lower()[:BIO_INDEX_CHARS])
+    return grams
+
+
+def query_grams(q: str) -> Set[str]:
+    """Return the grams a harmonizer must hold to match ``q`` (lowercase)."""
+    return {PREFIX_MARK + q} if len(q) < 3 else _trigrams(q)
+
+
+def has_gram_table(bind) -> bool:
+    """Return whether ``bind`` (an engine or connection) keeps the gram table."""
+    if inspect is None:
+        return False
+    engine = getattr(bind, "engine", bind)
+    if engine not in _gram_tables:
+        _gram_tables[engine] = engine.dialect.name != "postgresql" and inspect(
+            bind
+        ).has_table(harmonizer_search_grams.name)
+    return _gram_tables[engine]
+
+
+def _unindexed():
+    indexed = select(harmonizer_search_grams.c.harmonizer_id)
+    return select(Harmonizer.id).where(Harmonizer.id.not_in(indexed))
+
+
+def uses_grams(db) -> bool:
+    """Return whether ``db`` is served from the gram table.
+
+    Only a positive answer is cached per engine, so a table that is still
+    being backfilled is checked again on the next search.
+    """
+    bind = db.get_bind()
+    if not has_gram_table(bind):
+        return False
+    if not _uses_grams.get(bind):
+        _uses_grams[bind] = db.execute(_unindexed().limit(1)).first() is None
+    return _uses_grams[bind]
+
+
+def ensure_search_index(engine) -> int:
+    """Prepare the search index of ``engine``; return the harmonizers backfilled.
+
+    PostgreSQL gets its ``pg_trgm`` indexes.  Elsewhere, harmonizers created
+    before the gram table existed are indexed.
+    """
+    dialect = getattr(getattr(engine, "dialect", None), "name", None)
+    if dialect == "postgresql":
+        with engine.begin() as conn:
+            for statement in POSTGRES_INDEXES:
+                conn.execute(text(statement))
+        return 0
+    if dialect is None or not has_gram_table(engine):
+        return 0
+    with engine.begin() as conn:
+        missing = [
+            tuple(row)
+            for row in conn.execute(
+                select(Harmonizer.id, Harmonizer.username, Harmonizer.bio).where(
+                    Harmonizer.id.in_(_unindexed())
+                )
+            )
+        ]
+        for hid, username, bio in missing:
+            _write_grams(conn, hid, username, bio)
+    return len(missing)
+
+
+def _write_grams(conn, harmonizer_id: int, username: str, bio: Optional[str]) -> None:
+    conn.execute(
+        delete(harmonizer_search_grams).where(
+            harmonizer_search_grams.c.harmonizer_id == harmonizer_id
+        )
+    )
+    conn.execute(
+        insert(harmonizer_search_grams),
+        [
+            {"gram": gram, "harmonizer_id": harmonizer_id}
+            for gram in sorted(document_grams(username, bio))
+        ],
+    )
+
+
+def index_harmonizer(db, harmonizer: Harmonizer) -> None:
+    """Replace the grams of ``harmonizer``.  The caller commits.
+
+    The mapper events below already do this on insert and update; call it
+    only for rows changed behind the ORM's back.
+    """
+    if has_gram_table(db.get_bind()):
+        _write_grams(db, harmonizer.id, harmonizer.username, harmonizer.bio)
+
+
+def _index_inserted(mapper, connection, target) -> None:
+    if has_gram_table(connection):
+        _write_grams(connection, target.id, target.username, target.bio)
+
+
+def _index_updated(mapper, connection, target) -> None:
+    attrs = inspect(target).attrs
+    if not (attrs.username.history.has_changes() or attrs.bio.history.has_changes()):
+        return
+    if has_gram_table(connection):
+        _write_grams(connection, target.id, target.username, target.bio)
+
+
+if event is not None and hasattr(Harmonizer, "__table__"):
+    event.listen(Harmonizer, "after_insert", _index_inserted)
+    event.listen(Harmonizer, "after_update", _index_updated)
+
+
+def rebuild_search_index(db, batch_size: int = 1000) -> int:
+    """Regenerate every harmonizer's grams; return the number indexed."""
+    db.execute(delete(harmonizer_search_grams))
+    indexed = 0
+    rows: List[Dict[str, Any]] = []
+    query = db.query(Harmonizer.id, Harmonizer.username, Harmonizer.bio)
+    for hid, username, bio in stream(query, batch_size):
+        rows.extend({"gram": g, "harmonizer_id": hid} for g in document_grams(username, bio))
+        indexed += 1
+        if len(rows) >= batch_size:
+            db.execute(insert(harmonizer_search_grams), rows)
+            rows = []
+    if rows:
+        db.execute(insert(harmonizer_search_grams), rows)
+    db.commit()
+    return indexed
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def parse_cursor(cursor: str) -> Tuple[int, int, int]:
+    """Return ``(rank, length, id)`` from a result cursor."""
+    rank, size, hid = (int(part) for part in cursor.split("."))
+    return rank, size, hid
+
+
+def search_users(
+    db, q: str, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Return up to ``limit`` ranked matches for ``q`` after ``cursor``.
+
+    Raises ``ValueError`` for a malformed cursor.
+    """
+    q = q.strip().lower()
+    if not q:
+        return []
+    limit = max(1, min(limit, MAX_LIMIT))
+    escaped = _escape_like(q)
+    name = func.lower(Harmonizer.username)
+    rank = case(
+        (name == q, 0),
+        (name.like(f"{escaped}%", escape="\\"), 1),
+        (name.like(f"%{escaped}%", escape="\\"), 2),
+        else_=3,
+    )
+    size = func.length(Harmonizer.username)
+    if len(q) < 3:
+        match = name.like(f"{escaped}%", escape="\\")
+    else:
+        match = or_(
+            name.like(f"%{escaped}%", escape="\\"),
+            func.lower(Harmonizer.bio).like(f"%{escaped}%", escape="\\"),
+        )
+    stmt = select(Harmonizer.id, Harmonizer.username, rank, size).where(match)
+    if uses_grams(db):
+        grams = query_grams(q)
+        candidates = (
+            select(harmonizer_search_grams.c.harmonizer_id)
+            .where(harmonizer_search_grams.c.gram.in_(grams))
+            .group_by(harmonizer_search_grams.c.harmonizer_id)
+            .having(func.count() == len(grams))
+        )
+        stmt = stmt.where(Harmonizer.id.in_(candidates))
+    if cursor:
+        after_rank, after_size, after_id = parse_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                rank > after_rank,
+                and_(
+                    rank == after_rank,
+                    or_(size > after_size, and_(size == after_size, Harmonizer.id > after_id)),
+                ),
+            )
+        )
+    stmt = stmt.order_by(rank, size, Harmonizer.id).limit(limit)
+    return [
+        {"id": hid, "username": username, "cursor": f"{r}.{s}.{hid}"}
+        for hid, username, r, s in db.execute(stmt)
+    ]